@@ -25,6 +25,15 @@ from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 from circuitbreaker import circuit
 
+from rolling_stats import rolling_variance
+from self_optimizing_neuroplasticity import (  # noqa: F401 - re-exported
+    BatchedSelfOptimizingNeuroplasticity,
+    ExperienceMemoryRing,
+    SelfOptimizingNeuroplasticity,
+    VRAdaptationParameters,
+    benchmark_batched_neuroplasticity,
+)
+
 # Core ML and Neural Network imports
 try:
     import torch
@@ -84,15 +93,6 @@ class AdvancedEEGMetrics:
     neuroplasticity_index: float
     adaptability_threshold: float
 
-@dataclass
-class VRAdaptationParameters:
-    """VR environment adaptation parameters"""
-    difficulty_adjustment: float
-    relaxation_mode: bool
-    focus_enhancement: float
-    stress_reduction: float
-    learning_acceleration: float
-
 @dataclass
 class LearningExperience:
     """Individual learning experience with traits weighting"""
@@ -283,6 +283,7 @@ class QuantumEEGProcessor:
                 "gamma": (30, 50)
             },
             "quantum_optimization": True,
+            "feature_dtype": "float64",  # rolling-variance precision: "float64" or "float32"
             "adaptability_threshold": 0.5,
             "circuit_breaker_threshold": 5,
             "circuit_breaker_timeout": 300
@@ -408,10 +409,11 @@ class QuantumEEGProcessor:
             # Create quantum optimization problem
             problem = Problem(name="eeg_feature_selection")
             
-            # Add terms for each potential feature
-            for i in range(len(raw_signal)):
-                # Weight based on signal variance and relevance
-                weight = float(np.var(raw_signal[max(0, i-10):i+10]))
+            # Weight each potential feature by the variance of the surrounding
+            # 20-sample window; channels of a 2-D signal are numbered channel-major
+            weights = rolling_variance(np.atleast_2d(raw_signal), before=10, after=10,
+                                       dtype=self.config.get("feature_dtype", "float64")).ravel()
+            for i, weight in enumerate(weights.tolist()):
                 problem.add_term(c=weight, indices=[i])
             
             # Solve using quantum solver
@@ -561,142 +563,6 @@ class QuantumEEGProcessor:
         except Exception as e:
             logger.error(f"Failed to stream to Azure Event Hub: {e}")
 
-# ========================================================================================
-# SELF-OPTIMIZING NEUROPLASTICITY SYSTEM
-# ========================================================================================
-
-class SelfOptimizingNeuroplasticity:
-    """
-    Self-optimizing system for neuroplasticity enhancement with mathematical precision
-    """
-    
-    def __init__(self):
-        self.age_factor = 0.05
-        self.learning_rate = 0.01
-        self.memory_decay = 0.95
-        
-    def self_experiencing_stage(self, weights: np.ndarray, experiences: np.ndarray, 
-                              epsilon: float, age: int, D: float, R: float) -> Tuple[float, float]:
-        """
-        Self-experiencing stage with mathematical precision
-        
-        Args:
-            weights: Neural pathway weights
-            experiences: Experience vectors
-            epsilon: Exploration parameter
-            age: Learning system age
-            D: Difficulty parameter
-            R: Reward parameter
-            
-        Returns:
-            Experience value (E_t) and Capacity (C_t)
-        """
-        # Calculate experience value
-        E_t = np.sum(weights * experiences) + epsilon
-        
-        # Calculate capacity with age-dependent adjustment
-        C_t = 1 + (D / R) * (self.age_factor ** age)
-        
-        return float(E_t), float(C_t)
-    
-    def reflective_observation_stage(self, E_t: float, C_t: float, 
-                                   memory_bank: np.ndarray) -> Tuple[float, np.ndarray]:
-        """
-        Reflective observation with memory integration
-        
-        Args:
-            E_t: Experience value from self-experiencing stage
-            C_t: Capacity from self-experiencing stage
-            memory_bank: Long-term memory storage
-            
-        Returns:
-            Reflection value and updated memory bank
-        """
-        # Memory-weighted reflection
-        memory_influence = np.mean(memory_bank) if len(memory_bank) > 0 else 0.0
-        R_t = E_t * C_t * (1 + memory_influence * 0.3)
-        
-        # Update memory bank with decay
-        updated_memory = memory_bank * self.memory_decay
-        
-        # Add current experience to memory
-        if len(updated_memory) > 0:
-            updated_memory = np.append(updated_memory, [E_t])[-100:]  # Keep last 100 experiences
-        else:
-            updated_memory = np.array([E_t])
-        
-        return float(R_t), updated_memory
-    
-    def abstract_conceptualization_stage(self, R_t: float, learning_history: List[float],
-                                       neuroplasticity_factors: Dict[str, float]) -> float:
-        """
-        Abstract conceptualization with neuroplasticity integration
-        
-        Args:
-            R_t: Reflection value
-            learning_history: History of learning outcomes
-            neuroplasticity_factors: Current neuroplasticity measurements
-            
-        Returns:
-            Conceptualization value
-        """
-        # Calculate learning trend
-        if len(learning_history) > 1:
-            trend = np.mean(np.diff(learning_history[-10:]))  # Last 10 experiences
-        else:
-            trend = 0.0
-        
-        # Neuroplasticity enhancement
-        plasticity_boost = (
-            neuroplasticity_factors.get("alpha_power", 0.5) * 0.4 +
-            neuroplasticity_factors.get("theta_power", 0.3) * 0.3 +
-            neuroplasticity_factors.get("complexity", 0.2) * 0.3
-        )
-        
-        # Abstract conceptualization
-        A_t = R_t * (1 + trend * 0.2) * (1 + plasticity_boost)
-        
-        return float(A_t)
-    
-    def active_experimentation_stage(self, A_t: float, environment_feedback: Dict[str, float],
-                                   adaptation_parameters: VRAdaptationParameters) -> Dict[str, float]:
-        """
-        Active experimentation with VR environment integration
-        
-        Args:
-            A_t: Conceptualization value
-            environment_feedback: VR environment feedback
-            adaptation_parameters: Current VR adaptation settings
-            
-        Returns:
-            Experimentation results and new parameters
-        """
-        # Calculate experimentation value
-        feedback_influence = np.mean(list(environment_feedback.values()))
-        E_exp = A_t * (1 + feedback_influence * 0.5)
-        
-        # Determine optimal adaptations
-        stress_level = environment_feedback.get("stress", 0.3)
-        focus_level = environment_feedback.get("focus", 0.7)
-        
-        # Dynamic adaptation
-        new_difficulty = adaptation_parameters.difficulty_adjustment
-        if focus_level > 0.8 and stress_level < 0.2:
-            new_difficulty = min(1.0, new_difficulty + 0.1)  # Increase difficulty
-        elif stress_level > 0.6:
-            new_difficulty = max(0.1, new_difficulty - 0.15)  # Decrease difficulty
-        
-        # Calculate learning acceleration
-        learning_acceleration = E_exp * (focus_level - stress_level * 0.5)
-        
-        return {
-            "experimentation_value": E_exp,
-            "new_difficulty": new_difficulty,
-            "learning_acceleration": learning_acceleration,
-            "recommended_focus_enhancement": max(0.0, 0.8 - focus_level),
-            "recommended_stress_reduction": max(0.0, stress_level - 0.3)
-        }
-
 # ========================================================================================
 # FEDERATED LEARNING FOR SECURE MODEL AGGREGATION
 # ========================================================================================
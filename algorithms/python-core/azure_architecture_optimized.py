@@ -8,15 +8,21 @@ Copyright 2025 - Sergio Paya Benaully
 L.I.F.E. Platform - Azure Marketplace Offer ID: 9a600d96-fe1e-420b-902a-a0c42c561adb
 """
 
+import asyncio
+import inspect
 import json
 import logging
 import os
+import random
+import time
 from datetime import datetime, timedelta
 
 from azure.ai.ml import MLClient
 from azure.cosmos import CosmosClient
 from azure.identity import DefaultAzureCredential
 
+from synapse_local import LocalSynapseAnalyticsEngine
+
 # Setup logging directory
 LOGS_DIR = "logs"
 os.makedirs(LOGS_DIR, exist_ok=True)
@@ -27,6 +33,90 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Service limit for operations in one Cosmos DB transactional batch
+COSMOS_MAX_BATCH_OPERATIONS = 100
+
+
+async def _resolve(result):
+    """Await SDK results from async clients, pass through sync ones"""
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+def _retry_after_seconds(error):
+    """Return the 429 retry-after hint in seconds, or None if not throttled"""
+    if getattr(error, "status_code", None) != 429:
+        return None
+    headers = getattr(error, "headers", None) or {}
+    response = getattr(error, "response", None)
+    if not headers and response is not None:
+        headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("x-ms-retry-after-ms", 0)) / 1000.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _last_request_charge(container):
+    """Read x-ms-request-charge from the last response on a container client"""
+    headers = getattr(container, "last_response_headers", None)
+    if headers is None:
+        headers = getattr(getattr(container, "client_connection", None), "last_response_headers", None)
+    try:
+        return float((headers or {}).get("x-ms-request-charge", 0.0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class AdaptiveBatchController:
+    """
+    Adaptive Cosmos DB batch sizing driven by request charge and throttling
+    
+    - Grows the batch additively while requests succeed
+    - Caps the batch so its expected charge stays under the target request charge
+    - Halves the batch on every 429 and backs off exponentially with jitter,
+      never waiting less than the service's retry-after hint
+    """
+    
+    def __init__(self, initialsize=COSMOS_MAX_BATCH_OPERATIONS, minsize=1,
+                 maxsize=COSMOS_MAX_BATCH_OPERATIONS, targetrequestcharge=None,
+                 increasestep=10, basedelay=0.05, maxdelay=10.0, jitter=0.25, rng=None):
+        self.minsize = max(1, minsize)
+        self.maxsize = min(maxsize, COSMOS_MAX_BATCH_OPERATIONS)
+        self.batchsize = self._clamp(initialsize)
+        self.targetrequestcharge = targetrequestcharge
+        self.increasestep = increasestep
+        self.basedelay = basedelay
+        self.maxdelay = maxdelay
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.throttlecount = 0
+        self.lastchargeperoperation = 0.0
+    
+    def _clamp(self, size):
+        return max(self.minsize, min(self.maxsize, int(size)))
+    
+    def on_success(self, operationcount, requestcharge):
+        """Record a successful batch and resize for the next one"""
+        nextsize = self.batchsize + self.increasestep
+        if requestcharge > 0 and operationcount > 0:
+            self.lastchargeperoperation = requestcharge / operationcount
+            if self.targetrequestcharge:
+                nextsize = min(nextsize, self.targetrequestcharge / self.lastchargeperoperation)
+        self.batchsize = self._clamp(nextsize)
+    
+    def on_throttle(self):
+        """Record a 429 and shrink the batch multiplicatively"""
+        self.throttlecount += 1
+        self.batchsize = self._clamp(self.batchsize // 2)
+    
+    def backoff_delay(self, attempt, retryafter=0.0):
+        """Jittered exponential backoff that honours the retry-after hint"""
+        exponential = min(self.maxdelay, self.basedelay * (2 ** attempt))
+        return max(retryafter, exponential) * (1.0 + self.rng.uniform(0.0, self.jitter))
+
+
 class OptimizedAzureArchitecture:
     """
     Production-ready Azure Architecture Optimization for L.I.F.E. Platform
@@ -40,7 +130,7 @@ class OptimizedAzureArchitecture:
     - OIDC-only authentication (no connection strings)
     """
     
-    def __init__(self):
+    def __init__(self, cosmosclient=None, mlclient=None, provisionedru=None, sleep=None, rng=None):
         self.platform_name = "L.I.F.E. Platform"
         self.version = "2025.1.0-PRODUCTION"
         self.architecture_type = "Azure-Native Production System"
@@ -48,14 +138,28 @@ class OptimizedAzureArchitecture:
         
         # Azure OIDC Authentication (NO connection strings)
         self.credential = DefaultAzureCredential()
-        self.cosmosclient = None
-        self.mlclient = None
+        self.cosmosclient = cosmosclient
+        self.mlclient = mlclient
         self.synapseclient = None
         
         # Performance optimization targets
         self.ruoptimizationtarget = 0.7  # Target 70% RU utilization
-        self.batchsize = 100
+        self.batchsize = COSMOS_MAX_BATCH_OPERATIONS
         self.connectionpoolsize = 50
+        self.maxretries = 8
+        
+        # Keep each batch's charge within the RU utilization target when throughput is known
+        self.provisionedru = provisionedru
+        self.batchcontroller = AdaptiveBatchController(
+            initialsize=self.batchsize,
+            targetrequestcharge=provisionedru * self.ruoptimizationtarget if provisionedru else None,
+            rng=rng,
+        )
+        self.sleep = sleep or asyncio.sleep
+        
+        # In-process analytics over ingested data points (used when no Synapse client is set).
+        # Rows beyond the retention are compacted away; queries widen it when they look further back.
+        self.analyticsengine = LocalSynapseAnalyticsEngine(retention_seconds=2 * 3600)
         
         # Cost monitoring thresholds
         self.costthresholds = {
@@ -80,9 +184,13 @@ class OptimizedAzureArchitecture:
 
     def initoptimizedconnections(self):
         """Initialize Azure service connections with optimized settings"""
+        if self.cosmosclient is not None and self.mlclient is not None:
+            logger.info("Using injected Azure service clients")
+            return
+        
         try:
             # Cosmos DB with optimized connection policy
-            self.cosmosclient = CosmosClient(
+            self.cosmosclient = self.cosmosclient or CosmosClient(
                 url="https://stlifeplatformprod.documents.azure.com:443/",
                 credential=self.credential,
                 connection_policy={
@@ -95,7 +203,7 @@ class OptimizedAzureArchitecture:
             )
             
             # ML Client for neuroadaptive model training
-            self.mlclient = MLClient(
+            self.mlclient = self.mlclient or MLClient(
                 credential=self.credential,
                 subscription_id="5c88cef6-f243-497d-98af-6c6086d575ca",
                 resource_group_name="life-platform-prod",
@@ -113,28 +221,35 @@ class OptimizedAzureArchitecture:
         Intelligent EEG data ingestion with optimized partitioning for throughput
         
         Features:
-        - Adaptive partition key calculation based on user and time
-        - Batch optimization for maximum RU efficiency
+        - Data points grouped by their own partition key (user and hour)
+        - One transactional batch stream per partition, up to the service limit
+        - Batch size adapted to request charge and 429 throttling
         - Automatic TTL for data lifecycle management
-        - Fallback ingestion on failures
+        - Fallback ingestion on failures, per partition
         """
-        operations = []
-        partitionkey = self.calculateoptimalpartitionkey(eegdatabatch)
-        
+        partitions = {}
         for datapoint in eegdatabatch:
             enriched = self.enrichdatapoint(datapoint)
-            operations.append({
-                "operationType": "Upsert",
-                "resourceBody": enriched
-            })
+            partitions.setdefault(enriched["partitionKey"], []).append((datapoint, enriched))
         
+        results = []
+        for partitionkey, entries in partitions.items():
+            operations = [("upsert", (enriched,)) for _, enriched in entries]
+            try:
+                response = await self.executeoptimizedbatch(operations, partitionkey)
+                results.extend(response)
+            except Exception as e:
+                logger.warning(f"Batch ingestion failed for partition {partitionkey}, using fallback: {e}")
+                results.extend(await self.fallbackingestion([datapoint for datapoint, _ in entries]))
+        
+        # The data is already stored; the local analytics mirror must not fail ingestion
         try:
-            response = await self.executeoptimizedbatch(operations, partitionkey)
-            logger.info(f"Successfully ingested {len(operations)} EEG data points")
-            return response
+            self.analyticsengine.append(enriched for entries in partitions.values() for _, enriched in entries)
         except Exception as e:
-            logger.warning(f"Primary ingestion failed, using fallback: {e}")
-            return await self.fallbackingestion(eegdatabatch)
+            logger.error(f"Failed to mirror ingested EEG data into local analytics: {e}")
+        
+        logger.info(f"Ingested {len(eegdatabatch)} EEG data points across {len(partitions)} partitions")
+        return results
 
     def calculateoptimalpartitionkey(self, databatch):
         """Calculate optimal partition key for even distribution and query performance"""
@@ -155,44 +270,66 @@ class OptimizedAzureArchitecture:
         })
         return enriched
 
-    async def executeoptimizedbatch(self, operations, partitionkey):
-        """Execute optimized batch operations with adaptive sizing"""
+    def _eegcontainer(self):
         database = self.cosmosclient.get_database_client("LifeDatabase")
-        container = database.get_container_client("EEGData")
+        return database.get_container_client("EEGData")
+
+    async def _withthrottleretry(self, request):
+        """Run a Cosmos request, retrying 429s with jittered exponential backoff"""
+        attempt = 0
+        while True:
+            try:
+                return await _resolve(request())
+            except Exception as e:
+                retryafter = _retry_after_seconds(e)
+                if retryafter is None or attempt >= self.maxretries:
+                    raise
+                self.batchcontroller.on_throttle()
+                await self.sleep(self.batchcontroller.backoff_delay(attempt, retryafter))
+                attempt += 1
+
+    async def executeoptimizedbatch(self, operations, partitionkey):
+        """Execute single-partition transactional batches with adaptive sizing"""
+        container = self._eegcontainer()
         results = []
+        position = 0
         
-        # Adaptive batch sizing based on RU consumption
-        batchsize = self.batchsize
+        async def sendnextbatch():
+            # Sliced on every attempt so a 429 shrinks the retried request
+            batch = operations[position:position + self.batchcontroller.batchsize]
+            return batch, await _resolve(container.execute_item_batch(batch, partition_key=partitionkey))
         
-        for i in range(0, len(operations), batchsize):
-            batch = operations[i:i+batchsize]
+        while position < len(operations):
             try:
-                result = await container.execute_item_batch(batch, partition_key=partitionkey)
-                results.append(result)
+                batch, result = await self._withthrottleretry(sendnextbatch)
             except Exception as e:
                 logger.error(f"Batch execution failed: {e}")
-                # Implement exponential backoff and retry logic here
                 raise
+            self.batchcontroller.on_success(len(batch), _last_request_charge(container))
+            results.append(result)
+            position += len(batch)
         
         return results
 
     async def fallbackingestion(self, eegdatabatch):
         """Fallback ingestion method for failure scenarios"""
         logger.info("Executing fallback ingestion strategy")
-        results = []
+        container = self._eegcontainer()
+        semaphore = asyncio.Semaphore(self.connectionpoolsize)
         
-        database = self.cosmosclient.get_database_client("LifeDatabase")
-        container = database.get_container_client("EEGData")
-        
-        # Individual document upserts as fallback
-        for datapoint in eegdatabatch:
-            try:
+        async def upsert(datapoint):
+            async with semaphore:
                 enriched = self.enrichdatapoint(datapoint)
-                result = await container.upsert_item(enriched)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Fallback ingestion failed for datapoint: {e}")
+                return await self._withthrottleretry(lambda: container.upsert_item(enriched))
+        
+        # Individual document upserts as fallback, bounded by the connection pool
+        outcomes = await asyncio.gather(*(upsert(dp) for dp in eegdatabatch), return_exceptions=True)
+        results = []
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                logger.error(f"Fallback ingestion failed for datapoint: {outcome}")
                 continue
+            results.append(outcome)
         
         return results
 
@@ -239,7 +376,7 @@ class OptimizedAzureArchitecture:
         else:
             return "xlarge"
 
-    async def realtimesynapseanalytics(self, metricsdata):
+    async def realtimesynapseanalytics(self, metricsdata, lookbackseconds=3600, now=None):
         """
         Real-time Synapse Analytics for neuroplasticity insights
         
@@ -247,6 +384,12 @@ class OptimizedAzureArchitecture:
         - Optimized SQL queries for neuroplasticity metrics
         - Real-time aggregation and windowing
         - L.I.F.E. score calculation algorithms
+        - Local columnar engine runs the LifeScores semantics when Synapse is not connected
+        
+        Args:
+            metricsdata: Extra metric rows to append before querying (may be empty)
+            lookbackseconds: Query window, one hour like the production query
+            now: Query end time in epoch seconds (defaults to the current time)
         """
         optimizedquery = """
             -- Real-time neuroplasticity analytics for L.I.F.E. Platform
@@ -293,14 +436,31 @@ class OptimizedAzureArchitecture:
         """
         
         try:
-            # Note: In production, this would use the actual Synapse client
-            # result = await self.synapseclient.execute_query(optimizedquery)
+            if self.synapseclient is not None:
+                return await _resolve(self.synapseclient.execute_query(optimizedquery))
+            
+            if lookbackseconds > self.analyticsengine.retention_seconds:
+                self.analyticsengine.retention_seconds = lookbackseconds
+            if metricsdata:
+                self.analyticsengine.append(metricsdata)
             
-            # For now, return mock analytics result structure
+            now = time.time() if now is None else now
+            started = time.perf_counter()
+            scores = self.analyticsengine.life_scores(since=now - lookbackseconds, until=now)
+            executiontime = (time.perf_counter() - started) * 1000
+            
+            columns = list(scores)
+            rows = [
+                {name: (scores[name][i].item() if hasattr(scores[name][i], "item") else scores[name][i])
+                 for name in columns}
+                for i in range(len(scores["userid"]))
+            ]
             result = {
-                "query_execution_time_ms": 45.2,
-                "rows_processed": len(metricsdata) if metricsdata else 0,
+                "query_execution_time_ms": executiontime,
+                "rows_processed": int(scores["measurement_count"].sum()),
+                "life_scores": rows,
                 "optimization_applied": "neuroplasticity_focused",
+                "engine": "local_columnar",
                 "timestamp": datetime.utcnow().isoformat()
             }
             
@@ -325,7 +485,7 @@ class OptimizedAzureArchitecture:
             "performance_metrics": self.performance_metrics,
             "optimization_settings": {
                 "ru_utilization_target": f"{self.ruoptimizationtarget * 100}%",
-                "batch_size": self.batchsize,
+                "batch_size": self.batchcontroller.batchsize,
                 "connection_pool_size": self.connectionpoolsize,
             },
             "recommendations": [
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+L.I.F.E. Platform - Local In-Memory Cosmos DB Stand-In
+Deterministic Cosmos DB emulation for ingestion testing
+
+Features:
+- Database/container client shape matching the async azure-cosmos SDK
+- Transactional batches limited to one partition key and 100 operations
+- Token-bucket RU budget with 429 throttling and x-ms-retry-after-ms hints
+- Request charge reported through last_response_headers like the SDK
+- Injectable fake clock so throttling and backoff are fully deterministic
+
+Copyright 2025 - Sergio Paya Benaully
+L.I.F.E. Platform - Azure Marketplace Offer ID: 9a600d96-fe1e-420b-902a-a0c42c561adb
+"""
+
+import copy
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Service limit for operations in one transactional batch
+COSMOS_MAX_BATCH_OPERATIONS = 100
+
+
+class FakeClock:
+    """Manually advanced monotonic clock with an async sleep that advances it"""
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+        self.sleeps: List[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += max(0.0, seconds)
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.advance(seconds)
+
+
+class LocalCosmosError(Exception):
+    """Error shaped like azure.cosmos.exceptions.CosmosHttpResponseError"""
+
+    def __init__(self, status_code: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(f"({status_code}) {message}")
+        self.status_code = status_code
+        self.message = message
+        self.headers = headers or {}
+
+
+class InMemoryCosmosContainer:
+    """
+    Container with a provisioned RU/s budget
+
+    The RU bucket holds at most one second of throughput and refills linearly
+    with the clock. A request whose charge exceeds the remaining budget is
+    rejected with a 429 carrying the time until enough RUs have refilled.
+    """
+
+    def __init__(self, name: str, ru_per_second: float = 1000.0, ru_per_write: float = 10.0,
+                 clock: Optional[FakeClock] = None):
+        self.name = name
+        self.ru_per_second = ru_per_second
+        self.ru_per_write = ru_per_write
+        self.clock = clock
+        self.items: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.last_response_headers: Dict[str, str] = {}
+        self.request_count = 0
+        self.throttle_count = 0
+        self.batch_sizes: List[int] = []
+        self._available_ru = ru_per_second
+        self._last_refill = self._now()
+
+    def _now(self) -> float:
+        return self.clock.time() if self.clock else time.monotonic()
+
+    def _charge(self, request_charge: float) -> None:
+        now = self._now()
+        self._available_ru = min(
+            self.ru_per_second,
+            self._available_ru + (now - self._last_refill) * self.ru_per_second,
+        )
+        self._last_refill = now
+        self.request_count += 1
+
+        if request_charge > self._available_ru:
+            self.throttle_count += 1
+            deficit = request_charge - self._available_ru
+            retry_after_ms = max(1, int(round(1000 * deficit / self.ru_per_second)))
+            self.last_response_headers = {"x-ms-retry-after-ms": str(retry_after_ms),
+                                          "x-ms-request-charge": "0"}
+            raise LocalCosmosError(429, "Request rate is large", dict(self.last_response_headers))
+
+        self._available_ru -= request_charge
+        self.last_response_headers = {"x-ms-request-charge": f"{request_charge:.2f}"}
+
+    def _store(self, item: Dict[str, Any], partition_key: str) -> Dict[str, Any]:
+        if "id" not in item:
+            raise LocalCosmosError(400, "Item is missing 'id'")
+        stored = copy.deepcopy(item)
+        self.items[(partition_key, str(item["id"]))] = stored
+        return stored
+
+    async def upsert_item(self, body: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        partition_key = body.get("partitionKey", "")
+        self._charge(self.ru_per_write)
+        return self._store(body, partition_key)
+
+    async def execute_item_batch(self, batch_operations: List[Tuple[str, tuple]],
+                                 partition_key: str, **kwargs) -> List[Dict[str, Any]]:
+        if len(batch_operations) > COSMOS_MAX_BATCH_OPERATIONS:
+            raise LocalCosmosError(400, f"Batch exceeds {COSMOS_MAX_BATCH_OPERATIONS} operations")
+        for operation, args in batch_operations:
+            if operation not in ("upsert", "create"):
+                raise LocalCosmosError(400, f"Unsupported batch operation {operation!r}")
+            if args[0].get("partitionKey") != partition_key:
+                raise LocalCosmosError(400, "Batch items must share the batch partition key")
+
+        self._charge(self.ru_per_write * len(batch_operations))
+        self.batch_sizes.append(len(batch_operations))
+        return [
+            {"statusCode": 200, "resourceBody": self._store(args[0], partition_key)}
+            for _, args in batch_operations
+        ]
+
+
+class InMemoryCosmosDatabase:
+    def __init__(self, name: str, container_factory):
+        self.name = name
+        self._containers: Dict[str, InMemoryCosmosContainer] = {}
+        self._container_factory = container_factory
+
+    def get_container_client(self, name: str) -> InMemoryCosmosContainer:
+        if name not in self._containers:
+            self._containers[name] = self._container_factory(name)
+        return self._containers[name]
+
+
+class InMemoryCosmosClient:
+    """Drop-in for CosmosClient; every container shares the same RU settings and clock"""
+
+    def __init__(self, ru_per_second: float = 1000.0, ru_per_write: float = 10.0,
+                 clock: Optional[FakeClock] = None):
+        self.clock = clock
+        self._databases: Dict[str, InMemoryCosmosDatabase] = {}
+        self._container_factory = lambda name: InMemoryCosmosContainer(
+            name, ru_per_second=ru_per_second, ru_per_write=ru_per_write, clock=clock
+        )
+
+    def get_database_client(self, name: str) -> InMemoryCosmosDatabase:
+        if name not in self._databases:
+            self._databases[name] = InMemoryCosmosDatabase(name, self._container_factory)
+        return self._databases[name]
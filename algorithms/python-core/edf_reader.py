@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+L.I.F.E. Platform - Memory-Mapped EDF/EDF+ Reader
+Lightweight European Data Format reader for PhysioNet EEG recordings
+
+Features:
+- EDF and EDF+ (continuous and discontinuous) header parsing
+- Data records memory-mapped with NumPy, nothing read up front
+- Lazy per-channel decoding of int16 samples to physical units
+- EDF+ annotation channels kept out of the EEG signal list
+
+Copyright 2025 - Sergio Paya Benaully
+L.I.F.E. Platform - Azure Marketplace Offer ID: 9a600d96-fe1e-420b-902a-a0c42c561adb
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+EDF_ANNOTATION_LABEL = "EDF Annotations"
+
+
+@dataclass
+class EDFSignalHeader:
+    """Per-signal EDF header fields"""
+    label: str
+    transducer: str
+    physical_dimension: str
+    physical_min: float
+    physical_max: float
+    digital_min: int
+    digital_max: int
+    prefiltering: str
+    samples_per_record: int
+
+    @property
+    def is_annotation(self) -> bool:
+        return self.label == EDF_ANNOTATION_LABEL
+
+    @property
+    def gain(self) -> float:
+        digital_range = self.digital_max - self.digital_min
+        if digital_range == 0:
+            return 1.0
+        return (self.physical_max - self.physical_min) / digital_range
+
+    @property
+    def offset(self) -> float:
+        return self.physical_min - self.gain * self.digital_min
+
+
+class EDFReader:
+    """
+    Memory-mapped EDF/EDF+ reader
+
+    The data records are exposed as a (records x samples_per_record) int16
+    memmap. Channels are sliced out of that map and scaled to physical units
+    only when requested, so opening a large recording costs one header read.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            fixed = f.read(256)
+            if len(fixed) < 256:
+                raise ValueError(f"{self.path}: truncated EDF header")
+            self.num_signals = int(fixed[252:256].decode("ascii").strip())
+            signal_block = f.read(256 * self.num_signals)
+            if len(signal_block) < 256 * self.num_signals:
+                raise ValueError(f"{self.path}: truncated EDF signal header")
+
+        self.version = fixed[0:8].decode("ascii").strip()
+        self.patient_id = fixed[8:88].decode("ascii", "replace").strip()
+        self.recording_id = fixed[88:168].decode("ascii", "replace").strip()
+        self.start_date = fixed[168:176].decode("ascii").strip()
+        self.start_time = fixed[176:184].decode("ascii").strip()
+        self.header_bytes = int(fixed[184:192].decode("ascii").strip())
+        reserved = fixed[192:236].decode("ascii", "replace").strip()
+        self.is_edf_plus = reserved.startswith("EDF+")
+        self.is_discontinuous = reserved.startswith("EDF+D")
+        declared_records = int(fixed[236:244].decode("ascii").strip())
+        self.record_duration = float(fixed[244:252].decode("ascii").strip())
+
+        self.signals = self._parse_signal_headers(signal_block, self.num_signals)
+        self.samples_per_record = [s.samples_per_record for s in self.signals]
+        self.record_samples = int(sum(self.samples_per_record))
+        self._channel_offsets = np.concatenate([[0], np.cumsum(self.samples_per_record)]).astype(int)
+
+        # -1 records means the writer never finalized the header; trust the file size
+        data_bytes = os.path.getsize(self.path) - self.header_bytes
+        available_records = data_bytes // (2 * self.record_samples) if self.record_samples else 0
+        if declared_records < 0 or declared_records > available_records:
+            declared_records = available_records
+        self.num_records = int(declared_records)
+
+        self._records: Optional[np.memmap] = None
+        if self.num_records > 0 and self.record_samples > 0:
+            self._records = np.memmap(
+                self.path,
+                dtype="<i2",
+                mode="r",
+                offset=self.header_bytes,
+                shape=(self.num_records, self.record_samples),
+            )
+
+    @staticmethod
+    def _parse_signal_headers(block: bytes, ns: int) -> List[EDFSignalHeader]:
+        """Split the column-major signal header block into per-signal records"""
+        widths = [16, 80, 8, 8, 8, 8, 8, 80, 8, 32]
+        fields: List[List[str]] = []
+        position = 0
+        for width in widths:
+            fields.append([
+                block[position + i * width: position + (i + 1) * width].decode("ascii", "replace").strip()
+                for i in range(ns)
+            ])
+            position += width * ns
+
+        return [
+            EDFSignalHeader(
+                label=fields[0][i],
+                transducer=fields[1][i],
+                physical_dimension=fields[2][i],
+                physical_min=float(fields[3][i]),
+                physical_max=float(fields[4][i]),
+                digital_min=int(fields[5][i]),
+                digital_max=int(fields[6][i]),
+                prefiltering=fields[7][i],
+                samples_per_record=int(fields[8][i]),
+            )
+            for i in range(ns)
+        ]
+
+    def close(self) -> None:
+        """Release the memory map"""
+        if self._records is not None:
+            mmap_handle = getattr(self._records, "_mmap", None)
+            self._records = None
+            if mmap_handle is not None:
+                mmap_handle.close()
+
+    def __enter__(self) -> "EDFReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def channel_names(self) -> List[str]:
+        """EEG signal labels, excluding EDF+ annotation channels"""
+        return [s.label for s in self.signals if not s.is_annotation]
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.num_records * self.record_duration
+
+    def sampling_rate(self, channel: Union[int, str]) -> float:
+        signal = self.signals[self._channel_index(channel)]
+        if self.record_duration <= 0:
+            return float(signal.samples_per_record)
+        return signal.samples_per_record / self.record_duration
+
+    def _channel_index(self, channel: Union[int, str]) -> int:
+        if isinstance(channel, str):
+            for index, signal in enumerate(self.signals):
+                if signal.label == channel:
+                    return index
+            raise KeyError(f"Channel {channel!r} not found in {self.path}")
+        if not 0 <= channel < self.num_signals:
+            raise IndexError(f"Channel index {channel} out of range")
+        return channel
+
+    def read_digital(self, channel: Union[int, str]) -> np.ndarray:
+        """Raw int16 samples of one channel (a strided view where possible)"""
+        index = self._channel_index(channel)
+        if self._records is None:
+            return np.zeros(0, dtype="<i2")
+        start, stop = self._channel_offsets[index], self._channel_offsets[index + 1]
+        return self._records[:, start:stop].reshape(-1)
+
+    def read_channel(self, channel: Union[int, str], dtype=np.float64) -> np.ndarray:
+        """Decode one channel to physical units"""
+        signal = self.signals[self._channel_index(channel)]
+        digital = self.read_digital(channel)
+        return digital.astype(dtype) * dtype(signal.gain) + dtype(signal.offset)
+
+    def read_channels(self, channels: Optional[List[Union[int, str]]] = None,
+                      dtype=np.float64) -> Dict[str, np.ndarray]:
+        """Decode several channels (all EEG channels by default) to physical units"""
+        if channels is None:
+            channels = self.channel_names
+        return {
+            self.signals[self._channel_index(ch)].label: self.read_channel(ch, dtype=dtype)
+            for ch in channels
+        }
@@ -14,6 +14,7 @@ Launch Date: September 27, 2025
 import asyncio
 import json
 import logging
+import time
 import warnings
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -144,6 +145,75 @@ class LearningOutcome:
         }
 
 
+# EEG frequency bands (Hz) used for band power extraction
+EEG_BANDS: Dict[str, Tuple[float, float]] = {
+    'delta': (0.5, 4.0),
+    'theta': (4.0, 8.0),
+    'alpha': (8.0, 12.0),
+    'beta': (12.0, 30.0),
+    'gamma': (30.0, 100.0),
+}
+
+
+class EEGRingBuffer:
+    """
+    Preallocated ring buffer for raw EEG samples (channels x capacity)
+    
+    Every sample is written twice, at ``i`` and ``i + capacity``, so the most
+    recent ``n <= capacity`` samples are always one contiguous slice. This keeps
+    appends O(1) per sample and lets ``window`` return zero-copy views.
+    """
+    
+    def __init__(self, channels: int, capacity: int, dtype: Any = np.float64):
+        if channels <= 0 or capacity <= 0:
+            raise ValueError("channels and capacity must be positive")
+        self.channels = channels
+        self.capacity = capacity
+        self._data = np.zeros((channels, 2 * capacity), dtype=dtype)
+        self._head = 0  # Next write position in [0, capacity)
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def append(self, samples: np.ndarray) -> None:
+        """Append a (channels x n) block of samples"""
+        samples = np.asarray(samples)
+        if samples.ndim == 1:
+            samples = samples[:, np.newaxis]
+        if samples.shape[0] != self.channels:
+            raise ValueError(f"Expected {self.channels} channels, got {samples.shape[0]}")
+        
+        n = samples.shape[1]
+        if n >= self.capacity:
+            # Only the newest `capacity` samples survive
+            samples = samples[:, -self.capacity:]
+            self._data[:, :self.capacity] = samples
+            self._data[:, self.capacity:] = samples
+            self._head = 0
+            self._size = self.capacity
+            return
+        
+        first = min(n, self.capacity - self._head)
+        for offset in (0, self.capacity):
+            start = self._head + offset
+            self._data[:, start:start + first] = samples[:, :first]
+            if first < n:
+                self._data[:, offset:offset + n - first] = samples[:, first:]
+        self._head = (self._head + n) % self.capacity
+        self._size = min(self.capacity, self._size + n)
+    
+    def window(self, n: Optional[int] = None) -> np.ndarray:
+        """Zero-copy view of the most recent ``n`` samples (channels x n)"""
+        n = self._size if n is None else min(n, self._size)
+        end = self._head + self.capacity
+        return self._data[:, end - n:end]
+    
+    def clear(self) -> None:
+        self._head = 0
+        self._size = 0
+
+
 class LIFEAlgorithm:
     """
     L.I.F.E. (Learning Individually from Experience) Algorithm
@@ -159,17 +229,31 @@ class LIFEAlgorithm:
     - Clinical-grade neural processing
     """
     
-    def __init__(self, user_traits: UserTraits):
+    def __init__(
+        self,
+        user_traits: UserTraits,
+        sampling_rate: float = 256.0,
+        window_seconds: float = 1.0,
+        buffer_seconds: float = 30.0,
+    ):
         """
         Initialize L.I.F.E. Algorithm for a specific user
         
         Args:
             user_traits: Immutable user cognitive profile
+            sampling_rate: EEG sampling rate in Hz
+            window_seconds: Length of the analysis window for band powers
+            buffer_seconds: Raw EEG history kept in the ring buffer
         """
         self.user_traits = user_traits
         self.current_stage = LearningStage.ACQUISITION
         self.session_history: List[LearningOutcome] = []
-        self.eeg_buffer: List[EEGMetrics] = []
+        self.sampling_rate = float(sampling_rate)
+        self.window_samples = max(1, int(round(window_seconds * sampling_rate)))
+        self.buffer_capacity = max(self.window_samples, int(round(buffer_seconds * sampling_rate)))
+        # Raw EEG ring buffer, allocated on first sample once channel count is known
+        self.eeg_buffer: Optional[EEGRingBuffer] = None
+        self.metrics_buffer: List[EEGMetrics] = []
         
         # Adaptive learning parameters
         self.difficulty_level = 0.5  # Initial difficulty
@@ -188,20 +272,23 @@ class LIFEAlgorithm:
         Returns:
             EEGMetrics: Processed neural metrics
         """
-        # Simulate async processing for real-time EEG
-        await asyncio.sleep(0.001)  # Sub-millisecond target: 0.38-0.45ms
-        
-        # Calculate band powers using FFT
-        alpha_power = await self._calculate_band_power(eeg_data, 8, 12)
-        beta_power = await self._calculate_band_power(eeg_data, 12, 30)
-        theta_power = await self._calculate_band_power(eeg_data, 4, 8)
-        delta_power = await self._calculate_band_power(eeg_data, 0.5, 4)
-        gamma_power = await self._calculate_band_power(eeg_data, 30, 100)
+        eeg_data = np.atleast_2d(np.asarray(eeg_data, dtype=np.float64))
+        if self.eeg_buffer is None or self.eeg_buffer.channels != eeg_data.shape[0]:
+            self.eeg_buffer = EEGRingBuffer(eeg_data.shape[0], self.buffer_capacity)
+        self.eeg_buffer.append(eeg_data)
+        
+        # Calculate all band powers in one FFT pass over the analysis window
+        band_powers = self._calculate_band_power(self.eeg_buffer.window(self.window_samples))
+        alpha_power = band_powers['alpha']
+        beta_power = band_powers['beta']
+        theta_power = band_powers['theta']
+        delta_power = band_powers['delta']
+        gamma_power = band_powers['gamma']
         
         # Calculate derived metrics
-        attention_index = await self._calculate_attention_index(alpha_power, beta_power)
-        cognitive_load = await self._calculate_cognitive_load(theta_power, alpha_power)
-        engagement_score = await self._calculate_engagement(beta_power, alpha_power, gamma_power)
+        attention_index = self._calculate_attention_index(alpha_power, beta_power)
+        cognitive_load = self._calculate_cognitive_load(theta_power, alpha_power)
+        engagement_score = self._calculate_engagement(beta_power, alpha_power, gamma_power)
         
         # Determine neural state
         neural_state = self._determine_neural_state(attention_index, cognitive_load, engagement_score)
@@ -227,25 +314,39 @@ class LIFEAlgorithm:
             neural_state=neural_state
         )
         
-        self.eeg_buffer.append(metrics)
+        self.metrics_buffer.append(metrics)
         return metrics
     
-    async def _calculate_band_power(self, eeg_data: np.ndarray, low_freq: float, high_freq: float) -> float:
-        """Calculate power in specific frequency band (async)"""
-        await asyncio.sleep(0.0001)  # Simulate async processing
-        
-        # Simplified band power calculation (production uses advanced DSP)
-        if eeg_data.size == 0:
-            return 0.0
-        
-        # Simulate FFT and band power extraction
-        mean_power = np.mean(np.abs(eeg_data)) * np.random.uniform(0.8, 1.2)
-        return float(np.clip(mean_power, 0.0, 1.0))
-    
-    async def _calculate_attention_index(self, alpha_power: float, beta_power: float) -> float:
-        """Calculate attention index from EEG bands (async)"""
-        await asyncio.sleep(0.0001)
+    def _calculate_band_power(self, eeg_window: np.ndarray) -> Dict[str, float]:
+        """
+        Calculate relative power of every EEG band in one rFFT pass
         
+        Args:
+            eeg_window: EEG window (channels x samples)
+            
+        Returns:
+            Band name -> fraction of total 0.5-100 Hz power, averaged over channels
+        """
+        if eeg_window.size == 0 or eeg_window.shape[-1] < 2:
+            return {band: 0.0 for band in EEG_BANDS}
+        
+        n_samples = eeg_window.shape[-1]
+        centered = eeg_window - eeg_window.mean(axis=-1, keepdims=True)
+        spectrum = np.fft.rfft(centered * np.hanning(n_samples), axis=-1)
+        psd = np.abs(spectrum) ** 2
+        freqs = np.fft.rfftfreq(n_samples, d=1.0 / self.sampling_rate)
+        
+        # (bands x freqs) membership matrix -> (channels x bands) powers in one matmul
+        edges = np.array(list(EEG_BANDS.values()))
+        masks = (freqs >= edges[:, :1]) & (freqs < edges[:, 1:])
+        band_powers = psd @ masks.T.astype(psd.dtype)
+        total = band_powers.sum(axis=-1, keepdims=True)
+        relative = np.divide(band_powers, total, out=np.zeros_like(band_powers), where=total > 0)
+        mean_relative = relative.mean(axis=0)
+        return {band: float(mean_relative[idx]) for idx, band in enumerate(EEG_BANDS)}
+    
+    def _calculate_attention_index(self, alpha_power: float, beta_power: float) -> float:
+        """Calculate attention index from EEG bands"""
         # Attention correlates with beta/alpha ratio
         if alpha_power < 0.01:
             alpha_power = 0.01  # Prevent division by zero
@@ -253,18 +354,14 @@ class LIFEAlgorithm:
         attention = beta_power / (alpha_power + beta_power)
         return float(np.clip(attention, 0.0, 1.0))
     
-    async def _calculate_cognitive_load(self, theta_power: float, alpha_power: float) -> float:
-        """Calculate cognitive load from EEG bands (async)"""
-        await asyncio.sleep(0.0001)
-        
+    def _calculate_cognitive_load(self, theta_power: float, alpha_power: float) -> float:
+        """Calculate cognitive load from EEG bands"""
         # Cognitive load increases with theta, decreases with alpha
         load = (theta_power * 0.7 + (1 - alpha_power) * 0.3)
         return float(np.clip(load, 0.0, 1.0))
     
-    async def _calculate_engagement(self, beta_power: float, alpha_power: float, gamma_power: float) -> float:
-        """Calculate engagement score (async)"""
-        await asyncio.sleep(0.0001)
-        
+    def _calculate_engagement(self, beta_power: float, alpha_power: float, gamma_power: float) -> float:
+        """Calculate engagement score"""
         # Engagement is high beta + gamma with moderate alpha
         engagement = (beta_power * 0.5 + gamma_power * 0.3 + alpha_power * 0.2)
         return float(np.clip(engagement, 0.0, 1.0))
@@ -421,9 +518,9 @@ class LIFEAlgorithm:
         Returns:
             LearningOutcome with comprehensive session analysis
         """
-        if not self.eeg_buffer:
+        if not self.metrics_buffer:
             logger.warning("No EEG metrics recorded for session")
-            self.eeg_buffer = [
+            self.metrics_buffer = [
                 EEGMetrics(
                     timestamp=datetime.now(),
                     attention_index=0.5,
@@ -434,23 +531,23 @@ class LIFEAlgorithm:
             ]
         
         # Calculate session statistics
-        avg_attention = np.mean([m.attention_index for m in self.eeg_buffer])
-        avg_engagement = np.mean([m.engagement_score for m in self.eeg_buffer])
-        avg_efficiency = np.mean([m.learning_efficiency for m in self.eeg_buffer])
+        avg_attention = np.mean([m.attention_index for m in self.metrics_buffer])
+        avg_engagement = np.mean([m.engagement_score for m in self.metrics_buffer])
+        avg_efficiency = np.mean([m.learning_efficiency for m in self.metrics_buffer])
         
         # Generate recommendations
-        recommendations = self.generate_recommendations(self.eeg_buffer)
+        recommendations = self.generate_recommendations(self.metrics_buffer)
         
         # Adapt for next session
         self.adapt_difficulty(success_rate)
-        self.adapt_pacing(avg_attention, np.mean([m.cognitive_load for m in self.eeg_buffer]))
+        self.adapt_pacing(avg_attention, np.mean([m.cognitive_load for m in self.metrics_buffer]))
         
         # Create outcome report
         outcome = LearningOutcome(
             session_id=session_id,
             user_id=self.user_traits.user_id,
-            start_time=self.eeg_buffer[0].timestamp,
-            end_time=self.eeg_buffer[-1].timestamp,
+            start_time=self.metrics_buffer[0].timestamp,
+            end_time=self.metrics_buffer[-1].timestamp,
             stage=self.current_stage,
             success_rate=success_rate,
             avg_attention=float(avg_attention),
@@ -458,11 +555,13 @@ class LIFEAlgorithm:
             cognitive_efficiency=float(avg_efficiency),
             content_mastery=content_mastery,
             recommendations=recommendations,
-            eeg_metrics=self.eeg_buffer.copy()
+            eeg_metrics=self.metrics_buffer.copy()
         )
         
         self.session_history.append(outcome)
-        self.eeg_buffer.clear()
+        self.metrics_buffer.clear()
+        if self.eeg_buffer is not None:
+            self.eeg_buffer.clear()
         
         logger.info(f"Session {session_id} completed. Success: {success_rate:.2%}, Mastery: {content_mastery:.2%}")
         return outcome
@@ -551,7 +650,63 @@ async def demo_learning_session():
     return outcome
 
 
+async def benchmark_sessions_per_second(
+    num_sessions: int = 200,
+    samples_per_session: int = 10,
+    channels: int = 8,
+    window: int = 256,
+) -> Dict[str, float]:
+    """
+    Benchmark EEG stream throughput in learning sessions per second
+    
+    Each session feeds ``samples_per_session`` windows of (channels x window)
+    synthetic EEG through ``process_eeg_stream`` and then completes the session.
+    """
+    user = UserTraits(
+        user_id="benchmark_user",
+        curiosity=0.5,
+        persistence=0.5,
+        openness=0.5,
+        processing_speed=0.5,
+        learning_efficiency=0.5
+    )
+    life_algorithm = LIFEAlgorithm(user)
+    rng = np.random.default_rng(0)
+    eeg_windows = rng.standard_normal((samples_per_session, channels, window))
+    
+    previous_level = logger.level
+    logger.setLevel(logging.WARNING)
+    try:
+        start = time.perf_counter()
+        for session_index in range(num_sessions):
+            for eeg_data in eeg_windows:
+                await life_algorithm.process_eeg_stream(eeg_data)
+            await life_algorithm.complete_learning_session(
+                session_id=f"bench_{session_index}",
+                success_rate=0.75,
+                content_mastery=0.75
+            )
+        elapsed = time.perf_counter() - start
+    finally:
+        logger.setLevel(previous_level)
+    
+    return {
+        'sessions': float(num_sessions),
+        'elapsed_seconds': elapsed,
+        'sessions_per_second': num_sessions / elapsed if elapsed > 0 else float('inf'),
+        'windows_per_second': num_sessions * samples_per_session / elapsed if elapsed > 0 else float('inf'),
+    }
+
+
 if __name__ == "__main__":
+    import sys
+    
+    if "--benchmark" in sys.argv:
+        result = asyncio.run(benchmark_sessions_per_second())
+        logger.info(f"Benchmark: {result['sessions_per_second']:.1f} sessions/s "
+                   f"({result['windows_per_second']:.0f} EEG windows/s)")
+        sys.exit(0)
+    
     # Run demo session
     asyncio.run(demo_learning_session())
     
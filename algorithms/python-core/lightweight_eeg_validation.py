@@ -6,6 +6,8 @@ Lightweight EEG Validation System for Neuroadaptive Learning
 Features:
 - MNE-Python integration for professional EEG processing
 - PhysioNet dataset loading and validation
+- Memory-mapped EDF/EDF+ reading and parallel batch validation
+- Append-only segmented validation log with an incremental summary index
 - Quantum optimization stubs for future enhancement
 - Real-time EEG metrics calculation
 - Async processing for sub-millisecond response times
@@ -15,15 +17,22 @@ L.I.F.E. Platform - Azure Marketplace Offer ID: 9a600d96-fe1e-420b-902a-a0c42c56
 """
 
 import asyncio
+import glob
 import json
 import logging
 import os
+import random
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
+import numpy as np
 from azure.identity import DefaultAzureCredential
 
+from edf_reader import EDFReader
+from validation_log import ValidationLogLocked, ValidationLogWriter, read_summary
+
 
 # Critical file corruption handling
 def safe_read_file(file_path):
@@ -119,15 +128,20 @@ class ValidatedLIFE:
             "neuroplasticity_threshold": 0.4
         }
         
+        # Append-only validation log, opened on first write
+        self.validation_log: Optional[ValidationLogWriter] = None
+        
         logger.info("ValidatedLIFE EEG validation system initialized")
 
-    async def validate_eeg_stream(self, eeg_data: Dict, user_id: str) -> ValidationResult:
+    async def validate_eeg_stream(self, eeg_data: Dict, user_id: str,
+                                  log_result: bool = True) -> ValidationResult:
         """
         Main EEG validation pipeline with MNE processing
         
         Args:
             eeg_data: Raw EEG data dictionary with channels and samples
             user_id: User identifier for personalized validation
+            log_result: Append the result to the validation log
             
         Returns:
             ValidationResult with comprehensive metrics and recommendations
@@ -140,7 +154,11 @@ class ValidatedLIFE:
             mne_raw = await self._load_eeg_with_mne(eeg_data)
             
             # Step 2: Extract neuroplasticity metrics (async)
-            metrics = await self._extract_neuroplasticity_metrics(mne_raw)
+            try:
+                metrics = await self._extract_neuroplasticity_metrics(mne_raw)
+            finally:
+                if mne_raw.get("reader") is not None:
+                    mne_raw["reader"].close()
             
             # Step 3: Apply quantum optimization (stub for future)
             quantum_score = await self._apply_quantum_optimization(metrics)
@@ -166,7 +184,8 @@ class ValidatedLIFE:
             )
             
             # Log validation result
-            await self._log_validation_result(result)
+            if log_result:
+                await self._log_validation_result(result)
             
             logger.info(f"EEG validation completed: {validation_id} - Status: {status}")
             return result
@@ -186,51 +205,74 @@ class ValidatedLIFE:
             )
 
     async def _load_eeg_with_mne(self, eeg_data: Dict):
-        """Load EEG data using MNE library (stub - requires MNE installation)"""
-        try:
-            # In production, this would use actual MNE library:
-            # import mne
-            # raw = mne.io.RawArray(eeg_data['channels'], info, verbose=False)
-            # raw.filter(l_freq=0.5, h_freq=40.0)
-            # return raw
-            
-            # For now, return simulated MNE object structure
-            await asyncio.sleep(0.01)  # Simulate async processing
-            
+        """
+        Load EEG data from an EDF/EDF+ file or in-memory channel arrays
+        
+        EDF recordings (``eeg_data["edf_path"]``) are memory-mapped; channels are
+        decoded to physical units only when ``read_channel`` is called.
+        """
+        edf_path = eeg_data.get("edf_path")
+        if edf_path:
+            reader = EDFReader(edf_path)
+            ch_names = reader.channel_names
+            sfreq = reader.sampling_rate(ch_names[0]) if ch_names else self.sampling_rate
             return {
-                "data": eeg_data.get("channels", []),
+                "reader": reader,
+                "read_channel": reader.read_channel,
+                "channel_keys": ch_names,
+                "channel_sfreq": reader.sampling_rate,
                 "info": {
-                    "sfreq": self.sampling_rate,
-                    "ch_names": self.channels,
-                    "nchan": len(self.channels)
+                    "sfreq": sfreq,
+                    "ch_names": ch_names,
+                    "nchan": len(ch_names)
                 },
-                "n_times": len(eeg_data.get("channels", [[]])[0]) if eeg_data.get("channels") else 0
+                "n_times": int(round(reader.duration_seconds * sfreq))
             }
-            
-        except ImportError:
-            logger.warning("MNE-Python not installed. Using fallback processing.")
-            return {"data": eeg_data.get("channels", []), "fallback": True}
+        
+        channels = eeg_data.get("channels", [])
+        sfreq = eeg_data.get("sampling_rate", self.sampling_rate)
+        return {
+            "data": channels,
+            "read_channel": lambda index: np.asarray(channels[index], dtype=float),
+            "channel_keys": list(range(len(channels))),
+            "channel_sfreq": lambda index: sfreq,
+            "info": {
+                "sfreq": sfreq,
+                "ch_names": self.channels,
+                "nchan": len(self.channels)
+            },
+            "n_times": len(channels[0]) if channels else 0
+        }
 
     async def _extract_neuroplasticity_metrics(self, mne_raw) -> EEGMetrics:
-        """Extract neuroplasticity metrics from MNE processed data"""
-        await asyncio.sleep(0.005)  # Simulate async processing
-        
-        # Simulate advanced neuroplasticity calculations
-        # In production, this would use actual MNE signal processing
-        
-        import random
-        random.seed(int(datetime.now().timestamp()))
+        """
+        Band-power metrics from the decoded channels
         
-        # Simulated band power analysis
-        alpha_power = random.uniform(0.3, 0.9)
-        beta_power = random.uniform(0.2, 0.8)
-        theta_power = random.uniform(0.1, 0.7)
-        delta_power = random.uniform(0.1, 0.5)
+        Each channel is decoded on its own (one memory-mapped EDF channel at a
+        time) and reduced to relative band powers, i.e. the fraction of its
+        0.5-45 Hz power in each band; the metrics average those over channels.
+        Signal quality is the share of a channel's non-DC power inside
+        0.5-45 Hz, zero for flat channels.
+        """
+        read_channel = mne_raw["read_channel"]
+        channel_sfreq = mne_raw["channel_sfreq"]
+        bands = ("delta", "theta", "alpha", "beta")
+        powers, qualities = [], []
+        for key in mne_raw["channel_keys"]:
+            relative, quality = _relative_band_powers(
+                read_channel(key), channel_sfreq(key),
+                [self.frequency_bands[band] for band in bands],
+            )
+            powers.append(relative)
+            qualities.append(quality)
+        if not powers:
+            return self._create_default_metrics()
+        delta_power, theta_power, alpha_power, beta_power = (float(v) for v in np.mean(powers, axis=0))
+        signal_quality = float(np.mean(qualities))
         
         # Derived neuroplasticity metrics
         attention_index = (alpha_power + beta_power) / 2.0
         learning_efficiency = (alpha_power * 0.6) + (beta_power * 0.4)
-        signal_quality = random.uniform(0.7, 0.95)
         
         # Advanced neuroplasticity index calculation
         neuroplasticity_index = (
@@ -340,45 +382,130 @@ class ValidatedLIFE:
             "recommendations": result.recommendations
         }
         
-        # Save to tracking data directory
-        log_file = os.path.join(TRACKING_DATA_DIR, f"validation_{result.validation_id}.json")
-        
+        # Append to the segmented log in the tracking data directory
         try:
-            with open(log_file, 'w', encoding='utf-8') as f:
-                json.dump(log_data, f, indent=2, ensure_ascii=False)
+            if self.validation_log is None:
+                self.validation_log = self._open_validation_log()
+            self.validation_log.append(log_data)
         except Exception as e:
             logger.error(f"Failed to log validation result: {e}")
 
-    async def batch_validate_physionet_data(self, dataset_path: str, max_samples: int = 10) -> List[ValidationResult]:
+    def _open_validation_log(self) -> ValidationLogWriter:
         """
-        Batch validate PhysioNet dataset samples
+        Shared segment log, or a per-process sibling while another process holds it
+
+        Whoever holds the shared log folds finished siblings back into it;
+        summaries read the shared log and all siblings in the meantime.
+        """
+        try:
+            writer = ValidationLogWriter(os.path.join(TRACKING_DATA_DIR, "segments"))
+        except ValidationLogLocked as e:
+            log_dir = os.path.join(TRACKING_DATA_DIR, f"segments-{os.getpid()}")
+            logger.warning(f"{e}; writing this process's results to {log_dir}")
+            return ValidationLogWriter(log_dir)
+        try:
+            writer.merge_sibling_logs()
+        except Exception as e:
+            logger.error(f"Failed to merge per-process validation logs: {e}")
+        return writer
+
+    def close(self):
+        """Flush and close the validation log"""
+        if self.validation_log is not None:
+            self.validation_log.close()
+
+    async def iter_validate_physionet_data(
+        self,
+        dataset_path: str,
+        max_samples: int = 10,
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+    ) -> AsyncIterator[ValidationResult]:
+        """
+        Validate PhysioNet EDF recordings in parallel, yielding results as they finish
         
         Args:
-            dataset_path: Path to PhysioNet dataset
-            max_samples: Maximum number of samples to process
+            dataset_path: Directory searched recursively for ``*.edf`` files
+            max_samples: Maximum number of recordings to process
+            max_workers: Worker processes (defaults to the CPU count)
+            max_in_flight: Files submitted but not yet finished (defaults to 2x workers)
             
-        Returns:
-            List of validation results
+        Yields:
+            ValidationResult per recording, in completion order
         """
-        results = []
+        # One walk with a case-insensitive suffix test, so case-insensitive
+        # filesystems do not list every recording twice
+        edf_files = sorted(
+            path for path in glob.glob(os.path.join(dataset_path, "**", "*"), recursive=True)
+            if path.lower().endswith(".edf") and os.path.isfile(path)
+        )[:max_samples]
         
-        try:
-            # In production, this would load actual PhysioNet data
-            # For now, simulate batch processing
-            
+        if not edf_files:
+            logger.warning(f"No EDF recordings found in {dataset_path} - using simulated samples")
             for i in range(min(max_samples, 5)):  # Simulate 5 samples
                 simulated_eeg = {
                     "channels": [[random.uniform(-50, 50) for _ in range(1000)] for _ in range(len(self.channels))],
                     "user_id": f"physionet_subject_{i+1}",
                     "sampling_rate": self.sampling_rate
                 }
-                
-                result = await self.validate_eeg_stream(simulated_eeg, f"physionet_subject_{i+1}")
+                yield await self.validate_eeg_stream(simulated_eeg, f"physionet_subject_{i+1}")
+            return
+        
+        max_workers = max_workers or os.cpu_count() or 1
+        max_in_flight = max(1, max_in_flight or 2 * max_workers)
+        loop = asyncio.get_running_loop()
+        pending = set()
+        remaining = iter(edf_files)
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                while True:
+                    # Keep at most max_in_flight recordings submitted at once
+                    while len(pending) < max_in_flight:
+                        edf_path = next(remaining, None)
+                        if edf_path is None:
+                            break
+                        pending.add(loop.run_in_executor(executor, _validate_edf_file, edf_path))
+                    if not pending:
+                        break
+                    
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        # Workers skip logging; the single writer lives in this process
+                        result = future.result()
+                        await self._log_validation_result(result)
+                        yield result
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    async def batch_validate_physionet_data(
+        self,
+        dataset_path: str,
+        max_samples: int = 10,
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+    ) -> List[ValidationResult]:
+        """
+        Batch validate PhysioNet dataset samples
+        
+        Args:
+            dataset_path: Path to PhysioNet dataset
+            max_samples: Maximum number of samples to process
+            max_workers: Worker processes for parallel validation
+            max_in_flight: Bound on recordings queued to the worker pool
+            
+        Returns:
+            List of validation results, in completion order
+        """
+        results = []
+        
+        try:
+            async for result in self.iter_validate_physionet_data(
+                dataset_path, max_samples, max_workers=max_workers, max_in_flight=max_in_flight
+            ):
                 results.append(result)
                 
-                # Small delay between validations
-                await asyncio.sleep(0.1)
-                
             logger.info(f"Batch validation completed: {len(results)} samples processed")
             
         except Exception as e:
@@ -386,33 +513,84 @@ class ValidatedLIFE:
             
         return results
 
-    def get_validation_summary(self, results: List[ValidationResult]) -> Dict:
-        """Generate summary statistics from validation results"""
-        if not results:
-            return {"error": "No validation results provided"}
+    def get_validation_summary(self, results: Optional[List[ValidationResult]] = None) -> Dict:
+        """
+        Generate summary statistics from validation results
         
-        passed = sum(1 for r in results if r.validation_status == "passed")
-        failed = sum(1 for r in results if r.validation_status == "failed")
-        warnings = sum(1 for r in results if r.validation_status == "warning")
+        Args:
+            results: Results to summarize; when omitted the summary is answered
+                from the incremental indexes of the shared validation log and
+                any per-process logs written while it was held
+        """
+        if results is None:
+            if self.validation_log is not None:
+                self.validation_log.sync()
+            totals = read_summary(os.path.join(TRACKING_DATA_DIR, "segments"))
+        else:
+            totals = {
+                "total_validations": len(results),
+                "passed": sum(1 for r in results if r.validation_status == "passed"),
+                "failed": sum(1 for r in results if r.validation_status == "failed"),
+                "warnings": sum(1 for r in results if r.validation_status == "warning"),
+                "sum_processing_time_ms": sum(r.mne_processing_time_ms for r in results),
+                "sum_neuroplasticity_index": sum(r.metrics.neuroplasticity_index for r in results),
+                "sum_attention_index": sum(r.metrics.attention_index for r in results),
+            }
         
-        avg_processing_time = sum(r.mne_processing_time_ms for r in results) / len(results)
-        avg_neuroplasticity = sum(r.metrics.neuroplasticity_index for r in results) / len(results)
-        avg_attention = sum(r.metrics.attention_index for r in results) / len(results)
+        total = totals["total_validations"]
+        if not total:
+            return {"error": "No validation results provided"}
         
         return {
-            "total_validations": len(results),
-            "passed": passed,
-            "failed": failed,
-            "warnings": warnings,
-            "success_rate": f"{(passed / len(results) * 100):.1f}%",
-            "average_processing_time_ms": f"{avg_processing_time:.2f}",
-            "average_neuroplasticity_index": f"{avg_neuroplasticity:.3f}",
-            "average_attention_index": f"{avg_attention:.3f}",
+            "total_validations": total,
+            "passed": totals["passed"],
+            "failed": totals["failed"],
+            "warnings": totals["warnings"],
+            "success_rate": f"{(totals['passed'] / total * 100):.1f}%",
+            "average_processing_time_ms": f"{totals['sum_processing_time_ms'] / total:.2f}",
+            "average_neuroplasticity_index": f"{totals['sum_neuroplasticity_index'] / total:.3f}",
+            "average_attention_index": f"{totals['sum_attention_index'] / total:.3f}",
             "platform": self.platform_name,
             "version": self.version,
             "timestamp": datetime.now().isoformat()
         }
 
+def _relative_band_powers(signal: np.ndarray, sfreq: float,
+                          bands: List[Tuple[float, float]]) -> Tuple[np.ndarray, float]:
+    """
+    Relative power of ``signal`` in each band, and its in-band power share
+    
+    Hann-windowed periodogram of the mean-removed signal; band powers are
+    normalised by the total 0.5-45 Hz power.
+    """
+    signal = np.asarray(signal, dtype=float)
+    if signal.size < 2 or sfreq <= 0:
+        return np.zeros(len(bands)), 0.0
+    centred = signal - signal.mean()
+    spectrum = np.abs(np.fft.rfft(centred * np.hanning(signal.size))) ** 2
+    freqs = np.fft.rfftfreq(signal.size, d=1.0 / sfreq)
+    total = spectrum[1:].sum()
+    in_band = spectrum[(freqs >= 0.5) & (freqs < 45.0)].sum()
+    if total <= 0 or in_band <= 0:
+        return np.zeros(len(bands)), 0.0
+    relative = np.array([spectrum[(freqs >= low) & (freqs < high)].sum() / in_band for low, high in bands])
+    return relative, float(in_band / total)
+
+
+# Per-process validator reused by every recording a pool worker handles
+_WORKER_VALIDATOR: Optional[ValidatedLIFE] = None
+
+
+def _validate_edf_file(edf_path: str) -> ValidationResult:
+    """Process-pool entry point: validate a single EDF recording"""
+    global _WORKER_VALIDATOR
+    if _WORKER_VALIDATOR is None:
+        _WORKER_VALIDATOR = ValidatedLIFE()
+    user_id = os.path.splitext(os.path.basename(edf_path))[0]
+    return asyncio.run(
+        _WORKER_VALIDATOR.validate_eeg_stream({"edf_path": edf_path}, user_id, log_result=False)
+    )
+
 async def main():
     """Main function for testing the EEG validation system"""
     print("🧠 L.I.F.E. Platform - Advanced EEG Validation System")
@@ -430,7 +608,6 @@ async def main():
     # Test single EEG validation
     print("\n🔍 Testing single EEG validation...")
     
-    import random
     test_eeg_data = {
         "channels": [[random.uniform(-50, 50) for _ in range(1000)] for _ in range(len(validator.channels))],
         "user_id": "test_user_001",
@@ -464,6 +641,8 @@ async def main():
         print(f"   Average Processing Time: {summary['average_processing_time_ms']}ms")
         print(f"   Average Neuroplasticity: {summary['average_neuroplasticity_index']}")
     
+    validator.close()
+    
     print("\n✅ EEG Validation System testing completed!")
     print("🚀 Ready for production neuroadaptive learning!")
 
@@ -0,0 +1,544 @@
+# -*- coding: utf-8 -*-
+"""
+L.I.F.E. Platform - Append-Only Validation Log
+Segmented JSONL storage for EEG validation results
+
+Features:
+- Append-only JSONL segments with size-based rotation
+- Batched fsync (every N records, or T seconds after the last unsynced
+  append) instead of one file per result
+- Incrementally maintained summary index, so summaries never rescan records
+- Crash recovery: the index catches up from the tail of the active segment
+- Optional Parquet compaction of sealed segments (requires pandas + pyarrow)
+- Migration of legacy per-file ``validation_*.json`` logs into segments
+- Single-writer lockfile, so two processes never interleave appends; a
+  process that finds the log held writes to a sibling ``<log_dir>-<pid>``
+  log that summaries include and the next lock holder folds back in
+
+Usage:
+    python validation_log.py migrate --source tracking_data/eeg_validation
+    python validation_log.py compact --log-dir tracking_data/eeg_validation/segments
+
+Copyright 2025 - Sergio Paya Benaully
+L.I.F.E. Platform - Azure Marketplace Offer ID: 9a600d96-fe1e-420b-902a-a0c42c561adb
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+try:
+    import pandas as pd
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "summary_index.json"
+LOCK_FILE = "writer.lock"
+SEGMENT_PREFIX = "segment-"
+NESTED_FIELDS = ("metrics",)
+
+
+class ValidationLogLocked(RuntimeError):
+    """Another writer (usually another process) holds the log directory"""
+
+
+def sibling_log_dirs(log_dir: str) -> List[str]:
+    """Per-process ``<log_dir>-<pid>`` logs written while ``log_dir`` was held"""
+    base = os.path.normpath(log_dir)
+    return sorted(path for path in glob.glob(glob.escape(base) + "-*")
+                  if os.path.basename(path)[len(os.path.basename(base)) + 1:].isdigit() and os.path.isdir(path))
+
+
+def read_summary(log_dir: str, include_siblings: bool = True) -> Dict[str, float]:
+    """
+    Summary totals from the indexes of ``log_dir`` (and its sibling logs)
+
+    Reads only the index files, so it needs no writer lock; records a live
+    writer has not synced yet are not counted.
+    """
+    totals = _empty_totals()
+    for path in [log_dir] + (sibling_log_dirs(log_dir) if include_siblings else []):
+        try:
+            with open(os.path.join(path, INDEX_FILE), "r", encoding="utf-8") as f:
+                index_totals = json.load(f)["totals"]
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Skipping unreadable validation log index in {path}: {e}")
+            continue
+        for key in totals:
+            totals[key] += index_totals.get(key, 0)
+    return totals
+
+
+def _empty_totals() -> Dict[str, float]:
+    return {
+        "total_validations": 0,
+        "passed": 0,
+        "failed": 0,
+        "warnings": 0,
+        "sum_processing_time_ms": 0.0,
+        "sum_neuroplasticity_index": 0.0,
+        "sum_attention_index": 0.0,
+    }
+
+
+def _accumulate(totals: Dict[str, float], record: Dict[str, Any]) -> None:
+    """Fold one validation record into the running summary totals"""
+    metrics = record.get("metrics", {})
+    status = record.get("status")
+    totals["total_validations"] += 1
+    if status == "passed":
+        totals["passed"] += 1
+    elif status == "failed":
+        totals["failed"] += 1
+    elif status == "warning":
+        totals["warnings"] += 1
+    totals["sum_processing_time_ms"] += float(record.get("processing_time_ms", 0.0))
+    totals["sum_neuroplasticity_index"] += float(metrics.get("neuroplasticity_index", 0.0))
+    totals["sum_attention_index"] += float(metrics.get("attention_index", 0.0))
+
+
+def _flatten(record: Dict[str, Any]) -> Dict[str, Any]:
+    flat = {}
+    for key, value in record.items():
+        if key in NESTED_FIELDS and isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                flat[f"{key}.{sub_key}"] = sub_value
+        else:
+            flat[key] = value
+    return flat
+
+
+def _unflatten(flat: Dict[str, Any]) -> Dict[str, Any]:
+    record: Dict[str, Any] = {}
+    for key, value in flat.items():
+        if hasattr(value, "tolist"):
+            value = value.tolist()
+        head, _, tail = key.partition(".")
+        if tail and head in NESTED_FIELDS:
+            record.setdefault(head, {})[tail] = value
+        else:
+            record[key] = value
+    return record
+
+
+class ValidationLogWriter:
+    """
+    Append-only, segmented JSONL log with an incremental summary index
+
+    Records are appended to ``segment-NNNNNN.jsonl`` files that rotate once
+    they reach ``max_segment_bytes``. Data is fsynced in batches and the summary
+    index is rewritten atomically at each sync point, so the index never counts
+    records that are not on disk.
+
+    A writer holds an exclusive lock on ``writer.lock`` from opening until
+    close(); opening a second writer on the same directory raises
+    ValidationLogLocked instead of interleaving appends.
+
+    Pending records are synced at most ``fsync_interval`` seconds after an
+    append, by a timer if no further append or close comes first.
+    """
+
+    def __init__(
+        self,
+        log_dir: str,
+        max_segment_bytes: int = 16 * 1024 * 1024,
+        fsync_every: int = 64,
+        fsync_interval: float = 1.0,
+    ):
+        self.log_dir = log_dir
+        self.max_segment_bytes = max_segment_bytes
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        os.makedirs(self.log_dir, exist_ok=True)
+
+        self._file = None
+        self._lock_file = None
+        self._mutex = threading.RLock()
+        self._sync_timer: Optional[threading.Timer] = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._acquire_lock()
+        self._index = self._load_index()
+        self._recover()
+
+    # ------------------------------------------------------------------
+    # Writer lock
+    # ------------------------------------------------------------------
+
+    def _acquire_lock(self) -> None:
+        # A closed sibling log may have been merged away since it was opened
+        os.makedirs(self.log_dir, exist_ok=True)
+        lock_file = open(os.path.join(self.log_dir, LOCK_FILE), "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            try:
+                lock_file.seek(0)
+                holder = lock_file.read().strip() or "unknown"
+            except OSError:
+                holder = "unknown"
+            lock_file.close()
+            raise ValidationLogLocked(f"Validation log {self.log_dir} is held by writer pid {holder}")
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(str(os.getpid()))
+        lock_file.flush()
+        self._lock_file = lock_file
+
+    def _release_lock(self) -> None:
+        if self._lock_file is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+        else:
+            self._lock_file.seek(0)
+            msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        self._lock_file.close()
+        self._lock_file = None
+
+    # ------------------------------------------------------------------
+    # Index management
+    # ------------------------------------------------------------------
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.log_dir, INDEX_FILE)
+
+    def _segment_path(self, name: str) -> str:
+        return os.path.join(self.log_dir, name)
+
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Validation log index unreadable, rebuilding: {e}")
+
+        # No usable index: rebuild once from whatever segments exist
+        index = {"segments": [], "next_sequence": 0, "totals": _empty_totals()}
+        for path in sorted(glob.glob(self._segment_path(f"{SEGMENT_PREFIX}*"))):
+            name = os.path.basename(path)
+            records = 0
+            for record in self._read_segment(name):
+                _accumulate(index["totals"], record)
+                records += 1
+            size = os.path.getsize(path) if name.endswith(".jsonl") else 0
+            index["segments"].append({"name": name, "records": records, "bytes": size})
+            sequence = int(name[len(SEGMENT_PREFIX):].split(".")[0])
+            index["next_sequence"] = max(index["next_sequence"], sequence + 1)
+        return index
+
+    def _write_index(self) -> None:
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)
+
+    def _recover(self) -> None:
+        """Fold records written after the last index sync into the index"""
+        if not self._index["segments"]:
+            return
+        active = self._index["segments"][-1]
+        if not active["name"].endswith(".jsonl"):
+            return
+        path = self._segment_path(active["name"])
+        if not os.path.exists(path):
+            return
+        actual_size = os.path.getsize(path)
+        if actual_size <= active["bytes"]:
+            return
+
+        with open(path, "rb+") as f:
+            f.seek(active["bytes"])
+            tail = f.read()
+            complete = tail[: tail.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                if line.strip():
+                    _accumulate(self._index["totals"], json.loads(line))
+                    active["records"] += 1
+            # Drop a torn trailing line left by a crash mid-write
+            active["bytes"] += len(complete)
+            f.truncate(active["bytes"])
+        self._write_index()
+        logger.info(f"Validation log recovered tail of {active['name']}")
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _open_new_segment(self) -> None:
+        name = f"{SEGMENT_PREFIX}{self._index['next_sequence']:06d}.jsonl"
+        self._index["next_sequence"] += 1
+        self._index["segments"].append({"name": name, "records": 0, "bytes": 0})
+        self._file = open(self._segment_path(name), "ab")
+
+    def _active_segment(self) -> Dict[str, Any]:
+        if self._lock_file is None:
+            # Reopened after close(): another writer may have appended meanwhile
+            self._acquire_lock()
+            self._index = self._load_index()
+            self._recover()
+        if self._file is None:
+            segments = self._index["segments"]
+            if segments and segments[-1]["name"].endswith(".jsonl") \
+                    and segments[-1]["bytes"] < self.max_segment_bytes:
+                self._file = open(self._segment_path(segments[-1]["name"]), "ab")
+            else:
+                self._open_new_segment()
+        return self._index["segments"][-1]
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append one validation record"""
+        line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._mutex:
+            self._append_line(line, record)
+
+    def _append_line(self, line: bytes, record: Dict[str, Any]) -> None:
+        active = self._active_segment()
+        if active["records"] and active["bytes"] + len(line) > self.max_segment_bytes:
+            self.sync()
+            self._file.close()
+            self._open_new_segment()
+            active = self._index["segments"][-1]
+
+        self._file.write(line)
+        active["records"] += 1
+        active["bytes"] += len(line)
+        _accumulate(self._index["totals"], record)
+        self._unsynced += 1
+
+        if self._unsynced >= self.fsync_every or \
+                time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+        elif self._sync_timer is None:
+            self._sync_timer = threading.Timer(self.fsync_interval, self._sync_when_idle)
+            self._sync_timer.daemon = True
+            self._sync_timer.start()
+
+    def _sync_when_idle(self) -> None:
+        with self._mutex:
+            self._sync_timer = None
+            if self._unsynced and self._file is not None:
+                self.sync()
+
+    def sync(self) -> None:
+        """Flush and fsync pending records, then persist the summary index"""
+        with self._mutex:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            if self._lock_file is not None:
+                self._write_index()
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        with self._mutex:
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+            if self._file is not None:
+                self.sync()
+                self._file.close()
+                self._file = None
+            self._release_lock()
+
+    def __enter__(self) -> "ValidationLogWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def summary(self) -> Dict[str, float]:
+        """Summary totals from the index (O(1), no record scan)"""
+        return dict(self._index["totals"])
+
+    def _read_segment(self, name: str) -> Iterator[Dict[str, Any]]:
+        path = self._segment_path(name)
+        if name.endswith(".parquet"):
+            frame = pd.read_parquet(path)
+            for row in frame.to_dict(orient="records"):
+                yield _unflatten(row)
+            return
+        with open(path, "rb") as f:
+            for line in f:
+                if line.endswith(b"\n") and line.strip():
+                    yield json.loads(line)
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Iterate every stored record in append order"""
+        if self._file is not None:
+            self._file.flush()
+        for segment in list(self._index["segments"]):
+            yield from self._read_segment(segment["name"])
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def compact_to_parquet(self) -> int:
+        """
+        Rewrite sealed JSONL segments as Parquet files
+
+        Returns:
+            Number of segments compacted
+        """
+        if not PARQUET_AVAILABLE:
+            logger.warning("pandas/pyarrow not available - skipping Parquet compaction")
+            return 0
+
+        compacted = 0
+        sealed = self._index["segments"][:-1] if self._file is not None else self._index["segments"]
+        for segment in sealed:
+            name = segment["name"]
+            if not name.endswith(".jsonl"):
+                continue
+            rows = [_flatten(record) for record in self._read_segment(name)]
+            parquet_name = name[: -len(".jsonl")] + ".parquet"
+            pd.DataFrame(rows).to_parquet(self._segment_path(parquet_name), index=False)
+            segment["name"] = parquet_name
+            segment["bytes"] = 0
+            self._write_index()
+            os.remove(self._segment_path(name))
+            compacted += 1
+        logger.info(f"Compacted {compacted} validation log segments to Parquet")
+        return compacted
+
+    def merge_sibling_logs(self) -> int:
+        """
+        Fold idle ``<log_dir>-<pid>`` sibling logs into this log and delete them
+
+        Siblings whose writer is still open are left for a later call.
+        Records whose validation_id is already stored are skipped, so a merge
+        interrupted before the sibling is deleted never duplicates.
+
+        Returns:
+            Number of records merged
+        """
+        merged = 0
+        for path in sibling_log_dirs(self.log_dir):
+            try:
+                sibling = ValidationLogWriter(path)
+            except ValidationLogLocked:
+                continue
+            with sibling:
+                stored_ids = {record.get("validation_id") for record in self.iter_records()}
+                stored_ids.discard(None)
+                for record in sibling.iter_records():
+                    validation_id = record.get("validation_id")
+                    if validation_id is not None and validation_id in stored_ids:
+                        continue
+                    self.append(record)
+                    merged += 1
+                self.sync()
+            shutil.rmtree(path)
+        if merged:
+            logger.info(f"Merged {merged} validation records from sibling logs into {self.log_dir}")
+        return merged
+
+    def migrate_json_logs(self, source_dir: str, remove: bool = False) -> int:
+        """
+        Fold legacy per-validation ``validation_*.json`` files into segments
+
+        Re-running is safe: records whose validation_id is already stored are
+        skipped, so an interrupted or repeated migration never duplicates.
+
+        Args:
+            source_dir: Directory containing the legacy JSON files
+            remove: Delete each legacy file once its record is fsynced to a
+                segment; unreadable files are always kept
+
+        Returns:
+            Number of records migrated
+        """
+        paths = sorted(glob.glob(os.path.join(source_dir, "validation_*.json")))
+        stored_ids = {record.get("validation_id") for record in self.iter_records()}
+        stored_ids.discard(None)
+        durable_paths = []
+        migrated = 0
+        for path in paths:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    record = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable validation log {path}: {e}")
+                continue
+            validation_id = record.get("validation_id")
+            if validation_id is not None and validation_id in stored_ids:
+                durable_paths.append(path)
+                continue
+            self.append(record)
+            stored_ids.add(validation_id)
+            durable_paths.append(path)
+            migrated += 1
+        self.sync()
+        if remove:
+            for path in durable_paths:
+                os.remove(path)
+        logger.info(f"Migrated {migrated} legacy validation logs into {self.log_dir}")
+        return migrated
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="L.I.F.E. validation log maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate = subparsers.add_parser("migrate", help="Fold per-file JSON logs into segments")
+    migrate.add_argument("--source", default="tracking_data/eeg_validation",
+                         help="Directory with legacy validation_*.json files")
+    migrate.add_argument("--log-dir", default=None,
+                         help="Segment directory (defaults to <source>/segments)")
+    migrate.add_argument("--remove", action="store_true",
+                         help="Delete legacy files after migration")
+
+    compact = subparsers.add_parser("compact", help="Compact sealed segments to Parquet")
+    compact.add_argument("--log-dir", default="tracking_data/eeg_validation/segments")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    if args.command == "migrate":
+        log_dir = args.log_dir or os.path.join(args.source, "segments")
+        with ValidationLogWriter(log_dir) as writer:
+            count = writer.migrate_json_logs(args.source, remove=args.remove)
+        print(f"Migrated {count} validation records into {log_dir}")
+    else:
+        with ValidationLogWriter(args.log_dir) as writer:
+            writer.merge_sibling_logs()
+            count = writer.compact_to_parquet()
+        print(f"Compacted {count} segments in {args.log_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,311 @@
+"""
+L.I.F.E Algorithm - Sliding-Window Circuit Breaker
+
+Protects edge and cloud inference backends from being hammered while they
+are failing or slow, and from a thundering herd while they recover.
+
+Features
+  - Time-bucketed sliding window of calls, failures, slow calls and latency.
+    Old buckets expire as the clock moves, so the breaker reacts to the last
+    ``window_seconds`` only.
+  - Trips on failure rate or slow-call rate, once the window holds at least
+    ``minimum_calls`` results.
+  - Half-open probing: after the open timeout at most
+    ``half_open_max_probes`` callers are let through. The breaker closes when
+    they all succeed and reopens on the first failed or slow probe.
+  - Exponential backoff of the open timeout on every consecutive reopen,
+    capped at ``max_open_seconds`` and reset when the breaker closes.
+  - BreakerRegistry: one breaker per key (device, backend host, ...), all
+    sharing a config and clock.
+
+allow_request() takes no lock while closed or while open and cooling down,
+so it costs well under a microsecond; see measure_allow_request_overhead().
+
+Usage
+    registry = BreakerRegistry(BreakerConfig(failure_rate_threshold=0.5))
+    breaker = registry.get("edge-01")
+    if breaker.allow_request():
+        with breaker.guard():
+            call_backend()
+
+Copyright 2025 - Sergio Paya Benaully
+Azure Marketplace Offer ID: 9a600d96-fe1e-420b-902a-a0c42c561adb
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class BreakerConfig:
+    """Thresholds and timings shared by the breakers of a registry"""
+
+    window_seconds: float = 10.0
+    buckets: int = 10
+    minimum_calls: int = 10
+    failure_rate_threshold: float = 0.5
+    slow_call_seconds: float = 1.0
+    slow_call_rate_threshold: float = 0.8
+    open_seconds: float = 5.0
+    max_open_seconds: float = 300.0
+    backoff_multiplier: float = 2.0
+    half_open_max_probes: int = 3
+
+    def open_timeout(self, reopen_count: int) -> float:
+        """Open timeout after ``reopen_count`` consecutive failed recoveries"""
+        return min(self.max_open_seconds, self.open_seconds * self.backoff_multiplier ** reopen_count)
+
+
+class WindowTotals(NamedTuple):
+    calls: int
+    failures: int
+    slow_calls: int
+    latency_sum: float
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.calls if self.calls else 0.0
+
+    @property
+    def slow_call_rate(self) -> float:
+        return self.slow_calls / self.calls if self.calls else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.latency_sum / self.calls if self.calls else 0.0
+
+
+class SlidingWindow:
+    """
+    Ring of ``buckets`` time buckets covering the last ``seconds``
+
+    A bucket is tagged with the absolute tick it holds; a slot whose tag is
+    older than the window is treated as empty and reset on its next write.
+    """
+
+    def __init__(self, seconds: float, buckets: int) -> None:
+        if seconds <= 0 or buckets < 1:
+            raise ValueError("window needs a positive length and at least one bucket")
+        self.size = buckets
+        self.width = seconds / buckets
+        self.reset()
+
+    def reset(self) -> None:
+        self._ticks = [-1] * self.size
+        self._calls = [0] * self.size
+        self._failures = [0] * self.size
+        self._slow = [0] * self.size
+        self._latency = [0.0] * self.size
+
+    def add(self, now: float, failed: bool, slow: bool, latency: float) -> None:
+        tick = int(now // self.width)
+        slot = tick % self.size
+        if self._ticks[slot] != tick:
+            self._ticks[slot] = tick
+            self._calls[slot] = self._failures[slot] = self._slow[slot] = 0
+            self._latency[slot] = 0.0
+        self._calls[slot] += 1
+        self._failures[slot] += failed
+        self._slow[slot] += slow
+        self._latency[slot] += latency
+
+    def totals(self, now: float) -> WindowTotals:
+        oldest = int(now // self.width) - self.size
+        live = [i for i, tick in enumerate(self._ticks) if tick > oldest]
+        return WindowTotals(
+            sum(self._calls[i] for i in live),
+            sum(self._failures[i] for i in live),
+            sum(self._slow[i] for i in live),
+            sum(self._latency[i] for i in live),
+        )
+
+
+class CircuitBreaker:
+    """
+    Closed -> open -> half-open state machine over a SlidingWindow
+
+    Every call let through by allow_request() must report its outcome with
+    record_success() or record_failure() (or run inside guard()), since
+    half-open probe slots are only released by those calls.
+    """
+
+    def __init__(self, config: Optional[BreakerConfig] = None, clock: Callable[[], float] = time.monotonic,
+                 name: str = "breaker") -> None:
+        self.config = config or BreakerConfig()
+        self.clock = clock
+        self.name = name
+        self.window = SlidingWindow(self.config.window_seconds, self.config.buckets)
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._open_until = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.reopen_count = 0
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    @property
+    def open_until(self) -> Optional[float]:
+        return self._open_until if self._state == OPEN else None
+
+    def allow_request(self) -> bool:
+        state = self._state
+        if state == CLOSED:
+            return True
+        if state == OPEN and self.clock() < self._open_until:
+            # Rejections stay lock-free too; the counter is advisory
+            self.rejected += 1
+            return False
+        with self._lock:
+            if self._state == OPEN:
+                if self.clock() < self._open_until:
+                    self.rejected += 1
+                    return False
+                self._state = HALF_OPEN
+                self._probes_in_flight = self._probe_successes = 0
+                logger.info("Circuit %s half-open; probing", self.name)
+            if self._state == HALF_OPEN:
+                if self._probes_in_flight >= self.config.half_open_max_probes:
+                    self.rejected += 1
+                    return False
+                self._probes_in_flight += 1
+            return True
+
+    def record_success(self, latency: float = 0.0) -> None:
+        self._record(False, latency)
+
+    def record_failure(self, latency: float = 0.0) -> None:
+        self._record(True, latency)
+
+    def _record(self, failed: bool, latency: float) -> None:
+        slow = latency >= self.config.slow_call_seconds
+        with self._lock:
+            now = self.clock()
+            if self._state == CLOSED:
+                self.window.add(now, failed, slow, latency)
+                totals = self.window.totals(now)
+                if totals.calls >= self.config.minimum_calls and (
+                    totals.failure_rate >= self.config.failure_rate_threshold
+                    or totals.slow_call_rate >= self.config.slow_call_rate_threshold
+                ):
+                    self._open(now, totals)
+            elif self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if failed or slow:
+                    self.reopen_count += 1
+                    self._open(now, None)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.config.half_open_max_probes:
+                        self._close()
+            # Results arriving while open belong to calls started before the trip
+
+    def _open(self, now: float, totals: Optional[WindowTotals]) -> None:
+        self._state = OPEN
+        self._open_until = now + self.config.open_timeout(self.reopen_count)
+        self.trips += 1
+        if totals is not None:
+            logger.warning("Circuit %s opened: failure rate %.0f%%, slow-call rate %.0f%% over %d calls",
+                           self.name, totals.failure_rate * 100, totals.slow_call_rate * 100, totals.calls)
+        else:
+            logger.warning("Circuit %s reopened for %.1fs after a failed probe",
+                           self.name, self._open_until - now)
+
+    def _close(self) -> None:
+        self._state = CLOSED
+        self.reopen_count = 0
+        self.window.reset()
+        logger.info("Circuit %s closed", self.name)
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Time the enclosed call and record it; exceptions count as failures and propagate"""
+        start = self.clock()
+        try:
+            yield
+        except BaseException:
+            self.record_failure(self.clock() - start)
+            raise
+        self.record_success(self.clock() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            totals = self.window.totals(self.clock())
+            return {
+                "state": self._state,
+                "calls": totals.calls,
+                "failure_rate": totals.failure_rate,
+                "slow_call_rate": totals.slow_call_rate,
+                "mean_latency_s": totals.mean_latency,
+                "open_until": self.open_until,
+                "reopen_count": self.reopen_count,
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
+
+
+class BreakerRegistry:
+    """Lazily created CircuitBreaker per key, sharing one config and clock"""
+
+    def __init__(self, config: Optional[BreakerConfig] = None, clock: Callable[[], float] = time.monotonic,
+                 breaker_class: Callable[..., CircuitBreaker] = CircuitBreaker) -> None:
+        self.config = config or BreakerConfig()
+        self.clock = clock
+        self.breaker_class = breaker_class
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CircuitBreaker:
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(key)
+                if breaker is None:
+                    breaker = self.breaker_class(self.config, self.clock, name=key)
+                    self._breakers[key] = breaker
+        return breaker
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._breakers
+
+    def __len__(self) -> int:
+        return len(self._breakers)
+
+    def keys(self) -> List[str]:
+        return list(self._breakers)
+
+    def open_keys(self) -> List[str]:
+        return [key for key, breaker in self._breakers.items() if breaker.state != CLOSED]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {key: breaker.snapshot() for key, breaker in list(self._breakers.items())}
+
+
+def measure_allow_request_overhead(breaker: Optional[CircuitBreaker] = None, calls: int = 200_000) -> float:
+    """Mean cost of one allow_request() call in nanoseconds (closed breaker by default)"""
+    breaker = breaker or CircuitBreaker()
+    allow = breaker.allow_request
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        allow()
+    loop_start = time.perf_counter_ns()
+    for _ in range(calls):
+        pass
+    end = time.perf_counter_ns()
+    return max(0.0, ((loop_start - start) - (end - loop_start)) / calls)
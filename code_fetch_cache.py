@@ -0,0 +1,324 @@
+"""
+L.I.F.E Algorithm - Concurrent Code Fetching with a Content-Addressed Cache
+
+Downloads many source files at once for code analysis and avoids both
+re-downloading and re-analysing files that have not changed.
+
+Features
+  - fetch_all(): asyncio fan-out with a bounded number of requests in
+    flight. Uses aiohttp when installed, otherwise urllib on a thread pool
+    sized to the concurrency limit.
+  - HTTP revalidation: the ETag and Last-Modified of every URL are kept and
+    sent back as If-None-Match / If-Modified-Since, so an unchanged file
+    costs a 304 with no body.
+  - ContentCache: on-disk index of URL -> validators and SHA-256 of the last
+    body, plus one analysis record per content hash. A file whose bytes
+    hash to a known record (same file under another URL, or a 200 with
+    unchanged content) reuses that record instead of being analysed again.
+  - StandInCodeServer: local HTTP server that serves a dict of files with
+    ETags, answers 304s and counts requests, for tests and offline runs.
+
+Cache layout
+    root/index.json              url -> {"sha256", "etag", "last_modified"}
+    root/records/<sha256>.json   analysis record for that content
+
+Usage
+    cache = ContentCache("cache/code_analysis")
+    results = await fetch_all(urls, cache, concurrency=8)
+    for result in results:
+        record = cache.load_record(result.sha256)
+
+Copyright 2025 - Sergio Paya Benaully
+Azure Marketplace Offer ID: 9a600d96-fe1e-420b-902a-a0c42c561adb
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except Exception:  # pragma: no cover - aiohttp is optional
+    aiohttp = None  # type: ignore
+    AIOHTTP_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+RECORDS_DIR = "records"
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f".{path.name}-{uuid.uuid4().hex}")
+    staging.write_text(text)
+    os.replace(staging, path)
+
+
+class ContentCache:
+    """URL validators and per-content-hash analysis records on disk"""
+
+    def __init__(self, root: Union[str, Path]) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        index_path = self.root / INDEX_FILE
+        try:
+            self._index: Dict[str, Dict[str, Any]] = json.loads(index_path.read_text()) if index_path.exists() else {}
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable fetch cache index: %s", exc)
+            self._index = {}
+
+    def entry(self, url: str) -> Optional[Dict[str, Any]]:
+        return self._index.get(url)
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for ``url``, if its record is still on disk"""
+        entry = self._index.get(url)
+        if not entry or not self.has_record(entry["sha256"]):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def remember(self, url: str, sha256: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        with self._lock:
+            self._index[url] = {"sha256": sha256, "etag": etag, "last_modified": last_modified}
+
+    def _record_path(self, sha256: str) -> Path:
+        return self.root / RECORDS_DIR / f"{sha256}.json"
+
+    def has_record(self, sha256: str) -> bool:
+        return self._record_path(sha256).exists()
+
+    def load_record(self, sha256: str) -> Optional[Dict[str, Any]]:
+        path = self._record_path(sha256)
+        try:
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning("Discarding corrupt analysis record %s", sha256)
+            return None
+
+    def save_record(self, sha256: str, record: Mapping[str, Any]) -> None:
+        _write_atomic(self._record_path(sha256), json.dumps(record, default=str))
+
+    def save_index(self) -> None:
+        with self._lock:
+            text = json.dumps(self._index, indent=2, sort_keys=True)
+        _write_atomic(self.root / INDEX_FILE, text)
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: str  # "fetched", "not_modified" or "error"
+    http_status: int = 0
+    sha256: Optional[str] = None
+    body: Optional[bytes] = None  # only set when fetched
+    error: Optional[str] = None
+
+
+class ThreadedTransport:
+    """urllib requests on a private thread pool (the fallback without aiohttp)"""
+
+    def __init__(self, max_workers: int = 8, timeout: float = 15.0) -> None:
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="life-fetch")
+
+    def _get(self, url: str, headers: Dict[str, str]) -> Response:
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as exc:  # 304 and error statuses
+            return exc.code, dict(exc.headers or {}), b""
+
+    async def get(self, url: str, headers: Dict[str, str]) -> Response:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._get, url, headers)
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+class AiohttpTransport:
+    """Pooled keep-alive connections through one aiohttp session"""
+
+    def __init__(self, max_connections: int = 8, timeout: float = 15.0) -> None:
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._session: Any = None
+
+    async def get(self, url: str, headers: Dict[str, str]) -> Response:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        async with self._session.get(url, headers=headers) as response:
+            return response.status, dict(response.headers), await response.read()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def default_transport(concurrency: int = 8, timeout: float = 15.0) -> Any:
+    if AIOHTTP_AVAILABLE:
+        return AiohttpTransport(concurrency, timeout)
+    return ThreadedTransport(concurrency, timeout)
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    lowered = name.lower()
+    return next((v for k, v in headers.items() if k.lower() == lowered), None)
+
+
+async def _fetch_one(url: str, cache: ContentCache, transport: Any, limit: asyncio.Semaphore) -> FetchResult:
+    async with limit:
+        try:
+            status, headers, body = await transport.get(url, cache.validators(url))
+            if status == 304:
+                entry = cache.entry(url)
+                if entry and cache.has_record(entry["sha256"]):
+                    return FetchResult(url, "not_modified", status, entry["sha256"])
+                # Validators outlived their record; fetch the full body again
+                status, headers, body = await transport.get(url, {})
+            if not 200 <= status < 300:
+                return FetchResult(url, "error", status, error=f"HTTP {status}")
+        except Exception as exc:
+            return FetchResult(url, "error", error=str(exc) or type(exc).__name__)
+    sha256 = content_hash(body)
+    cache.remember(url, sha256, _header(headers, "ETag"), _header(headers, "Last-Modified"))
+    return FetchResult(url, "fetched", status, sha256, body)
+
+
+async def fetch_all(urls: Sequence[str], cache: ContentCache, transport: Any = None,
+                    concurrency: int = 8) -> List[FetchResult]:
+    """
+    Fetch ``urls`` with at most ``concurrency`` requests in flight
+
+    Results come back in input order (duplicates share one request), and the
+    cache index is saved once at the end.
+    """
+    own_transport = transport is None
+    transport = transport or default_transport(concurrency)
+    limit = asyncio.Semaphore(max(1, concurrency))
+    unique = list(dict.fromkeys(urls))
+    try:
+        fetched = await asyncio.gather(*(_fetch_one(url, cache, transport, limit) for url in unique))
+    finally:
+        if own_transport:
+            await transport.close()
+    cache.save_index()
+    by_url = dict(zip(unique, fetched))
+    return [by_url[url] for url in urls]
+
+
+class StandInCodeServer:
+    """
+    Local HTTP server for a dict of path -> source text
+
+    Sends a strong ETag (hash of the body) and answers a matching
+    If-None-Match with 304. ``delay`` slows every response down so tests can
+    observe concurrency; ``max_in_flight`` records the peak.
+    """
+
+    def __init__(self, files: Dict[str, str], delay: float = 0.0) -> None:
+        self.files = files
+        self.delay = delay
+        self.requests = 0
+        self.not_modified = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def url(self, path: str) -> str:
+        host, port = self._server.server_address[:2]  # type: ignore[union-attr]
+        return f"http://{host}:{port}/{path.lstrip('/')}"
+
+    def _respond(self, handler: BaseHTTPRequestHandler) -> None:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            text = self.files.get(handler.path.lstrip("/"))
+            if text is None:
+                handler.send_response(404)
+                handler.send_header("Content-Length", "0")
+                handler.end_headers()
+                return
+            body = text.encode("utf-8")
+            etag = f'"{content_hash(body)[:32]}"'
+            if handler.headers.get("If-None-Match") == etag:
+                with self._lock:
+                    self.not_modified += 1
+                handler.send_response(304)
+                handler.send_header("ETag", etag)
+                handler.end_headers()
+                return
+            handler.send_response(200)
+            handler.send_header("ETag", etag)
+            handler.send_header("Content-Type", "text/plain; charset=utf-8")
+            handler.send_header("Content-Length", str(len(body)))
+            handler.end_headers()
+            handler.wfile.write(body)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def start(self) -> "StandInCodeServer":
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server naming
+                owner._respond(self)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="life-code-server", daemon=True).start()
+        return self
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StandInCodeServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
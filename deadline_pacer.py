@@ -0,0 +1,233 @@
+"""
+L.I.F.E Algorithm - Deadline-Paced Async Loop
+
+Runs a periodic tick on an asyncio event loop against absolute monotonic
+deadlines (start + k * interval), so per-tick processing time never shifts the
+schedule. When a tick overruns one or more deadlines the missed ticks are
+either skipped (resume on the next future deadline) or coalesced (one
+immediate catch-up tick told how many ticks it stands for). The loop stops on
+a StopToken, on task cancellation, or after a tick budget, and keeps jitter
+and overrun counters for monitoring.
+
+Usage
+    token = StopToken()
+    pacer = DeadlinePacer(0.25, policy=MissedTickPolicy.COALESCE, stop_token=token)
+    task = asyncio.create_task(pacer.run(on_tick))
+    ...
+    token.stop()
+    stats = await task
+
+Clock and sleep are injectable so tests can drive thousands of ticks against a
+fake clock without real waiting.
+
+Copyright 2025 - Sergio Paya Benaully
+Azure Marketplace Offer ID: 9a600d96-fe1e-420b-902a-a0c42c561adb
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import math
+import threading
+import time
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MissedTickPolicy(str, Enum):
+    """What to do with deadlines that passed while a tick was still running"""
+
+    SKIP = "skip"  # drop them and wait for the next deadline on the grid
+    COALESCE = "coalesce"  # run one tick immediately that stands for all of them
+
+
+class StopToken:
+    """
+    Cooperative stop signal shared between a loop and its owner
+
+    stop() may be called from any thread. Each wait() parks on an Event of its
+    own running loop, so one token can serve successive asyncio.run() calls.
+    """
+
+    def __init__(self) -> None:
+        self._stopped = False
+        self._lock = threading.Lock()
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stopped
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopped = True
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:  # loop already closed
+                pass
+
+    async def wait(self, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds, waking early on stop; True if stopped"""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            if self._stopped:
+                return True
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+        return self._stopped
+
+
+@dataclass
+class TickContext:
+    """Passed to every tick callback"""
+
+    index: int  # grid index of the deadline this tick serves
+    deadline: float
+    started: float
+    missed: int  # ticks folded into this one (COALESCE) or dropped before it (SKIP)
+
+
+@dataclass
+class PacerStats:
+    """Jitter is how late a tick started relative to its deadline, in seconds"""
+
+    ticks: int = 0
+    overruns: int = 0  # ticks whose processing ran past the next deadline
+    missed_ticks: int = 0  # deadlines never served by a tick of their own
+    coalesced_ticks: int = 0  # missed deadlines folded into a catch-up tick
+    errors: int = 0
+    jitter_last: float = 0.0
+    jitter_max: float = 0.0
+    jitter_total: float = 0.0
+    busy_seconds: float = 0.0
+
+    @property
+    def jitter_mean(self) -> float:
+        return self.jitter_total / self.ticks if self.ticks else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        data = asdict(self)
+        data["jitter_mean"] = self.jitter_mean
+        return data
+
+
+class DeadlinePacer:
+    """
+    Periodic async runner scheduled on an absolute monotonic grid
+
+    Args:
+        interval: Seconds between deadlines
+        policy: MissedTickPolicy for deadlines lost to an overrunning tick
+        stop_token: Optional StopToken; a fresh one is created otherwise
+        clock: Monotonic clock in seconds (time.monotonic)
+        sleep: Async sleep override, e.g. a fake clock's; defaults to waiting
+            on the stop token so stop() wakes the loop immediately
+        stop_on_error: Stop after a tick raises (otherwise log, count, continue)
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        policy: MissedTickPolicy = MissedTickPolicy.SKIP,
+        stop_token: Optional[StopToken] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Optional[Callable[[float], Awaitable[Any]]] = None,
+        stop_on_error: bool = False,
+    ) -> None:
+        if not interval > 0:
+            raise ValueError("interval must be positive")
+        self.interval = float(interval)
+        self.policy = MissedTickPolicy(policy)
+        self.stop_token = stop_token or StopToken()
+        self.clock = clock
+        self._sleep = sleep
+        self.stop_on_error = stop_on_error
+        self.stats = PacerStats()
+
+    def stop(self) -> None:
+        self.stop_token.stop()
+
+    async def _wait_until(self, deadline: float) -> None:
+        # Loop timers may fire a hair early; never start a tick before its deadline
+        while not self.stop_token.stopped:
+            delay = deadline - self.clock()
+            if delay <= 0:
+                return
+            if self._sleep is not None:
+                await self._sleep(delay)
+            else:
+                await self.stop_token.wait(delay)
+
+    async def run(self, on_tick: Callable[[TickContext], Any], max_ticks: Optional[int] = None) -> PacerStats:
+        """
+        Call ``on_tick`` (sync or async) once per deadline until stopped
+
+        Returns:
+            The PacerStats for this run; cancellation propagates after the
+            stats are final
+        """
+        stats = self.stats
+        start = self.clock()
+        index = 0
+        missed = 0
+        try:
+            while not self.stop_token.stopped and (max_ticks is None or stats.ticks < max_ticks):
+                deadline = start + index * self.interval
+                await self._wait_until(deadline)
+                if self.stop_token.stopped:
+                    break
+
+                started = self.clock()
+                jitter = max(0.0, started - deadline)
+                stats.jitter_last = jitter
+                stats.jitter_total += jitter
+                stats.jitter_max = max(stats.jitter_max, jitter)
+                try:
+                    result = on_tick(TickContext(index, deadline, started, missed))
+                    if inspect.isawaitable(result):
+                        await result
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    stats.errors += 1
+                    logger.error("Paced tick %d failed: %s", index, exc)
+                    if self.stop_on_error:
+                        break
+                finally:
+                    stats.ticks += 1
+                    stats.busy_seconds += self.clock() - started
+
+                # Next deadline on the grid, and how many were lost to this tick
+                finished = self.clock()
+                index += 1
+                next_deadline = start + index * self.interval
+                if finished > next_deadline:
+                    stats.overruns += 1
+                    behind = int(math.floor((finished - next_deadline) / self.interval)) + 1
+                    if self.policy is MissedTickPolicy.COALESCE:
+                        # Serve the latest passed deadline now; it stands for the rest
+                        missed = behind - 1
+                        stats.coalesced_ticks += missed
+                    else:
+                        missed = behind
+                    stats.missed_ticks += missed
+                    index += missed
+                else:
+                    missed = 0
+        except asyncio.CancelledError:
+            logger.info("Paced loop cancelled after %d ticks", stats.ticks)
+            raise
+        return stats
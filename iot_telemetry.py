@@ -0,0 +1,615 @@
+"""
+L.I.F.E Algorithm - Batched IoT Hub Telemetry
+
+Streams EEG metric samples to IoT Hub through one long-lived device client
+per connection string. Callers enqueue samples without blocking; a sender
+thread packs everything queued into a single message, so a burst of N
+samples costs one send instead of N connect/send/shutdown round trips.
+
+Features
+  - Columnar encoding: a batch of samples (dicts) is stored column by column
+    with struct, typed per field (float64, int64, bool, timestamp, string,
+    float64 array, JSON). Each message carries its schema and a 64-bit
+    schema tag, so a receiver can cache decoders per tag.
+  - PII redaction applies to string-typed values only. Numeric columns never
+    go through the regular expressions.
+  - TelemetryBatcher: send queue plus sender thread. A batch is sent when it
+    reaches max_batch samples, when its oldest sample is max_delay seconds
+    old, or on flush().
+  - StandInBroker: in-process MQTT-style broker with an IoTHubDeviceClient
+    compatible client factory, for tests and offline runs.
+
+Wire format (little-endian)
+    header   <4sBBHI8s>   magic "LIFT", version, flags, column count, row count, schema tag
+    schema   per column: <BB> type, name length, then the UTF-8 name
+    columns  per column: <B> has-nulls, validity bitmap if so, then the values
+
+Usage
+    sender = get_telemetry_client(connection_string, max_batch=64, redact=anonymizer.anonymize)
+    sender.send({"timestamp": datetime.now(), "focus_level": 0.7})
+    sender.flush()
+    samples = decode_batch(message.data)
+
+Copyright 2025 - Sergio Paya Benaully
+Azure Marketplace Offer ID: 9a600d96-fe1e-420b-902a-a0c42c561adb
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import numbers
+import queue
+import struct
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+try:  # The Azure message type is only needed when talking to a real hub
+    from azure.iot.device import IoTHubDeviceClient, Message as AzureMessage
+except Exception:  # pragma: no cover - SDK is optional
+    IoTHubDeviceClient = None  # type: ignore
+    AzureMessage = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"LIFT"
+WIRE_VERSION = 1
+HEADER = struct.Struct("<4sBBHI8s")
+CONTENT_TYPE = "application/vnd.life.telemetry-columns"
+
+# Column types
+F64 = 1
+I64 = 2
+BOOL = 3
+STR = 4
+TIME = 5  # naive datetime, local time
+TIME_UTC = 6  # timezone-aware datetime, decoded in UTC
+F64_ARRAY = 7
+JSON = 8
+
+Schema = List[Tuple[str, int]]
+Redactor = Callable[[str], str]
+
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_INT64_RANGE = (-(1 << 63), (1 << 63) - 1)
+
+
+# ----------------------------------------------------------------------
+# Columnar encoding
+# ----------------------------------------------------------------------
+def _column_type(values: Sequence[Any]) -> int:
+    present = [v for v in values if v is not None]
+    if not present:
+        return F64
+    if all(isinstance(v, bool) for v in present):
+        return BOOL
+    if all(isinstance(v, numbers.Integral) and not isinstance(v, bool) for v in present):
+        low, high = _INT64_RANGE
+        return I64 if all(low <= int(v) <= high for v in present) else JSON
+    if all(isinstance(v, numbers.Real) and not isinstance(v, bool) for v in present):
+        return F64
+    if all(isinstance(v, str) for v in present):
+        return STR
+    if all(isinstance(v, datetime) for v in present):
+        aware = {v.tzinfo is not None for v in present}
+        return (TIME_UTC if aware == {True} else TIME) if len(aware) == 1 else JSON
+    if all(_is_real_vector(v) for v in present):
+        return F64_ARRAY
+    return JSON
+
+
+def _is_real_vector(value: Any) -> bool:
+    if isinstance(value, (str, bytes, Mapping)) or not hasattr(value, "__len__"):
+        return False
+    try:
+        return all(isinstance(x, numbers.Real) and not isinstance(x, bool) for x in value)
+    except TypeError:
+        return False
+
+
+def infer_schema(samples: Sequence[Mapping[str, Any]]) -> Schema:
+    """Field names in order of first appearance, each with its column type"""
+    names: Dict[str, None] = {}
+    for sample in samples:
+        names.update(dict.fromkeys(sample))
+    return [(name, _column_type([s.get(name) for s in samples])) for name in names]
+
+
+def _schema_bytes(schema: Schema) -> bytes:
+    parts = []
+    for name, kind in schema:
+        encoded = name.encode("utf-8")
+        if len(encoded) > 255:
+            raise ValueError(f"field name too long: {name[:32]!r}...")
+        parts.append(struct.pack("<BB", kind, len(encoded)) + encoded)
+    return b"".join(parts)
+
+
+def schema_tag(schema: Schema) -> bytes:
+    """64-bit BLAKE2b tag identifying a schema"""
+    return hashlib.blake2b(_schema_bytes(schema), digest_size=8).digest()
+
+
+def _redact_nested(value: Any, redact: Redactor) -> Any:
+    if isinstance(value, str):
+        return redact(value)
+    if isinstance(value, Mapping):
+        return {k: _redact_nested(v, redact) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_redact_nested(v, redact) for v in value]
+    return value
+
+
+def _pack_strings(strings: Sequence[bytes]) -> bytes:
+    return struct.pack(f"<{len(strings)}I", *map(len, strings)) + b"".join(strings)
+
+
+def _encode_values(kind: int, values: List[Any], redact: Optional[Redactor]) -> bytes:
+    n = len(values)
+    if kind == F64:
+        return struct.pack(f"<{n}d", *(float("nan") if v is None else float(v) for v in values))
+    if kind == I64:
+        return struct.pack(f"<{n}q", *(0 if v is None else int(v) for v in values))
+    if kind == BOOL:
+        return bytes(bool(v) for v in values)
+    if kind in (TIME, TIME_UTC):
+        return struct.pack(f"<{n}q", *(0 if v is None else _to_micros(v) for v in values))
+    if kind == STR:
+        return _pack_strings([
+            b"" if v is None else (redact(v) if redact else v).encode("utf-8") for v in values
+        ])
+    if kind == F64_ARRAY:
+        vectors = [[] if v is None else [float(x) for x in v] for v in values]
+        flat = [x for vector in vectors for x in vector]
+        return struct.pack(f"<{n}I", *map(len, vectors)) + struct.pack(f"<{len(flat)}d", *flat)
+    return _pack_strings([
+        b"" if v is None else json.dumps(_redact_nested(v, redact) if redact else v, default=str).encode("utf-8")
+        for v in values
+    ])
+
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is None:
+        # Whole seconds through the local-time conversion, microseconds exactly
+        return int(value.replace(microsecond=0).timestamp()) * 1_000_000 + value.microsecond
+    return (value - _EPOCH_UTC) // timedelta(microseconds=1)
+
+
+def encode_batch(samples: Sequence[Mapping[str, Any]], redact: Optional[Redactor] = None,
+                 schema: Optional[Schema] = None) -> bytes:
+    """
+    Pack samples into one columnar message
+
+    Args:
+        samples: Dicts; fields missing from a sample are stored as nulls
+        redact: Applied to string values (STR columns and strings nested in
+            JSON columns) before they are written
+        schema: Explicit schema; inferred from the samples when omitted
+    """
+    schema = schema if schema is not None else infer_schema(samples)
+    n = len(samples)
+    parts = [HEADER.pack(MAGIC, WIRE_VERSION, 0, len(schema), n, schema_tag(schema)), _schema_bytes(schema)]
+    for name, kind in schema:
+        values = [s.get(name) for s in samples]
+        valid = [v is not None for v in values]
+        if all(valid):
+            parts.append(b"\x00")
+        else:
+            bitmap = bytearray((n + 7) // 8)
+            for i, ok in enumerate(valid):
+                if ok:
+                    bitmap[i >> 3] |= 1 << (i & 7)
+            parts.append(b"\x01" + bytes(bitmap))
+        parts.append(_encode_values(kind, values, redact))
+    return b"".join(parts)
+
+
+class _Reader:
+    def __init__(self, data: bytes) -> None:
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def take(self, size: int) -> memoryview:
+        if self.offset + size > len(self.data):
+            raise ValueError("truncated telemetry message")
+        chunk = self.data[self.offset:self.offset + size]
+        self.offset += size
+        return chunk
+
+    def unpack(self, fmt: str) -> Tuple[Any, ...]:
+        return struct.unpack(fmt, self.take(struct.calcsize(fmt)))
+
+    def strings(self, n: int) -> List[str]:
+        return [bytes(self.take(size)).decode("utf-8") for size in self.unpack(f"<{n}I")]
+
+
+def _decode_values(kind: int, n: int, reader: _Reader) -> List[Any]:
+    if kind == F64:
+        return list(reader.unpack(f"<{n}d"))
+    if kind == I64:
+        return list(reader.unpack(f"<{n}q"))
+    if kind == BOOL:
+        return [bool(b) for b in reader.take(n)]
+    if kind == TIME:
+        return [datetime.fromtimestamp(us // 1_000_000).replace(microsecond=us % 1_000_000)
+                for us in reader.unpack(f"<{n}q")]
+    if kind == TIME_UTC:
+        return [_EPOCH_UTC + timedelta(microseconds=us) for us in reader.unpack(f"<{n}q")]
+    if kind == STR:
+        return reader.strings(n)
+    if kind == F64_ARRAY:
+        lengths = reader.unpack(f"<{n}I")
+        flat = reader.unpack(f"<{sum(lengths)}d")
+        out, start = [], 0
+        for length in lengths:
+            out.append(list(flat[start:start + length]))
+            start += length
+        return out
+    if kind == JSON:
+        return [json.loads(s) if s else None for s in reader.strings(n)]
+    raise ValueError(f"unknown column type {kind}")
+
+
+def decode_schema(data: bytes) -> Tuple[Schema, int, bytes]:
+    """Schema, row count and schema tag of an encoded message"""
+    schema, rows, tag, _ = _decode_header(_Reader(data))
+    return schema, rows, tag
+
+
+def _decode_header(reader: _Reader) -> Tuple[Schema, int, bytes, _Reader]:
+    magic, version, _, columns, rows, tag = reader.unpack(HEADER.format)
+    if magic != MAGIC or version != WIRE_VERSION:
+        raise ValueError("not a L.I.F.E telemetry message")
+    schema: Schema = []
+    for _ in range(columns):
+        kind, length = reader.unpack("<BB")
+        schema.append((bytes(reader.take(length)).decode("utf-8"), kind))
+    if schema_tag(schema) != tag:
+        raise ValueError("schema tag mismatch")
+    return schema, rows, tag, reader
+
+
+def decode_batch(data: bytes) -> List[Dict[str, Any]]:
+    """Inverse of encode_batch; null fields are omitted from the samples"""
+    schema, rows, _, reader = _decode_header(_Reader(data))
+    samples: List[Dict[str, Any]] = [{} for _ in range(rows)]
+    for name, kind in schema:
+        valid = None
+        if reader.unpack("<B")[0]:
+            bitmap = reader.take((rows + 7) // 8)
+            valid = [bool(bitmap[i >> 3] >> (i & 7) & 1) for i in range(rows)]
+        for i, value in enumerate(_decode_values(kind, rows, reader)):
+            if valid is None or valid[i]:
+                samples[i][name] = value
+    if reader.offset != len(reader.data):
+        raise ValueError("trailing bytes after telemetry columns")
+    return samples
+
+
+# ----------------------------------------------------------------------
+# Long-lived batching client
+# ----------------------------------------------------------------------
+@dataclass
+class TelemetryMessage:
+    """Message stand-in with the attributes of azure.iot.device.Message"""
+
+    data: bytes
+    content_type: str = CONTENT_TYPE
+    custom_properties: Dict[str, str] = field(default_factory=dict)
+
+
+def build_message(payload: bytes, rows: int) -> Any:
+    """Wrap an encoded batch in an IoT Hub message (or TelemetryMessage without the SDK)"""
+    properties = {"schema": bytes(payload[HEADER.size - 8:HEADER.size]).hex(), "rows": str(rows)}
+    if AzureMessage is None:
+        return TelemetryMessage(payload, custom_properties=properties)
+    message = AzureMessage(payload)
+    message.content_type = CONTENT_TYPE
+    message.custom_properties.update(properties)
+    return message
+
+
+@dataclass
+class TelemetryStats:
+    samples_queued: int = 0
+    samples_sent: int = 0
+    samples_dropped: int = 0
+    messages_sent: int = 0
+    bytes_sent: int = 0
+    send_failures: int = 0
+
+    @property
+    def samples_per_message(self) -> float:
+        return self.samples_sent / self.messages_sent if self.messages_sent else 0.0
+
+
+_STOP = object()
+
+
+class TelemetryBatcher:
+    """
+    Send queue in front of one long-lived device client
+
+    send() only enqueues. A daemon thread drains the queue, packs samples
+    into columnar batches and calls ``client.send_message`` once per batch;
+    the client is connected once and reused until close(). Batchers still
+    open at interpreter exit are flushed and closed by close_telemetry_clients.
+
+    Args:
+        client: Object with send_message(message) and optionally connect()
+            and shutdown(), e.g. an IoTHubDeviceClient
+        max_batch: Samples per message
+        max_delay: Seconds a queued sample may wait for its batch to fill;
+            None sends only on a full batch, flush() or close()
+        redact: PII redactor applied to string values only
+        max_queue: Queued samples beyond this are dropped (and counted)
+        message_factory: Builds the message from (payload, rows)
+    """
+
+    def __init__(self, client: Any, max_batch: int = 64, max_delay: Optional[float] = 1.0,
+                 redact: Optional[Redactor] = None, max_queue: int = 10000,
+                 message_factory: Callable[[bytes, int], Any] = build_message) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.client = client
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.redact = redact
+        self.message_factory = message_factory
+        self.stats = TelemetryStats()
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        _live_batchers.add(self)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="life-iot-telemetry", daemon=True)
+                self._thread.start()
+
+    def send(self, sample: Mapping[str, Any]) -> bool:
+        """Queue one sample; False if the queue is full and the sample was dropped"""
+        if self._closed:
+            raise RuntimeError("telemetry client is closed")
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((time.monotonic(), dict(sample)))
+        except queue.Full:
+            self.stats.samples_dropped += 1
+            logger.warning("Telemetry queue full; sample dropped")
+            return False
+        self.stats.samples_queued += 1
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Send everything queued so far; True once it has been handed to the client"""
+        done = threading.Event()
+        with self._lock:
+            # After close() the sender thread is gone and close() already sent the queue
+            if self._thread is None or self._closed:
+                return True
+            self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, shutdown_client: bool = True, timeout: Optional[float] = 10.0) -> None:
+        """Send what is queued, stop the sender thread and shut the client down"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            if thread is not None:
+                self._queue.put(_STOP)
+        _live_batchers.discard(self)
+        if thread is not None:
+            thread.join(timeout)
+        if shutdown_client and hasattr(self.client, "shutdown"):
+            try:
+                self.client.shutdown()
+            except Exception as exc:
+                logger.warning("IoT client shutdown failed: %s", exc)
+
+    def _run(self) -> None:
+        if hasattr(self.client, "connect"):
+            try:
+                self.client.connect()
+            except Exception as exc:
+                # send_message connects on demand, so keep going
+                logger.warning("IoT client connect failed: %s", exc)
+        batch: List[Dict[str, Any]] = []
+        deadline = 0.0
+        while True:
+            timeout = None if not batch or self.max_delay is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                batch = self._send(batch)
+                continue
+            if item is _STOP:
+                self._send(batch)
+                return
+            if isinstance(item, threading.Event):
+                batch = self._send(batch)
+                item.set()
+                continue
+            queued_at, sample = item
+            if not batch and self.max_delay is not None:
+                deadline = queued_at + self.max_delay
+            batch.append(sample)
+            if len(batch) >= self.max_batch:
+                batch = self._send(batch)
+
+    def _send(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not batch:
+            return batch
+        try:
+            payload = encode_batch(batch, self.redact)
+            self.client.send_message(self.message_factory(payload, len(batch)))
+            self.stats.messages_sent += 1
+            self.stats.samples_sent += len(batch)
+            self.stats.bytes_sent += len(payload)
+        except Exception as exc:
+            self.stats.send_failures += 1
+            self.stats.samples_dropped += len(batch)
+            logger.error("Telemetry batch of %d samples failed: %s", len(batch), exc)
+        return []
+
+
+_clients: Dict[str, TelemetryBatcher] = {}
+_clients_lock = threading.Lock()
+# Every open batcher, shared or not, so interpreter exit flushes them all
+_live_batchers: "weakref.WeakSet[TelemetryBatcher]" = weakref.WeakSet()
+
+
+def get_telemetry_client(connection_string: str, client_factory: Optional[Callable[[str], Any]] = None,
+                         **options: Any) -> TelemetryBatcher:
+    """
+    Shared TelemetryBatcher for ``connection_string``
+
+    The device client is created on first use (by default with
+    IoTHubDeviceClient.create_from_connection_string) and kept until
+    release_telemetry_client() or interpreter exit. ``options`` only apply
+    when the batcher is created.
+    """
+    with _clients_lock:
+        batcher = _clients.get(connection_string)
+        if batcher is None or batcher.closed:
+            if client_factory is None:
+                if IoTHubDeviceClient is None:
+                    raise RuntimeError("IoT Hub SDK unavailable")
+                client_factory = IoTHubDeviceClient.create_from_connection_string
+            batcher = TelemetryBatcher(client_factory(connection_string), **options)
+            _clients[connection_string] = batcher
+        return batcher
+
+
+def release_telemetry_client(connection_string: str) -> None:
+    with _clients_lock:
+        batcher = _clients.pop(connection_string, None)
+    if batcher is not None:
+        batcher.close()
+
+
+def close_telemetry_clients() -> None:
+    """Flush and close every shared client and any other open batcher"""
+    with _clients_lock:
+        batchers = list(_clients.values())
+        _clients.clear()
+    for batcher in batchers + list(_live_batchers):
+        batcher.close()
+
+
+atexit.register(close_telemetry_clients)
+
+
+# ----------------------------------------------------------------------
+# In-process stand-in broker
+# ----------------------------------------------------------------------
+def parse_connection_string(connection_string: str) -> Dict[str, str]:
+    """'HostName=h;DeviceId=d;SharedAccessKey=k' -> {"HostName": "h", ...}"""
+    parts = (item.partition("=") for item in connection_string.split(";") if item)
+    return {key.strip(): value for key, _, value in parts}
+
+
+def topic_matches(topic_filter: str, topic: str) -> bool:
+    """MQTT topic filter match with '+' (one level) and '#' (rest) wildcards"""
+    filter_levels, levels = topic_filter.split("/"), topic.split("/")
+    for i, part in enumerate(filter_levels):
+        if part == "#":
+            return True
+        if i >= len(levels) or part not in ("+", levels[i]):
+            return False
+    return len(filter_levels) == len(levels)
+
+
+@dataclass
+class BrokerMessage:
+    client_id: str
+    topic: str
+    payload: bytes
+    properties: Dict[str, str]
+
+
+class StandInBroker:
+    """
+    In-process MQTT-style broker that records every publish
+
+    Device clients from client_factory() publish device-to-cloud messages
+    on the IoT Hub MQTT topic ``devices/<DeviceId>/messages/events/``.
+    """
+
+    def __init__(self) -> None:
+        self.messages: List[BrokerMessage] = []
+        self.connections = 0
+        self._subscriptions: List[Tuple[str, Callable[[BrokerMessage], None]]] = []
+        self._lock = threading.Lock()
+
+    def connect(self, client_id: str) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def subscribe(self, topic_filter: str, callback: Callable[[BrokerMessage], None]) -> None:
+        with self._lock:
+            self._subscriptions.append((topic_filter, callback))
+
+    def publish(self, topic: str, payload: bytes, properties: Optional[Dict[str, str]] = None,
+                client_id: str = "") -> None:
+        message = BrokerMessage(client_id, topic, bytes(payload), dict(properties or {}))
+        with self._lock:
+            self.messages.append(message)
+            callbacks = [cb for f, cb in self._subscriptions if topic_matches(f, topic)]
+        for callback in callbacks:
+            callback(message)
+
+    def received(self, topic_filter: str = "#") -> List[BrokerMessage]:
+        with self._lock:
+            return [m for m in self.messages if topic_matches(topic_filter, m.topic)]
+
+    def samples(self, topic_filter: str = "#") -> List[Dict[str, Any]]:
+        """Decode every recorded telemetry batch back into samples"""
+        return [s for m in self.received(topic_filter) for s in decode_batch(m.payload)]
+
+    def client_factory(self) -> Callable[[str], "StandInDeviceClient"]:
+        """Drop-in for IoTHubDeviceClient.create_from_connection_string"""
+        return lambda connection_string: StandInDeviceClient(self, connection_string)
+
+
+class StandInDeviceClient:
+    """IoTHubDeviceClient look-alike publishing to a StandInBroker"""
+
+    def __init__(self, broker: StandInBroker, connection_string: str) -> None:
+        self.broker = broker
+        self.device_id = parse_connection_string(connection_string).get("DeviceId", "device")
+        self.connected = False
+        self.shutdowns = 0
+
+    def connect(self) -> None:
+        if not self.connected:
+            self.broker.connect(self.device_id)
+            self.connected = True
+
+    def send_message(self, message: Any) -> None:
+        self.connect()
+        data = getattr(message, "data", message)
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        properties = dict(getattr(message, "custom_properties", None) or {})
+        if getattr(message, "content_type", None):
+            properties["$.ct"] = message.content_type
+        self.broker.publish(f"devices/{self.device_id}/messages/events/", data, properties, self.device_id)
+
+    def shutdown(self) -> None:
+        self.connected = False
+        self.shutdowns += 1
@@ -16,9 +16,10 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional
 
 try:  # Optional third-party dependencies
     import requests
@@ -49,6 +50,11 @@ except Exception:  # pragma: no cover
 
 # Azure ML pipeline & RL imports are loaded lazily inside methods to avoid hard failures
 
+from circuit_breaker import BreakerConfig, BreakerRegistry, CircuitBreaker
+from code_fetch_cache import ContentCache, fetch_all
+from iot_telemetry import TelemetryBatcher, get_telemetry_client, release_telemetry_client
+from vr_adaptation_bus import ENVIRONMENT_FLAGS, KIND_COMPLEXITY
+
 try:
     from life_algorithm_section8_integration import (
         AZURE_AVAILABLE,
@@ -119,30 +125,26 @@ class AdaptiveIIR:
         return variance / mean_val
 
 
-class EdgeCircuitBreaker:
-    """Circuit breaker for hybrid edge/cloud inference pipelines"""
-
-    def __init__(self) -> None:
-        self.failure_count = 0
-        self.threshold = 5
-        self.open_state_until: Optional[datetime] = None
+# Edge defaults: the old breaker tripped after 5 failures and cooled down for 10 s
+EDGE_BREAKER_CONFIG = BreakerConfig(
+    window_seconds=30.0,
+    buckets=10,
+    minimum_calls=5,
+    failure_rate_threshold=0.5,
+    slow_call_seconds=0.5,
+    slow_call_rate_threshold=0.8,
+    open_seconds=10.0,
+    max_open_seconds=300.0,
+    half_open_max_probes=2,
+)
 
-    def record_success(self) -> None:
-        self.failure_count = max(0, self.failure_count - 1)
-        if self.failure_count == 0:
-            self.open_state_until = None
 
-    def record_failure(self) -> None:
-        self.failure_count += 1
-        if self.failure_count >= self.threshold:
-            self.open_state_until = datetime.utcnow()
-            logger.warning("Edge circuit breaker opened due to repeated failures")
+class EdgeCircuitBreaker(CircuitBreaker):
+    """Circuit breaker for hybrid edge/cloud inference pipelines"""
 
-    def allow_request(self) -> bool:
-        if self.open_state_until is None:
-            return True
-        # Simple 10 second cooldown before allowing retries
-        return (datetime.utcnow() - self.open_state_until).total_seconds() > 10
+    def __init__(self, config: Optional[BreakerConfig] = None, clock: Callable[[], float] = time.monotonic,
+                 name: str = "edge") -> None:
+        super().__init__(config or EDGE_BREAKER_CONFIG, clock, name)
 
 
 class LIFEAlgorithmSection10(LIFEAlgorithm):
@@ -155,7 +157,15 @@ class LIFEAlgorithmSection10(LIFEAlgorithm):
         self.default_credential: Optional[_DefaultAzureCredential] = None
         self.eventhub_consumer: Optional[_EventHubConsumerClient] = None
         self.edge_filter = AdaptiveIIR()
-        self.circuit_breaker = EdgeCircuitBreaker()
+        # One breaker per edge device, so a single failing device cannot cut off the rest
+        breaker_config = self.config.get("edge_breaker")
+        self.circuit_breakers = BreakerRegistry(
+            BreakerConfig(**breaker_config) if breaker_config else EDGE_BREAKER_CONFIG,
+            breaker_class=EdgeCircuitBreaker,
+        )
+        self.circuit_breaker = self.circuit_breakers.get("edge")
+        self.eeg_stream: Optional[TelemetryBatcher] = None
+        self.code_cache: Optional[ContentCache] = None
 
         if AZURE_SECTION10_AVAILABLE and DefaultAzureCredential:
             try:
@@ -179,15 +189,90 @@ class LIFEAlgorithmSection10(LIFEAlgorithm):
             logger.error("GitHub analysis failed: %s", exc)
             return None
 
+    async def analyze_code_urls(self, urls: List[str], concurrency: Optional[int] = None,
+                                transport: Any = None) -> Dict[str, Any]:
+        """
+        Fetch and analyze many code files concurrently
+
+        Requests revalidate with ETags and at most ``concurrency`` (config
+        code_fetch_concurrency, default 8) are in flight. Trait records are
+        cached on disk by content hash (config code_cache_dir), so an
+        unchanged file is neither re-downloaded nor re-analyzed. New files go
+        through the learning cycle together, with a single model update.
+        """
+        if not self.consent_manager.request_consent("eeg_processing", "Process learning data"):
+            logger.warning("User consent not granted for experience processing")
+            return {"files": [], "life_score": 0.0, "analyzed": 0, "reused": 0, "errors": 0}
+        if self.code_cache is None:
+            self.code_cache = ContentCache(self.config.get("code_cache_dir", "cache/code_analysis"))
+        cache = self.code_cache
+        limit = concurrency or int(self.config.get("code_fetch_concurrency", 8))
+        fetched = await fetch_all(urls, cache, transport=transport, concurrency=limit)
+
+        files: List[Dict[str, Any]] = []
+        new_traits: List[Dict[str, Any]] = []
+        new_docstrings: List[str] = []
+        for result in fetched:
+            if result.status == "error":
+                files.append({"url": result.url, "status": "error", "error": result.error})
+                continue
+            record = cache.load_record(result.sha256)
+            status = "not_modified" if result.status == "not_modified" else "cached"
+            if record is None:
+                anonymized = self.gdpr_anonymizer.anonymize(result.body.decode("utf-8", errors="replace"))
+                extracted = self._extract_traits(anonymized)
+                record = {"traits": None, "docstrings": 0}
+                if extracted is not None:
+                    record = {"traits": extracted[0], "docstrings": len(extracted[1])}
+                    new_traits.append(extracted[0])
+                    new_docstrings.extend(extracted[1])
+                cache.save_record(result.sha256, record)
+                self.experiences.append(anonymized)
+                status = "analyzed"
+            traits = record["traits"]
+            files.append({
+                "url": result.url,
+                "status": status,
+                "sha256": result.sha256,
+                "traits": traits,
+                "life_score": self._life_score([traits]) if traits else 0.0,
+            })
+
+        self.abstract_conceptualization(new_traits, new_docstrings)
+        scored = [f["traits"] for f in files if f.get("traits")]
+        summary = {
+            "files": files,
+            "life_score": self._life_score(scored),
+            "analyzed": sum(f["status"] == "analyzed" for f in files),
+            "reused": sum(f["status"] in ("cached", "not_modified") for f in files),
+            "errors": sum(f["status"] == "error" for f in files),
+        }
+        logger.info("Analyzed %d code files (%d new, %d reused, %d failed)",
+                    len(files), summary["analyzed"], summary["reused"], summary["errors"])
+        return summary
+
     def visualize_complexity_in_vr(self, complexity_scores: List[float]) -> List[Dict[str, Any]]:
-        """Generate VR-ready visualization payloads"""
+        """Generate VR-ready visualization payloads
+
+        With the VR bus running each file is also a bus slot, so a rescored
+        file replaces its unsent state instead of queueing behind it.
+        """
         visualization_payload = []
+        bus = self.vr_bus
         for index, score in enumerate(complexity_scores, start=1):
+            action = "increase" if score < 0.5 else "stabilize"
             visualization_payload.append({
                 "sequence": index,
                 "complexity": float(score),
-                "recommended_action": "increase" if score < 0.5 else "stabilize",
+                "recommended_action": action,
             })
+            if bus is not None:
+                bus.publish(
+                    f"complexity:{index}",
+                    value=float(score),
+                    flags=ENVIRONMENT_FLAGS["increase_complexity" if action == "increase" else "stabilize"],
+                    kind=KIND_COMPLEXITY,
+                )
             logger.debug("VR visualization packet generated for file %s (score %.3f)", index, score)
         return visualization_payload
 
@@ -250,23 +335,53 @@ class LIFEAlgorithmSection10(LIFEAlgorithm):
     # Real-time streaming (IoT Hub and Event Hub)
     # ------------------------------------------------------------------
     def stream_eeg_to_hub(self, eeg_payload: Dict[str, Any]) -> bool:
-        if not AZURE_SECTION10_AVAILABLE or IoTHubDeviceClient is None:
-            logger.warning("IoT Hub SDK unavailable; skipping stream")
-            return False
+        """
+        Queue an EEG payload for IoT Hub
+
+        Payloads go through one long-lived device client per connection
+        string and are sent in columnar batches (config iot_batch_size,
+        default 64, and iot_batch_delay_s, default 1.0). Config
+        iot_client_factory replaces IoTHubDeviceClient.create_from_connection_string.
+        """
         connection_string = self.config.get("iot_hub_connection_string")
         if not connection_string:
             logger.warning("IoT Hub connection string missing")
             return False
+        client_factory = self.config.get("iot_client_factory")
+        if client_factory is None and (not AZURE_SECTION10_AVAILABLE or IoTHubDeviceClient is None):
+            logger.warning("IoT Hub SDK unavailable; skipping stream")
+            return False
         try:
-            client = IoTHubDeviceClient.create_from_connection_string(connection_string)
-            client.send_message(json.dumps(eeg_payload))
-            client.shutdown()
-            logger.debug("EEG payload streamed to IoT Hub")
-            return True
+            sender = self._iot_sender(connection_string, client_factory)
+            queued = sender.send(eeg_payload)
+            logger.debug("EEG payload queued for IoT Hub")
+            return queued
         except Exception as exc:
             logger.error("IoT Hub streaming failed: %s", exc)
             return False
 
+    def _iot_sender(self, connection_string: str, client_factory: Any) -> TelemetryBatcher:
+        if self.eeg_stream is None or self.eeg_stream.closed:
+            self.eeg_stream = get_telemetry_client(
+                connection_string,
+                client_factory,
+                max_batch=int(self.config.get("iot_batch_size", 64)),
+                max_delay=float(self.config.get("iot_batch_delay_s", 1.0)),
+                redact=self.gdpr_anonymizer.anonymize,
+            )
+        return self.eeg_stream
+
+    def flush_eeg_stream(self, timeout: Optional[float] = None) -> bool:
+        """Send every queued EEG payload now"""
+        return self.eeg_stream.flush(timeout) if self.eeg_stream is not None else True
+
+    def close_eeg_stream(self) -> None:
+        """Flush queued payloads and shut the shared IoT Hub client down"""
+        self.eeg_stream = None
+        connection_string = self.config.get("iot_hub_connection_string")
+        if connection_string:
+            release_telemetry_client(connection_string)
+
     async def consume_eventhub_stream(self, consumer_group: str = "$Default") -> None:
         if not AZURE_SECTION10_AVAILABLE or EventHubConsumerClient is None:
             logger.warning("Event Hub SDK unavailable; cannot consume stream")
@@ -361,7 +476,22 @@ class LIFEAlgorithmSection10(LIFEAlgorithm):
             logger.warning("RL experiment submission failed: %s", exc)
             return None
 
-    def export_model_to_mobile(self, model_name: str, dummy_input: Optional[List[float]] = None) -> Optional[str]:
+    def export_model_to_mobile(self, model_name: str, dummy_input: Optional[List[float]] = None,
+                               model: Any = None) -> Optional[str]:
+        """
+        Export a model for on-device inference
+
+        Local models (``model`` or self.models[model_name]) are exported with
+        the verified ONNX exporter and an int8 copy, whose path is returned.
+        Otherwise the scripted model is downloaded from the Azure registry.
+        """
+        local_model = model if model is not None else self.models.get(model_name)
+        if local_model is not None:
+            sample_inputs = [np.asarray([dummy_input], dtype=float)] if dummy_input and NUMPY_AVAILABLE else None
+            path = self.export_model_to_onnx(f"{model_name}_mobile", model=local_model,
+                                             sample_inputs=sample_inputs, quantize=True)
+            result = self.onnx_exports.get(f"{model_name}_mobile")
+            return result.quantized_path if path and result and result.quantized_path else path
         if not NUMPY_AVAILABLE:
             logger.warning("NumPy unavailable; cannot build dummy input for ONNX export")
             return None
@@ -389,12 +519,13 @@ class LIFEAlgorithmSection10(LIFEAlgorithm):
     # Edge telemetry ingestion and adaptive fallback
     # ------------------------------------------------------------------
     def process_edge_telemetry(self, telemetry: EdgeDeviceTelemetry) -> Dict[str, Any]:
-        if not self.circuit_breaker.allow_request():
-            logger.warning("Circuit breaker open; skipping edge telemetry processing")
-            return {"status": "circuit-open"}
+        breaker = self.circuit_breakers.get(telemetry.device_id)
+        if not breaker.allow_request():
+            logger.warning("Circuit breaker open for %s; skipping edge telemetry processing", telemetry.device_id)
+            return {"status": "circuit-open", "device_id": telemetry.device_id}
         try:
-            filter_result = self.edge_filter.update(telemetry.eeg_metrics.values())
-            self.circuit_breaker.record_success()
+            with breaker.guard():
+                filter_result = self.edge_filter.update(telemetry.eeg_metrics.values())
             return {
                 "status": "processed",
                 "device_id": telemetry.device_id,
@@ -403,7 +534,6 @@ class LIFEAlgorithmSection10(LIFEAlgorithm):
                 "stress_level": telemetry.stress_level,
             }
         except Exception as exc:
-            self.circuit_breaker.record_failure()
             logger.error("Edge telemetry processing failed: %s", exc)
             return {"status": "failed", "error": str(exc)}
 
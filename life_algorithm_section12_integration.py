@@ -31,6 +31,7 @@ import logging
 import math
 import statistics
 import uuid
+from collections import deque
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from typing import (
@@ -78,6 +79,21 @@ except Exception:  # pragma: no cover
     Web3 = None  # type: ignore[assignment]
     WEB3_AVAILABLE = False
 
+from merkle_ledger import MerkleBatchMinter, default_ledger_path  # noqa: E402
+
+try:  # Local QUBO annealer (needs NumPy)
+    from qubo_annealer import (  # noqa: E402
+        SimulatedAnnealing as LocalAnnealer,
+        correlation_redundancy,
+        feature_selection_problem,
+        solve_selection,
+    )
+
+    QUBO_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    LocalAnnealer = None  # type: ignore[assignment]
+    QUBO_AVAILABLE = False
+
 try:
     from life_algorithm_section11_integration import (  # type: ignore[import]
         GuardrailDecision,
@@ -190,14 +206,22 @@ class FederatedAggregationReport:
 
 
 class BlockchainReporter:
-    """Lightweight blockchain / NFT recorder with graceful degradation."""
+    """Lightweight blockchain / NFT recorder with graceful degradation.
+
+    Records are batched by a MerkleBatchMinter into an append-only local
+    ledger (config ``ledger_path``, ``batch_size``, ``max_delay_s``); with a
+    Web3 endpoint only each batch root would be anchored on chain. The
+    ledger is the record of truth; ``records`` only keeps the most recent
+    ``recent_records`` mints for inspection.
+    """
 
     def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
         self.config = config or {}
         self.enabled = bool(self.config.get("enabled", False))
         self.ledger_name = self.config.get("ledger_name", "life-ledger")
-        self.records: List[Dict[str, Any]] = []
+        self.records: deque = deque(maxlen=int(self.config.get("recent_records", 64)))
         self._web3: Optional[Any] = None
+        self.minter: Optional[MerkleBatchMinter] = None
         if self.enabled and WEB3_AVAILABLE and Web3 is not None:
             endpoint = self.config.get("endpoint")
             if endpoint:
@@ -209,27 +233,63 @@ class BlockchainReporter:
                 except Exception as exc:  # pragma: no cover
                     logger.warning("Blockchain init failed: %s", exc)
                     self.enabled = False
+        if self.enabled:
+            ledger_path = self.config.get("ledger_path") or default_ledger_path(f"{self.ledger_name}.jsonl")
+            self.minter = MerkleBatchMinter(
+                ledger_path,
+                batch_size=int(self.config.get("batch_size", 256)),
+                max_delay=self.config.get("max_delay_s", 1.0),
+                on_commit=self._anchor_root,
+            )
+
+    def _anchor_root(self, batch: Dict[str, Any]) -> None:
+        # In production this would submit batch["root"] to a smart contract.
+        logger.info(
+            "Blockchain batch %d anchored on %s: %d records, root %s",
+            batch["batch"],
+            self.ledger_name,
+            batch["size"],
+            batch["root"],
+        )
 
     async def mint_learning_record(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        if not self.enabled:
+        if not self.enabled or self.minter is None:
             return {"status": "disabled"}
         record = dict(payload)
-        record["token_id"] = payload.get("token_id") or f"LIFE-NFT-{len(self.records) + 1:06d}"
+        record["token_id"] = payload.get("token_id") or f"LIFE-NFT-{self.minter.next_sequence:06d}"
         record["ledger"] = self.ledger_name
         record["timestamp"] = datetime.utcnow().isoformat()
-        # In production this would submit to a smart contract.
+        receipt = self.minter.submit(record)
         self.records.append(record)
-        logger.info("Blockchain mint recorded: %s", record["token_id"])
-        return {"status": "minted", "token_id": record["token_id"], "ledger": self.ledger_name}
+        logger.debug("Blockchain mint queued: %s", record["token_id"])
+        return {
+            "status": "minted",
+            "token_id": record["token_id"],
+            "ledger": self.ledger_name,
+            "batch": receipt["batch"],
+            "batch_status": receipt["status"],
+            "leaf_hash": receipt["leaf"],
+        }
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """Commit pending records now (e.g. at shutdown)"""
+        return self.minter.flush() if self.minter is not None else None
+
+    def proof_for(self, token_id: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], str]]:
+        """(record, proof, root) for a committed token, for use with merkle_ledger.verify"""
+        return self.minter.ledger.lookup(token_id) if self.minter is not None else None
 
 
 class QuantumFeatureSelector:
-    """Azure Quantum hook with deterministic fallback."""
+    """Azure Quantum hook with a local simulated-annealing QUBO fallback."""
 
     def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
         self.config = config or {}
         self.enabled = bool(self.config.get("enabled", False))
         self.max_features = int(self.config.get("max_features", 8))
+        # Recent feature vectors; their correlations are the redundancy term
+        self.history: deque = deque(maxlen=int(self.config.get("history", 64)))
+        self.seed = self.config.get("seed", 0)
 
     async def select_features(self, features: Sequence[float]) -> Dict[str, Any]:
         if not self.enabled:
@@ -257,8 +317,22 @@ class QuantumFeatureSelector:
             return self._fallback_selection(features)
 
     def _fallback_selection(self, features: Sequence[float]) -> Dict[str, Any]:
-        ranked = sorted(enumerate(features), key=lambda item: item[1], reverse=True)
-        selected = [idx for idx, _ in ranked[: self.max_features]]
+        values = [float(v) if math.isfinite(float(v)) else 0.0 for v in features]
+        if not QUBO_AVAILABLE or not values:
+            ranked = sorted(enumerate(values), key=lambda item: item[1], reverse=True)
+            selected = [idx for idx, _ in ranked[: self.max_features]]
+        else:
+            if self.history and len(self.history[-1]) != len(values):
+                self.history.clear()
+            self.history.append(values)
+            redundancy = None
+            if len(self.history) >= 3:
+                redundancy = correlation_redundancy(np.asarray(self.history).T)
+            problem = feature_selection_problem(
+                values, redundancy, k=min(self.max_features, len(values)), name="life_feature_selection"
+            )
+            solver = LocalAnnealer(sweeps=100, replicas=8, seed=self.seed)
+            selected = solve_selection(problem, values, solver)
         return {
             "status": "fallback",
             "selected_indices": selected,
@@ -22,14 +22,21 @@ import ast
 import asyncio
 import json
 import logging
+import os
 import uuid
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-import joblib
 import numpy as np
 import requests
 
+from feature_ranking import rank_windows_by_variance
+from model_registry import BackgroundTrainer, ModelRef, ModelStore, ModelVersion, OnlineLearner
+from onnx_export import ExportResult, export_sklearn_model
+from vr_adaptation_bus import DEFAULT_PORT as VR_BUS_PORT
+from vr_adaptation_bus import KIND_ADAPTATION, VRAdaptationBus
+from qubo_annealer import correlation_redundancy, feature_selection_problem, solve_selection
+
 # Core Azure and ML imports
 try:
     from azure.blockchain import BlockchainMember
@@ -75,12 +82,9 @@ except ImportError:
 
 # Machine learning imports
 try:
-    import pandas as pd
-    import scikit_learn
-    import tensorflow as tf
     from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import SGDClassifier
     from sklearn.model_selection import train_test_split
-    from sklearn.preprocessing import StandardScaler
     ML_AVAILABLE = True
 except ImportError:
     logging.warning("Section 4: ML libraries not available - using simplified models")
@@ -93,6 +97,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Stress levels predicted by the stress classification models
+STRESS_CLASSES = (0, 1, 2)
+DEFAULT_MODEL_DIR = os.path.join("models", "section4")
+
+
+def fit_stress_classifier(X: Any, y: Any, n_estimators: int = 100, random_state: int = 42) -> Any:
+    """
+    Full stress-classifier retrain; top-level so it can run in a worker process
+    
+    Holds out 20% of the data and records the held-out accuracy on the model.
+    """
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=random_state)
+    model = RandomForestClassifier(n_estimators=n_estimators, random_state=random_state)
+    model.fit(X_train, y_train)
+    model.holdout_accuracy_ = float(model.score(X_test, y_test))
+    return model
+
 def calculate_self_development(learning, individual, experience):
     """
     Section 4 enhanced self-development calculation with error handling
@@ -207,7 +228,7 @@ class LIFEAlgorithmSection4:
     Combines all previous sections with advanced GDPR, quantum, and pilot features
     """
     
-    def __init__(self):
+    def __init__(self, model_dir: Optional[str] = None):
         """Initialize Section 4 L.I.F.E Algorithm with enhanced capabilities"""
         self.version = "Section4-Ultimate-v1.0"
         self.consent_manager = ConsentManager()
@@ -217,12 +238,23 @@ class LIFEAlgorithmSection4:
         self.models = {"complexity": None, "quality": None, "stress_classification": None}
         self.trait_weights = {"functions": 0.8, "comments": 0.6, "neural_adaptation": 0.9}
         
+        # Stress models: full retrains run in a worker process and are swapped in
+        # through stress_model; online updates go to an incremental learner
+        self.model_store = ModelStore(model_dir or os.environ.get("LIFE_MODEL_DIR", DEFAULT_MODEL_DIR))
+        self.stress_model = ModelRef(self._load_published_model())
+        self.model_trainer = BackgroundTrainer(self.model_store, self.stress_model)
+        self.online_stress_model = (
+            OnlineLearner(SGDClassifier(loss="log_loss", random_state=42), STRESS_CLASSES)
+            if ML_AVAILABLE else None
+        )
+        
         # Section 4 specific components
         self.blockchain_member = None
         self.azure_ml_workspace = None
         self.quantum_workspace = None
         self.event_hub_clients = {}
         self.real_time_processing = False
+        self.vr_bus: Optional[VRAdaptationBus] = None
         
         # Performance tracking
         self.processing_stats = {
@@ -478,6 +510,14 @@ class LIFEAlgorithmSection4:
             focus_level = self._calculate_focus_level(eeg_data)
             stress_level = self._calculate_stress_level(eeg_data)
             
+            if self.vr_bus is not None:
+                # Latest-wins per user; the bus sends it with the next VR frame
+                self.vr_bus.publish(
+                    eeg_data.get("user_id", "anonymous"), focus_level, stress_level, kind=KIND_ADAPTATION
+                )
+                self.processing_stats["vr_adaptations_sent"] += 1
+                return True
+            
             # Create VR adaptation message
             vr_message = {
                 "focus": focus_level,
@@ -501,6 +541,26 @@ class LIFEAlgorithmSection4:
             logger.error(f"VR adaptation error: {e}")
             return False
     
+    async def start_vr_bus(self, host: str = "127.0.0.1", port: int = VR_BUS_PORT,
+                           rate_hz: float = 90.0) -> VRAdaptationBus:
+        """
+        Section 4: Stream VR adaptations over the coalescing UDP bus
+        
+        Once started, send_vr_adaptation only queues the newest state per user
+        and a frame-paced flusher delivers it at ``rate_hz`` (72/90 Hz).
+        """
+        if self.vr_bus is None:
+            self.vr_bus = await VRAdaptationBus.connect(host, port, rate_hz=rate_hz)
+            self.vr_bus.start()
+            logger.info(f"VR adaptation bus streaming to {host}:{port} at {rate_hz:g} Hz")
+        return self.vr_bus
+    
+    async def stop_vr_bus(self) -> None:
+        """Flush pending VR states and close the bus"""
+        bus, self.vr_bus = self.vr_bus, None
+        if bus is not None:
+            await bus.stop()
+    
     async def _send_to_unity_vr(self, vr_message: Dict[str, Any]) -> bool:
         """Send message to Unity VR controller"""
         try:
@@ -638,47 +698,157 @@ class LIFEAlgorithmSection4:
             logger.error(f"Model training error: {e}")
             return None
     
+    def _load_published_model(self) -> Optional[ModelVersion]:
+        """Serve the last published local model, if any, until the next retrain"""
+        try:
+            return self.model_store.load_current()
+        except Exception as e:
+            logger.warning(f"Published model could not be loaded: {e}")
+            return None
+    
+    def _stress_training_data(self, dataset: Any) -> Tuple[Any, Any]:
+        # Generate sample data if none provided
+        if dataset is None:
+            X = np.random.randn(1000, 10)
+            y = np.random.randint(0, len(STRESS_CLASSES), 1000)
+            return X, y
+        return dataset.iloc[:, :-1], dataset.iloc[:, -1]
+    
+    def _submit_stress_retrain(self, dataset: Any, **fit_kwargs: Any):
+        """Start a background retrain; the new model is swapped in when it finishes"""
+        X, y = self._stress_training_data(dataset)
+        future = self.model_trainer.submit(
+            fit_stress_classifier, X, y, metadata={"samples": len(y)}, **fit_kwargs
+        )
+        future.add_done_callback(self._on_stress_model_installed)
+        return future
+    
+    def _on_stress_model_installed(self, future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        installed = future.result()
+        self.models["stress_classification"] = {
+            "model": installed.model,
+            "model_path": installed.path,
+            "version": installed.version,
+            "training_date": installed.metadata.get("trained_at"),
+        }
+    
+    async def retrain_stress_model(self, dataset: Any = None, **fit_kwargs: Any) -> Optional[str]:
+        """
+        Section 4: Retrain the stress classifier without blocking the event loop
+        
+        Training runs in a worker process; predictions keep using the current
+        model until the new version is stored and swapped in.
+        
+        Returns:
+            local:// URI of the new content-addressed model, or None on failure
+        """
+        if not ML_AVAILABLE:
+            logger.warning("ML libraries not available - using mock model")
+            return "mock://local_model"
+        try:
+            installed = await asyncio.wrap_future(self._submit_stress_retrain(dataset, **fit_kwargs))
+            logger.info(f"Stress model {installed.version} trained in background")
+            return f"local://{installed.path}"
+        except Exception as e:
+            logger.error(f"Background model training error: {e}")
+            return None
+    
     def _train_local_model(self, dataset: Any) -> str:
-        """Fallback local model training"""
+        """
+        Fallback local model training
+        
+        Inside a running event loop the retrain is only scheduled (returns a
+        pending:// URI) so the loop is never blocked; otherwise waits for it.
+        """
         try:
             logger.info("Training local fallback model")
             
-            # Simulate local model training
-            if ML_AVAILABLE:
-                # Simple RandomForest model
-                model = RandomForestClassifier(n_estimators=100, random_state=42)
-                
-                # Generate sample data if none provided
-                if dataset is None:
-                    X = np.random.randn(1000, 10)
-                    y = np.random.randint(0, 3, 1000)  # 3 stress levels
-                else:
-                    X, y = dataset.iloc[:, :-1], dataset.iloc[:, -1]
-                
-                # Train model
-                X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2)
-                model.fit(X_train, y_train)
-                
-                # Save model
-                model_path = "local_stress_model.joblib"
-                joblib.dump(model, model_path)
-                
-                self.models["stress_classification"] = {
-                    "model": model,
-                    "model_path": model_path,
-                    "training_date": datetime.now().isoformat()
-                }
-                
-                logger.info("Local model trained successfully")
-                return f"local://{model_path}"
-            else:
+            if not ML_AVAILABLE:
                 logger.warning("ML libraries not available - using mock model")
                 return "mock://local_model"
+            
+            future = self._submit_stress_retrain(dataset)
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                installed = future.result()
+                logger.info("Local model trained successfully")
+                return f"local://{installed.path}"
+            return f"pending://{self.model_store.root}"
                 
         except Exception as e:
             logger.error(f"Local model training error: {e}")
             return None
     
+    def update_stress_model(self, X: Any, y: Any) -> int:
+        """
+        Section 4: Continuous update of the incremental stress learner
+        
+        Cheap enough to call per batch between full retrains; returns the
+        number of updates applied so far.
+        """
+        if self.online_stress_model is None:
+            return 0
+        self.online_stress_model.partial_fit(np.asarray(X, dtype=float), np.asarray(y))
+        return self.online_stress_model.updates
+    
+    def predict_stress(self, features: Any) -> Optional[Dict[str, Any]]:
+        """
+        Section 4: Stress-level prediction from the current model snapshot
+        
+        The full model and the online learner are each read once, so a
+        retrain finishing mid-call cannot mix two versions. When both are
+        available their class probabilities are averaged.
+        """
+        snapshot = self.stress_model.get()
+        online = self.online_stress_model
+        online_model = online.estimator if online is not None and online.fitted else None
+        if snapshot is None and online_model is None:
+            return None
+        
+        X = np.atleast_2d(np.asarray(features, dtype=float))
+        probabilities = []
+        for model in (snapshot.model if snapshot else None, online_model):
+            if model is None:
+                continue
+            proba = np.zeros((len(X), len(STRESS_CLASSES)))
+            proba[:, [STRESS_CLASSES.index(c) for c in model.classes_]] = model.predict_proba(X)
+            probabilities.append(proba)
+        proba = np.mean(probabilities, axis=0)
+        
+        self.processing_stats["ml_predictions"] += len(X)
+        return {
+            "predictions": [STRESS_CLASSES[i] for i in proba.argmax(axis=1)],
+            "probabilities": proba.tolist(),
+            "model_version": snapshot.version if snapshot else None,
+            "online_updates": online.updates if online_model is not None else 0,
+        }
+    
+    def export_stress_model_to_onnx(self, path: Optional[str] = None, quantize: bool = False) -> Optional[ExportResult]:
+        """
+        Section 4: Export the serving stress classifier to ONNX
+        
+        Defaults to <model_dir>/onnx/<version>.onnx, outside the immutable
+        version directories. Returns None when no full model is installed or
+        the ONNX toolchain is missing.
+        """
+        snapshot = self.stress_model.get()
+        if snapshot is None:
+            logger.warning("No stress model installed; nothing to export")
+            return None
+        target = path or str(self.model_store.root / "onnx" / f"{snapshot.version}.onnx")
+        try:
+            return export_sklearn_model(snapshot.model, target, quantize=quantize)
+        except Exception as e:
+            logger.error(f"Stress model ONNX export failed: {e}")
+            return None
+    
+    def shutdown_model_training(self, wait: bool = True) -> None:
+        """Stop the background training worker"""
+        self.model_trainer.shutdown(wait=wait)
+    
     async def quantum_optimize_eeg_features(self, eeg_data: Dict[str, Any]) -> Optional[List[int]]:
         """
         Section 4: Quantum-optimized EEG feature selection
@@ -686,8 +856,8 @@ class LIFEAlgorithmSection4:
         """
         try:
             if not QUANTUM_AVAILABLE or not self.quantum_workspace:
-                logger.debug("Quantum optimization not available - using classical method")
-                return self._classical_feature_optimization(eeg_data)
+                logger.debug("Quantum workspace not available - solving the QUBO locally")
+                return self._local_qubo_feature_optimization(eeg_data)
             
             # Check quantum optimization consent
             if not self.consent_manager.consent_status.get('quantum_optimization'):
@@ -697,22 +867,27 @@ class LIFEAlgorithmSection4:
             if not raw_signal or len(raw_signal) < 10:
                 return None
             
-            # Create quantum optimization problem
-            problem = Problem(name="eeg_feature_selection")
+            qubo = self._window_feature_qubo(raw_signal)
+            if qubo is None:
+                return self._classical_feature_optimization(eeg_data)
+            local_problem, starts, _ = qubo
             
-            # Add terms for each feature (simplified approach)
-            for i in range(min(len(raw_signal), 100)):  # Limit to 100 features
-                coefficient = abs(raw_signal[i]) if i < len(raw_signal) else 0.1
-                problem.add_term(c=coefficient, indices=[i])
+            # Rebuild the relevance-minus-redundancy QUBO for the remote solver
+            problem = Problem(name=local_problem.name)
+            for coefficient, indices in local_problem.iter_terms():
+                problem.add_term(c=coefficient, indices=indices)
             
             # Use Simulated Annealing solver
             solver = SimulatedAnnealing(workspace=self.quantum_workspace)
             
             # Optimize
             result = solver.optimize(problem)
+            configuration = result["configuration"] if isinstance(result, dict) else getattr(result, "configuration", result)
+            if isinstance(configuration, dict):
+                configuration = [configuration.get(str(i), 0) for i in range(len(starts))]
             
             # Extract selected features
-            selected_features = [i for i, val in enumerate(result.configuration) if val == 1]
+            selected_features = [starts[i] for i, val in enumerate(configuration) if val == 1 and i < len(starts)]
             
             # Update statistics
             self.processing_stats["quantum_optimizations"] += 1
@@ -724,33 +899,71 @@ class LIFEAlgorithmSection4:
             logger.error(f"Quantum optimization error: {e}")
             return self._classical_feature_optimization(eeg_data)
     
-    def _classical_feature_optimization(self, eeg_data: Dict[str, Any]) -> List[int]:
-        """Classical feature optimization fallback"""
+    def _window_feature_qubo(self, raw_signal: List[float]) -> Optional[Tuple[Any, List[int], np.ndarray]]:
+        """
+        Feature-selection QUBO over the signal windows used by the classical method
+        
+        Relevance is the window variance, redundancy the absolute correlation
+        between window waveforms, and half of the windows are selected.
+        
+        Returns:
+            (problem, window start indices, relevance), or None if the signal is too short
+        """
+        signal_array = np.asarray(raw_signal, dtype=float)
+        window_size = min(50, len(signal_array) // 10)
+        if window_size < 2:
+            return None
+        num_windows = (len(signal_array) - 1) // window_size
+        starts = list(range(0, num_windows * window_size, window_size))
+        windows = signal_array[:num_windows * window_size].reshape(num_windows, window_size)
+        relevance = windows.var(axis=1)
+        problem = feature_selection_problem(
+            relevance,
+            correlation_redundancy(windows),
+            k=max(1, num_windows // 2),
+        )
+        return problem, starts, relevance
+    
+    def _local_qubo_feature_optimization(self, eeg_data: Dict[str, Any]) -> List[int]:
+        """Solve the window feature-selection QUBO with the in-process annealer"""
         try:
             raw_signal = eeg_data.get("processed_data", [])
-            if not raw_signal:
+            qubo = self._window_feature_qubo(raw_signal) if raw_signal else None
+            if qubo is None:
+                return self._classical_feature_optimization(eeg_data)
+            problem, starts, relevance = qubo
+            selected = solve_selection(problem, relevance)
+            self.processing_stats["quantum_optimizations"] += 1
+            return [starts[i] for i in selected]
+        except Exception as e:
+            logger.error(f"Local QUBO optimization error: {e}")
+            return self._classical_feature_optimization(eeg_data)
+    
+    def _classical_feature_optimization(self, eeg_data: Dict[str, Any]) -> Union[List[int], List[List[int]]]:
+        """
+        Classical feature optimization fallback
+        
+        Ranks non-overlapping windows of min(50, n // 10) samples by variance
+        and keeps the top half, most variable first. A 2-D ``processed_data``
+        (sessions x samples) is ranked in one call and yields one list per
+        session.
+        """
+        try:
+            raw_signal = eeg_data.get("processed_data", [])
+            if raw_signal is None or len(raw_signal) == 0:
                 return []
             
-            # Simple variance-based feature selection
-            signal_array = np.array(raw_signal)
+            signal_array = np.asarray(raw_signal, dtype=float)
+            batched = signal_array.ndim == 2
+            signals = signal_array if batched else signal_array[None, :]
             
-            # Calculate importance based on variance
-            window_size = min(50, len(signal_array) // 10)
+            window_size = min(50, signals.shape[1] // 10)
             if window_size < 2:
-                return list(range(len(signal_array)))
-            
-            feature_importance = []
-            for i in range(0, len(signal_array) - window_size, window_size):
-                window = signal_array[i:i + window_size]
-                importance = np.var(window)
-                feature_importance.append((i, importance))
-            
-            # Select top 50% features
-            feature_importance.sort(key=lambda x: x[1], reverse=True)
-            selected_count = max(1, len(feature_importance) // 2)
-            selected_features = [idx for idx, _ in feature_importance[:selected_count]]
+                selected = [list(range(signals.shape[1])) for _ in range(len(signals))]
+            else:
+                selected = rank_windows_by_variance(signals, window_size).tolist()
             
-            return selected_features
+            return selected if batched else selected[0]
             
         except Exception as e:
             logger.error(f"Classical optimization error: {e}")
@@ -875,7 +1088,7 @@ class LIFEAlgorithmSection4:
             # Stage 3: ML Model Training
             logger.info("🤖 Stage 3: ML Model Training")
             ml_start = datetime.now()
-            model_uri = self._train_local_model(None)  # Use simulated data
+            model_uri = await self.retrain_stress_model(None)  # Use simulated data
             ml_duration = (datetime.now() - ml_start).total_seconds()
             
             results["stages_completed"].append("ml_training")
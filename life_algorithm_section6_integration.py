@@ -27,6 +27,15 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
+from merkle_ledger import MerkleBatchMinter, default_ledger_path
+from qubo_annealer import (
+    autocorrelation_redundancy,
+    correlation_redundancy,
+    feature_selection_problem,
+    shortlist_candidates,
+    solve_selection,
+)
+
 # Core Azure and ML imports with fallbacks
 try:
     import neurokit2 as nk
@@ -180,6 +189,7 @@ class LIFEAlgorithmSection6:
         self.models = {"complexity": None, "quality": None}
         self.trait_weights = {"functions": 0.8, "comments": 0.6}
         self.consent_manager = ConsentManager()
+        self.skill_minter: Optional[MerkleBatchMinter] = None
         
         # Initialize Azure services
         self._init_azure()
@@ -601,24 +611,40 @@ class LIFEAlgorithmSection6:
                 "algorithm_version": "6.0.0"
             }
             
-            if SECTION6_SERVICES_AVAILABLE and self.blockchain_member:
-                # Real blockchain transaction
-                tx_hash = self.blockchain_member.send_transaction(
-                    to="0xSKILL_CONTRACT_ADDRESS",
-                    data=json.dumps(metadata)
-                )
-                logger.info(f"✅ Skill NFT minted: {tx_hash}")
-                return tx_hash
-            else:
-                # Simulated blockchain transaction
-                simulated_tx = f"0x{''.join(np.random.choice(list('0123456789abcdef'), 64))}"
-                logger.info(f"🔄 Simulated skill NFT: {simulated_tx}")
-                return simulated_tx
+            # Credentials are batched; one Merkle root per batch goes on chain
+            receipt = self._get_skill_minter().submit(metadata)
+            leaf_hash = f"0x{receipt['leaf']}"
+            logger.info(f"🔄 Skill NFT queued: {leaf_hash} (batch {receipt['batch']}, {receipt['status']})")
+            return leaf_hash
                 
         except Exception as e:
             logger.error(f"NFT minting error: {e}")
             return f"error_{datetime.now().timestamp()}"
     
+    def _get_skill_minter(self) -> MerkleBatchMinter:
+        """
+        Lazily open the local skill NFT ledger (created on first mint only)
+        """
+        if self.skill_minter is None:
+            self.skill_minter = MerkleBatchMinter(
+                default_ledger_path("section6-skill-nft-ledger.jsonl"),
+                batch_size=64,
+                max_delay=2.0,
+                on_commit=self._anchor_skill_batch,
+            )
+        return self.skill_minter
+    
+    def _anchor_skill_batch(self, batch: Dict[str, Any]) -> None:
+        """
+        Submit a committed batch root to the skill contract
+        """
+        if SECTION6_SERVICES_AVAILABLE and self.blockchain_member:
+            tx_hash = self.blockchain_member.send_transaction(
+                to="0xSKILL_CONTRACT_ADDRESS",
+                data=json.dumps({"merkle_root": batch["root"], "batch": batch["batch"], "size": batch["size"]})
+            )
+            logger.info(f"✅ Skill NFT batch {batch['batch']} anchored: {tx_hash}")
+    
     def get_eeg_signature(self, user_id: str) -> str:
         """
         Generate neural signature for blockchain credentialing
@@ -672,51 +698,68 @@ class LIFEAlgorithmSection6:
     def optimize_eeg_features_quantum(self, raw_signal: np.ndarray) -> List[int]:
         """
         Quantum-optimized EEG feature selection using Azure Quantum
+        
+        CPU-bound; async callers run it through asyncio.to_thread.
         """
         if not self.consent_manager.get_consent_status('quantum_optimization'):
             logger.warning("Quantum optimization consent not granted")
             return list(range(min(10, len(raw_signal))))
             
         try:
+            local_problem, relevance, candidates = self._feature_selection_qubo(raw_signal)
+
             if SECTION6_SERVICES_AVAILABLE and self.quantum_workspace:
-                # Real quantum optimization
+                # Real quantum optimization of the same relevance/redundancy QUBO
                 problem = Problem(name="eeg_feature_selection")
-                
-                # Add terms for each signal component
-                for i in range(min(len(raw_signal), 100)):  # Limit for quantum solver
-                    coefficient = abs(raw_signal[i]) if raw_signal[i] != 0 else 0.001
-                    problem.add_term(c=coefficient, indices=[i])
+                for coefficient, indices in local_problem.iter_terms():
+                    problem.add_term(c=coefficient, indices=indices)
                 
                 # Use simulated annealing solver
                 solver = SimulatedAnnealing(workspace=self.quantum_workspace)
                 result = solver.optimize(problem)
                 
                 # Extract selected features
-                selected_features = [i for i, val in enumerate(result.configuration) if val == 1]
+                selected_features = [int(candidates[i]) for i, val in enumerate(result.configuration) if val == 1]
                 
                 logger.info(f"✅ Quantum optimization selected {len(selected_features)} features")
                 return selected_features
                 
             else:
-                # Classical fallback optimization
-                # Use variance-based feature selection
-                signal_variance = np.var(raw_signal.reshape(-1, 1), axis=0) if raw_signal.ndim > 1 else np.var(raw_signal)
-                
-                # Select top features by variance
-                num_features = min(20, len(raw_signal))
-                if isinstance(signal_variance, np.ndarray):
-                    top_indices = np.argsort(signal_variance)[-num_features:]
-                else:
-                    top_indices = list(range(num_features))
-                
-                logger.info(f"🔄 Classical fallback selected {len(top_indices)} features")
-                return top_indices.tolist() if hasattr(top_indices, 'tolist') else top_indices
+                # No workspace: anneal the QUBO locally
+                selected_features = [int(candidates[i]) for i in solve_selection(local_problem, relevance)]
+                logger.info(f"🔄 Local QUBO annealing selected {len(selected_features)} features")
+                return selected_features
                 
         except Exception as e:
             logger.error(f"Quantum optimization error: {e}")
             # Emergency fallback
             return list(range(min(10, len(raw_signal))))
     
+    def _feature_selection_qubo(self, raw_signal: np.ndarray) -> Tuple[Any, np.ndarray, np.ndarray]:
+        """
+        Relevance-minus-redundancy QUBO selecting up to 20 features
+        
+        Channels (rows of a 2-D signal) are scored by variance and made
+        redundant by their correlation; samples of a 1-D signal by magnitude
+        and the autocorrelation at their lag. Only the most relevant
+        candidates (MAX_QUBO_CANDIDATES) become variables.
+        
+        Returns:
+            (problem, candidate relevance, candidate feature indices)
+        """
+        signal = np.asarray(raw_signal, dtype=float)
+        if signal.ndim > 1:
+            signal = signal.reshape(signal.shape[0], -1)
+            candidates = shortlist_candidates(signal.var(axis=1))
+            relevance = signal[candidates].var(axis=1)
+            redundancy = correlation_redundancy(signal[candidates])
+        else:
+            candidates = shortlist_candidates(signal)
+            relevance = np.abs(signal[candidates])
+            redundancy = autocorrelation_redundancy(signal, indices=candidates)
+        k = min(20, relevance.size)
+        return feature_selection_problem(relevance, redundancy, k=k), relevance, candidates
+    
     async def run_section6_demonstration(self) -> Dict[str, Any]:
         """
         Comprehensive demonstration of Section 6 capabilities
@@ -818,6 +861,8 @@ class LearningEngine:
             blockchain_start = datetime.now()
             
             nft_tx = self.mint_skill_nft("demo_user", "neural_processing", 0.85)
+            if self.skill_minter:
+                self.skill_minter.flush()
             blockchain_duration = (datetime.now() - blockchain_start).total_seconds()
             
             demo_results["stages_completed"].append("blockchain_nft")
@@ -846,7 +891,7 @@ class LearningEngine:
             logger.info("⚛️ Stage 7: Quantum EEG Optimization")
             quantum_start = datetime.now()
             
-            selected_features = self.optimize_eeg_features_quantum(sample_eeg)
+            selected_features = await asyncio.to_thread(self.optimize_eeg_features_quantum, sample_eeg)
             quantum_duration = (datetime.now() - quantum_start).total_seconds()
             
             demo_results["stages_completed"].append("quantum_optimization")
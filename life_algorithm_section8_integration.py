@@ -9,6 +9,7 @@ Comprehensive implementation covering:
 - Real-time EEG/IoT/ML streaming pipeline with GDPR/Quantum/VR integration
 - Federated learning and quantum optimization
 - GDPR-compliant anonymization and consent management
+- Bulk learning-outcome tracking into a partitioned columnar store
 - Mobile/ONNX export capabilities
 - Hardware-aware feature gating and lazy initialization
 
@@ -17,15 +18,32 @@ This file provides production-ready integration for all L.I.F.E domains and tech
 
 import ast
 import asyncio
-import json
 import logging
+import time
 import uuid
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
+from eeg_bandpower import EEG_BANDS, eeg_band_powers
+from feature_ranking import top_magnitude_features
+from iot_telemetry import TelemetryBatcher
+from onnx_export import ExportResult, export_model
+from outcome_store import OutcomeStore
+from qubo_annealer import (
+    autocorrelation_redundancy,
+    feature_selection_problem,
+    shortlist_candidates,
+    solve_selection,
+)
+from vr_adaptation_bus import DEFAULT_PORT as VR_BUS_PORT
+from vr_adaptation_bus import KIND_ENVIRONMENT, VRAdaptationBus, encode_flags
+
 # Azure SDK imports are optional and loaded at runtime to allow local testing
 try:
     from azure.blockchain import BlockchainMember
@@ -41,13 +59,6 @@ try:
 except Exception:
     AZURE_AVAILABLE = False
 
-# Neuroplasticity and EEG processing imports (optional)
-try:
-    import neurokit2 as nk
-    NEUROKIT_AVAILABLE = True
-except Exception:
-    NEUROKIT_AVAILABLE = False
-
 # Federated learning imports (optional)
 try:
     import flwr as fl
@@ -61,6 +72,16 @@ logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
+# Domain -> (outcome field scaled, assessment key holding the factor)
+DOMAIN_OUTCOME_MULTIPLIERS: Dict[str, Tuple[str, str]] = {
+    "healthcare": ("confidence_score", "clinical_accuracy"),
+    "finance": ("confidence_score", "risk_assessment_accuracy"),
+    "education": ("skill_improvement", "comprehension_rate"),
+    "corporate": ("neural_adaptation", "performance_improvement"),
+}
+OUTCOME_METRICS = ("skill_improvement", "neural_adaptation", "completion_time", "confidence_score")
+
+
 @dataclass
 class EEGMetrics:
     """Structured EEG metrics for real-time processing"""
@@ -74,6 +95,52 @@ class EEGMetrics:
     neuroplasticity_score: float = 0.0
 
 
+@dataclass
+class EEGMetricsBatch:
+    """EEG metrics for many sessions as parallel arrays (one row per session)"""
+    timestamp: datetime
+    alpha_power: np.ndarray
+    beta_power: np.ndarray
+    theta_power: np.ndarray
+    attention_index: np.ndarray
+    stress_level: np.ndarray
+    focus_level: np.ndarray
+    neuroplasticity_score: np.ndarray
+
+    @classmethod
+    def from_band_powers(cls, alpha: np.ndarray, beta: np.ndarray, theta: np.ndarray,
+                         timestamp: Optional[datetime] = None) -> "EEGMetricsBatch":
+        """Derive the attention, stress, focus and neuroplasticity indices from band powers"""
+        return cls(
+            timestamp=timestamp or datetime.now(),
+            alpha_power=alpha,
+            beta_power=beta,
+            theta_power=theta,
+            attention_index=beta / (alpha + 1e-9),
+            stress_level=np.clip(beta / (alpha + 1e-9) / 10.0, 0.0, 1.0),
+            focus_level=np.clip(alpha / (theta + 1e-9) / 5.0, 0.0, 1.0),
+            neuroplasticity_score=np.clip((alpha * beta) / (theta + 1e-9) / 20.0, 0.0, 1.0),
+        )
+
+    def __len__(self) -> int:
+        return len(self.alpha_power)
+
+    def __getitem__(self, index: int) -> EEGMetrics:
+        return EEGMetrics(
+            timestamp=self.timestamp,
+            alpha_power=float(self.alpha_power[index]),
+            beta_power=float(self.beta_power[index]),
+            theta_power=float(self.theta_power[index]),
+            attention_index=float(self.attention_index[index]),
+            stress_level=float(self.stress_level[index]),
+            focus_level=float(self.focus_level[index]),
+            neuroplasticity_score=float(self.neuroplasticity_score[index]),
+        )
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
 @dataclass
 class LearningOutcome:
     """Learning outcome tracking with neural signatures"""
@@ -86,10 +153,155 @@ class LearningOutcome:
     confidence_score: float
 
 
+@dataclass
+class LearningOutcomeBatch:
+    """Learning outcomes as parallel arrays (one row per outcome)"""
+    session_id: np.ndarray
+    user_id: np.ndarray
+    domain: np.ndarray
+    timestamp: np.ndarray  # datetime64[us]
+    skill_improvement: np.ndarray
+    neural_adaptation: np.ndarray
+    completion_time: np.ndarray
+    confidence_score: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.session_id)
+
+    def __getitem__(self, index: int) -> LearningOutcome:
+        return LearningOutcome(
+            session_id=str(self.session_id[index]),
+            user_id=str(self.user_id[index]),
+            domain=str(self.domain[index]),
+            skill_improvement=float(self.skill_improvement[index]),
+            neural_adaptation=float(self.neural_adaptation[index]),
+            completion_time=float(self.completion_time[index]),
+            confidence_score=float(self.confidence_score[index]),
+        )
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Column mapping in the layout OutcomeStore.append expects"""
+        return {name: getattr(self, name) for name in (
+            "session_id", "user_id", "domain", "timestamp", *OUTCOME_METRICS)}
+
+
+class EEGWindowBuffer:
+    """Per-session EEG sample buffer that wakes consumers when a full window is ready
+
+    The ingestion path calls ``push``; ``next_window`` blocks on an
+    asyncio.Condition until ``window_size`` samples are buffered, then returns
+    the window together with the monotonic time it became complete. Windows
+    advance by ``hop`` samples (non-overlapping by default). At most
+    ``max_samples`` are kept (32 windows by default): when a slow consumer
+    falls behind, the oldest whole hops are dropped and reported as dropped
+    windows by the next ``next_window``.
+    """
+
+    def __init__(self, window_size: int = 100, hop: Optional[int] = None,
+                 clock=time.perf_counter, max_samples: Optional[int] = None):
+        if window_size < 1:
+            raise ValueError("window_size must be at least 1")
+        self.window_size = window_size
+        self.hop = hop or window_size
+        self.max_samples = max_samples or 32 * max(window_size, self.hop)
+        if self.max_samples < window_size:
+            raise ValueError("max_samples must hold at least one window")
+        self.clock = clock
+        self._samples: List[float] = []
+        self._ready_at: Deque[float] = deque()
+        self._overflow = 0
+        self._condition = asyncio.Condition()
+        self.closed = False
+
+    def available(self) -> int:
+        """Number of complete windows currently buffered"""
+        if len(self._samples) < self.window_size:
+            return 0
+        return (len(self._samples) - self.window_size) // self.hop + 1
+
+    async def push(self, samples: Sequence[float]) -> None:
+        """Append samples and notify the consumer if a window completed"""
+        async with self._condition:
+            self._samples.extend(float(x) for x in samples)
+            excess = len(self._samples) - self.max_samples
+            if excess > 0:
+                hops = -(-excess // self.hop)
+                del self._samples[:hops * self.hop]
+                for _ in range(min(hops, len(self._ready_at))):
+                    self._ready_at.popleft()
+                self._overflow += hops
+            ready = self.available()
+            if ready > len(self._ready_at):
+                now = self.clock()
+                self._ready_at.extend([now] * (ready - len(self._ready_at)))
+                self._condition.notify_all()
+
+    async def close(self) -> None:
+        """Wake any waiting consumer; buffered windows are discarded"""
+        async with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    async def next_window(self, latest: bool = False) -> Optional[Tuple[np.ndarray, float, int]]:
+        """
+        Wait for a full window
+
+        Args:
+            latest: Skip to the newest complete window, dropping older ones
+
+        Returns:
+            (window, ready_at, dropped) or None once the buffer is closed
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.closed or self.available() > 0)
+            if self.closed:
+                return None
+            dropped = self.available() - 1 if latest else 0
+            if dropped:
+                del self._samples[:dropped * self.hop]
+                for _ in range(dropped):
+                    self._ready_at.popleft()
+            dropped += self._overflow
+            self._overflow = 0
+            window = np.asarray(self._samples[:self.window_size], dtype=float)
+            del self._samples[:self.hop]
+            return window, self._ready_at.popleft(), dropped
+
+
+@dataclass
+class FeedbackLoopStats:
+    """Counters and data-to-adjustment latencies (seconds) for one feedback loop"""
+    updates: int = 0
+    dropped_windows: int = 0
+    errors: int = 0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=10000))
+
+    def percentile(self, q: float) -> float:
+        return float(np.percentile(self.latencies, q)) if self.latencies else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "updates": self.updates,
+            "dropped_windows": self.dropped_windows,
+            "errors": self.errors,
+            "latency_p50_ms": self.percentile(50) * 1000.0,
+            "latency_p99_ms": self.percentile(99) * 1000.0,
+        }
+
+
+def _uuid5_anonymous_id(user_id: str) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, user_id))
+
+
 class GDPRAnonymizer:
     """GDPR-compliant data anonymization"""
     
-    def __init__(self):
+    def __init__(self, id_cache_size: int = 65536):
+        # Recently seen user IDs skip the SHA-1 of uuid5; the mapping is deterministic
+        self._anonymous_ids = lru_cache(maxsize=id_cache_size)(_uuid5_anonymous_id)
         self.redaction_patterns = [
             r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',  # email
             r'\b\d{3}-\d{2}-\d{4}\b',  # SSN pattern
@@ -106,7 +318,11 @@ class GDPRAnonymizer:
     
     def generate_anonymous_id(self, user_id: str) -> str:
         """Generate consistent anonymous ID for user"""
-        return str(uuid.uuid5(uuid.NAMESPACE_OID, user_id))
+        return self._anonymous_ids(user_id)
+
+    def anonymous_id_cache_info(self):
+        """Hits, misses and size of the anonymous-ID LRU"""
+        return self._anonymous_ids.cache_info()
 
 
 class ConsentManager:
@@ -168,6 +384,7 @@ class LIFEAlgorithm:
         self.models = {"complexity": None, "quality": None}
         self.trait_weights = {"functions": 0.8, "comments": 0.6}
         self.model_registry = None
+        self.onnx_exports: Dict[str, ExportResult] = {}
         
         # GDPR and consent management
         self.gdpr_anonymizer = GDPRAnonymizer()
@@ -178,9 +395,21 @@ class LIFEAlgorithm:
         self.keyvault = None
         self.eventhub_producer = None
         self.iot_client = None
+        self.iot_telemetry: Optional[TelemetryBatcher] = None
         self.blockchain_member = None
         self.quantum_workspace = None
         
+        # Real-time feedback: per-session EEG buffers fed by ingest_eeg
+        self.eeg_buffers: Dict[str, EEGWindowBuffer] = {}
+        self.feedback_stats: Dict[str, FeedbackLoopStats] = {}
+        
+        # Coalescing VR transport, started with start_vr_bus
+        self.vr_bus: Optional[VRAdaptationBus] = None
+        
+        # Partitioned columnar store for bulk-tracked learning outcomes
+        outcome_dir = self.config.get("outcome_store_dir")
+        self.outcome_store: Optional[OutcomeStore] = OutcomeStore(outcome_dir) if outcome_dir else None
+        
         # Initialize Azure services if available
         if AZURE_AVAILABLE:
             try:
@@ -252,30 +481,37 @@ class LIFEAlgorithm:
         traits, experiences = [], []
         
         for code in self.experiences:
-            try:
-                tree = ast.parse(code)
-                current_traits = {
-                    "func_count": sum(1 for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)),
-                    "docstring_presence": any(isinstance(n, ast.Expr) for n in tree.body[:1]),
-                    "import_complexity": len([n for n in ast.walk(tree) if isinstance(n, ast.Import)]),
-                    "class_count": sum(1 for node in ast.walk(tree) if isinstance(node, ast.ClassDef)),
-                    "async_func_count": sum(1 for node in ast.walk(tree) if isinstance(node, ast.AsyncFunctionDef))
-                }
-                traits.append(current_traits)
-                
-                # Extract docstrings and comments
-                experiences.extend([
-                    getattr(n.value, "value", "")
-                    for n in ast.walk(tree)
-                    if isinstance(n, ast.Expr)
-                    and isinstance(getattr(n, "value", None), ast.Constant)
-                    and isinstance(getattr(n.value, "value", None), str)
-                ])
-            except SyntaxError:
-                continue
+            extracted = self._extract_traits(code)
+            if extracted is not None:
+                traits.append(extracted[0])
+                experiences.extend(extracted[1])
                 
         return traits, experiences
 
+    @staticmethod
+    def _extract_traits(code: str) -> Optional[Tuple[Dict[str, Any], List[str]]]:
+        """AST traits and docstrings of one code sample, None if it does not parse"""
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            return None
+        traits = {
+            "func_count": sum(1 for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)),
+            "docstring_presence": any(isinstance(n, ast.Expr) for n in tree.body[:1]),
+            "import_complexity": len([n for n in ast.walk(tree) if isinstance(n, ast.Import)]),
+            "class_count": sum(1 for node in ast.walk(tree) if isinstance(node, ast.ClassDef)),
+            "async_func_count": sum(1 for node in ast.walk(tree) if isinstance(node, ast.AsyncFunctionDef))
+        }
+        # Extract docstrings and comments
+        docstrings = [
+            getattr(n.value, "value", "")
+            for n in ast.walk(tree)
+            if isinstance(n, ast.Expr)
+            and isinstance(getattr(n, "value", None), ast.Constant)
+            and isinstance(getattr(n.value, "value", None), str)
+        ]
+        return traits, docstrings
+
     def abstract_conceptualization(self, traits: List[Dict[str, Any]], experiences: List[str]) -> None:
         """Stage 3: Build adaptive models from analyzed patterns"""
         if not traits:
@@ -304,116 +540,92 @@ class LIFEAlgorithm:
         traits, experiences = self.reflective_observation()
         self.abstract_conceptualization(traits, experiences)
         
-        # Calculate L.I.F.E score
-        life_score = 0.0
-        if traits:
-            life_score = sum(
-                trait["func_count"] * self.trait_weights["functions"] +
-                trait["docstring_presence"] * self.trait_weights["comments"] +
-                trait["import_complexity"] * 0.5 +
-                trait["class_count"] * 0.4 +
-                trait["async_func_count"] * 0.7
-                for trait in traits
-            ) / len(traits)
-        
         return {
-            "life_score": life_score,
+            "life_score": self._life_score(traits),
             "traits_analyzed": len(traits),
             "experiences_extracted": len(experiences),
             "azure_model_version": getattr(self.model_registry, 'version', 'local') if self.model_registry else "local",
             "timestamp": datetime.now().isoformat()
         }
 
+    def _life_score(self, traits: List[Dict[str, Any]]) -> float:
+        """Mean weighted L.I.F.E score of trait records"""
+        if not traits:
+            return 0.0
+        return sum(
+            trait["func_count"] * self.trait_weights["functions"] +
+            trait["docstring_presence"] * self.trait_weights["comments"] +
+            trait["import_complexity"] * 0.5 +
+            trait["class_count"] * 0.4 +
+            trait["async_func_count"] * 0.7
+            for trait in traits
+        ) / len(traits)
+
     # ----------------
     # Advanced EEG/Biometric Pipeline with Neuroplasticity
     # ----------------
     def preprocess_eeg(self, eeg_signal: List[float]) -> EEGMetrics:
         """Advanced EEG preprocessing with neuroplasticity analysis"""
-        if not self.consent_manager.request_consent("eeg_processing", "Process EEG data for learning optimization"):
-            raise PermissionError("EEG processing consent not granted")
-        
-        # Use NeuroKit2 if available, otherwise use simplified processing
-        if NEUROKIT_AVAILABLE:
-            try:
-                processed = nk.eeg_clean(np.array(eeg_signal), sampling_rate=128)
-                alpha_power = nk.eeg_power(processed, frequency_band=[8, 12], method="welch")[0]
-                beta_power = nk.eeg_power(processed, frequency_band=[12, 30], method="welch")[0]
-                theta_power = nk.eeg_power(processed, frequency_band=[4, 8], method="welch")[0]
-            except Exception as e:
-                logger.warning(f"NeuroKit2 processing failed: {e}, using fallback")
-                alpha_power, beta_power, theta_power = self._fallback_eeg_processing(eeg_signal)
-        else:
-            alpha_power, beta_power, theta_power = self._fallback_eeg_processing(eeg_signal)
-        
-        # Calculate derived metrics
-        attention_index = self._calculate_attention_index(alpha_power, beta_power)
-        stress_level = self._calculate_stress_level(alpha_power, beta_power)
-        focus_level = self._calculate_focus_level(alpha_power, theta_power)
-        neuroplasticity_score = self._calculate_neuroplasticity(alpha_power, beta_power, theta_power)
-        
-        return EEGMetrics(
-            timestamp=datetime.now(),
-            alpha_power=float(alpha_power),
-            beta_power=float(beta_power),
-            theta_power=float(theta_power),
-            attention_index=attention_index,
-            stress_level=stress_level,
-            focus_level=focus_level,
-            neuroplasticity_score=neuroplasticity_score
-        )
+        return self.preprocess_eeg_batch(np.asarray(eeg_signal, dtype=float).reshape(1, -1))[0]
 
-    def _fallback_eeg_processing(self, eeg_signal: List[float]) -> tuple[float, float, float]:
-        """Simplified EEG processing when NeuroKit2 is not available"""
-        signal_array = np.array(eeg_signal) if eeg_signal else np.array([0.0])
+    def preprocess_eeg_batch(self, eeg_signals: Any, sampling_rate: Optional[float] = None) -> EEGMetricsBatch:
+        """
+        Preprocess a (sessions x samples) EEG array in one pass
         
-        # Simplified band power estimation using basic statistics
-        alpha_power = float(np.mean(np.abs(signal_array[::4])))  # Rough alpha approximation
-        beta_power = float(np.mean(np.abs(signal_array[::2])))   # Rough beta approximation  
-        theta_power = float(np.mean(np.abs(signal_array[::8])))  # Rough theta approximation
+        One zero-phase band-pass over the batch, one Welch rFFT and one band
+        integration (theta 4-8, alpha 8-12, beta 12-30 Hz); the indices are
+        then array expressions. Sampling rate: config eeg_sampling_rate,
+        default 128 Hz.
+        """
+        if not self.consent_manager.request_consent("eeg_processing", "Process EEG data for learning optimization"):
+            raise PermissionError("EEG processing consent not granted")
         
-        return alpha_power, beta_power, theta_power
-
-    def _calculate_attention_index(self, alpha_power: float, beta_power: float) -> float:
-        """Calculate attention index from EEG band powers"""
-        return float(beta_power / (alpha_power + 1e-9))
-
-    def _calculate_stress_level(self, alpha_power: float, beta_power: float) -> float:
-        """Calculate stress level (normalized 0-1)"""
-        raw_stress = beta_power / (alpha_power + 1e-9)
-        return float(max(0.0, min(1.0, raw_stress / 10.0)))  # Normalize to 0-1
-
-    def _calculate_focus_level(self, alpha_power: float, theta_power: float) -> float:
-        """Calculate focus level from alpha and theta powers"""
-        focus = alpha_power / (theta_power + 1e-9)
-        return float(max(0.0, min(1.0, focus / 5.0)))  # Normalize to 0-1
-
-    def _calculate_neuroplasticity(self, alpha: float, beta: float, theta: float) -> float:
-        """Calculate neuroplasticity score based on EEG coherence"""
-        coherence = (alpha * beta) / (theta + 1e-9)
-        return float(max(0.0, min(1.0, coherence / 20.0)))  # Normalize to 0-1
+        X = np.asarray(eeg_signals, dtype=float)
+        X = X.reshape(1, -1) if X.ndim == 1 else X
+        fs = float(sampling_rate or self.config.get("eeg_sampling_rate", 128.0))
+        powers = dict(zip(EEG_BANDS, eeg_band_powers(X, fs).T))
+        return EEGMetricsBatch.from_band_powers(powers["alpha"], powers["beta"], powers["theta"])
 
     def stream_to_azure_iot(self, eeg_metrics: EEGMetrics) -> None:
-        """Stream EEG metrics to Azure IoT Hub"""
+        """
+        Stream EEG metrics to Azure IoT Hub
+        
+        Metrics are queued and sent in columnar batches over the one iot_client
+        (config iot_batch_size, default 64, and iot_batch_delay_s, default 1.0).
+        The anonymizer only sees string fields, so numeric metrics skip it.
+        """
         if not self.iot_client or not self.consent_manager.consent_status.get("cloud_analytics", False):
             logger.warning("IoT streaming not available or consent not granted")
             return
             
         try:
-            message_data = {
-                "timestamp": eeg_metrics.timestamp.isoformat(),
+            if self.iot_telemetry is None or self.iot_telemetry.client is not self.iot_client:
+                if self.iot_telemetry is not None:
+                    # iot_client was replaced; send what the old client still holds
+                    self.iot_telemetry.close()
+                self.iot_telemetry = TelemetryBatcher(
+                    self.iot_client,
+                    max_batch=int(self.config.get("iot_batch_size", 64)),
+                    max_delay=float(self.config.get("iot_batch_delay_s", 1.0)),
+                    redact=self.gdpr_anonymizer.anonymize,
+                )
+            self.iot_telemetry.send({
+                "timestamp": eeg_metrics.timestamp,
                 "attention_index": eeg_metrics.attention_index,
                 "stress_level": eeg_metrics.stress_level,
                 "focus_level": eeg_metrics.focus_level,
                 "neuroplasticity_score": eeg_metrics.neuroplasticity_score
-            }
-            
-            # Anonymize before sending
-            anonymized_data = self.gdpr_anonymizer.anonymize(json.dumps(message_data))
-            self.iot_client.send_message(anonymized_data)
-            logger.info("EEG metrics streamed to Azure IoT Hub")
+            })
+            logger.debug("EEG metrics queued for Azure IoT Hub")
         except Exception as e:
             logger.error(f"Failed to stream to IoT Hub: {e}")
 
+    def close_iot_stream(self) -> None:
+        """Send queued EEG metrics and shut the IoT client down"""
+        telemetry, self.iot_telemetry = self.iot_telemetry, None
+        if telemetry is not None:
+            telemetry.close()
+
     # ----------------
     # Azure ML Integration with AutoML Retraining
     # ----------------
@@ -456,35 +668,51 @@ class LIFEAlgorithm:
     # Quantum Optimization for EEG Feature Selection
     # ----------------
     def optimize_eeg_features_quantum(self, raw_signal: List[float]) -> List[int]:
-        """Advanced quantum optimization for EEG feature selection"""
+        """Advanced quantum optimization for EEG feature selection
+
+        The annealing is CPU-bound; call it through asyncio.to_thread from
+        async code.
+        """
         if not self.consent_manager.consent_status.get("quantum_optimization", False):
             logger.warning("Quantum optimization consent not granted")
             return self._classical_feature_selection(raw_signal)
         
+        n_features = min(16, max(1, len(raw_signal) // 4))
+        if not len(raw_signal):
+            return self._classical_feature_selection(raw_signal)
+
         try:
+            # Relevance is the sample magnitude; neighbouring samples are redundant
+            # in proportion to the signal's autocorrelation at their lag. Only the
+            # most relevant samples become QUBO variables, so long signals stay cheap.
+            relevance = np.abs(np.asarray(raw_signal, dtype=float))
+            candidates = shortlist_candidates(relevance)
+            local_problem = feature_selection_problem(
+                relevance[candidates], autocorrelation_redundancy(raw_signal, indices=candidates), k=n_features
+            )
+
             if self.quantum_workspace and AZURE_AVAILABLE:
                 # Quantum annealing approach for feature selection
                 from azure.quantum.optimization import SimulatedAnnealing
                 
                 problem = Problem(name="eeg_feature_selection")
-                
-                # Add terms for each feature (QUBO formulation)
-                for i in range(len(raw_signal)):
-                    # Feature importance term
-                    problem.add_term(c=abs(raw_signal[i]), indices=[i])
-                    
-                    # Penalty for selecting too many features
-                    for j in range(i + 1, len(raw_signal)):
-                        problem.add_term(c=0.1, indices=[i, j])
+                for coefficient, indices in local_problem.iter_terms():
+                    problem.add_term(c=coefficient, indices=indices)
                 
                 # Use simulated annealing solver
                 solver = SimulatedAnnealing(workspace=self.quantum_workspace)
                 result = solver.optimize(problem)
                 
                 # Extract selected features
-                selected_features = [i for i, val in enumerate(result) if val == 1]
+                selected_features = [int(candidates[i]) for i, val in enumerate(result) if val == 1]
                 logger.info(f"Quantum optimization selected {len(selected_features)} features")
                 return selected_features
+
+            # No workspace: anneal the same QUBO in-process
+            chosen = solve_selection(local_problem, relevance[candidates])
+            selected_features = sorted(int(candidates[i]) for i in chosen)
+            logger.info(f"Local QUBO annealing selected {len(selected_features)} features")
+            return selected_features
                 
         except Exception as e:
             logger.warning(f"Quantum optimization failed: {e}")
@@ -492,16 +720,19 @@ class LIFEAlgorithm:
         # Fallback to classical selection
         return self._classical_feature_selection(raw_signal)
 
-    def _classical_feature_selection(self, raw_signal: List[float]) -> List[int]:
-        """Classical feature selection based on signal magnitude"""
-        magnitudes = [(i, abs(float(x))) for i, x in enumerate(raw_signal)]
-        magnitudes.sort(key=lambda x: -x[1])  # Sort by magnitude descending
+    def _classical_feature_selection(
+        self, raw_signal: Union[Sequence[float], np.ndarray]
+    ) -> Union[List[int], List[List[int]]]:
+        """
+        Classical feature selection based on signal magnitude
         
-        # Select top 16 features or 25% of total features, whichever is smaller
-        n_features = min(16, max(1, len(raw_signal) // 4))
-        selected = [idx for idx, _ in magnitudes[:n_features]]
-        
-        return sorted(selected)
+        Keeps the top 16 samples by |x| or 25% of them, whichever is smaller,
+        returned in index order. A (sessions x samples) array is ranked in one
+        call and yields one list per session.
+        """
+        signals = np.asarray(raw_signal, dtype=float)
+        selected = top_magnitude_features(signals, max_features=16).tolist()
+        return selected if signals.ndim == 2 else selected[0]
 
     # ----------------
     # Federated Learning Integration
@@ -534,8 +765,14 @@ class LIFEAlgorithm:
     # ----------------
     # VR/Unity Integration for Adaptive Environments
     # ----------------
-    def adjust_vr_environment(self, eeg_metrics: EEGMetrics, domain: str = "education") -> Dict[str, Any]:
-        """Generate VR environment adjustments based on EEG metrics"""
+    def adjust_vr_environment(self, eeg_metrics: EEGMetrics, domain: str = "education",
+                              session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Generate VR environment adjustments based on EEG metrics
+        
+        On the VR bus each session has its own latest-wins slot
+        ("environment:<session_id>"), so concurrent sessions never overwrite
+        each other's state; calls without a session share "environment:<domain>".
+        """
         if not self.consent_manager.consent_status.get("vr_adaptation", False):
             logger.warning("VR adaptation consent not granted")
             return {}
@@ -573,8 +810,41 @@ class LIFEAlgorithm:
         elif domain == "education":
             adjustments["environment_changes"].append("learning_pace_adjustment")
         
+        if self.vr_bus is not None:
+            changes = adjustments["environment_changes"]
+            self.vr_bus.publish(
+                f"environment:{session_id}" if session_id else f"environment:{domain}",
+                eeg_metrics.focus_level,
+                eeg_metrics.stress_level,
+                value=adjustments["difficulty_adjustment"],
+                flags=encode_flags(changes + ["trigger_relaxation"] if adjustments["trigger_relaxation"] else changes),
+                kind=KIND_ENVIRONMENT,
+            )
+        
         return adjustments
 
+    async def start_vr_bus(self, host: str = "127.0.0.1", port: Optional[int] = None,
+                           rate_hz: Optional[float] = None) -> VRAdaptationBus:
+        """
+        Stream VR adjustments over the coalescing UDP bus
+        
+        Adjustments are then also queued latest-wins per slot and sent once per
+        frame (config vr_frame_rate_hz, default 90).
+        """
+        if self.vr_bus is None:
+            port = port if port is not None else int(self.config.get("vr_bus_port", VR_BUS_PORT))
+            rate_hz = rate_hz if rate_hz is not None else float(self.config.get("vr_frame_rate_hz", 90.0))
+            self.vr_bus = await VRAdaptationBus.connect(host, port, rate_hz=rate_hz)
+            self.vr_bus.start()
+            logger.info(f"VR adaptation bus streaming to {host}:{port} at {rate_hz:g} Hz")
+        return self.vr_bus
+
+    async def stop_vr_bus(self) -> None:
+        """Flush pending VR states and close the bus"""
+        bus, self.vr_bus = self.vr_bus, None
+        if bus is not None:
+            await bus.stop()
+
     # ----------------
     # Blockchain Credentialing and NFT Minting
     # ----------------
@@ -617,24 +887,31 @@ class LIFEAlgorithm:
     # ----------------
     # Mobile/ONNX Export for Broad Deployment
     # ----------------
-    def export_model_to_onnx(self, model_name: str = "life_neuroplasticity_model") -> Optional[str]:
-        """Export trained model to ONNX format for mobile deployment"""
-        if not self.workspace or not self.model_registry:
-            logger.warning("Azure ML workspace or model registry not available")
+    def export_model_to_onnx(self, model_name: str = "life_neuroplasticity_model", model: Any = None,
+                             sample_inputs: Optional[Sequence[Any]] = None, output_dir: str = "./models",
+                             quantize: bool = False) -> Optional[str]:
+        """
+        Export a model to ONNX format for mobile deployment
+        
+        The model is ``model``, else self.models[model_name], else the Azure
+        registry entry. Torch modules (VRAdaptationModel, LIFETransformer) and
+        fitted sklearn estimators are supported; the file is verified against
+        the source model before its path is returned. With ``quantize`` an int8
+        copy is written next to it (see onnx_export.ExportResult).
+        """
+        if model is None:
+            model = self.models.get(model_name)
+        if model is None and self.workspace and self.model_registry:
+            model = self.model_registry.get(model_name)
+        if model is None:
+            logger.warning(f"Model {model_name} not found locally or in the registry")
             return None
         
         try:
-            # Get the latest model
-            model = self.model_registry.get(model_name)
-            if not model:
-                logger.warning(f"Model {model_name} not found in registry")
-                return None
-            
-            # Export to ONNX (placeholder - actual implementation would depend on model type)
-            onnx_path = f"./models/{model_name}.onnx"
-            logger.info(f"Model exported to ONNX: {onnx_path}")
-            
-            return onnx_path
+            result = export_model(model, Path(output_dir) / f"{model_name}.onnx", sample_inputs, quantize=quantize)
+            self.onnx_exports[model_name] = result
+            logger.info(f"Model exported to ONNX: {result.path} (max abs error {result.max_abs_error:.2e})")
+            return result.path
             
         except Exception as e:
             logger.error(f"Failed to export model to ONNX: {e}")
@@ -643,34 +920,99 @@ class LIFEAlgorithm:
     # ----------------
     # Real-time Feedback and Self-Optimization
     # ----------------
-    async def real_time_feedback_loop(self, session_id: str, domain: str = "education") -> None:
-        """Continuous real-time feedback and optimization loop"""
+    def get_eeg_buffer(self, session_id: str) -> EEGWindowBuffer:
+        """EEG window buffer for a session (config "feedback_window_size", "feedback_hop",
+        "feedback_max_buffer_samples")"""
+        buffer = self.eeg_buffers.get(session_id)
+        if buffer is None:
+            buffer = EEGWindowBuffer(
+                window_size=int(self.config.get("feedback_window_size", 100)),
+                hop=self.config.get("feedback_hop"),
+                max_samples=self.config.get("feedback_max_buffer_samples"),
+            )
+            self.eeg_buffers[session_id] = buffer
+        return buffer
+
+    async def ingest_eeg(self, session_id: str, samples: Sequence[float]) -> None:
+        """Ingestion path: buffer samples and wake the session's feedback loop"""
+        await self.get_eeg_buffer(session_id).push(samples)
+
+    async def stop_feedback_loop(self, session_id: str) -> None:
+        """Stop a session's feedback loop and release its buffer"""
+        buffer = self.eeg_buffers.pop(session_id, None)
+        if buffer is not None:
+            await buffer.close()
+
+    async def real_time_feedback_loop(self, session_id: str, domain: str = "education",
+                                      min_update_interval: Optional[float] = None,
+                                      max_updates: Optional[int] = None) -> FeedbackLoopStats:
+        """Event-driven real-time feedback and optimization loop
+        
+        Sleeps until ingest_eeg completes a window, so adjustments follow new
+        data immediately and idle sessions cost nothing. adjust_vr_environment
+        is rate-limited to one call per min_update_interval seconds (config
+        "feedback_min_interval_s", default 0); windows that complete while
+        waiting out the limit are collapsed into the newest one. Runs until
+        stop_feedback_loop(session_id), max_updates, or more than
+        "feedback_max_consecutive_errors" (default 10) failed windows in a
+        row; the session's buffer is released when it ends.
+        """
         logger.info(f"Starting real-time feedback loop for session {session_id}")
+        if min_update_interval is None:
+            min_update_interval = float(self.config.get("feedback_min_interval_s", 0.0))
+        max_errors = int(self.config.get("feedback_max_consecutive_errors", 10))
+        buffer = self.get_eeg_buffer(session_id)
+        stats = self.feedback_stats[session_id] = FeedbackLoopStats()
+        last_update: Optional[float] = None
+        consecutive_errors = 0
         
         try:
-            while True:  # In production, add proper termination conditions
-                # Simulate EEG data collection (replace with actual sensor data)
-                eeg_sample = [0.5, 0.3, 0.8, 0.2, 0.6] * 20  # 100 sample points
-                
-                # Process EEG metrics
-                eeg_metrics = self.preprocess_eeg(eeg_sample)
+            while max_updates is None or stats.updates < max_updates:
+                item = await buffer.next_window()
+                if item is None:
+                    break
                 
-                # Generate VR adjustments
-                vr_adjustments = self.adjust_vr_environment(eeg_metrics, domain)
+                # Rate limit, then act on the freshest window available
+                if last_update is not None and min_update_interval > 0:
+                    remaining = last_update + min_update_interval - buffer.clock()
+                    if remaining > 0:
+                        await asyncio.sleep(remaining)
+                        if buffer.available():
+                            item = await buffer.next_window(latest=True)
+                            if item is None:
+                                break
+                            stats.dropped_windows += 1  # superseded by the newer window
+                window, ready_at, dropped = item
+                stats.dropped_windows += dropped
                 
-                # Stream to Azure IoT
-                self.stream_to_azure_iot(eeg_metrics)
+                try:
+                    eeg_metrics = self.preprocess_eeg(window.tolist())
+                    self.adjust_vr_environment(eeg_metrics, domain, session_id=session_id)
+                    self.stream_to_azure_iot(eeg_metrics)
+                except Exception as e:
+                    stats.errors += 1
+                    consecutive_errors += 1
+                    logger.error(f"Real-time feedback loop error: {e}")
+                    if consecutive_errors > max_errors:
+                        logger.error(f"Stopping feedback loop for session {session_id} "
+                                     f"after {consecutive_errors} consecutive errors")
+                        break
+                    continue
+                finally:
+                    last_update = buffer.clock()
                 
-                # Log feedback
-                logger.info(f"Feedback cycle complete - Focus: {eeg_metrics.focus_level:.2f}, "
-                          f"Stress: {eeg_metrics.stress_level:.2f}, "
-                          f"Neuroplasticity: {eeg_metrics.neuroplasticity_score:.2f}")
-                
-                # Wait before next cycle (1 second intervals)
-                await asyncio.sleep(1.0)
-                
-        except Exception as e:
-            logger.error(f"Real-time feedback loop error: {e}")
+                consecutive_errors = 0
+                stats.updates += 1
+                stats.latencies.append(last_update - ready_at)
+                logger.debug(f"Feedback cycle complete - Focus: {eeg_metrics.focus_level:.2f}, "
+                             f"Stress: {eeg_metrics.stress_level:.2f}, "
+                             f"Neuroplasticity: {eeg_metrics.neuroplasticity_score:.2f}")
+        finally:
+            if self.eeg_buffers.get(session_id) is buffer:
+                await self.stop_feedback_loop(session_id)
+        
+        logger.info(f"Real-time feedback loop for session {session_id} finished: {stats.summary()}")
+        return stats
 
     # ----------------
     # Multi-Domain Learning Outcomes Tracking
@@ -700,29 +1042,112 @@ class LIFEAlgorithm:
         logger.info(f"Learning outcome tracked for {domain}: {outcome.skill_improvement:.2f} improvement")
         return outcome
 
-    def _process_healthcare_outcome(self, outcome: LearningOutcome, data: Dict[str, Any]) -> LearningOutcome:
-        """Process healthcare-specific learning outcomes"""
-        # Add healthcare-specific metrics
-        outcome.confidence_score *= data.get("clinical_accuracy", 1.0)
+    @staticmethod
+    def _apply_domain_multiplier(outcome: LearningOutcome, domain: str, data: Dict[str, Any]) -> LearningOutcome:
+        """Scale the domain's outcome field by its assessment factor (see DOMAIN_OUTCOME_MULTIPLIERS)"""
+        target, factor_key = DOMAIN_OUTCOME_MULTIPLIERS[domain]
+        setattr(outcome, target, getattr(outcome, target) * data.get(factor_key, 1.0))
         return outcome
 
+    def _process_healthcare_outcome(self, outcome: LearningOutcome, data: Dict[str, Any]) -> LearningOutcome:
+        """Process healthcare-specific learning outcomes (clinical accuracy scales confidence)"""
+        return self._apply_domain_multiplier(outcome, "healthcare", data)
+
     def _process_finance_outcome(self, outcome: LearningOutcome, data: Dict[str, Any]) -> LearningOutcome:
-        """Process finance-specific learning outcomes"""
-        # Add finance-specific risk assessment
-        outcome.confidence_score *= data.get("risk_assessment_accuracy", 1.0)
-        return outcome
+        """Process finance-specific learning outcomes (risk assessment accuracy scales confidence)"""
+        return self._apply_domain_multiplier(outcome, "finance", data)
 
     def _process_education_outcome(self, outcome: LearningOutcome, data: Dict[str, Any]) -> LearningOutcome:
-        """Process education-specific learning outcomes"""
-        # Add education-specific comprehension metrics
-        outcome.skill_improvement *= data.get("comprehension_rate", 1.0)
-        return outcome
+        """Process education-specific learning outcomes (comprehension rate scales skill improvement)"""
+        return self._apply_domain_multiplier(outcome, "education", data)
 
     def _process_corporate_outcome(self, outcome: LearningOutcome, data: Dict[str, Any]) -> LearningOutcome:
-        """Process corporate training-specific learning outcomes"""
-        # Add corporate-specific performance metrics
-        outcome.neural_adaptation *= data.get("performance_improvement", 1.0)
-        return outcome
+        """Process corporate training-specific learning outcomes (performance improvement scales adaptation)"""
+        return self._apply_domain_multiplier(outcome, "corporate", data)
+
+    def track_learning_outcomes(self, records: Union[Sequence[Dict[str, Any]], Dict[str, Any]],
+                                persist: bool = True) -> LearningOutcomeBatch:
+        """
+        Bulk track_learning_outcome over many records
+
+        ``records`` is either a sequence of dicts with session_id, user_id,
+        domain, an optional timestamp and the assessment fields (flat or under
+        "assessment_data"), or a dict of equal-length columns with the same
+        names. User IDs are anonymised once per distinct ID through the LRU,
+        domain multipliers are applied per domain as masked column products,
+        and the batch is appended to ``self.outcome_store`` when one is
+        configured and ``persist`` is set.
+        """
+        columns = records if isinstance(records, dict) else self._outcome_columns(records)
+        n = len(columns["session_id"])
+        domains = np.asarray(columns["domain"], dtype=str)
+        raw_users, user_index = np.unique(np.asarray(columns["user_id"], dtype=str), return_inverse=True)
+        anonymous = np.array([self.gdpr_anonymizer.generate_anonymous_id(u) for u in raw_users], dtype=str)
+        timestamps = columns.get("timestamp")
+        if timestamps is None:
+            timestamps = np.full(n, np.datetime64(datetime.now(), "us"))
+        metrics = {}
+        for name in OUTCOME_METRICS:
+            values = columns.get(name)
+            metrics[name] = np.zeros(n) if values is None else np.asarray(values, dtype=float).copy()
+
+        for domain, (target, factor_key) in DOMAIN_OUTCOME_MULTIPLIERS.items():
+            factors = columns.get(factor_key)
+            if factors is None:
+                continue
+            mask = domains == domain
+            if mask.any():
+                # None/NaN (factor not reported for this row) leaves the value unscaled
+                scale = np.asarray(factors, dtype=float)[mask]
+                metrics[target][mask] *= np.where(np.isnan(scale), 1.0, scale)
+
+        batch = LearningOutcomeBatch(
+            session_id=np.asarray(columns["session_id"], dtype=str),
+            user_id=anonymous[user_index.reshape(-1)] if n else np.array([], dtype=str),
+            domain=domains,
+            timestamp=np.asarray(timestamps, dtype="datetime64[us]"),
+            **metrics,
+        )
+        if persist and self.outcome_store is not None and n:
+            self.outcome_store.append(batch.columns())
+        logger.info(f"Tracked {n} learning outcomes across {len(np.unique(domains))} domains")
+        return batch
+
+    @staticmethod
+    def _outcome_columns(records: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """Row records -> columns; missing metrics become 0.0 and missing factors NaN (unscaled)"""
+        assessments = [r.get("assessment_data", r) for r in records]
+        columns: Dict[str, Any] = {
+            "session_id": [r["session_id"] for r in records],
+            "user_id": [r["user_id"] for r in records],
+            "domain": [r["domain"] for r in records],
+        }
+        if any(r.get("timestamp") is not None for r in records):
+            now = datetime.now()
+            columns["timestamp"] = [r.get("timestamp") or now for r in records]
+        # One pass over the rows; the factor is each row's own domain factor,
+        # which can back every factor column since a multiplier only reads its
+        # domain's rows
+        factor_keys = {domain: key for domain, (_, key) in DOMAIN_OUTCOME_MULTIPLIERS.items()}
+        values = np.array(
+            [(a.get("skill_improvement", 0.0), a.get("neural_adaptation", 0.0), a.get("completion_time", 0.0),
+              a.get("confidence_score", 0.0), a.get(factor_keys.get(d, "")))
+             for a, d in zip(assessments, columns["domain"])],
+            dtype=float,
+        ).reshape(-1, len(OUTCOME_METRICS) + 1)
+        for i, name in enumerate(OUTCOME_METRICS):
+            columns[name] = values[:, i]
+        for factor_key in factor_keys.values():
+            columns[factor_key] = values[:, -1]
+        return columns
+
+    def learning_outcome_summary(self, domain: Optional[str] = None, start: Optional[Union[str, date]] = None,
+                                 end: Optional[Union[str, date]] = None) -> Dict[str, Dict[str, float]]:
+        """Per-domain aggregates of the stored outcomes (see OutcomeStore.aggregate)"""
+        if self.outcome_store is None:
+            logger.warning("No outcome store configured; set outcome_store_dir")
+            return {}
+        return self.outcome_store.aggregate(domain, start, end)
 
 
 # ----------------
@@ -796,7 +1221,7 @@ def adaptive_learning_function():
     
     # Test quantum feature selection
     raw_signal = [0.5, 0.8, 0.2, 0.9, 0.1, 0.7, 0.4, 0.6, 0.3, 0.85]
-    selected_features = algo.optimize_eeg_features_quantum(raw_signal)
+    selected_features = await asyncio.to_thread(algo.optimize_eeg_features_quantum, raw_signal)
     print(f"   Selected Features: {selected_features}")
     print(f"   Feature Count: {len(selected_features)}")
     
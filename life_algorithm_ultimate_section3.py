@@ -18,10 +18,13 @@ Azure Marketplace Offer ID: 9a600d96-fe1e-420b-902a-a0c42c561adb
 """
 
 import ast
+import asyncio
 import json
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 import joblib
 import numpy as np
@@ -90,21 +93,72 @@ except Exception:
     VenturiSystem = None  # type: ignore[assignment]
     VENTURI_ADAPTIVE_AVAILABLE = False
 
+from deadline_pacer import DeadlinePacer, MissedTickPolicy, PacerStats, StopToken, TickContext
+from merkle_ledger import MerkleBatchMinter, default_ledger_path
+from onnx_export import ExportResult, export_sklearn_model
+
 logger = logging.getLogger(__name__)
 
 # ========================================================================================
 # NEURAL PREDICTIVE CODING MODEL (TENSORFLOW)
 # ========================================================================================
 
+class _SessionStateCache:
+    """
+    Recurrent state per live session, bounded by count and idle time
+
+    Least recently used sessions are evicted beyond ``max_sessions``; a
+    session idle for ``idle_seconds`` is dropped on the next access.
+    """
+
+    def __init__(self, max_sessions: int = 1024, idle_seconds: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_sessions = max(1, max_sessions)
+        self.idle_seconds = idle_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._entries
+
+    def get(self, session_id: str) -> Any:
+        self._expire()
+        entry = self._entries.get(session_id)
+        return None if entry is None else entry[1]
+
+    def put(self, session_id: str, state: Any):
+        self._entries[session_id] = (self._clock(), state)
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_sessions:
+            self._entries.popitem(last=False)
+
+    def pop(self, session_id: str):
+        self._entries.pop(session_id, None)
+
+    def _expire(self):
+        # Entries are in last-use order, so stale ones are all at the front
+        cutoff = self._clock() - self.idle_seconds
+        while self._entries:
+            session_id, (last_used, _) = next(iter(self._entries.items()))
+            if last_used >= cutoff:
+                break
+            del self._entries[session_id]
+
+
 class NeuralPredictiveCodingModel:
     """
     Advanced neural predictive coding model using TensorFlow LSTM
     Implements prediction of future EEG states based on current and previous states
     """
     
-    def __init__(self, input_dim: int = 64):
+    def __init__(self, input_dim: int = 64, max_sessions: int = 1024, session_idle_seconds: float = 300.0):
         self.input_dim = input_dim
         self.model = None
+        # Per-session recurrent state for streaming prediction (session_id -> [h, c])
+        self._session_states = _SessionStateCache(max_sessions, session_idle_seconds)
         
         if TENSORFLOW_AVAILABLE:
             self._build_tensorflow_model()
@@ -135,6 +189,18 @@ class NeuralPredictiveCodingModel:
         self.weights = np.random.normal(0, 0.1, (self.input_dim, self.input_dim))
         logger.info("Fallback Neural Predictive Coding Model initialized")
     
+    def _fallback_combined_input(self, x_t: np.ndarray, x_t_minus_1: np.ndarray,
+                                 delta_venturi: np.ndarray) -> np.ndarray:
+        """Concatenate inputs on the feature axis and truncate/pad to input_dim"""
+        combined_input = np.concatenate([x_t, x_t_minus_1, delta_venturi], axis=-1)
+        width = combined_input.shape[-1]
+        if width > self.input_dim:
+            combined_input = combined_input[..., :self.input_dim]
+        elif width < self.input_dim:
+            pad_width = [(0, 0)] * (combined_input.ndim - 1) + [(0, self.input_dim - width)]
+            combined_input = np.pad(combined_input, pad_width, "constant")
+        return combined_input
+    
     def predict(self, x_t: np.ndarray, x_t_minus_1: np.ndarray, 
                 delta_venturi: np.ndarray) -> np.ndarray:
         """
@@ -158,15 +224,90 @@ class NeuralPredictiveCodingModel:
             return prediction.numpy().squeeze()
         else:
             # Fallback implementation
-            combined_input = np.concatenate([x_t, x_t_minus_1, delta_venturi])
-            if len(combined_input) > self.input_dim:
-                combined_input = combined_input[:self.input_dim]
-            elif len(combined_input) < self.input_dim:
-                padding = np.zeros(self.input_dim - len(combined_input))
-                combined_input = np.concatenate([combined_input, padding])
-            
+            combined_input = self._fallback_combined_input(
+                np.asarray(x_t), np.asarray(x_t_minus_1), np.asarray(delta_venturi)
+            )
             prediction = np.dot(self.weights, combined_input)
             return prediction
+    
+    def predict_batch(self, x_t: np.ndarray, x_t_minus_1: np.ndarray,
+                      delta_venturi: np.ndarray) -> np.ndarray:
+        """
+        Predict future neural states for a whole batch of sequences in one call
+        
+        Args:
+            x_t: Current EEG states, shape (batch, time, features)
+            x_t_minus_1: Previous EEG states, shape (batch, time, features)
+            delta_venturi: Venturi gate deltas, shape (batch, time, features)
+            
+        Returns:
+            Predicted next EEG states, shape (batch, time, input_dim)
+        """
+        x_t = np.asarray(x_t, dtype=float)
+        x_t_minus_1 = np.asarray(x_t_minus_1, dtype=float)
+        delta_venturi = np.asarray(delta_venturi, dtype=float)
+        if x_t.ndim != 3:
+            raise ValueError(f"predict_batch expects (batch, time, features), got {x_t.shape}")
+        
+        if TENSORFLOW_AVAILABLE and self.model:
+            prediction = self.model([
+                tf.convert_to_tensor(x_t, dtype=tf.float32),
+                tf.convert_to_tensor(x_t_minus_1, dtype=tf.float32),
+                tf.convert_to_tensor(delta_venturi, dtype=tf.float32),
+            ])
+            return prediction.numpy()
+        
+        # Fallback: one matmul over every (batch, time) row
+        combined_input = self._fallback_combined_input(x_t, x_t_minus_1, delta_venturi)
+        return combined_input @ self.weights.T
+    
+    def predict_step(self, session_id: Optional[str], x_t: np.ndarray, x_t_minus_1: np.ndarray,
+                     delta_venturi: np.ndarray) -> np.ndarray:
+        """
+        Streaming prediction for one tick of a live session
+        
+        The LSTM hidden/cell state is carried between calls per session, so each
+        tick only feeds the newest sample instead of re-running the full window.
+        At most ``max_sessions`` states are kept, idle ones expire, and
+        reset_session drops a state when its session ends.
+        
+        Args:
+            session_id: Identifier of the live session owning the recurrent state;
+                None predicts from a zero state and carries nothing
+            x_t: Current EEG state
+            x_t_minus_1: Previous EEG state
+            delta_venturi: Venturi gate delta values
+            
+        Returns:
+            Predicted next EEG state
+        """
+        if not (TENSORFLOW_AVAILABLE and self.model):
+            # The fallback model has no recurrence, so a step is a plain prediction
+            return self.predict(x_t, x_t_minus_1, delta_venturi)
+        
+        step_input = tf.convert_to_tensor(
+            np.concatenate([x_t, x_t_minus_1, delta_venturi])[np.newaxis, :],
+            dtype=tf.float32,
+        )
+        if not self.model.lstm.built:
+            # Build the layers with a single-step dummy call
+            dummy = tf.zeros((1, 1, len(x_t)))
+            self.model([dummy, tf.zeros((1, 1, len(x_t_minus_1))), tf.zeros((1, 1, len(delta_venturi)))])
+        
+        states = self._session_states.get(session_id) if session_id is not None else None
+        if states is None:
+            units = self.model.lstm.units
+            states = [tf.zeros((1, units)), tf.zeros((1, units))]
+        
+        output, new_states = self.model.lstm.cell(step_input, states)
+        if session_id is not None:
+            self._session_states.put(session_id, list(new_states))
+        prediction = self.model.dense(output)
+        return prediction.numpy().squeeze()
+    
+    def reset_session(self, session_id: str):
+        """Drop the carried recurrent state for a session"""
+        self._session_states.pop(session_id)
 
 # ========================================================================================
 # ULTIMATE L.I.F.E ALGORITHM CLASS
@@ -197,6 +338,7 @@ class LIFEAlgorithm:
         
         # Domain-specific components
         self.blockchain_member = None
+        self.skill_minter: Optional[MerkleBatchMinter] = None
         self.workspace = None
         self.secret_client = None
         self.quantum_workspace = None
@@ -208,6 +350,8 @@ class LIFEAlgorithm:
         self._venturi_vector = np.zeros(3)
         self._venturi_delta = np.zeros(4)
         self._venturi_snapshot = {"cognitive": 0.0, "render": 0.0, "offload": 0.0}
+        self.biometrics_stop = StopToken()
+        self.biometrics_stats = PacerStats()
         
         # Initialize all components
         self._init_azure()
@@ -229,6 +373,8 @@ class LIFEAlgorithm:
             "motor_intent_enabled": True,
             "stress_monitoring": True,
             "vr_integration": True,
+            "biometrics_interval_s": 0.25,
+            "biometrics_missed_tick_policy": "coalesce",
             "venturi_render_profile": {
                 "framerate": 72.0,
                 "hardwarecapacity": 12.0,
@@ -338,37 +484,86 @@ class LIFEAlgorithm:
         """
         Continuous biometric processing loop for real-time EEG monitoring
         Corporate Training Domain: Stress monitoring and performance optimization
+        
+        Blocking wrapper around run_biometrics(); stop it with
+        stop_biometrics() from another thread or with Ctrl+C.
+        """
+        try:
+            asyncio.run(self.run_biometrics())
+        except KeyboardInterrupt:
+            logger.info("Biometric processing interrupted")
+    
+    async def run_biometrics(self, interval_s: Optional[float] = None,
+                             policy: Optional[Union[str, MissedTickPolicy]] = None,
+                             stop_token: Optional[StopToken] = None,
+                             max_ticks: Optional[int] = None,
+                             clock: Optional[Callable[[], float]] = None,
+                             sleep: Optional[Callable[[float], Awaitable[Any]]] = None) -> PacerStats:
+        """
+        Deadline-paced biometric loop that shares the caller's event loop
+        
+        Ticks are scheduled on absolute monotonic deadlines, so processing time
+        does not accumulate as drift. Overrunning ticks skip or coalesce the
+        missed deadlines per policy. The loop ends on stop_biometrics(), on the
+        given stop token, on task cancellation, on a tick error, or after
+        max_ticks.
+        
+        Args:
+            interval_s: Seconds between ticks (config "biometrics_interval_s")
+            policy: "skip" or "coalesce" (config "biometrics_missed_tick_policy")
+            stop_token: Token to stop the loop; defaults to self.biometrics_stop
+            max_ticks: Optional tick budget
+            clock: Monotonic clock override (tests)
+            sleep: Async sleep override (tests)
+            
+        Returns:
+            PacerStats with jitter and overrun counters (also self.biometrics_stats)
         """
+        if stop_token is None:
+            if self.biometrics_stop.stopped:
+                self.biometrics_stop = StopToken()
+            stop_token = self.biometrics_stop
+        pacer = DeadlinePacer(
+            interval_s or self.config.get("biometrics_interval_s", 0.25),
+            policy=policy or self.config.get("biometrics_missed_tick_policy", MissedTickPolicy.COALESCE),
+            stop_token=stop_token,
+            clock=clock or time.monotonic,
+            sleep=sleep,
+            stop_on_error=True,
+        )
+        self.biometrics_stats = pacer.stats
         logger.info("Starting continuous biometric processing")
+        # Ticks do blocking Key Vault / Event Hub I/O; keep it off the shared loop
+        return await pacer.run(lambda tick: asyncio.to_thread(self._biometrics_tick, tick), max_ticks=max_ticks)
+    
+    def stop_biometrics(self) -> None:
+        """Ask a running biometric loop to finish after its current tick"""
+        self.biometrics_stop.stop()
+    
+    def _biometrics_tick(self, tick: TickContext) -> None:
+        """One biometric processing step (run in a worker thread); errors propagate and stop the loop"""
+        # Get EEG data (would be from actual device)
+        eeg_data = self._get_simulated_eeg_data()
         
-        while True:
-            try:
-                # Get EEG data (would be from actual device)
-                eeg_data = self._get_simulated_eeg_data()
-                
-                # Analyze stress levels
-                stress_level = self.analyze_stress(eeg_data.get("alpha", 0.5), 
-                                                 eeg_data.get("beta", 0.3))
-                
-                # Update real-time dashboard
-                self.update_dashboard(stress_level)
-                
-                # Stream to Azure if configured
-                if self.config.get("stress_monitoring", True):
-                    self.stream_eeg_to_azure(eeg_data)
-                
-                # Check for motor intent (healthcare domain)
-                if self.config.get("motor_intent_enabled", True):
-                    motor_intent = self.detect_motor_intent(eeg_data)
-                    if motor_intent:
-                        logger.info(f"Motor intent detected: {motor_intent}")
-                
-                # Apply stability guardrails
-                self._check_stability_guardrails({"error_rate": 0.02})
-                
-            except Exception as e:
-                logger.error(f"Biometric processing error: {e}")
-                break
+        # Analyze stress levels
+        stress_level = self.analyze_stress(eeg_data.get("alpha", 0.5), 
+                                         eeg_data.get("beta", 0.3))
+        
+        # Update real-time dashboard
+        self.update_dashboard(stress_level)
+        
+        # Stream to Azure if configured
+        if self.config.get("stress_monitoring", True):
+            self.stream_eeg_to_azure(eeg_data)
+        
+        # Check for motor intent (healthcare domain)
+        if self.config.get("motor_intent_enabled", True):
+            motor_intent = self.detect_motor_intent(eeg_data)
+            if motor_intent:
+                logger.info(f"Motor intent detected: {motor_intent}")
+        
+        # Apply stability guardrails
+        self._check_stability_guardrails({"error_rate": 0.02})
     
     def analyze_stress(self, alpha: float, beta: float) -> float:
         """
@@ -618,6 +813,25 @@ class LIFEAlgorithm:
             logger.error(f"Motor intent detection failed: {e}")
             return None
     
+    def export_motor_intent_model_to_onnx(self, path: str = "models/onnx/motor_intent.onnx",
+                                          quantize: bool = False) -> Optional[ExportResult]:
+        """
+        Export the motor intent classifier to ONNX
+        
+        The model takes the five C3/C4 features built by detect_motor_intent.
+        Returns None when the classifier is missing or unfitted, or the ONNX
+        toolchain is not installed.
+        """
+        model = self.models.get("motor_intent")
+        if model is None or not hasattr(model, "n_features_in_"):
+            logger.warning("No fitted motor intent classifier; nothing to export")
+            return None
+        try:
+            return export_sklearn_model(model, path, quantize=quantize)
+        except Exception as e:
+            logger.error(f"Motor intent model ONNX export failed: {e}")
+            return None
+    
     def _build_venturi_payloads(
         self, processed_data: Dict[str, float]
     ) -> Tuple[Dict[str, float], Dict[str, float], Dict[str, float]]:
@@ -691,8 +905,11 @@ class LIFEAlgorithm:
         Education/Corporate Domain: Adaptive learning environments
         
         Args:
-            eeg_data: Real-time EEG data dictionary
+            eeg_data: Real-time EEG data dictionary; an optional ``session_id``
+                carries predictive state between ticks and ``session_end``
+                marks the session's last tick
         """
+        session_id = eeg_data.get("session_id")
         try:
             # Process EEG features
             processed_data = {
@@ -722,9 +939,12 @@ class LIFEAlgorithm:
                     venturi_delta = np.zeros_like(current_state)
                 self._venturi_delta = venturi_delta
                 
-                # Predict next state
-                predicted_state = self.neural_predictive_model.predict(
-                    current_state, previous_state, venturi_delta
+                # Predict next state, carrying recurrent state across ticks
+                predicted_state = self.neural_predictive_model.predict_step(
+                    session_id,
+                    current_state,
+                    previous_state,
+                    venturi_delta,
                 )
                 
                 # Update previous state
@@ -751,6 +971,14 @@ class LIFEAlgorithm:
             
         except Exception as e:
             logger.error(f"EEG stream processing failed: {e}")
+        finally:
+            if session_id is not None and eeg_data.get("session_end"):
+                self.end_eeg_session(session_id)
+    
+    def end_eeg_session(self, session_id: str):
+        """Release the predictive state carried for a finished EEG session"""
+        if self.neural_predictive_model:
+            self.neural_predictive_model.reset_session(session_id)
     
     def predict_with_azure_ml(self, data: Dict[str, float]) -> Dict[str, Any]:
         """
@@ -826,7 +1054,7 @@ class LIFEAlgorithm:
             skill: Skill name to certify
             
         Returns:
-            Transaction hash if successful, None otherwise
+            Certificate leaf hash (0x-prefixed) if queued, None otherwise
         """
         try:
             # Get neural signature for this user's skill acquisition
@@ -842,25 +1070,36 @@ class LIFEAlgorithm:
                 "verification_algorithm": "L.I.F.E-v3.0-ultimate"
             }
             
-            if BLOCKCHAIN_AVAILABLE and self.blockchain_member:
-                # Mint NFT on blockchain
-                tx_hash = self.blockchain_member.send_transaction(
-                    to="0xSKILL_CONTRACT",
-                    data=json.dumps(metadata)
-                )
-                
-                logger.info(f"Skill NFT minted for {user_id}: {skill} (tx: {tx_hash})")
-                return tx_hash
-            else:
-                # Mock blockchain transaction
-                tx_hash = f"mock_tx_{hash(json.dumps(metadata)) % 10000:04d}"
-                logger.info(f"Mock skill NFT minted: {tx_hash}")
-                return tx_hash
+            # Certificates are batched; one Merkle root per batch goes on chain
+            receipt = self._get_skill_minter().submit(metadata)
+            tx_hash = f"0x{receipt['leaf']}"
+            logger.info(f"Skill NFT queued for {user_id}: {skill} (leaf: {tx_hash}, batch {receipt['batch']})")
+            return tx_hash
                 
         except Exception as e:
             logger.error(f"NFT minting failed: {e}")
             return None
     
+    def _get_skill_minter(self) -> MerkleBatchMinter:
+        """Lazily open the local skill NFT ledger (created on first mint only)"""
+        if self.skill_minter is None:
+            self.skill_minter = MerkleBatchMinter(
+                self.config.get("skill_ledger_path") or default_ledger_path("section3-skill-nft-ledger.jsonl"),
+                batch_size=self.config.get("skill_batch_size", 64),
+                max_delay=self.config.get("skill_batch_max_delay_s", 2.0),
+                on_commit=self._anchor_skill_batch,
+            )
+        return self.skill_minter
+    
+    def _anchor_skill_batch(self, batch: Dict[str, Any]) -> None:
+        """Submit a committed batch root to the skill contract when a member is configured"""
+        if BLOCKCHAIN_AVAILABLE and self.blockchain_member:
+            tx_hash = self.blockchain_member.send_transaction(
+                to="0xSKILL_CONTRACT",
+                data=json.dumps({"merkle_root": batch["root"], "batch": batch["batch"], "size": batch["size"]})
+            )
+            logger.info(f"Skill NFT batch {batch['batch']} anchored ({batch['size']} certificates, tx: {tx_hash})")
+    
     def get_eeg_signature(self, user_id: str) -> Dict[str, float]:
         """
         Generate unique neural signature for skill verification
@@ -1105,6 +1344,8 @@ async def main():
     # 5. Finance: Blockchain Skill Certification
     print("\n5. 💰 Finance - Blockchain Skill NFT")
     tx_hash = life_algorithm.mint_skill_nft("user123", "machine_learning")
+    if life_algorithm.skill_minter:
+        life_algorithm.skill_minter.flush()
     print(f"   NFT Minted: {tx_hash}")
     
     # 6. Neural Predictive Coding
@@ -0,0 +1,382 @@
+"""
+L.I.F.E Algorithm - Merkle-Batched Ledger
+
+Batching minter for learning records and skill NFTs. Records are buffered and,
+once a size or time threshold is reached, hashed into a Merkle tree. One line
+per batch is appended to a local JSONL ledger holding the root, the hash of the
+previous batch line, and every record with its compact inclusion proof, so a
+single root (one on-chain transaction in production) certifies the whole batch.
+
+Design notes
+  - Leaves and nodes are domain-separated SHA-256 (RFC 6962 / 9162 tree shape),
+    so a proof is just the leaf index, the tree size, and the sibling hashes
+  - Records are hashed as canonical JSON (sorted keys, no whitespace)
+  - The ledger is append-only and chained; on restart it is replayed to restore
+    the sequence counters, and a torn final line from a crash is cut off
+  - The ledger file doubles as the test stand-in for a real chain
+  - Ledgers live under $LIFE_LEDGER_DIR, else data/ledger relative to the
+    working directory (see default_ledger_path)
+
+Usage
+    minter = MerkleBatchMinter(default_ledger_path("life-ledger.jsonl"), batch_size=256, max_delay=1.0)
+    receipt = minter.submit({"token_id": "LIFE-NFT-000001", "score": 0.9})
+    minter.flush()
+    record, proof, root = minter.ledger.lookup("LIFE-NFT-000001")
+    assert verify(record, proof, root)
+
+Copyright 2025 - Sergio Paya Benaully
+Azure Marketplace Offer ID: 9a600d96-fe1e-420b-902a-a0c42c561adb
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LEDGER_DIR_ENV = "LIFE_LEDGER_DIR"
+DEFAULT_LEDGER_DIR = Path("data") / "ledger"
+
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+
+def default_ledger_path(name: str) -> Path:
+    """``name`` under $LIFE_LEDGER_DIR when set, else under DEFAULT_LEDGER_DIR"""
+    return Path(os.environ.get(LEDGER_DIR_ENV) or DEFAULT_LEDGER_DIR) / name
+
+
+def canonical_bytes(record: Mapping[str, Any]) -> bytes:
+    """Stable JSON encoding used for hashing; non-JSON values fall back to str()"""
+    return json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def leaf_hash(record: Mapping[str, Any]) -> bytes:
+    return hashlib.sha256(_LEAF_PREFIX + canonical_bytes(record)).digest()
+
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(_NODE_PREFIX + left + right).digest()
+
+
+def merkle_levels(leaves: List[bytes]) -> List[List[bytes]]:
+    """All tree levels, leaves first; an unpaired last node is carried up unchanged"""
+    if not leaves:
+        raise ValueError("cannot build a Merkle tree without leaves")
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [_node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def inclusion_path(levels: List[List[bytes]], index: int) -> List[bytes]:
+    """Sibling hashes from leaf to root; levels where the node is carried up add nothing"""
+    path = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append(level[sibling])
+        index //= 2
+    return path
+
+
+def verify(record: Mapping[str, Any], proof: Mapping[str, Any], root: str) -> bool:
+    """
+    Check that a record is included under a Merkle root
+
+    Args:
+        record: The record exactly as it was submitted
+        proof: {"index": leaf index, "size": leaves in the batch, "path": [hex sibling hashes]}
+        root: Hex Merkle root of the batch
+
+    Returns:
+        True if the proof recomputes the root
+    """
+    try:
+        index = int(proof["index"])
+        last = int(proof["size"]) - 1
+        path = [bytes.fromhex(h) for h in proof["path"]]
+        expected = bytes.fromhex(root)
+    except (KeyError, TypeError, ValueError):
+        return False
+    if not 0 <= index <= last:
+        return False
+
+    # RFC 9162 section 2.1.3.2
+    node = leaf_hash(record)
+    for sibling in path:
+        if last == 0:
+            return False
+        if index & 1 or index == last:
+            node = _node_hash(sibling, node)
+            if not index & 1:
+                while index and not index & 1:
+                    index >>= 1
+                    last >>= 1
+        else:
+            node = _node_hash(node, sibling)
+        index >>= 1
+        last >>= 1
+    return last == 0 and node == expected
+
+
+def _utc_timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class MerkleLedger:
+    """Append-only JSONL file with one chained line per committed batch"""
+
+    def __init__(self, path: os.PathLike | str, fsync: bool = False):
+        self.path = Path(path)
+        self.fsync = fsync
+        self.batch_count = 0
+        self.record_count = 0
+        self.head = ""  # sha256 of the last batch line
+        self._index: Dict[str, Tuple[int, int]] = {}  # token_id -> (batch, leaf)
+        self._offsets: List[int] = []
+        self._recover()
+
+    def _recover(self) -> None:
+        if not self.path.exists():
+            return
+        good_end = 0
+        with open(self.path, "rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    batch = json.loads(raw)
+                except ValueError:
+                    break
+                self._track(batch, good_end)
+                self.head = hashlib.sha256(raw.rstrip(b"\n")).hexdigest()
+                good_end += len(raw)
+        if good_end < self.path.stat().st_size:
+            logger.warning("Ledger %s ends with a torn batch; truncating to %d bytes", self.path, good_end)
+            with open(self.path, "r+b") as f:
+                f.truncate(good_end)
+
+    def _track(self, batch: Mapping[str, Any], offset: int) -> None:
+        for leaf, entry in enumerate(batch["records"]):
+            token_id = entry["record"].get("token_id")
+            if token_id is not None:
+                self._index[str(token_id)] = (batch["batch"], leaf)
+        self._offsets.append(offset)
+        self.batch_count = batch["batch"] + 1
+        self.record_count += batch["size"]
+
+    def append(self, records: List[Mapping[str, Any]]) -> Dict[str, Any]:
+        """Build the tree for a batch, append it, and return the batch line"""
+        levels = merkle_levels([leaf_hash(r) for r in records])
+        root = levels[-1][0].hex()
+        size = len(records)
+        batch = {
+            "batch": self.batch_count,
+            "root": root,
+            "prev": self.head,
+            "size": size,
+            "committed_at": _utc_timestamp(),
+            "records": [
+                {"record": record, "proof": {"index": i, "size": size,
+                                             "path": [h.hex() for h in inclusion_path(levels, i)]}}
+                for i, record in enumerate(records)
+            ],
+        }
+        line = json.dumps(batch, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(line + b"\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self._track(batch, offset)
+        self.head = hashlib.sha256(line).hexdigest()
+        return batch
+
+    def read_batch(self, number: int) -> Dict[str, Any]:
+        with open(self.path, "rb") as f:
+            f.seek(self._offsets[number])
+            return json.loads(f.readline())
+
+    def batches(self) -> Iterator[Dict[str, Any]]:
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            for _ in range(self.batch_count):
+                yield json.loads(f.readline())
+
+    def lookup(self, token_id: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], str]]:
+        """(record, proof, root) for a committed token id, or None"""
+        location = self._index.get(str(token_id))
+        if location is None:
+            return None
+        batch = self.read_batch(location[0])
+        entry = batch["records"][location[1]]
+        return entry["record"], entry["proof"], batch["root"]
+
+    def verify_chain(self) -> bool:
+        """Re-check every batch root and the prev-hash links"""
+        prev = ""
+        if not self.path.exists():
+            return True
+        with open(self.path, "rb") as f:
+            for raw in f:
+                line = raw.rstrip(b"\n")
+                batch = json.loads(line)
+                if batch["prev"] != prev:
+                    return False
+                levels = merkle_levels([leaf_hash(e["record"]) for e in batch["records"]])
+                if levels[-1][0].hex() != batch["root"]:
+                    return False
+                prev = hashlib.sha256(line).hexdigest()
+        return True
+
+
+class MerkleBatchMinter:
+    """
+    Buffers records and commits them to a MerkleLedger in batches
+
+    A batch is committed when ``batch_size`` records are pending or the oldest
+    pending record is ``max_delay`` seconds old (checked on submit and by a
+    one-shot timer armed when a batch opens). ``on_commit`` receives every
+    committed batch line, e.g. to anchor the root on a real chain.
+    """
+
+    def __init__(
+        self,
+        ledger: MerkleLedger | os.PathLike | str,
+        batch_size: int = 256,
+        max_delay: Optional[float] = 1.0,
+        on_commit: Optional[Callable[[Dict[str, Any]], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.ledger = ledger if isinstance(ledger, MerkleLedger) else MerkleLedger(ledger)
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.on_commit = on_commit
+        self.clock = clock
+        self._pending: List[Dict[str, Any]] = []
+        self._opened_at = 0.0
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self._closed = False
+
+    @property
+    def next_sequence(self) -> int:
+        """1-based sequence number the next submitted record will get"""
+        with self._lock:
+            return self.ledger.record_count + len(self._pending) + 1
+
+    def submit(self, record: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Queue a record for the next batch
+
+        Returns:
+            Receipt with the record's sequence number, leaf hash, the batch it
+            will land in, and "committed" if that batch was written by this call
+        """
+        entry = dict(record)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("minter is closed")
+            if not self._pending:
+                self._opened_at = self.clock()
+                self._arm_timer()
+            sequence = self.ledger.record_count + len(self._pending) + 1
+            batch = self.ledger.batch_count
+            self._pending.append(entry)
+            committed = None
+            if len(self._pending) >= self.batch_size or self._overdue():
+                committed = self._commit()
+        return {
+            "sequence": sequence,
+            "leaf": leaf_hash(entry).hex(),
+            "batch": batch,
+            "status": "committed" if committed else "pending",
+            "root": committed["root"] if committed else None,
+        }
+
+    def _overdue(self) -> bool:
+        return self.max_delay is not None and self.clock() - self._opened_at >= self.max_delay
+
+    def flush_if_due(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if self._pending and self._overdue():
+                return self._commit()
+        return None
+
+    def flush(self) -> Optional[Dict[str, Any]]:
+        """Commit whatever is pending; returns the batch line or None if empty"""
+        with self._lock:
+            return self._commit() if self._pending else None
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._closed = True
+
+    def _commit(self) -> Dict[str, Any]:
+        records, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = self.ledger.append(records)
+        logger.info("Merkle batch %d committed: %d records, root %s", batch["batch"], batch["size"], batch["root"])
+        if self.on_commit is not None:
+            try:
+                self.on_commit(batch)
+            except Exception as exc:
+                logger.warning("Merkle batch %d anchor callback failed: %s", batch["batch"], exc)
+        return batch
+
+    def _arm_timer(self) -> None:
+        # Only wall-clock minters get a timer; injected clocks rely on submit/flush_if_due
+        if self.max_delay is None or self.clock is not time.monotonic:
+            return
+        self._timer = threading.Timer(self.max_delay, self._timer_flush, args=(self.ledger.batch_count,))
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _timer_flush(self, batch: int) -> None:
+        with self._lock:
+            # A timer that lost the race with a size-triggered commit must not cut the next batch short
+            if self._pending and self.ledger.batch_count == batch:
+                self._commit()
+
+    def __enter__(self) -> "MerkleBatchMinter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def benchmark_minting(path: os.PathLike | str, num_records: int = 20000, batch_size: int = 256) -> Dict[str, float]:
+    """Submit synthetic learning records through a minter and report records per second"""
+    minter = MerkleBatchMinter(path, batch_size=batch_size, max_delay=None)
+    start = time.perf_counter()
+    for i in range(num_records):
+        minter.submit({"token_id": f"BENCH-{i:08d}", "attention": (i % 97) / 97.0, "domain": "education"})
+    minter.close()
+    elapsed = time.perf_counter() - start
+    return {
+        "records": float(num_records),
+        "batches": float(minter.ledger.batch_count),
+        "seconds": elapsed,
+        "records_per_second": num_records / elapsed if elapsed > 0 else float("inf"),
+    }
@@ -0,0 +1,337 @@
+"""
+L.I.F.E Algorithm - Versioned Model Store and Background Retraining
+
+Keeps serving models consistent while they are retrained. Full retrains run
+in a worker process so the event loop that serves predictions never waits on
+them; continuous updates go to a small incremental (partial_fit) learner in
+between.
+
+Features
+  - ModelStore: content-addressed model directory. A version is the SHA-256
+    of the serialised model, written to a temporary directory and renamed
+    into place, plus an atomically replaced CURRENT pointer.
+  - ModelRef: swappable reference to an immutable snapshot. Readers take one
+    snapshot per prediction, so a swap never changes the model halfway
+    through a request.
+  - BackgroundTrainer: runs a top-level fit function in a process pool. The
+    worker saves the fitted model to the store; the parent loads it by
+    version and swaps it in unless a later-submitted retrain already was,
+    then prunes old versions.
+  - OnlineLearner: copy-on-write partial_fit. Each update is applied to a
+    copy that replaces the live estimator in one assignment.
+
+Usage
+    store = ModelStore("models/section4")
+    ref = ModelRef()
+    trainer = BackgroundTrainer(store, ref)
+    version = await trainer.retrain(fit_fn, X, y)   # fit_fn(X, y, **kwargs) -> model
+    snapshot = ref.get()                            # use snapshot.model for one request
+
+Copyright 2025 - Sergio Paya Benaully
+Azure Marketplace Offer ID: 9a600d96-fe1e-420b-902a-a0c42c561adb
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import joblib
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = "model.joblib"
+METADATA_FILE = "metadata.json"
+POINTER_FILE = "CURRENT"
+
+
+@dataclass(frozen=True)
+class ModelVersion:
+    """One immutable serving snapshot"""
+
+    version: str
+    model: Any
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    path: Optional[str] = None
+
+
+class ModelStore:
+    """
+    Content-addressed model directory
+
+        root/<version>/model.joblib
+        root/<version>/metadata.json
+        root/CURRENT              (version currently published)
+
+    Versions are named by the hash of the model bytes, so saving the same
+    model twice is a no-op and a version directory never changes once
+    written.
+    """
+
+    def __init__(self, root: Union[str, Path], hash_length: int = 16) -> None:
+        self.root = Path(root)
+        self.hash_length = hash_length
+
+    def _dir(self, version: str) -> Path:
+        return self.root / version
+
+    def save(self, model: Any, metadata: Optional[Dict[str, Any]] = None) -> ModelVersion:
+        """Serialise ``model`` into its content-addressed directory"""
+        buffer = io.BytesIO()
+        joblib.dump(model, buffer)
+        payload = buffer.getvalue()
+        version = hashlib.sha256(payload).hexdigest()[:self.hash_length]
+        meta = {"version": version, "saved_at": datetime.now().isoformat(), "bytes": len(payload)}
+        meta.update(metadata or {})
+
+        target = self._dir(version)
+        if not target.exists():
+            self.root.mkdir(parents=True, exist_ok=True)
+            staging = self.root / f".tmp-{uuid.uuid4().hex}"
+            staging.mkdir()
+            try:
+                (staging / MODEL_FILE).write_bytes(payload)
+                (staging / METADATA_FILE).write_text(json.dumps(meta, indent=2, default=str))
+                os.replace(staging, target)
+            except OSError:
+                # Lost a race with an identical save; the winner's copy is equivalent
+                if not target.exists():
+                    raise
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+        return ModelVersion(version, model, self.metadata(version), str(target / MODEL_FILE))
+
+    def load(self, version: str) -> ModelVersion:
+        target = self._dir(version)
+        if not (target / MODEL_FILE).exists():
+            raise KeyError(f"unknown model version {version!r}")
+        return ModelVersion(version, joblib.load(target / MODEL_FILE), self.metadata(version), str(target / MODEL_FILE))
+
+    def metadata(self, version: str) -> Dict[str, Any]:
+        path = self._dir(version) / METADATA_FILE
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    def versions(self) -> List[str]:
+        """Stored versions, oldest first"""
+        if not self.root.is_dir():
+            return []
+        found = [p for p in self.root.iterdir() if p.is_dir() and not p.name.startswith(".")]
+        return [p.name for p in sorted(found, key=lambda p: p.stat().st_mtime)]
+
+    def publish(self, version: str) -> None:
+        """Point CURRENT at ``version`` (atomic rename of a temporary pointer file)"""
+        if not (self._dir(version) / MODEL_FILE).exists():
+            raise KeyError(f"unknown model version {version!r}")
+        staging = self.root / f".{POINTER_FILE}-{uuid.uuid4().hex}"
+        staging.write_text(version)
+        os.replace(staging, self.root / POINTER_FILE)
+
+    def current_version(self) -> Optional[str]:
+        pointer = self.root / POINTER_FILE
+        return pointer.read_text().strip() if pointer.exists() else None
+
+    def load_current(self) -> Optional[ModelVersion]:
+        version = self.current_version()
+        return self.load(version) if version else None
+
+    def prune(self, keep: int = 5) -> List[str]:
+        """Delete all but the newest ``keep`` versions, never the published one"""
+        current = self.current_version()
+        stale = [v for v in self.versions()[:-keep or None] if v != current] if keep > 0 else []
+        for version in stale:
+            shutil.rmtree(self._dir(version), ignore_errors=True)
+        return stale
+
+
+class ModelRef:
+    """
+    Atomically swappable reference to a ModelVersion
+
+    get() is a single attribute read, so readers need no lock; writers
+    serialise through one and may make the swap conditional on the version
+    they started from (compare-and-swap).
+    """
+
+    def __init__(self, initial: Optional[ModelVersion] = None) -> None:
+        self._current = initial
+        self._lock = threading.Lock()
+        self.swaps = 0
+
+    def get(self) -> Optional[ModelVersion]:
+        return self._current
+
+    def swap(self, new: ModelVersion, expected: Any = ...) -> bool:
+        """Install ``new``; with ``expected`` only if the current snapshot is still that one"""
+        with self._lock:
+            if expected is not ... and self._current is not expected:
+                return False
+            self._current = new
+            self.swaps += 1
+            return True
+
+
+def _fit_and_save(root: str, fit_fn: Callable[..., Any], X: Any, y: Any,
+                  fit_kwargs: Dict[str, Any], metadata: Dict[str, Any]) -> str:
+    # Runs in the worker process: fit, persist, and hand back only the version
+    model = fit_fn(X, y, **fit_kwargs)
+    return ModelStore(root).save(model, metadata).version
+
+
+class BackgroundTrainer:
+    """
+    Full retrains in a worker process, installed into a ModelRef when done
+
+    Args:
+        store: Where the worker saves models and the parent loads them from
+        ref: Reference swapped to each finished model
+        executor: Defaults to a one-worker spawn-context process pool, so a
+            retrain never competes with the serving process for the GIL
+        publish: Also move the store's CURRENT pointer to each new version
+        keep_versions: After publishing, prune the store down to this many
+            versions (None keeps everything)
+
+    Retrains are numbered as they are submitted. One that finishes after a
+    later-submitted retrain has been installed is stored but not swapped in
+    or published, so a slow, older fit never replaces a newer model.
+    """
+
+    def __init__(self, store: ModelStore, ref: ModelRef, executor: Optional[Executor] = None,
+                 publish: bool = True, keep_versions: Optional[int] = 5) -> None:
+        self.store = store
+        self.ref = ref
+        self.publish = publish
+        self.keep_versions = keep_versions
+        self._own_executor = executor is None
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._installed = 0
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.superseded = 0
+
+    @property
+    def executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def submit(self, fit_fn: Callable[..., Any], X: Any, y: Any, metadata: Optional[Dict[str, Any]] = None,
+               **fit_kwargs: Any) -> "Future[ModelVersion]":
+        """
+        Start a retrain; ``fit_fn`` must be a picklable top-level function
+
+        Returns:
+            Future resolving to the live ModelVersion once this retrain is
+            done: its own model, or the newer one that superseded it
+        """
+        meta = {"trained_at": datetime.now().isoformat(), "trainer": getattr(fit_fn, "__name__", str(fit_fn))}
+        meta.update(metadata or {})
+        outer: "Future[ModelVersion]" = Future()
+        with self._lock:
+            self.pending += 1
+            self._submitted += 1
+            generation = self._submitted
+        inner = self.executor.submit(_fit_and_save, str(self.store.root), fit_fn, X, y, fit_kwargs, meta)
+        inner.add_done_callback(lambda done: self._install(done, outer, generation))
+        return outer
+
+    def _install(self, done: Future, outer: "Future[ModelVersion]", generation: int) -> None:
+        # Runs on the executor's callback thread, never on the event loop
+        try:
+            loaded = self.store.load(done.result())
+            with self._lock:
+                installed = generation > self._installed
+                if installed:
+                    self._installed = generation
+                    self.ref.swap(loaded)
+                    if self.publish:
+                        self.store.publish(loaded.version)
+                    self.completed += 1
+                else:
+                    self.superseded += 1
+            if not installed:
+                logger.info("Model %s superseded by a newer retrain; not installed", loaded.version)
+                outer.set_result(self.ref.get() or loaded)
+                return
+            if self.publish and self.keep_versions is not None:
+                pruned = self.store.prune(self.keep_versions)
+                if pruned:
+                    logger.debug("Pruned model versions %s", pruned)
+            logger.info("Model %s installed", loaded.version)
+            outer.set_result(loaded)
+        except BaseException as exc:  # noqa: BLE001 - surfaced through the future
+            with self._lock:
+                self.failed += 1
+            logger.error("Background retrain failed: %s", exc)
+            outer.set_exception(exc)
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    async def retrain(self, fit_fn: Callable[..., Any], X: Any, y: Any,
+                      metadata: Optional[Dict[str, Any]] = None, **fit_kwargs: Any) -> ModelVersion:
+        """Awaitable submit(); the event loop keeps running while the worker fits"""
+        return await asyncio.wrap_future(self.submit(fit_fn, X, y, metadata, **fit_kwargs))
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None and self._own_executor:
+            executor.shutdown(wait=wait)
+
+
+class OnlineLearner:
+    """
+    Copy-on-write wrapper around an estimator with partial_fit
+
+    Each update fits a copy and replaces the live estimator in one
+    assignment, so a concurrent predict sees either the old or the new
+    weights, never a half-updated model.
+    """
+
+    def __init__(self, estimator: Any, classes: Sequence[Any]) -> None:
+        self.classes = list(classes)
+        self._estimator = estimator
+        self.updates = 0
+        self.samples_seen = 0
+
+    @property
+    def estimator(self) -> Any:
+        return self._estimator
+
+    @property
+    def fitted(self) -> bool:
+        return self.updates > 0
+
+    def partial_fit(self, X: Any, y: Any) -> "OnlineLearner":
+        updated = copy.deepcopy(self._estimator)
+        updated.partial_fit(X, y, classes=self.classes)
+        self._estimator = updated
+        self.updates += 1
+        self.samples_seen += len(y)
+        return self
+
+    def snapshot(self, version: Optional[str] = None) -> ModelVersion:
+        return ModelVersion(
+            version or f"online-{self.updates}",
+            self._estimator,
+            {"updates": self.updates, "samples_seen": self.samples_seen},
+        )
+
@@ -0,0 +1,330 @@
+"""
+L.I.F.E Algorithm - ONNX Export and ONNX Runtime Inference
+
+Exports the in-repo PyTorch models (VRAdaptationModel, LIFETransformer) and
+the scikit-learn classifiers (stress and motor-intent models) to ONNX,
+verifies every file against its source model, and serves it through ONNX
+Runtime on the CPU.
+
+Features
+  - export_torch_model / export_sklearn_model: write the ONNX file with a
+    dynamic batch axis, run onnx.checker, and compare ONNX Runtime outputs
+    with the source model on sample inputs. A mismatch raises instead of
+    leaving a silently wrong model on disk.
+  - Optional int8 dynamic quantisation (weights only) written next to the
+    fp32 file, with its own looser parity check.
+  - ONNXPredictor: CPU InferenceSession with predict / predict_proba for
+    classifier exports and run() for anything else.
+  - benchmark_backends: latency percentiles for any set of callables, e.g.
+    the source model against the fp32 and int8 ONNX files.
+
+All dependencies (torch, onnx, onnxruntime, skl2onnx) are optional; the
+functions raise ImportError naming what is missing.
+
+Usage
+    result = export_sklearn_model(classifier, "models/stress.onnx", n_features=10, quantize=True)
+    predictor = ONNXPredictor(result.path)
+    labels = predictor.predict(X)
+
+Copyright 2025 - Sergio Paya Benaully
+Azure Marketplace Offer ID: 9a600d96-fe1e-420b-902a-a0c42c561adb
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    torch = None  # type: ignore
+    TORCH_AVAILABLE = False
+
+try:
+    import onnx
+    ONNX_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    onnx = None  # type: ignore
+    ONNX_AVAILABLE = False
+
+try:
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    ONNXRUNTIME_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    ort = None  # type: ignore
+    ONNXRUNTIME_AVAILABLE = False
+
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+    SKL2ONNX_AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    SKL2ONNX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPSET = 17
+PathLike = Union[str, Path]
+
+
+def _require(**available: bool) -> None:
+    missing = [name for name, ok in available.items() if not ok]
+    if missing:
+        raise ImportError(f"ONNX export needs {', '.join(missing)}")
+
+
+@dataclass
+class ExportResult:
+    """Files written by an export and how closely they match the source model"""
+
+    path: str
+    source: str  # "torch" or "sklearn"
+    input_names: List[str]
+    output_names: List[str]
+    max_abs_error: float
+    quantized_path: Optional[str] = None
+    quantized_max_abs_error: Optional[float] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class ONNXPredictor:
+    """
+    ONNX Runtime CPU session for an exported model
+
+    Inputs are cast to float32. For sklearn classifier exports, output 0 is
+    the label and output 1 the class-probability matrix.
+    """
+
+    def __init__(self, path: PathLike, intra_op_threads: Optional[int] = None) -> None:
+        _require(onnxruntime=ONNXRUNTIME_AVAILABLE)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        self.path = str(path)
+        self.session = ort.InferenceSession(self.path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.output_names = [o.name for o in self.session.get_outputs()]
+
+    def run(self, *inputs: Any, **named: Any) -> List[np.ndarray]:
+        feeds = dict(zip(self.input_names, inputs))
+        feeds.update(named)
+        return self.session.run(None, {k: np.asarray(v, dtype=np.float32) for k, v in feeds.items()})
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.run(X)[0]
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        outputs = self.run(X)
+        if len(outputs) < 2:
+            raise ValueError("model has no probability output")
+        return outputs[1]
+
+
+def _quantize(path: Path) -> Path:
+    quantized = path.with_name(f"{path.stem}.int8{path.suffix}")
+    quantize_dynamic(str(path), str(quantized), weight_type=QuantType.QInt8)
+    return quantized
+
+
+def _max_error(expected: Sequence[np.ndarray], actual: Sequence[np.ndarray]) -> float:
+    return max(float(np.max(np.abs(np.asarray(e, dtype=np.float64) - np.asarray(a, dtype=np.float64))))
+               if np.size(e) else 0.0 for e, a in zip(expected, actual))
+
+
+def export_torch_model(model: Any, sample_inputs: Sequence[Any], path: PathLike, input_names: Sequence[str],
+                       output_names: Sequence[str], dynamic_axes: Mapping[str, Mapping[int, str]],
+                       quantize: bool = False, opset: int = DEFAULT_OPSET, atol: float = 1e-4,
+                       quantized_atol: float = 0.1) -> ExportResult:
+    """
+    Export a torch.nn.Module in eval mode and verify it with ONNX Runtime
+
+    The module's train/eval mode is restored afterwards, so exporting a model
+    that is still being trained does not switch off its dropout.
+
+    Args:
+        sample_inputs: Example tensors (or arrays) for tracing and the parity check
+        dynamic_axes: Per input/output name, the axes that may vary at run time
+        atol: Largest allowed absolute difference of the fp32 file
+        quantized_atol: The same for the int8 file, which trades accuracy for size
+    """
+    _require(torch=TORCH_AVAILABLE, onnx=ONNX_AVAILABLE, onnxruntime=ONNXRUNTIME_AVAILABLE)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    was_training = model.training
+    model.eval()
+    tensors = tuple(torch.as_tensor(np.asarray(x, dtype=np.float32)) for x in sample_inputs)
+    try:
+        with torch.no_grad():
+            torch.onnx.export(model, tensors, str(path), input_names=list(input_names),
+                              output_names=list(output_names),
+                              dynamic_axes={k: dict(v) for k, v in dynamic_axes.items()},
+                              opset_version=opset, do_constant_folding=True)
+            expected = model(*tensors)
+    finally:
+        model.train(was_training)
+    expected = [t.numpy() for t in (expected if isinstance(expected, (tuple, list)) else (expected,))]
+    onnx.checker.check_model(str(path))
+
+    arrays = [t.numpy() for t in tensors]
+    error = _max_error(expected, ONNXPredictor(path).run(*arrays))
+    if error > atol:
+        raise ValueError(f"ONNX export of {type(model).__name__} differs by {error:.2e} (> {atol:g})")
+    result = ExportResult(str(path), "torch", list(input_names), list(output_names), error,
+                          metadata={"opset": opset, "model": type(model).__name__})
+    if quantize:
+        quantized = _quantize(path)
+        result.quantized_path = str(quantized)
+        result.quantized_max_abs_error = _max_error(expected, ONNXPredictor(quantized).run(*arrays))
+        if result.quantized_max_abs_error > quantized_atol:
+            raise ValueError(f"int8 export differs by {result.quantized_max_abs_error:.2e} (> {quantized_atol:g})")
+    logger.info("Exported %s to %s (max abs error %.2e)", type(model).__name__, path, error)
+    return result
+
+
+def export_vr_adaptation_model(model: Any, path: PathLike, batch_size: int = 8, quantize: bool = False,
+                               seed: int = 0) -> ExportResult:
+    """VRAdaptationModel: features [batch, input_dim] -> adaptation [batch, output_dim]"""
+    sample = np.random.default_rng(seed).normal(size=(batch_size, model.input_dim))
+    return export_torch_model(model, [sample], path, ["features"], ["adaptation"],
+                              {"features": {0: "batch"}, "adaptation": {0: "batch"}}, quantize=quantize)
+
+
+def export_life_transformer(model: Any, path: PathLike, seq_len: int = 6, batch_size: int = 4,
+                            quantize: bool = False, seed: int = 0) -> ExportResult:
+    """LIFETransformer: experiences [seq, batch, input_dim], traits [batch, trait_dim] -> outcome [batch]"""
+    rng = np.random.default_rng(seed)
+    experiences = rng.normal(size=(seq_len, batch_size, model.input_dim))
+    traits = rng.normal(size=(batch_size, model.trait_dim))
+    return export_torch_model(
+        model, [experiences, traits], path, ["experiences", "traits"], ["outcome"],
+        {"experiences": {0: "sequence", 1: "batch"}, "traits": {0: "batch"}, "outcome": {0: "batch"}},
+        quantize=quantize, atol=1e-3,
+    )
+
+
+def export_sklearn_model(model: Any, path: PathLike, n_features: Optional[int] = None,
+                         sample_inputs: Optional[Any] = None, quantize: bool = False,
+                         opset: int = DEFAULT_OPSET, atol: float = 1e-4, seed: int = 0) -> ExportResult:
+    """
+    Export a fitted scikit-learn estimator and verify it with ONNX Runtime
+
+    Classifiers export labels plus a plain probability matrix (no ZipMap);
+    the check requires identical labels and probabilities within ``atol``.
+    """
+    _require(skl2onnx=SKL2ONNX_AVAILABLE, onnx=ONNX_AVAILABLE, onnxruntime=ONNXRUNTIME_AVAILABLE)
+    n_features = n_features or getattr(model, "n_features_in_", None)
+    if not n_features:
+        raise ValueError("n_features is required for an unfitted or featureless model")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    is_classifier = hasattr(model, "predict_proba")
+    options = {id(model): {"zipmap": False}} if is_classifier else None
+    onnx_model = convert_sklearn(model, initial_types=[("features", FloatTensorType([None, n_features]))],
+                                 options=options, target_opset=opset)
+    path.write_bytes(onnx_model.SerializeToString())
+    onnx.checker.check_model(str(path))
+
+    X = np.asarray(sample_inputs if sample_inputs is not None
+                   else np.random.default_rng(seed).normal(size=(64, n_features)), dtype=np.float32)
+    predictor = ONNXPredictor(path)
+    error = _check_sklearn(model, predictor, X, is_classifier, atol)
+    result = ExportResult(str(path), "sklearn", predictor.input_names, predictor.output_names, error,
+                          metadata={"opset": opset, "model": type(model).__name__})
+    if quantize:
+        # Tree ensembles have no MatMul weights to quantise; the file then equals the fp32 one
+        quantized = _quantize(path)
+        result.quantized_path = str(quantized)
+        result.quantized_max_abs_error = _check_sklearn(model, ONNXPredictor(quantized), X, is_classifier,
+                                                        atol=0.1, labels_must_match=False)
+    logger.info("Exported %s to %s (max abs error %.2e)", type(model).__name__, path, error)
+    return result
+
+
+def _check_sklearn(model: Any, predictor: ONNXPredictor, X: np.ndarray, is_classifier: bool, atol: float,
+                   labels_must_match: bool = True) -> float:
+    outputs = predictor.run(X)
+    if is_classifier:
+        if labels_must_match and not np.array_equal(outputs[0], model.predict(X)):
+            raise ValueError("ONNX labels differ from the source classifier")
+        error = _max_error([model.predict_proba(X)], [outputs[1]])
+    else:
+        error = _max_error([np.asarray(model.predict(X)).reshape(outputs[0].shape)], [outputs[0]])
+    if error > atol:
+        raise ValueError(f"ONNX export of {type(model).__name__} differs by {error:.2e} (> {atol:g})")
+    return error
+
+
+def export_model(model: Any, path: PathLike, sample_inputs: Optional[Sequence[Any]] = None,
+                 quantize: bool = False) -> ExportResult:
+    """Dispatch on the model type: torch module, known L.I.F.E torch model, or sklearn estimator"""
+    if TORCH_AVAILABLE and isinstance(model, torch.nn.Module):
+        name = type(model).__name__
+        if sample_inputs is None and name == "VRAdaptationModel":
+            return export_vr_adaptation_model(model, path, quantize=quantize)
+        if sample_inputs is None and name == "LIFETransformer":
+            return export_life_transformer(model, path, quantize=quantize)
+        if sample_inputs is None:
+            raise ValueError(f"sample_inputs are required to export {name}")
+        names = [f"input_{i}" for i in range(len(sample_inputs))]
+        axes = {n: {0: "batch"} for n in names + ["output"]}
+        return export_torch_model(model, sample_inputs, path, names, ["output"], axes, quantize=quantize)
+    if hasattr(model, "predict"):
+        X = None if sample_inputs is None else sample_inputs[0]
+        return export_sklearn_model(model, path, sample_inputs=X, quantize=quantize)
+    raise TypeError(f"cannot export {type(model).__name__} to ONNX")
+
+
+def benchmark_backends(backends: Mapping[str, Callable[[], Any]], repeats: int = 200,
+                       warmup: int = 10) -> Dict[str, Dict[str, float]]:
+    """
+    Latency of each zero-argument callable, in milliseconds
+
+    Returns:
+        {name: {"p50_ms", "p99_ms", "mean_ms"}}
+    """
+    report = {}
+    for name, call in backends.items():
+        for _ in range(warmup):
+            call()
+        samples = np.empty(repeats)
+        for i in range(repeats):
+            start = time.perf_counter()
+            call()
+            samples[i] = time.perf_counter() - start
+        samples *= 1000.0
+        report[name] = {
+            "p50_ms": float(np.percentile(samples, 50)),
+            "p99_ms": float(np.percentile(samples, 99)),
+            "mean_ms": float(samples.mean()),
+        }
+    return report
+
+
+def benchmark_export(model: Any, result: ExportResult, inputs: Sequence[Any],
+                     repeats: int = 200) -> Dict[str, Dict[str, float]]:
+    """Source model vs the fp32 ONNX file vs the int8 file (when exported) on the same inputs"""
+    arrays = [np.asarray(x, dtype=np.float32) for x in inputs]
+    if result.source == "torch":
+        tensors = [torch.as_tensor(a) for a in arrays]
+
+        def source() -> Any:
+            with torch.no_grad():
+                return model(*tensors)
+    else:
+        source = lambda: model.predict(arrays[0])  # noqa: E731
+    backends: Dict[str, Callable[[], Any]] = {result.source: source}
+    fp32 = ONNXPredictor(result.path)
+    backends["onnx_fp32"] = lambda: fp32.run(*arrays)
+    if result.quantized_path:
+        int8 = ONNXPredictor(result.quantized_path)
+        backends["onnx_int8"] = lambda: int8.run(*arrays)
+    return benchmark_backends(backends, repeats=repeats)
@@ -0,0 +1,200 @@
+"""
+L.I.F.E Algorithm - Partitioned Columnar Learning-Outcome Store
+
+Local store for learning outcomes that cohort analytics can query without
+scanning everything. Rows are appended in batches as column files, split
+into one directory per domain and day.
+
+Features
+  - Hive-style partitions: root/domain=<domain>/date=<YYYY-MM-DD>/part-*.
+    Each append writes one part file per partition it touches, via a
+    temporary file and an atomic rename.
+  - Parquet part files when pyarrow is installed, otherwise numpy .npz
+    files; both are read back transparently.
+  - read() prunes partitions by domain and date range before opening any
+    file and loads only the requested columns.
+  - aggregate(): per-domain count, distinct users and metric means.
+
+Usage
+    store = OutcomeStore("data/outcomes")
+    store.append(columns)                 # dict of equal-length numpy arrays
+    store.aggregate(start="2025-01-01")   # {"education": {"count": ..., ...}, ...}
+
+Copyright 2025 - Sergio Paya Benaully
+Azure Marketplace Offer ID: 9a600d96-fe1e-420b-902a-a0c42c561adb
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import uuid
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:  # pragma: no cover - pyarrow is optional
+    PARQUET_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+METRIC_COLUMNS = ("skill_improvement", "neural_adaptation", "completion_time", "confidence_score")
+# Stored in every part file; domain and date live in the partition path
+FILE_COLUMNS = ("session_id", "user_id", "timestamp") + METRIC_COLUMNS
+COLUMNS = ("domain", "date") + FILE_COLUMNS
+
+DateLike = Union[str, date, np.datetime64, None]
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def _day(value: DateLike) -> Optional[np.datetime64]:
+    return None if value is None else np.datetime64(value, "D")
+
+
+def _empty_columns(names: Sequence[str]) -> Dict[str, np.ndarray]:
+    empty = {"timestamp": np.array([], dtype="datetime64[us]"), "date": np.array([], dtype="datetime64[D]")}
+    return {n: empty.get(n, np.array([], dtype=float if n in METRIC_COLUMNS else str)) for n in names}
+
+
+class OutcomeStore:
+    """Append-only, (domain, date)-partitioned column files under ``root``"""
+
+    def __init__(self, root: Union[str, Path], file_format: Optional[str] = None) -> None:
+        self.root = Path(root)
+        self.file_format = file_format or ("parquet" if PARQUET_AVAILABLE else "npz")
+        if self.file_format == "parquet" and not PARQUET_AVAILABLE:
+            raise ImportError("Parquet part files need pyarrow")
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def append(self, columns: Mapping[str, Any]) -> int:
+        """
+        Append rows given as equal-length columns
+
+        Required: domain, timestamp (datetime64-convertible) and the
+        FILE_COLUMNS; returns the number of rows written.
+        """
+        domains = np.asarray(columns["domain"], dtype=str)
+        timestamps = np.asarray(columns["timestamp"], dtype="datetime64[us]")
+        n = len(domains)
+        if n == 0:
+            return 0
+        data = {name: np.asarray(columns[name]) for name in FILE_COLUMNS if name != "timestamp"}
+        data["timestamp"] = timestamps
+        data["session_id"] = data["session_id"].astype(str)
+        data["user_id"] = data["user_id"].astype(str)
+        for name in METRIC_COLUMNS:
+            data[name] = data[name].astype(float)
+        if any(len(v) != n for v in data.values()):
+            raise ValueError("all outcome columns must have the same length")
+
+        # Few distinct domains: hash-based unique plus one mask each beats sorting the strings
+        names = np.unique(domains)
+        domain_codes = np.zeros(n, dtype=np.int64)
+        for code, name in enumerate(names[1:], start=1):
+            domain_codes[domains == name] = code
+        days = timestamps.astype("datetime64[D]").astype(np.int64)
+        order = np.lexsort((days, domain_codes))
+        keys = domain_codes[order] * (1 << 32) + (days[order] - days.min())
+        bounds = np.flatnonzero(np.diff(keys)) + 1
+        for rows in np.split(order, bounds):
+            first = rows[0]
+            partition = self._partition_dir(names[domain_codes[first]], np.datetime64(int(days[first]), "D"))
+            self._write_part(partition, {name: column[rows] for name, column in data.items()})
+        logger.debug("Appended %d outcomes in %d partitions under %s", n, len(bounds) + 1, self.root)
+        return n
+
+    def _partition_dir(self, domain: str, day: np.datetime64) -> Path:
+        if not _SAFE_NAME.match(domain):
+            raise ValueError(f"unsupported domain name {domain!r}")
+        return self.root / f"domain={domain}" / f"date={day}"
+
+    def _write_part(self, partition: Path, data: Dict[str, np.ndarray]) -> None:
+        partition.mkdir(parents=True, exist_ok=True)
+        name = f"part-{uuid.uuid4().hex}.{self.file_format}"
+        staging = partition / f".{name}"
+        if self.file_format == "parquet":
+            pq.write_table(pa.table({k: pa.array(v) for k, v in data.items()}), staging)
+        else:
+            with open(staging, "wb") as handle:
+                np.savez(handle, **data)
+        os.replace(staging, partition / name)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def partitions(self, domain: Optional[str] = None, start: DateLike = None,
+                   end: DateLike = None) -> List[Tuple[str, np.datetime64, Path]]:
+        """(domain, date, directory) of partitions matching the filters; ``end`` is inclusive"""
+        first, last = _day(start), _day(end)
+        found = []
+        pattern = f"domain={domain}" if domain else "domain=*"
+        for domain_dir in sorted(self.root.glob(pattern)):
+            for date_dir in sorted(domain_dir.glob("date=*")):
+                day = np.datetime64(date_dir.name[len("date="):], "D")
+                if (first is None or day >= first) and (last is None or day <= last):
+                    found.append((domain_dir.name[len("domain="):], day, date_dir))
+        return found
+
+    def _read_part(self, path: Path, names: Sequence[str]) -> Dict[str, np.ndarray]:
+        if path.suffix == ".parquet":
+            table = pq.read_table(path, columns=list(names))
+            out = {}
+            for name in names:
+                column = table.column(name).to_numpy()
+                out[name] = column.astype(str) if column.dtype == object else column
+            return out
+        with np.load(path) as part:
+            return {name: part[name] for name in names}
+
+    def read(self, domain: Optional[str] = None, start: DateLike = None, end: DateLike = None,
+             columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """Concatenated columns of the matching partitions"""
+        wanted = list(columns or COLUMNS)
+        file_columns = [c for c in wanted if c in FILE_COLUMNS]
+        pieces: Dict[str, List[np.ndarray]] = {name: [] for name in wanted}
+        for part_domain, day, directory in self.partitions(domain, start, end):
+            for path in sorted(directory.glob("part-*")):
+                part = self._read_part(path, file_columns or ["timestamp"])
+                rows = len(next(iter(part.values())))
+                for name in wanted:
+                    if name == "domain":
+                        pieces[name].append(np.full(rows, part_domain))
+                    elif name == "date":
+                        pieces[name].append(np.full(rows, day))
+                    else:
+                        pieces[name].append(part[name])
+        empty = _empty_columns(wanted)
+        return {name: np.concatenate(chunks) if chunks else empty[name] for name, chunks in pieces.items()}
+
+    def count(self, domain: Optional[str] = None, start: DateLike = None, end: DateLike = None) -> int:
+        return len(self.read(domain, start, end, columns=["timestamp"])["timestamp"])
+
+    def aggregate(self, domain: Optional[str] = None, start: DateLike = None,
+                  end: DateLike = None) -> Dict[str, Dict[str, float]]:
+        """
+        Per-domain cohort summary
+
+        Returns:
+            {domain: {"count", "unique_users", "mean_<metric>" for each metric}}
+        """
+        summary: Dict[str, Dict[str, float]] = {}
+        domains = sorted({d for d, _, _ in self.partitions(domain, start, end)})
+        for name in domains:
+            data = self.read(name, start, end, columns=["user_id", *METRIC_COLUMNS])
+            stats: Dict[str, float] = {
+                "count": int(len(data["user_id"])),
+                "unique_users": int(len(np.unique(data["user_id"]))),
+            }
+            for metric in METRIC_COLUMNS:
+                stats[f"mean_{metric}"] = float(data[metric].mean()) if len(data[metric]) else 0.0
+            summary[name] = stats
+        return summary
@@ -0,0 +1,545 @@
+"""
+L.I.F.E Algorithm - Local QUBO Annealer
+
+In-process NumPy solver for the quadratic unconstrained binary optimisation
+(QUBO) problems behind the "quantum" EEG feature selectors. It mirrors the
+Azure Quantum optimisation shape (Problem / add_term / solver.optimize) so the
+same problem can be solved locally when no quantum workspace is configured,
+which is always the case offline.
+
+Features
+  - Problem with add_term(c, indices) plus dense add_linear / add_quadratic
+  - SimulatedAnnealing and ParallelTempering over a (replicas x variables)
+    bit matrix, with local fields kept up to date so every flip proposal costs
+    one vectorised O(replicas) energy delta
+  - Relevance-minus-redundancy (mRMR-style) feature selection QUBOs with an
+    optional exact-cardinality penalty; when a problem carries a cardinality
+    the local solvers move by swapping one selected and one unselected
+    variable, so they never have to climb over the penalty
+  - Exhaustive search for small instances (tests, verification)
+
+Energy convention (minimised, x in {0, 1}):
+    E(x) = offset + sum_i h_i x_i + sum_{i<j} J_ij x_i x_j
+
+Copyright 2025 - Sergio Paya Benaully
+Azure Marketplace Offer ID: 9a600d96-fe1e-420b-902a-a0c42c561adb
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from feature_ranking import top_k_indices
+
+# Dense selection QUBOs carry n^2 / 2 pair terms; larger inputs are shortlisted
+# by relevance before the problem is built
+MAX_QUBO_CANDIDATES = 100
+
+class Problem:
+    """QUBO problem with the add_term interface of azure.quantum.optimization.Problem"""
+
+    def __init__(self, name: str = "qubo", num_variables: int = 0, problem_type: Any = None) -> None:
+        self.name = name
+        self.problem_type = problem_type
+        self.offset = 0.0
+        # Exact number of ones every feasible solution has; local solvers then use
+        # cardinality-preserving swap moves instead of single flips
+        self.cardinality: Optional[int] = None
+        self._n = int(num_variables)
+        self._linear: List[Tuple[int, float]] = []
+        self._pairs: List[Tuple[int, int, float]] = []
+        self._dense_h: Optional[np.ndarray] = None
+        self._dense_J: Optional[np.ndarray] = None
+
+    @property
+    def num_variables(self) -> int:
+        return self._n
+
+    def _grow(self, *indices: int) -> None:
+        for i in indices:
+            if i < 0:
+                raise ValueError("variable indices must be non-negative")
+            self._n = max(self._n, i + 1)
+
+    def add_term(self, c: float, indices: Sequence[int]) -> None:
+        """Add c * prod(x[i] for i in indices); constant, linear and quadratic terms only"""
+        idx = [int(i) for i in indices]
+        c = float(c)
+        if len(idx) == 0:
+            self.offset += c
+        elif len(idx) == 1 or (len(idx) == 2 and idx[0] == idx[1]):
+            self._grow(idx[0])
+            self._linear.append((idx[0], c))  # x * x == x for binaries
+        elif len(idx) == 2:
+            self._grow(*idx)
+            self._pairs.append((idx[0], idx[1], c))
+        else:
+            raise ValueError("only terms of degree <= 2 are supported (QUBO)")
+
+    def add_terms(self, terms: Iterable[Any]) -> None:
+        """Add (c, indices) tuples or objects with .c and .ids / .indices"""
+        for term in terms:
+            if isinstance(term, tuple):
+                self.add_term(*term)
+            else:
+                self.add_term(term.c, getattr(term, "ids", None) or term.indices)
+
+    def add_linear(self, h: Sequence[float]) -> None:
+        """Dense linear coefficients for variables 0..len(h)-1"""
+        h = np.asarray(h, dtype=float)
+        self._grow(len(h) - 1)
+        self._dense_h = h.copy() if self._dense_h is None else _pad_add(self._dense_h, h)
+
+    def add_quadratic(self, J: np.ndarray) -> None:
+        """Dense pair coefficients; J[i, j] + J[j, i] multiplies x_i x_j and the diagonal is linear"""
+        J = np.asarray(J, dtype=float)
+        if J.ndim != 2 or J.shape[0] != J.shape[1]:
+            raise ValueError("quadratic coefficients must be a square matrix")
+        self._grow(J.shape[0] - 1)
+        self._dense_J = J.copy() if self._dense_J is None else _pad_add(self._dense_J, J)
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray, float]:
+        """(h, W, offset) with W symmetric, zero diagonal, so E = offset + h.x + x.W.x / 2"""
+        n = self._n
+        h = np.zeros(n)
+        W = np.zeros((n, n))
+        if self._dense_h is not None:
+            h[:len(self._dense_h)] += self._dense_h
+        if self._dense_J is not None:
+            m = self._dense_J.shape[0]
+            W[:m, :m] += self._dense_J + self._dense_J.T
+        if self._linear:
+            idx, c = zip(*self._linear)
+            np.add.at(h, list(idx), c)
+        if self._pairs:
+            i, j, c = (np.asarray(v) for v in zip(*self._pairs))
+            np.add.at(W, (i, j), c)
+            np.add.at(W, (j, i), c)
+        h += np.diag(W) / 2.0
+        np.fill_diagonal(W, 0.0)
+        return h, W, self.offset
+
+    def iter_terms(self) -> Iterator[Tuple[float, List[int]]]:
+        """Non-zero (c, indices) terms, e.g. to rebuild the problem for a remote solver"""
+        h, W, offset = self.to_arrays()
+        if offset:
+            yield offset, []
+        for i in np.flatnonzero(h):
+            yield float(h[i]), [int(i)]
+        rows, cols = np.nonzero(np.triu(W, 1))
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            yield float(W[i, j]), [i, j]
+
+    def evaluate(self, configuration: Sequence[int]) -> np.ndarray | float:
+        """Energy of one configuration, or of each row of a 2-D batch"""
+        h, W, offset = self.to_arrays()
+        x = np.asarray(configuration, dtype=float)
+        energy = offset + x @ h + 0.5 * np.einsum("...i,ij,...j->...", x, W, x)
+        return float(energy) if x.ndim == 1 else energy
+
+
+def _pad_add(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    shape = tuple(max(p, q) for p, q in zip(a.shape, b.shape))
+    out = np.zeros(shape)
+    out[tuple(slice(0, s) for s in a.shape)] += a
+    out[tuple(slice(0, s) for s in b.shape)] += b
+    return out
+
+
+@dataclass
+class SolverResult:
+    """Best configuration found; iterating yields the 0/1 values like the Azure result list"""
+    configuration: List[int]
+    cost: float
+    solver: str
+    sweeps: int
+    replicas: int
+    acceptance_rate: float = 0.0
+    swap_rate: float = 0.0
+    extra: dict = field(default_factory=dict)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.configuration)
+
+    @property
+    def selected(self) -> List[int]:
+        return [i for i, v in enumerate(self.configuration) if v]
+
+
+class SimulatedAnnealing:
+    """
+    Vectorised simulated annealing; all replicas share a geometric beta schedule
+
+    Args:
+        sweeps: Full passes over the variables (each proposes one flip per variable per replica)
+        replicas: Independent chains annealed side by side
+        beta_start / beta_stop: Inverse temperatures; derived from the coefficients when None
+        seed: RNG seed
+        workspace: Accepted for Azure API parity and ignored
+    """
+
+    name = "simulated-annealing"
+
+    def __init__(self, sweeps: int = 200, replicas: int = 16, beta_start: Optional[float] = None,
+                 beta_stop: Optional[float] = None, seed: Optional[int] = None, workspace: Any = None) -> None:
+        self.sweeps = max(1, int(sweeps))
+        self.replicas = max(1, int(replicas))
+        self.beta_start = beta_start
+        self.beta_stop = beta_stop
+        self.rng = np.random.default_rng(seed)
+
+    def _beta_range(self, state: "_ChainState") -> Tuple[float, float]:
+        # Hot enough to accept a large uphill proposal half the time, cold enough to
+        # reject a small one with probability 0.99; both read off proposals from the
+        # random starting states, so penalty terms that no move can change do not count
+        deltas = np.abs(state.sample_deltas())
+        deltas = deltas[deltas > 1e-12]
+        if deltas.size:
+            max_delta, min_delta = float(np.percentile(deltas, 95)), float(np.percentile(deltas, 2))
+        else:
+            max_delta = min_delta = 1.0
+        start = self.beta_start if self.beta_start is not None else math.log(2) / max_delta
+        stop = self.beta_stop if self.beta_stop is not None else math.log(100) / min_delta
+        return start, max(stop, start)
+
+    def _schedule(self, state: "_ChainState", sweep: int, start: float, stop: float) -> None:
+        frac = sweep / max(1, self.sweeps - 1)
+        state.betas = np.full(self.replicas, start * (stop / start) ** frac)
+
+    def _after_sweep(self, state: "_ChainState") -> None:
+        pass
+
+    def optimize(self, problem: Problem) -> SolverResult:
+        h, W, offset = problem.to_arrays()
+        n = h.size
+        if n == 0:
+            return SolverResult([], float(offset), self.name, 0, self.replicas)
+        state = _ChainState(h, W, offset, self.replicas, self.rng, problem.cardinality)
+        start, stop = self._beta_range(state)
+        for sweep in range(self.sweeps):
+            self._schedule(state, sweep, start, stop)
+            state.sweep()
+            self._after_sweep(state)
+            state.track_best()
+        state.quench()
+        best = state.best_x.astype(int)
+        return SolverResult(
+            configuration=best.tolist(),
+            cost=float(problem.evaluate(best)),
+            solver=self.name,
+            sweeps=self.sweeps,
+            replicas=self.replicas,
+            acceptance_rate=state.accepted / max(1, state.proposed),
+            swap_rate=state.swaps_accepted / max(1, state.swaps_proposed),
+        )
+
+
+class ParallelTempering(SimulatedAnnealing):
+    """
+    Replica-exchange Monte Carlo: replicas sit on a fixed geometric temperature
+    ladder and adjacent temperatures swap configurations after every sweep
+    """
+
+    name = "parallel-tempering"
+
+    def _schedule(self, state: "_ChainState", sweep: int, start: float, stop: float) -> None:
+        # The ladder is fixed; exchanges permute it among replicas after sweep 0
+        if sweep == 0:
+            steps = np.arange(self.replicas) / max(1, self.replicas - 1)
+            state.betas = start * (stop / start) ** steps if self.replicas > 1 else np.array([stop])
+
+    def _after_sweep(self, state: "_ChainState") -> None:
+        state.exchange()
+
+
+class _ChainState:
+    """
+    (replicas x variables) bits with their local fields F = X @ W and energies
+
+    With a cardinality every replica starts with exactly that many ones and
+    moves swap one selected variable for one unselected variable, so the chain
+    never leaves the feasible set. Each replica keeps its selected and
+    unselected indices in two position arrays; a swap exchanges one entry of
+    each, which keeps uniform pair proposals O(1) per replica.
+    """
+
+    def __init__(self, h: np.ndarray, W: np.ndarray, offset: float, replicas: int,
+                 rng: np.random.Generator, cardinality: Optional[int] = None) -> None:
+        self.h, self.W, self.offset, self.rng = h, W, offset, rng
+        n = h.size
+        self.cardinality = None if cardinality is None else int(min(max(cardinality, 0), n))
+        if self.cardinality is None:
+            self.X = (rng.random((replicas, n)) < 0.5).astype(float)
+        else:
+            order = np.argsort(rng.random((replicas, n)), axis=1)
+            self.ones = order[:, :self.cardinality].copy()
+            self.zeros = order[:, self.cardinality:].copy()
+            self.X = np.zeros((replicas, n))
+            np.put_along_axis(self.X, self.ones, 1.0, axis=1)
+        self.F = self.X @ W
+        self.E = offset + self.X @ h + 0.5 * np.einsum("ri,ri->r", self.X, self.F)
+        self.betas = np.ones(replicas)
+        self.best_x = self.X[int(np.argmin(self.E))].copy()
+        self.best_e = float(self.E.min())
+        self.accepted = self.proposed = 0
+        self.swaps_accepted = self.swaps_proposed = 0
+
+    @property
+    def _can_swap(self) -> bool:
+        return 0 < self.cardinality < self.h.size  # type: ignore[operator]
+
+    def _flip(self, k: int, rows: np.ndarray, sign: np.ndarray, delta: np.ndarray) -> None:
+        self.X[rows, k] += sign
+        self.F[rows] += sign[:, None] * self.W[k]
+        self.E[rows] += delta
+
+    def _pair_deltas(self, a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Dropping i and adding j: -(h_i + F_i) + (h_j + F_j) - W_ij
+        rows = np.arange(self.X.shape[0])
+        i, j = self.ones[rows, a], self.zeros[rows, b]
+        return i, j, self.h[j] + self.F[rows, j] - self.h[i] - self.F[rows, i] - self.W[i, j]
+
+    def _swap(self, rows: np.ndarray, a: np.ndarray, b: np.ndarray, i: np.ndarray, j: np.ndarray,
+              delta: np.ndarray) -> None:
+        self.X[rows, i] = 0.0
+        self.X[rows, j] = 1.0
+        self.F[rows] += self.W[j] - self.W[i]
+        self.E[rows] += delta
+        self.ones[rows, a], self.zeros[rows, b] = j, i
+
+    def sample_deltas(self, samples: int = 64) -> np.ndarray:
+        """Energy changes of proposals from the current states (for temperature ranges)"""
+        if self.cardinality is None:
+            return ((1.0 - 2.0 * self.X) * (self.h + self.F)).ravel()
+        if not self._can_swap:
+            return np.zeros(0)
+        replicas = self.X.shape[0]
+        out = []
+        for _ in range(samples):
+            a = self.rng.integers(0, self.ones.shape[1], replicas)
+            b = self.rng.integers(0, self.zeros.shape[1], replicas)
+            out.append(self._pair_deltas(a, b)[2])
+        return np.concatenate(out)
+
+    def sweep(self) -> None:
+        n = self.h.size
+        replicas = self.X.shape[0]
+        # Accept when beta * delta < -log(u): precompute the thresholds for the whole sweep
+        thresholds = -np.log(self.rng.random((n, replicas)))
+        betas = self.betas
+        if self.cardinality is not None:
+            if not self._can_swap:
+                return
+            # n pair proposals per replica, independent pairs in every replica
+            A = self.rng.integers(0, self.ones.shape[1], (n, replicas))
+            B = self.rng.integers(0, self.zeros.shape[1], (n, replicas))
+            for t in range(n):
+                i, j, delta = self._pair_deltas(A[t], B[t])
+                rows = np.flatnonzero(betas * delta < thresholds[t])
+                if rows.size:
+                    self._swap(rows, A[t, rows], B[t, rows], i[rows], j[rows], delta[rows])
+                    self.accepted += rows.size
+            self.proposed += n * replicas
+            return
+        for t, k in enumerate(self.rng.permutation(n)):
+            sign = 1.0 - 2.0 * self.X[:, k]
+            delta = sign * (self.h[k] + self.F[:, k])
+            rows = np.flatnonzero(betas * delta < thresholds[t])
+            if rows.size:
+                self._flip(k, rows, sign[rows], delta[rows])
+                self.accepted += rows.size
+        self.proposed += n * replicas
+
+    def quench(self, max_sweeps: int = 20) -> None:
+        """Zero-temperature descent on every replica until no single move helps"""
+        if self.cardinality is not None:
+            self._quench_swaps(max_sweeps * self.h.size)
+            return
+        for _ in range(max_sweeps):
+            improved = False
+            for k in range(self.h.size):
+                sign = 1.0 - 2.0 * self.X[:, k]
+                delta = sign * (self.h[k] + self.F[:, k])
+                rows = np.flatnonzero(delta < -1e-12)
+                if rows.size:
+                    self._flip(k, rows, sign[rows], delta[rows])
+                    improved = True
+            self.track_best()
+            if not improved:
+                break
+
+    def _quench_swaps(self, max_steps: int) -> None:
+        # Steepest descent: take the best (drop, add) pair of every replica at once
+        if not self._can_swap:
+            return
+        rows_all = np.arange(self.X.shape[0])
+        for _ in range(max_steps):
+            g = self.h + self.F
+            gi = np.take_along_axis(g, self.ones, axis=1)
+            gj = np.take_along_axis(g, self.zeros, axis=1)
+            pair_w = self.W[self.ones[:, :, None], self.zeros[:, None, :]]
+            delta = gj[:, None, :] - gi[:, :, None] - pair_w
+            flat = delta.reshape(delta.shape[0], -1).argmin(axis=1)
+            a, b = np.divmod(flat, delta.shape[2])
+            best = delta[rows_all, a, b]
+            rows = np.flatnonzero(best < -1e-12)
+            if not rows.size:
+                break
+            self._swap(rows, a[rows], b[rows], self.ones[rows, a[rows]], self.zeros[rows, b[rows]], best[rows])
+        self.track_best()
+
+    def exchange(self) -> None:
+        # Walk the ladder (sorted by beta) and swap temperatures of adjacent replicas
+        ladder = np.argsort(self.betas)
+        for a, b in zip(ladder[:-1], ladder[1:]):
+            self.swaps_proposed += 1
+            log_p = (self.betas[b] - self.betas[a]) * (self.E[b] - self.E[a])
+            if log_p >= 0 or self.rng.random() < math.exp(log_p):
+                self.betas[a], self.betas[b] = self.betas[b], self.betas[a]
+                self.swaps_accepted += 1
+
+    def track_best(self) -> None:
+        r = int(np.argmin(self.E))
+        if self.E[r] < self.best_e:
+            self.best_e = float(self.E[r])
+            self.best_x = self.X[r].copy()
+
+
+def solve_exhaustive(problem: Problem, max_variables: int = 22) -> SolverResult:
+    """Exact minimum by enumerating all 2^n configurations (small problems only)"""
+    h, W, offset = problem.to_arrays()
+    n = h.size
+    if n > max_variables:
+        raise ValueError(f"exhaustive search limited to {max_variables} variables, got {n}")
+    best_e, best_x = math.inf, np.zeros(n)
+    chunk = 1 << min(n, 16)
+    for base in range(0, 1 << n, chunk):
+        codes = np.arange(base, min(base + chunk, 1 << n))
+        X = ((codes[:, None] >> np.arange(n)) & 1).astype(float)
+        E = offset + X @ h + 0.5 * np.einsum("ri,ij,rj->r", X, W, X)
+        r = int(np.argmin(E))
+        if E[r] < best_e:
+            best_e, best_x = float(E[r]), X[r]
+    return SolverResult(best_x.astype(int).tolist(), best_e, "exhaustive", 0, 1)
+
+
+# ---------------------------------------------------------------------------
+# Feature selection QUBOs
+# ---------------------------------------------------------------------------
+
+
+def feature_selection_problem(relevance: Sequence[float], redundancy: Optional[np.ndarray] = None,
+                              k: Optional[int] = None, redundancy_weight: float = 1.0,
+                              penalty: Optional[float] = None,
+                              name: str = "eeg_feature_selection") -> Problem:
+    """
+    Relevance-minus-redundancy QUBO (mRMR with a fixed subset size)
+
+        E(x) = -sum_i r_i x_i + w * (2 / k) * sum_{i<j} R_ij x_i x_j + P * (sum_i x_i - k)^2
+
+    Relevance is scaled to max |r| = 1 and redundancy is expected in [0, 1]
+    (e.g. absolute correlations). For a fixed subset size the first two terms
+    are k times mean relevance minus mean pairwise redundancy. The cardinality
+    penalty P defaults to a value large enough that the optimum has exactly k
+    features; with k=None the subset size is left free.
+    """
+    r = np.abs(np.asarray(relevance, dtype=float))
+    n = r.size
+    scale = float(r.max()) if n and r.max() > 0 else 1.0
+    r = r / scale
+    size = k if k is not None else max(1, n // 4)
+    problem = Problem(name=name, num_variables=n)
+    problem.add_linear(-r)
+    max_row = 0.0
+    if redundancy is not None and n > 1:
+        R = np.nan_to_num(np.abs(np.asarray(redundancy, dtype=float)))
+        R = (R + R.T) / 2.0
+        np.fill_diagonal(R, 0.0)
+        pair_weight = redundancy_weight * 2.0 / max(1, size)
+        problem.add_quadratic(np.triu(R, 1) * pair_weight)
+        max_row = float((R * pair_weight).sum(axis=1).max())
+    if k is not None:
+        k = int(min(max(k, 0), n))
+        P = penalty if penalty is not None else 1.0 + max_row + 1e-3
+        # P * (sum x - k)^2 = P * [(1 - 2k) sum x + 2 sum_{i<j} x_i x_j + k^2]
+        problem.add_linear(np.full(n, P * (1 - 2 * k)))
+        problem.add_quadratic(np.triu(np.full((n, n), 2.0 * P), 1))
+        problem.offset += P * k * k
+        problem.cardinality = k
+    return problem
+
+
+def shortlist_candidates(relevance: Sequence[float], max_candidates: int = MAX_QUBO_CANDIDATES) -> np.ndarray:
+    """Indices of the ``max_candidates`` most relevant features in ascending order (all if fewer)"""
+    r = np.abs(np.asarray(relevance, dtype=float))
+    if r.size <= max_candidates:
+        return np.arange(r.size)
+    return np.sort(top_k_indices(r, max_candidates)[0])
+
+
+def autocorrelation_redundancy(signal: Sequence[float], num_features: Optional[int] = None,
+                               indices: Optional[Sequence[int]] = None) -> np.ndarray:
+    """
+    Redundancy between sample-indexed features of one signal: R_ij = |acf(|i - j|)|
+
+    Neighbouring samples of a smooth EEG trace carry the same information; the
+    sample autocorrelation says how much at each lag. ``indices`` restricts
+    the matrix to those samples (e.g. a shortlist) instead of the first
+    ``num_features``.
+    """
+    x = np.asarray(signal, dtype=float)
+    n = x.size if num_features is None else int(num_features)
+    centred = x - x.mean() if x.size else x
+    denom = float(centred @ centred)
+    lags = np.arange(n) if indices is None else np.asarray(indices, dtype=np.intp)
+    n = int(lags.max()) + 1 if lags.size else 0
+    if denom <= 0 or x.size < 2:
+        acf = (np.arange(n) == 0).astype(float)
+    else:
+        spectrum = np.fft.rfft(centred, 2 * x.size)
+        full = np.fft.irfft(spectrum * np.conj(spectrum))[:x.size] / denom
+        acf = np.zeros(n)
+        acf[:min(n, x.size)] = full[:min(n, x.size)]
+    return np.abs(acf[np.abs(lags[:, None] - lags[None, :])])
+
+
+def correlation_redundancy(observations: np.ndarray) -> np.ndarray:
+    """|Pearson correlation| between rows (features x observations); constant rows count as 0"""
+    X = np.asarray(observations, dtype=float)
+    if X.shape[0] < 2 or X.shape[1] < 2:
+        return np.zeros((X.shape[0], X.shape[0]))
+    centred = X - X.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(centred, axis=1)
+    safe = np.where(norms > 1e-12, norms, 1.0)
+    corr = (centred @ centred.T) / np.outer(safe, safe)
+    corr[norms <= 1e-12] = 0.0
+    corr[:, norms <= 1e-12] = 0.0
+    return np.abs(np.clip(corr, -1.0, 1.0))
+
+
+def select_features(relevance: Sequence[float], redundancy: Optional[np.ndarray] = None,
+                    k: Optional[int] = None, solver: Optional[SimulatedAnnealing] = None,
+                    redundancy_weight: float = 1.0, seed: Optional[int] = 0) -> List[int]:
+    """Solve the feature-selection QUBO locally; indices ordered by relevance, most relevant first"""
+    if np.size(relevance) == 0:
+        return []
+    problem = feature_selection_problem(relevance, redundancy, k, redundancy_weight)
+    return solve_selection(problem, relevance, solver, seed)
+
+
+def solve_selection(problem: Problem, relevance: Sequence[float], solver: Optional[SimulatedAnnealing] = None,
+                    seed: Optional[int] = 0) -> List[int]:
+    """Selected variables of a feature-selection QUBO, most relevant first"""
+    r = np.abs(np.asarray(relevance, dtype=float))
+    if problem.num_variables == 0:
+        return []
+    if solver is None:
+        # Keep the work roughly constant (~40k proposals per replica) across sizes
+        sweeps = int(np.clip(40000 // problem.num_variables, 20, 200))
+        solver = ParallelTempering(sweeps=sweeps, replicas=16, seed=seed)
+    chosen = solver.optimize(problem).selected
+    return sorted(chosen, key=lambda i: (-r[i], i))
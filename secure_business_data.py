@@ -22,12 +22,18 @@ Usage (examples)
     Redact to output mirror (non-destructive copy):
         python secure_business_data.py redact --root . --out .\\sanitized
 
+  Benchmark single-pass redaction against the four-pass reference:
+    python secure_business_data.py benchmark --root .\\bench_tree --size-mb 2048
+
   Encrypt a file:
     python secure_business_data.py encrypt --file README.md --passphrase "your passphrase"
 
   Decrypt a file:
     python secure_business_data.py decrypt --file README.md.enc --passphrase "your passphrase"
 
+  Encrypt several files (the passphrase is stretched once for the whole run):
+    python secure_business_data.py encrypt --file a.md b.md c.md --passphrase "your passphrase"
+
 Note: Do NOT hard-code passphrases; provide via CLI or environment at runtime.
 """
 
@@ -35,24 +41,40 @@ from __future__ import annotations
 
 import argparse
 import base64
+import filecmp
+import io
 import json
+import os
+import random
 import re
+import struct
 import sys
-from dataclasses import dataclass
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Sequence, Tuple
+from typing import BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 
 # Optional crypto support (only required for encrypt/decrypt paths)
 try:
+    from cryptography.exceptions import InvalidTag
     from cryptography.fernet import Fernet
     from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
     from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
     _CRYPTO_AVAILABLE = True
 except ImportError:  # pragma: no cover - optional dependency
     # Define dummies to avoid NameError if crypto not installed
+    InvalidTag = Exception  # type: ignore
     Fernet = None  # type: ignore
     hashes = None  # type: ignore
+    AESGCM = None  # type: ignore
+    HKDF = None  # type: ignore
     PBKDF2HMAC = None  # type: ignore
     _CRYPTO_AVAILABLE = False
 
@@ -61,11 +83,31 @@ LOGS_DIR = Path(__file__).resolve().parent / "logs"
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
 
+# Files above this size are redacted chunk by chunk instead of read whole
+STREAM_THRESHOLD_BYTES = 8 * 1024 * 1024
+STREAM_CHUNK_CHARS = 1024 * 1024
+# Longest match the chunked reader guarantees to see whole across a chunk boundary
+STREAM_OVERLAP_CHARS = 4096
+# Characters kept before the resume point so \b sees the previous character
+_STREAM_CONTEXT_CHARS = 64
+
+DEFAULT_PATTERN_CATEGORIES = ("currency", "finance_term", "period", "phrase")
+# Every default pattern starts with a currency sign or, at a word boundary, one of
+# these characters. The lookahead lets the scanner reject most positions with a
+# single check instead of trying all four alternatives; keep it in sync with
+# _compile_default_patterns (test_default_guard_admits_every_default_match).
+_DEFAULT_PATTERN_GUARD = r"(?=[\$€£]|(?i:\b[2abfmpqr]))"
+
+_INLINE_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"), (re.VERBOSE, "x"))
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+
 @dataclass
 class RedactionResult:
     path: Path
     redactions: int
     written_to: Optional[Path]
+    categories: Dict[str, int] = field(default_factory=dict)
 
 
 def _compile_default_patterns() -> List[re.Pattern]:
@@ -82,16 +124,50 @@ def _compile_default_patterns() -> List[re.Pattern]:
         re.compile(r"\b(revenue|revenues|profit|margin|arr|mrr|forecast|projection|budget|pricing|price)\b", flags),
         # Quarter/year phrases that typically accompany projections
         re.compile(r"\b(q[1-4]\s*20\d{2}|fy\s*20\d{2}|202[5-9]|203\d)\b", flags),
-        # Explicit phrases
-        re.compile(r"\b(business\s+plan|financial\s+plan|financial\s+forecast|sales\s+forecast)\b", flags),
+        # Explicit phrases ("financial forecast" and "sales forecast" are covered by
+        # the "forecast" term above, which has always been redacted first)
+        re.compile(r"\b(business\s+plan|financial\s+plan)\b", flags),
     ]
     return patterns
 
 
+def _combine_patterns(
+    patterns: Sequence[re.Pattern],
+    names: Sequence[str],
+    guard: Optional[str] = None,
+) -> Optional[re.Pattern]:
+    """Join patterns into one alternation with a named group per category.
+
+    Each pattern keeps its own flags through a scoped inline group. Patterns
+    that cannot be embedded (bytes, backreferences, global inline flags) make
+    this return None so the caller falls back to one pass per pattern. An
+    optional ``guard`` lookahead is tried before the alternation.
+    """
+    parts = []
+    for name, pat in zip(names, patterns):
+        if not isinstance(pat.pattern, str) or _BACKREFERENCE.search(pat.pattern):
+            return None
+        flags = "".join(letter for flag, letter in _INLINE_FLAGS if pat.flags & flag)
+        body = f"(?{flags}:{pat.pattern})" if flags else f"(?:{pat.pattern})"
+        parts.append(f"(?P<{name}>{body})")
+    combined = "|".join(parts)
+    if guard:
+        combined = f"{guard}(?:{combined})"
+    try:
+        return re.compile(combined)
+    except re.error:
+        return None
+
+
 class BusinessSecurityUtility:
     """Selective financial redaction and optional encryption for text files.
 
     Default behavior is conservative and non-destructive.
+
+    All patterns are compiled into a single alternation, so each file is
+    scanned once; the named group that matched tells which category to count
+    and which replacement token to emit. Where two categories could match at
+    the same place the leftmost match wins, then the earlier pattern.
     """
 
     def __init__(
@@ -101,12 +177,29 @@ class BusinessSecurityUtility:
         exclude_dirs: Optional[Sequence[str]] = None,
         redaction_token: str = "[REDACTED]",
         patterns: Optional[Sequence[re.Pattern]] = None,
+        category_tokens: Optional[Dict[str, str]] = None,
+        stream_threshold: int = STREAM_THRESHOLD_BYTES,
+        chunk_chars: int = STREAM_CHUNK_CHARS,
+        overlap_chars: int = STREAM_OVERLAP_CHARS,
     ) -> None:
         self.root = Path(root).resolve()
         self.include_exts = set(e.lower() for e in (include_exts or [".md", ".txt", ".json", ".yaml", ".yml"]))
         self.exclude_dirs = set((exclude_dirs or [".git", ".venv", "node_modules", "__pycache__"]))
         self.redaction_token = redaction_token
         self.patterns = list(patterns or _compile_default_patterns())
+        if not patterns:
+            self.categories = list(DEFAULT_PATTERN_CATEGORIES)
+        else:
+            self.categories = [f"pattern_{i}" for i in range(len(self.patterns))]
+        self.category_tokens = dict(category_tokens or {})
+        self.stream_threshold = stream_threshold
+        self.chunk_chars = chunk_chars
+        self.overlap_chars = overlap_chars
+        self.combined_pattern = _combine_patterns(
+            self.patterns,
+            self.categories,
+            guard=None if patterns else _DEFAULT_PATTERN_GUARD,
+        )
 
     def _should_process(self, p: Path) -> bool:
         if not p.is_file():
@@ -115,7 +208,48 @@ class BusinessSecurityUtility:
             return False
         return p.suffix.lower() in self.include_exts
 
+    def iter_candidates(self) -> Iterator[Path]:
+        """Files under root that would be processed, pruning excluded dirs early"""
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(d for d in dirnames if d not in self.exclude_dirs)
+            for name in sorted(filenames):
+                p = Path(dirpath) / name
+                if self._should_process(p):
+                    yield p
+
+    def _replacer(self, counts: Dict[str, int]) -> Callable[[re.Match], str]:
+        tokens = self.category_tokens
+        default = self.redaction_token
+
+        def replace(m: re.Match) -> str:
+            category = m.lastgroup
+            counts[category] = counts.get(category, 0) + 1
+            return tokens.get(category, default)
+
+        return replace
+
+    def redact_text_with_counts(self, text: str) -> Tuple[str, Dict[str, int]]:
+        """Redact in one scan and report the number of redactions per category"""
+        counts: Dict[str, int] = {}
+        if self.combined_pattern is None:
+            redacted = text
+            for category, pat in zip(self.categories, self.patterns):
+                token = self.category_tokens.get(category, self.redaction_token)
+                redacted, c = pat.subn(token, redacted)
+                if c:
+                    counts[category] = c
+            return redacted, counts
+        return self.combined_pattern.sub(self._replacer(counts), text), counts
+
     def redact_text(self, text: str) -> Tuple[str, int]:
+        redacted, counts = self.redact_text_with_counts(text)
+        return redacted, sum(counts.values())
+
+    def redact_text_sequential(self, text: str) -> Tuple[str, int]:
+        """Reference implementation: one full pass per pattern, in order.
+
+        With the default patterns its output is identical to the single pass.
+        """
         count = 0
         redacted = text
         for pat in self.patterns:
@@ -123,6 +257,56 @@ class BusinessSecurityUtility:
             count += c
         return redacted, count
 
+    def redact_stream(self, reader, write: Callable[[str], object]) -> Dict[str, int]:
+        """Redact a text stream chunk by chunk, passing output to ``write``.
+
+        The last ``overlap_chars`` characters of every chunk are held back and
+        rescanned with the next chunk, so any match no longer than the overlap
+        is found exactly as if the whole text had been scanned at once.
+        """
+        counts: Dict[str, int] = {}
+        pattern = self.combined_pattern
+        if pattern is None:
+            redacted, counts = self.redact_text_with_counts(reader.read())
+            write(redacted)
+            return counts
+
+        replace = self._replacer(counts)
+        buf = ""
+        scan_from = 0
+        while True:
+            chunk = reader.read(self.chunk_chars)
+            eof = not chunk
+            buf += chunk
+            safe = len(buf) if eof else len(buf) - self.overlap_chars
+            if safe <= scan_from:
+                if eof:
+                    break
+                continue
+
+            last = scan_from
+            cut = safe
+            for m in pattern.finditer(buf, scan_from):
+                if m.end() > safe:
+                    # May still change with more input; rescan from here next time
+                    cut = min(m.start(), safe)
+                    break
+                if m.start() > last:
+                    write(buf[last:m.start()])
+                write(replace(m))
+                last = m.end()
+            cut = max(cut, last)
+            if cut > last:
+                write(buf[last:cut])
+            if eof:
+                break
+
+            keep = max(0, cut - _STREAM_CONTEXT_CHARS)
+            buf = buf[keep:]
+            scan_from = cut - keep
+
+        return counts
+
     def process_file(
         self,
         src: Path,
@@ -136,57 +320,236 @@ class BusinessSecurityUtility:
         if not self._should_process(src):
             return RedactionResult(path=src, redactions=0, written_to=None)
 
+        if not dry_run and not in_place and not out_dir:
+            raise ValueError("out_dir is required when not using --in-place")
+
         try:
+            if src.stat().st_size > self.stream_threshold:
+                return self._process_file_streaming(src, out_dir, in_place, encoding, errors, dry_run)
             text = src.read_text(encoding=encoding, errors=errors)
         except Exception as exc:  # pragma: no cover - IO safeguard
             _append_log(f"READ_FAIL {src}: {exc}")
             return RedactionResult(path=src, redactions=0, written_to=None)
 
-        new_text, redactions = self.redact_text(text)
+        new_text, categories = self.redact_text_with_counts(text)
+        redactions = sum(categories.values())
         if redactions == 0:
             return RedactionResult(path=src, redactions=0, written_to=None)
 
         if dry_run:
             _append_log(f"DRY_RUN REDACT {src} redactions={redactions}")
-            return RedactionResult(path=src, redactions=redactions, written_to=None)
+            return RedactionResult(path=src, redactions=redactions, written_to=None, categories=categories)
 
         if in_place:
             try:
                 src.write_text(new_text, encoding=encoding, errors=errors)
                 _append_log(f"REDACTED_IN_PLACE {src} redactions={redactions}")
-                return RedactionResult(path=src, redactions=redactions, written_to=src)
+                return RedactionResult(path=src, redactions=redactions, written_to=src, categories=categories)
             except Exception as exc:  # pragma: no cover
                 _append_log(f"WRITE_FAIL {src}: {exc}")
                 return RedactionResult(path=src, redactions=0, written_to=None)
 
         else:
-            if not out_dir:
-                raise ValueError("out_dir is required when not using --in-place")
             dst = Path(out_dir) / src.relative_to(self.root)
             dst.parent.mkdir(parents=True, exist_ok=True)
             try:
                 dst.write_text(new_text, encoding=encoding, errors=errors)
                 _append_log(f"REDACTED_TO {dst} from {src} redactions={redactions}")
-                return RedactionResult(path=src, redactions=redactions, written_to=dst)
+                return RedactionResult(path=src, redactions=redactions, written_to=dst, categories=categories)
             except Exception as exc:  # pragma: no cover
                 _append_log(f"WRITE_FAIL {dst}: {exc}")
                 return RedactionResult(path=src, redactions=0, written_to=None)
 
+    def _process_file_streaming(
+        self,
+        src: Path,
+        out_dir: Optional[Path],
+        in_place: bool,
+        encoding: str,
+        errors: str,
+        dry_run: bool,
+    ) -> RedactionResult:
+        """Large-file path: redact into a temp file beside the target, then swap it in"""
+        if dry_run:
+            with src.open("r", encoding=encoding, errors=errors) as reader:
+                categories = self.redact_stream(reader, lambda _text: None)
+            redactions = sum(categories.values())
+            if redactions:
+                _append_log(f"DRY_RUN REDACT {src} redactions={redactions}")
+            return RedactionResult(path=src, redactions=redactions, written_to=None, categories=categories)
+
+        if in_place:
+            dst = src
+        else:
+            dst = Path(out_dir) / src.relative_to(self.root)
+            dst.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{dst.name}.", suffix=".tmp", dir=str(dst.parent))
+        tmp = Path(tmp_name)
+        try:
+            with src.open("r", encoding=encoding, errors=errors) as reader, \
+                    os.fdopen(fd, "w", encoding=encoding, errors=errors) as writer:
+                categories = self.redact_stream(reader, writer.write)
+            redactions = sum(categories.values())
+            if redactions == 0:
+                tmp.unlink()
+                return RedactionResult(path=src, redactions=0, written_to=None)
+            os.replace(tmp, dst)
+        except Exception as exc:  # pragma: no cover
+            tmp.unlink(missing_ok=True)
+            _append_log(f"WRITE_FAIL {dst}: {exc}")
+            return RedactionResult(path=src, redactions=0, written_to=None)
+
+        if in_place:
+            _append_log(f"REDACTED_IN_PLACE {src} redactions={redactions}")
+        else:
+            _append_log(f"REDACTED_TO {dst} from {src} redactions={redactions}")
+        return RedactionResult(path=src, redactions=redactions, written_to=dst, categories=categories)
+
     def walk_and_process(
         self,
         out_dir: Optional[Path] = None,
         in_place: bool = False,
         dry_run: bool = True,
+        max_workers: Optional[int] = None,
+        use_processes: bool = True,
+        max_in_flight: Optional[int] = None,
     ) -> List[RedactionResult]:
+        """Process every candidate file, fanning out over a bounded worker pool.
+
+        Regex scanning holds the GIL, so a process pool is the default; threads
+        only help when the tree is IO-bound. At most ``max_in_flight`` files are
+        queued at once and results come back in walk order.
+        """
+        workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
         results: List[RedactionResult] = []
-        for p in self.root.rglob("*"):
-            if self._should_process(p):
+        if workers <= 1:
+            for p in self.iter_candidates():
                 res = self.process_file(p, out_dir=out_dir, in_place=in_place, dry_run=dry_run)
                 if res.redactions:
                     results.append(res)
+            return results
+
+        limit = max_in_flight or workers * 4
+        pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        pending: Deque[Future] = deque()
+        executor: Executor
+        with pool_cls(max_workers=workers) as executor:
+            for p in self.iter_candidates():
+                if len(pending) >= limit:
+                    res = pending.popleft().result()
+                    if res.redactions:
+                        results.append(res)
+                pending.append(executor.submit(
+                    self.process_file, p, out_dir=out_dir, in_place=in_place, dry_run=dry_run
+                ))
+            while pending:
+                res = pending.popleft().result()
+                if res.redactions:
+                    results.append(res)
         return results
 
 
+# ----------------------------
+# Benchmark
+# ----------------------------
+
+_BENCH_SENTENCES = (
+    "The onboarding flow was reviewed with the clinical team this week.\n",
+    "Revenue for Q3 2025 reached $1,250,000 with an ARR of $4.2M.\n",
+    "Session latency stayed under 50 ms across all regions.\n",
+    "The budget for FY 2026 includes pricing changes of €35k per tenant.\n",
+    "EEG preprocessing now runs before the neuroplasticity scoring step.\n",
+    "See the business plan and the financial plan for 2027 details.\n",
+    "Margin improved while MRR held at £90,000 in 2028.\n",
+    "Documentation for the adaptive learning module lives in docs/.\n",
+)
+
+
+def generate_benchmark_tree(root: Path, total_bytes: int, file_bytes: int = 4 * 1024 * 1024,
+                            seed: int = 0) -> int:
+    """Write a deterministic tree of markdown files totalling roughly ``total_bytes``"""
+    rng = random.Random(seed)
+    root = Path(root)
+    written = 0
+    index = 0
+    while written < total_bytes:
+        target = root / f"dept_{index % 16:02d}" / f"report_{index:05d}.md"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        size = min(file_bytes, total_bytes - written)
+        lines = []
+        length = 0
+        while length < size:
+            line = rng.choice(_BENCH_SENTENCES)
+            lines.append(line)
+            length += len(line.encode("utf-8"))
+        data = "".join(lines).encode("utf-8")
+        target.write_bytes(data)
+        written += len(data)
+        index += 1
+    return index
+
+
+def _sequential_redact_tree(util: BusinessSecurityUtility, out_dir: Path) -> int:
+    """Pre-combined-regex behaviour: serial rglob, whole-file read, one pass per pattern"""
+    total = 0
+    for p in util.root.rglob("*"):
+        if util._should_process(p):
+            new_text, c = util.redact_text_sequential(p.read_text(encoding="utf-8", errors="replace"))
+            if c:
+                dst = out_dir / p.relative_to(util.root)
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                dst.write_text(new_text, encoding="utf-8", errors="replace")
+                total += c
+    return total
+
+
+def benchmark_redaction(root: Path, size_mb: int = 2048, max_workers: Optional[int] = None,
+                        file_mb: int = 4) -> Dict[str, object]:
+    """Time the four-pass serial walk against the single-pass pooled walk and diff outputs"""
+    root = Path(root)
+    source = root / "source"
+    if not source.exists():
+        generate_benchmark_tree(source, size_mb * 1024 * 1024, file_bytes=file_mb * 1024 * 1024)
+    util = BusinessSecurityUtility(root=source)
+
+    reference_dir = root / "out_sequential"
+    start = time.perf_counter()
+    reference_total = _sequential_redact_tree(util, reference_dir)
+    sequential_seconds = time.perf_counter() - start
+
+    combined_dir = root / "out_combined"
+    start = time.perf_counter()
+    results = util.walk_and_process(out_dir=combined_dir, dry_run=False, max_workers=max_workers)
+    combined_seconds = time.perf_counter() - start
+
+    identical = differing = 0
+    for ref in reference_dir.rglob("*"):
+        if ref.is_file():
+            other = combined_dir / ref.relative_to(reference_dir)
+            if other.exists() and filecmp.cmp(ref, other, shallow=False):
+                identical += 1
+            else:
+                differing += 1
+
+    categories: Dict[str, int] = {}
+    for res in results:
+        for category, count in res.categories.items():
+            categories[category] = categories.get(category, 0) + count
+
+    return {
+        "size_mb": sum(p.stat().st_size for p in source.rglob("*") if p.is_file()) / (1024 * 1024),
+        "sequential_seconds": sequential_seconds,
+        "combined_seconds": combined_seconds,
+        "speedup": sequential_seconds / combined_seconds if combined_seconds else float("inf"),
+        "sequential_redactions": reference_total,
+        "combined_redactions": sum(r.redactions for r in results),
+        "categories": categories,
+        "identical_files": identical,
+        "differing_files": differing,
+    }
+
+
 # ----------------------------
 # Encryption/Decryption helpers
 # ----------------------------
@@ -196,30 +559,173 @@ def _require_crypto():
         raise RuntimeError("cryptography is not installed. Install 'cryptography' to use encryption features.")
 
 
-def _derive_key(passphrase: str, salt: bytes) -> bytes:
+_PBKDF2_ITERATIONS = 390000
+
+# SB2 layout: magic | KDF salt | file salt | chunk size, then one AES-GCM
+# sealed chunk per chunk_size bytes of plaintext (the last may be shorter).
+# The header is the associated data of every chunk, and each chunk nonce
+# carries its index and a final-chunk flag, so chunks cannot be reordered,
+# dropped, or moved to the end of the stream without failing authentication.
+SB2_MAGIC = b"SB2"
+SB2_CHUNK_SIZE = 64 * 1024
+# Upper bound on the header's chunk size: it sizes reads (up to max_workers at a
+# time) before any chunk is authenticated, so a forged header must not be trusted
+SB2_MAX_CHUNK_SIZE = 16 * 1024 * 1024
+_SB2_HEADER = struct.Struct(">3s16s16sI")
+_SB2_TAG_BYTES = 16
+_SB2_HKDF_INFO = b"L.I.F.E. secure_business_data SB2 file key"
+
+
+def _pbkdf2(passphrase: str, salt: bytes) -> bytes:
     # At runtime, crypto must be available; the asserts help static analyzers
     assert PBKDF2HMAC is not None and hashes is not None  # type: ignore[unreachable]
     kdf = PBKDF2HMAC(  # type: ignore[misc]
         algorithm=hashes.SHA256(),  # type: ignore[attr-defined]
         length=32,
         salt=salt,
-        iterations=390000,
+        iterations=_PBKDF2_ITERATIONS,
     )
-    return base64.urlsafe_b64encode(kdf.derive(passphrase.encode("utf-8")))
+    return kdf.derive(passphrase.encode("utf-8"))
+
+
+def _derive_key(passphrase: str, salt: bytes) -> bytes:
+    return base64.urlsafe_b64encode(_pbkdf2(passphrase, salt))
 
 
-def encrypt_bytes(data: bytes, passphrase: str) -> bytes:
+class PassphraseKeyring:
+    """Master keys stretched from one passphrase, cached for the run.
+
+    PBKDF2 runs once per KDF salt: every file encrypted through the keyring
+    shares the run's salt, and decrypting files from the same run reuses the
+    cached master key. Per-file AES keys are cheap HKDF expansions of it.
+    """
+
+    def __init__(self, passphrase: str) -> None:
+        self._passphrase = passphrase
+        self._master_keys: Dict[bytes, bytes] = {}
+        self._lock = threading.Lock()
+        self.run_salt = os.urandom(16)
+
+    def master_key(self, salt: bytes) -> bytes:
+        with self._lock:
+            key = self._master_keys.get(salt)
+            if key is None:
+                key = _pbkdf2(self._passphrase, salt)
+                self._master_keys[salt] = key
+            return key
+
+    def file_key(self, kdf_salt: bytes, file_salt: bytes) -> bytes:
+        assert HKDF is not None and hashes is not None  # type: ignore[unreachable]
+        return HKDF(  # type: ignore[misc]
+            algorithm=hashes.SHA256(),  # type: ignore[attr-defined]
+            length=32,
+            salt=file_salt,
+            info=_SB2_HKDF_INFO,
+        ).derive(self.master_key(kdf_salt))
+
+
+def _sb2_nonce(index: int, final: bool) -> bytes:
+    return index.to_bytes(11, "big") + (b"\x01" if final else b"\x00")
+
+
+def _iter_chunks(reader: BinaryIO, size: int) -> Iterator[Tuple[int, bytes, bool]]:
+    """Yield (index, chunk, is_final) with one chunk of lookahead; empty input is one empty final chunk"""
+    index = 0
+    current = reader.read(size)
+    while True:
+        following = reader.read(size) if len(current) == size else b""
+        yield index, current, not following
+        if not following:
+            return
+        current = following
+        index += 1
+
+
+def _map_ordered(fn: Callable, items: Iterable, max_workers: int) -> Iterator:
+    """Apply fn over items with at most 2 * max_workers in flight, preserving order"""
+    if max_workers <= 1:
+        for item in items:
+            yield fn(item)
+        return
+    pending: Deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for item in items:
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+            pending.append(executor.submit(fn, item))
+        while pending:
+            yield pending.popleft().result()
+
+
+def encrypt_stream(
+    reader: BinaryIO,
+    writer: BinaryIO,
+    keyring: PassphraseKeyring,
+    chunk_size: int = SB2_CHUNK_SIZE,
+    max_workers: int = 1,
+) -> None:
+    """Encrypt reader into writer in SB2 format using bounded memory"""
+    _require_crypto()
+    if not 0 < chunk_size <= SB2_MAX_CHUNK_SIZE:
+        raise ValueError(f"chunk_size must be between 1 and {SB2_MAX_CHUNK_SIZE} bytes")
+    file_salt = os.urandom(16)
+    header = _SB2_HEADER.pack(SB2_MAGIC, keyring.run_salt, file_salt, chunk_size)
+    aead = AESGCM(keyring.file_key(keyring.run_salt, file_salt))  # type: ignore[misc]
+
+    def seal(item: Tuple[int, bytes, bool]) -> bytes:
+        index, chunk, final = item
+        return aead.encrypt(_sb2_nonce(index, final), chunk, header)
+
+    writer.write(header)
+    for sealed in _map_ordered(seal, _iter_chunks(reader, chunk_size), max_workers):
+        writer.write(sealed)
+
+
+def decrypt_stream(
+    reader: BinaryIO,
+    writer: BinaryIO,
+    keyring: PassphraseKeyring,
+    max_workers: int = 1,
+) -> None:
+    """Decrypt an SB2 stream, raising ValueError on any tampering or truncation"""
     _require_crypto()
-    import os as _os
+    header = reader.read(_SB2_HEADER.size)
+    if len(header) < _SB2_HEADER.size:
+        raise ValueError("Truncated SB2 header")
+    magic, kdf_salt, file_salt, chunk_size = _SB2_HEADER.unpack(header)
+    if magic != SB2_MAGIC or chunk_size == 0:
+        raise ValueError("Unsupported blob format")
+    if chunk_size > SB2_MAX_CHUNK_SIZE:
+        raise ValueError(f"SB2 chunk size {chunk_size} exceeds the {SB2_MAX_CHUNK_SIZE}-byte maximum")
+    aead = AESGCM(keyring.file_key(kdf_salt, file_salt))  # type: ignore[misc]
 
-    salt = _os.urandom(16)
-    key = _derive_key(passphrase, salt)
-    token = Fernet(key).encrypt(data)  # type: ignore[misc]
-    return b"SB1" + salt + token  # simple header + salt + fernet token
+    def open_chunk(item: Tuple[int, bytes, bool]) -> bytes:
+        index, sealed, final = item
+        try:
+            return aead.decrypt(_sb2_nonce(index, final), sealed, header)
+        except InvalidTag:
+            raise ValueError(
+                f"SB2 chunk {index} failed authentication (wrong passphrase, or data truncated, "
+                "reordered or modified)"
+            ) from None
 
+    for plain in _map_ordered(open_chunk, _iter_chunks(reader, chunk_size + _SB2_TAG_BYTES), max_workers):
+        writer.write(plain)
 
-def decrypt_bytes(blob: bytes, passphrase: str) -> bytes:
+
+def encrypt_bytes(data: bytes, passphrase: str, keyring: Optional[PassphraseKeyring] = None) -> bytes:
     _require_crypto()
+    out = io.BytesIO()
+    encrypt_stream(io.BytesIO(data), out, keyring or PassphraseKeyring(passphrase))
+    return out.getvalue()
+
+
+def decrypt_bytes(blob: bytes, passphrase: str, keyring: Optional[PassphraseKeyring] = None) -> bytes:
+    _require_crypto()
+    if blob.startswith(SB2_MAGIC):
+        out = io.BytesIO()
+        decrypt_stream(io.BytesIO(blob), out, keyring or PassphraseKeyring(passphrase))
+        return out.getvalue()
     if not blob.startswith(b"SB1"):
         raise ValueError("Unsupported blob format")
     salt = blob[3:19]
@@ -228,28 +734,60 @@ def decrypt_bytes(blob: bytes, passphrase: str) -> bytes:
     return Fernet(key).decrypt(token)  # type: ignore[misc]
 
 
-def encrypt_file(path: Path, passphrase: str, out_path: Optional[Path] = None) -> Path:
+def _atomic_write_stream(dst: Path, produce: Callable[[BinaryIO], None]) -> None:
+    """Write through a temp file so a failed or rejected stream never leaves partial output"""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{dst.name}.", suffix=".tmp", dir=str(dst.parent))
+    try:
+        with os.fdopen(fd, "wb") as writer:
+            produce(writer)
+        os.replace(tmp_name, dst)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def encrypt_file(
+    path: Path,
+    passphrase: str,
+    out_path: Optional[Path] = None,
+    keyring: Optional[PassphraseKeyring] = None,
+    max_workers: int = 1,
+) -> Path:
+    _require_crypto()
     path = Path(path)
-    data = path.read_bytes()
-    blob = encrypt_bytes(data, passphrase)
+    keyring = keyring or PassphraseKeyring(passphrase)
     dst = out_path or path.with_suffix(path.suffix + ".enc")
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    dst.write_bytes(blob)
+    with path.open("rb") as reader:
+        _atomic_write_stream(dst, lambda writer: encrypt_stream(reader, writer, keyring, max_workers=max_workers))
     _append_log(f"ENCRYPTED_FILE {path} -> {dst}")
     return dst
 
 
-def decrypt_file(path: Path, passphrase: str, out_path: Optional[Path] = None) -> Path:
+def decrypt_file(
+    path: Path,
+    passphrase: str,
+    out_path: Optional[Path] = None,
+    keyring: Optional[PassphraseKeyring] = None,
+    max_workers: int = 1,
+) -> Path:
     path = Path(path)
-    blob = path.read_bytes()
-    data = decrypt_bytes(blob, passphrase)
     if out_path is None:
         if path.suffix.lower() == ".enc":
             out_path = path.with_suffix("")
         else:
             out_path = path.with_name(path.name + ".dec")
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_bytes(data)
+
+    with path.open("rb") as reader:
+        magic = reader.read(len(SB2_MAGIC))
+        reader.seek(0)
+        if magic == SB2_MAGIC:
+            keyring = keyring or PassphraseKeyring(passphrase)
+            _atomic_write_stream(out_path, lambda writer: decrypt_stream(reader, writer, keyring, max_workers))
+        else:
+            # SB1 files are a single Fernet token and can only be decrypted whole
+            data = decrypt_bytes(reader.read(), passphrase)
+            _atomic_write_stream(out_path, lambda writer: writer.write(data))
     _append_log(f"DECRYPTED_FILE {path} -> {out_path}")
     return out_path
 
@@ -280,16 +818,24 @@ def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     pr.add_argument("--dry-run", action="store_true", help="Dry run: report what would change (default)")
     pr.add_argument("--no-dry-run", dest="dry_run", action="store_false", help="Disable dry-run")
     pr.add_argument("--include-exts", nargs="*", default=None, help="Override default extensions (.md .txt .json .yaml .yml)")
+    pr.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count, 1 = serial)")
+
+    pb = sub.add_parser("benchmark", help="Benchmark redaction on a generated tree against the four-pass reference")
+    pb.add_argument("--root", required=True, help="Scratch folder for the generated tree and outputs")
+    pb.add_argument("--size-mb", type=int, default=2048, help="Size of the generated tree in MB")
+    pb.add_argument("--workers", type=int, default=None, help="Worker processes for the single-pass run")
 
-    pe = sub.add_parser("encrypt", help="Encrypt a single file using a passphrase")
-    pe.add_argument("--file", required=True, help="Path to file to encrypt")
+    pe = sub.add_parser("encrypt", help="Encrypt files using a passphrase")
+    pe.add_argument("--file", required=True, nargs="+", help="Path(s) to file(s) to encrypt")
     pe.add_argument("--passphrase", required=True, help="Passphrase (do not hard-code in scripts)")
-    pe.add_argument("--out", type=str, default=None, help="Destination path (default: <file>.enc)")
+    pe.add_argument("--out", type=str, default=None, help="Destination path (default: <file>.enc; single file only)")
+    pe.add_argument("--workers", type=int, default=1, help="Threads encrypting chunks in parallel")
 
-    pd = sub.add_parser("decrypt", help="Decrypt a single file using a passphrase")
-    pd.add_argument("--file", required=True, help="Path to file to decrypt")
+    pd = sub.add_parser("decrypt", help="Decrypt files using a passphrase")
+    pd.add_argument("--file", required=True, nargs="+", help="Path(s) to file(s) to decrypt")
     pd.add_argument("--passphrase", required=True, help="Passphrase (do not hard-code in scripts)")
-    pd.add_argument("--out", type=str, default=None, help="Destination path (default: strip .enc)")
+    pd.add_argument("--out", type=str, default=None, help="Destination path (default: strip .enc; single file only)")
+    pd.add_argument("--workers", type=int, default=1, help="Threads decrypting chunks in parallel")
 
     return p.parse_args(argv)
 
@@ -306,30 +852,60 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         out_dir = Path(args.out) if args.out else None
 
         try:
-            results = util.walk_and_process(out_dir=out_dir, in_place=bool(args.in_place), dry_run=bool(args.dry_run))
+            results = util.walk_and_process(
+                out_dir=out_dir,
+                in_place=bool(args.in_place),
+                dry_run=bool(args.dry_run),
+                max_workers=args.workers,
+            )
         except ValueError as ve:
             print(str(ve))
             return 2
 
         total = sum(r.redactions for r in results)
         changed = len(results)
+        categories: Dict[str, int] = {}
+        for res in results:
+            for category, count in res.categories.items():
+                categories[category] = categories.get(category, 0) + count
         print(f"Redaction candidates changed={changed} total_redactions={total} dry_run={bool(args.dry_run)}")
+        if categories:
+            print("By category: " + " ".join(f"{k}={v}" for k, v in sorted(categories.items())))
         return 0
 
+    if args.cmd == "benchmark":
+        report = benchmark_redaction(Path(args.root), size_mb=args.size_mb, max_workers=args.workers)
+        print(json.dumps(report, indent=2))
+        return 0
+
+    if args.cmd in ("encrypt", "decrypt") and args.out and len(args.file) > 1:
+        print("--out can only be used with a single --file")
+        return 2
+
     if args.cmd == "encrypt":
         if not _CRYPTO_AVAILABLE:
             print("cryptography is not installed. Install it to use encryption.")
             return 3
-        dst = encrypt_file(Path(args.file), args.passphrase, Path(args.out) if args.out else None)
-        print(f"Encrypted -> {dst}")
+        keyring = PassphraseKeyring(args.passphrase)
+        for name in args.file:
+            dst = encrypt_file(Path(name), args.passphrase, Path(args.out) if args.out else None,
+                               keyring=keyring, max_workers=args.workers)
+            print(f"Encrypted -> {dst}")
         return 0
 
     if args.cmd == "decrypt":
         if not _CRYPTO_AVAILABLE:
             print("cryptography is not installed. Install it to use decryption.")
             return 3
-        dst = decrypt_file(Path(args.file), args.passphrase, Path(args.out) if args.out else None)
-        print(f"Decrypted -> {dst}")
+        keyring = PassphraseKeyring(args.passphrase)
+        for name in args.file:
+            try:
+                dst = decrypt_file(Path(name), args.passphrase, Path(args.out) if args.out else None,
+                                   keyring=keyring, max_workers=args.workers)
+            except ValueError as ve:
+                print(f"{name}: {ve}")
+                return 4
+            print(f"Decrypted -> {dst}")
         return 0
 
     return 0
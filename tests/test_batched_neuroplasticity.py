@@ -0,0 +1,114 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'algorithms', 'python-core'))
+
+from self_optimizing_neuroplasticity import (  # type: ignore[import]  # noqa: E402
+    BatchedSelfOptimizingNeuroplasticity,
+    ExperienceMemoryRing,
+    SelfOptimizingNeuroplasticity,
+    VRAdaptationParameters,
+    benchmark_batched_neuroplasticity,
+)
+
+
+def _cohort(num_users, dims, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "weights": rng.uniform(0.1, 1.0, (num_users, dims)),
+        "experiences": rng.normal(0, 1, (num_users, dims)),
+        "D": rng.uniform(0.1, 0.9, num_users),
+        "R": rng.uniform(0.1, 0.9, num_users),
+        "feedback": {"stress": rng.uniform(0, 1, num_users), "focus": rng.uniform(0, 1, num_users)},
+        "factors": {"alpha_power": rng.uniform(0, 1, num_users), "complexity": rng.uniform(0, 1, num_users)},
+    }
+
+
+def test_ring_matches_append_and_trim_with_decay():
+    ring = ExperienceMemoryRing(num_users=2, capacity=5, decay=0.9)
+    ring.RENORMALIZE_STEPS = 7
+    reference = [np.array([]), np.array([])]
+    rng = np.random.default_rng(1)
+
+    for _ in range(30):
+        entries = rng.normal(size=2)
+        expected_means = [np.mean(m) if len(m) else 0.0 for m in reference]
+        np.testing.assert_allclose(ring.mean()[:, 0], expected_means, rtol=1e-12, atol=1e-12)
+        ring.push(entries)
+        for u in range(2):
+            decayed = reference[u] * 0.9
+            reference[u] = np.append(decayed, [entries[u]])[-5:]
+
+    for u in range(2):
+        np.testing.assert_allclose(ring.to_array(u)[:, 0], reference[u], rtol=1e-12)
+    assert ring.steps.max() < 7
+
+
+@pytest.mark.parametrize("decay, dtype", [(0.01, np.float64), (0.05, np.float32), (1e-3, np.float32)])
+def test_ring_stays_finite_under_strong_decay(decay, dtype):
+    ring = ExperienceMemoryRing(num_users=3, capacity=4, decay=decay, dtype=dtype)
+    rng = np.random.default_rng(2)
+    last = None
+
+    for _ in range(600):
+        last = rng.uniform(1, 2, size=3)
+        ring.push(last)
+
+    assert np.isfinite(ring.values).all() and np.isfinite(ring.sums).all()
+    np.testing.assert_allclose(ring.to_array(0)[-1, 0], last[0], rtol=1e-5)
+    expected = [np.mean(ring.to_array(u)[:, 0]) for u in range(3)]
+    np.testing.assert_allclose(ring.mean()[:, 0], expected, rtol=1e-5)
+
+
+def test_batched_step_matches_single_user_path():
+    num_users, dims, steps = 6, 4, 120
+    data = _cohort(num_users, dims)
+    batched = BatchedSelfOptimizingNeuroplasticity(num_users)
+    single = SelfOptimizingNeuroplasticity()
+    memories = [np.array([]) for _ in range(num_users)]
+    histories = [[] for _ in range(num_users)]
+    adaptations = [VRAdaptationParameters(0.5, False, 0.0, 0.0, 0.0) for _ in range(num_users)]
+
+    for age in range(steps):
+        out = batched.step(data["weights"], data["experiences"], 0.1, age, data["D"], data["R"],
+                           data["feedback"], data["factors"])
+        for u in range(num_users):
+            E_t, C_t = single.self_experiencing_stage(
+                data["weights"][u], data["experiences"][u], 0.1, age, data["D"][u], data["R"][u])
+            R_t, memories[u] = single.reflective_observation_stage(E_t, C_t, memories[u])
+            A_t = single.abstract_conceptualization_stage(
+                R_t, histories[u], {k: v[u] for k, v in data["factors"].items()})
+            histories[u].append(A_t)
+            result = single.active_experimentation_stage(
+                A_t, {k: v[u] for k, v in data["feedback"].items()}, adaptations[u])
+            adaptations[u].difficulty_adjustment = result["new_difficulty"]
+
+            assert out["experience_value"][u] == pytest.approx(E_t, rel=1e-9)
+            assert out["reflection_value"][u] == pytest.approx(R_t, rel=1e-9)
+            assert out["conceptualization_value"][u] == pytest.approx(A_t, rel=1e-9)
+            for key, value in result.items():
+                assert out[key][u] == pytest.approx(value, rel=1e-9, abs=1e-12)
+
+    for u in range(num_users):
+        np.testing.assert_allclose(batched.memory.to_array(u)[:, 0], memories[u], rtol=1e-9)
+
+
+def test_explicit_ragged_histories_match_single_trend():
+    single = SelfOptimizingNeuroplasticity()
+    batched = BatchedSelfOptimizingNeuroplasticity(num_users=4)
+    histories = [[], [0.4], [0.1, 0.5, 0.2], list(np.linspace(0, 3, 25))]
+    R_t = np.array([1.0, 2.0, 3.0, 4.0])
+
+    out = batched.abstract_conceptualization_stage(R_t, batched.stack_histories(histories))
+
+    expected = [single.abstract_conceptualization_stage(R_t[u], histories[u], {}) for u in range(4)]
+    np.testing.assert_allclose(out, expected, rtol=1e-12)
+
+
+def test_benchmark_reports_speedup():
+    report = benchmark_batched_neuroplasticity(num_users=500, steps=3, single_user_sample=20)
+    assert report["num_users"] == 500
+    assert report["user_steps_per_second"] > 0
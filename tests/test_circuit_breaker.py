@@ -0,0 +1,156 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from circuit_breaker import (  # type: ignore[import]  # noqa: E402
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    BreakerConfig,
+    BreakerRegistry,
+    CircuitBreaker,
+    SlidingWindow,
+    measure_allow_request_overhead,
+)
+
+CONFIG = BreakerConfig(window_seconds=10.0, buckets=10, minimum_calls=4, failure_rate_threshold=0.5,
+                       slow_call_seconds=1.0, slow_call_rate_threshold=0.75, open_seconds=5.0,
+                       max_open_seconds=30.0, backoff_multiplier=2.0, half_open_max_probes=2)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def _breaker():
+    clock = FakeClock()
+    return CircuitBreaker(CONFIG, clock), clock
+
+
+def test_window_expires_old_buckets():
+    window = SlidingWindow(10.0, 10)
+    window.add(0.5, True, False, 0.2)
+    window.add(5.5, False, True, 1.5)
+    assert window.totals(9.9) == (2, 1, 1, pytest.approx(1.7))
+    assert window.totals(10.5).calls == 1  # the first bucket has aged out
+    window.add(15.2, False, False, 0.1)  # reuses the slot of t=5.x after it expired
+    assert window.totals(15.9) == (1, 0, 0, pytest.approx(0.1))
+
+
+def test_trips_on_failure_rate_only_after_minimum_calls():
+    breaker, clock = _breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CLOSED  # 3 < minimum_calls
+    breaker.record_success()
+    assert breaker.state == OPEN and not breaker.allow_request()
+    assert breaker.open_until == clock.now + 5.0 and breaker.rejected == 1
+
+
+def test_old_failures_age_out_of_the_window():
+    breaker, clock = _breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(11)
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_trips_on_slow_call_rate():
+    breaker, _ = _breaker()
+    for latency in (2.0, 1.5, 0.1, 3.0):
+        breaker.record_success(latency)
+    assert breaker.state == OPEN and breaker.snapshot()["slow_call_rate"] == 0.75
+
+
+def test_half_open_admits_bounded_probes_and_closes():
+    breaker, clock = _breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    clock.advance(5)
+
+    admitted = [breaker.allow_request() for _ in range(50)]  # the herd arrives at once
+    assert admitted.count(True) == 2 and breaker.state == HALF_OPEN
+
+    breaker.record_success(0.1)
+    assert breaker.state == HALF_OPEN and breaker.allow_request()  # a freed slot is reusable
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED and breaker.snapshot()["calls"] == 0
+    assert all(breaker.allow_request() for _ in range(10))
+
+
+def test_failed_probes_back_off_exponentially():
+    breaker, clock = _breaker()
+    for _ in range(4):
+        breaker.record_failure()
+    timeouts = []
+    for _ in range(5):
+        timeouts.append(breaker.open_until - clock.now)
+        clock.advance(timeouts[-1] - 0.01)
+        assert not breaker.allow_request()
+        clock.advance(0.01)
+        assert breaker.allow_request()
+        breaker.record_success(2.0)  # a slow probe counts as failed
+    assert timeouts == [5.0, 10.0, 20.0, 30.0, 30.0]
+
+    clock.advance(30)
+    for _ in range(2):
+        assert breaker.allow_request()
+        breaker.record_success()
+    assert breaker.state == CLOSED and breaker.reopen_count == 0
+
+
+def test_guard_records_latency_and_exceptions():
+    breaker, clock = _breaker()
+    with breaker.guard():
+        clock.advance(0.25)
+    with pytest.raises(RuntimeError):
+        with breaker.guard():
+            raise RuntimeError("backend down")
+    snapshot = breaker.snapshot()
+    assert snapshot["calls"] == 2 and snapshot["failure_rate"] == 0.5
+    assert snapshot["mean_latency_s"] == pytest.approx(0.125)
+
+
+def test_registry_isolates_keys():
+    clock = FakeClock()
+    registry = BreakerRegistry(CONFIG, clock)
+    for _ in range(4):
+        registry.get("edge-01").record_failure()
+    assert registry.get("edge-01") is registry.get("edge-01")
+    assert registry.get("edge-02").allow_request()
+    assert registry.open_keys() == ["edge-01"] and len(registry) == 2
+
+
+def test_allow_request_overhead_below_one_microsecond():
+    assert measure_allow_request_overhead(calls=200_000) < 1000.0
+
+
+def test_section10_breaks_per_device():
+    section10 = pytest.importorskip("life_algorithm_section10_integration")
+    algo = section10.LIFEAlgorithmSection10({"edge_breaker": {"minimum_calls": 2, "open_seconds": 60.0}})
+
+    def telemetry(device, metrics):
+        return section10.EdgeDeviceTelemetry(device_id=device, timestamp=None, eeg_metrics=metrics,
+                                             focus_level=0.5, stress_level=0.5, battery_level=0.9,
+                                             connection_quality=0.8)
+
+    broken = {"alpha": "not-a-number"}
+    assert algo.process_edge_telemetry(telemetry("edge-bad", broken))["status"] == "failed"
+    assert algo.process_edge_telemetry(telemetry("edge-bad", broken))["status"] == "failed"
+    assert algo.process_edge_telemetry(telemetry("edge-bad", broken))["status"] == "circuit-open"
+    ok = algo.process_edge_telemetry(telemetry("edge-ok", {"alpha": 0.7, "beta": 0.4, "theta": 0.2}))
+    assert ok["status"] == "processed"
+    assert algo.circuit_breakers.open_keys() == ["edge-bad"]
+    assert isinstance(algo.circuit_breaker, section10.EdgeCircuitBreaker)
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from code_fetch_cache import (  # type: ignore[import]  # noqa: E402
+    ContentCache,
+    StandInCodeServer,
+    ThreadedTransport,
+    content_hash,
+    fetch_all,
+)
+
+
+def _files(n):
+    return {
+        f"pkg/mod{i}.py": f'"""Module {i}"""\nimport os\n\n' + "".join(
+            f"def f{j}():\n    return {j}\n\n" for j in range(i % 4 + 1))
+        for i in range(n)
+    }
+
+
+def _fetch(urls, cache, concurrency=4):
+    return asyncio.run(fetch_all(urls, cache, ThreadedTransport(concurrency), concurrency))
+
+
+def test_fetch_all_bounds_concurrency_and_revalidates(tmp_path):
+    files = _files(12)
+    with StandInCodeServer(files, delay=0.05) as server:
+        urls = [server.url(path) for path in files]
+        cache = ContentCache(tmp_path)
+        first = _fetch(urls + urls[:2], cache)
+        for result in first:
+            cache.save_record(result.sha256, {"traits": None})
+        assert [r.status for r in first] == ["fetched"] * 14
+        assert server.requests == 12 and 1 < server.max_in_flight <= 4
+        assert first[0].body == files["pkg/mod0.py"].encode() and first[12] is first[0]
+
+        files["pkg/mod3.py"] += "\nclass Changed:\n    pass\n"
+        second = _fetch(urls, ContentCache(tmp_path))  # a new process reading the same cache
+        assert server.requests == 24 and server.not_modified == 11
+        assert [r.status for r in second].count("not_modified") == 11
+        assert second[3].status == "fetched" and second[3].sha256 == content_hash(files["pkg/mod3.py"].encode())
+        assert second[0].body is None
+
+        missing = _fetch([server.url("missing.py")], ContentCache(tmp_path))[0]
+        assert missing.status == "error" and missing.http_status == 404
+
+
+def test_validators_are_dropped_when_the_record_is_gone(tmp_path):
+    files = _files(1)
+    with StandInCodeServer(files) as server:
+        url = server.url("pkg/mod0.py")
+        cache = ContentCache(tmp_path)
+        (result,) = _fetch([url], cache)
+        assert cache.validators(url) == {}  # nothing analysed yet, so nothing to reuse
+        cache.save_record(result.sha256, {"traits": None})
+        assert "If-None-Match" in cache.validators(url)
+        os.remove(tmp_path / "records" / f"{result.sha256}.json")
+        (again,) = _fetch([url], cache)
+        assert again.status == "fetched" and server.not_modified == 0
+
+
+def test_section10_reuses_cached_trait_records(tmp_path):
+    section10 = pytest.importorskip("life_algorithm_section10_integration")
+    files = _files(10)
+    files["pkg/copy.py"] = files["pkg/mod1.py"]  # same bytes under another URL
+    files["pkg/broken.py"] = "def oops(:\n"
+    algo = section10.LIFEAlgorithmSection10({"code_cache_dir": str(tmp_path)})
+    algo.consent_manager.set_consent("eeg_processing", True)
+    calls = []
+    extract = algo._extract_traits
+    algo._extract_traits = lambda code: calls.append(code) or extract(code)
+
+    with StandInCodeServer(files) as server:
+        urls = [server.url(path) for path in files] + [server.url("missing.py")]
+        first = asyncio.run(algo.analyze_code_urls(urls, concurrency=4))
+        assert len(calls) == 11  # the copy reused mod1's record
+        assert (first["analyzed"], first["reused"], first["errors"]) == (11, 1, 1)
+        by_url = {f["url"]: f for f in first["files"]}
+        assert by_url[server.url("pkg/copy.py")]["status"] == "cached"
+        assert by_url[server.url("pkg/mod3.py")]["traits"]["func_count"] == 4
+        assert by_url[server.url("pkg/broken.py")]["traits"] is None
+
+        files["pkg/mod5.py"] = files["pkg/mod5.py"].replace("return 0", "return -1")
+        second = asyncio.run(algo.analyze_code_urls(urls, concurrency=4))
+        assert len(calls) == 12 and server.not_modified == 11
+        assert (second["analyzed"], second["reused"], second["errors"]) == (1, 11, 1)
+        assert [f.get("traits") for f in second["files"]] == [f.get("traits") for f in first["files"]]
+
+    algo.consent_manager.set_consent("eeg_processing", False)
+    assert asyncio.run(algo.analyze_code_urls(urls))["files"] == []
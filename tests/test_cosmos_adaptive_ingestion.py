@@ -0,0 +1,109 @@
+import asyncio
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'algorithms', 'python-core'))
+
+pytest.importorskip("azure.cosmos")
+pytest.importorskip("azure.ai.ml")
+pytest.importorskip("azure.identity")
+
+from azure_architecture_optimized import (  # type: ignore[import]  # noqa: E402
+    AdaptiveBatchController,
+    OptimizedAzureArchitecture,
+)
+from cosmos_local import (  # type: ignore[import]  # noqa: E402
+    FakeClock,
+    InMemoryCosmosClient,
+    LocalCosmosError,
+)
+
+
+def _architecture(ru_per_second=100_000.0, ru_per_write=10.0, provisionedru=None):
+    clock = FakeClock()
+    client = InMemoryCosmosClient(ru_per_second=ru_per_second, ru_per_write=ru_per_write, clock=clock)
+    architecture = OptimizedAzureArchitecture(
+        cosmosclient=client,
+        mlclient=object(),
+        provisionedru=provisionedru,
+        sleep=clock.sleep,
+        rng=random.Random(7),
+    )
+    container = client.get_database_client("LifeDatabase").get_container_client("EEGData")
+    return architecture, container, clock
+
+
+def _datapoints(users, per_user):
+    return [
+        {"id": f"{user}-{i}", "userid": user, "alpha": 0.5}
+        for user in users for i in range(per_user)
+    ]
+
+
+def test_ingestion_issues_one_batch_stream_per_partition():
+    architecture, container, _ = _architecture()
+    data = _datapoints(["u1", "u2", "u3"], 30)
+
+    results = asyncio.run(architecture.optimizeddataingestion(data))
+
+    assert len(results) == 3
+    assert container.batch_sizes == [30, 30, 30]
+    assert {pk.split("_")[0] for pk, _ in container.items} == {"u1", "u2", "u3"}
+    assert len(container.items) == 90
+
+
+def test_batches_never_exceed_service_limit():
+    architecture, container, _ = _architecture()
+    asyncio.run(architecture.optimizeddataingestion(_datapoints(["u1"], 250)))
+
+    assert max(container.batch_sizes) <= 100
+    assert sum(container.batch_sizes) == 250
+
+
+def test_throttling_shrinks_batches_and_honours_retry_after():
+    architecture, container, clock = _architecture(ru_per_second=500.0, ru_per_write=10.0)
+
+    asyncio.run(architecture.optimizeddataingestion(_datapoints(["u1"], 300)))
+
+    assert len(container.items) == 300
+    assert container.throttle_count > 0
+    assert max(container.batch_sizes) <= 50
+    assert architecture.batchcontroller.throttlecount == container.throttle_count
+    assert clock.sleeps and all(delay > 0 for delay in clock.sleeps)
+
+
+def test_request_charge_caps_batch_size_to_target():
+    architecture, container, _ = _architecture(provisionedru=200.0)
+
+    asyncio.run(architecture.optimizeddataingestion(_datapoints(["u1"], 200)))
+
+    # Target charge 200 RU * 0.7 = 140 RU at 10 RU per write -> 14 operations
+    assert container.batch_sizes[0] == 100
+    assert set(container.batch_sizes[1:-1]) == {14}
+    assert sum(container.batch_sizes) == 200
+
+
+def test_backoff_is_exponential_jittered_and_respects_retry_after():
+    controller = AdaptiveBatchController(basedelay=0.1, maxdelay=2.0, jitter=0.25, rng=random.Random(1))
+
+    delays = [controller.backoff_delay(attempt) for attempt in range(6)]
+    for attempt, delay in enumerate(delays):
+        expected = min(2.0, 0.1 * 2 ** attempt)
+        assert expected <= delay <= expected * 1.25
+    assert controller.backoff_delay(0, retryafter=1.5) >= 1.5
+
+
+def test_failed_partition_falls_back_to_individual_upserts():
+    architecture, container, _ = _architecture()
+
+    async def reject_batch(*_args, **_kwargs):
+        raise LocalCosmosError(400, "Bad request")
+
+    container.execute_item_batch = reject_batch
+    results = asyncio.run(architecture.optimizeddataingestion(_datapoints(["u1", "u2"], 5)))
+
+    assert len(results) == 10
+    assert len(container.items) == 10
@@ -0,0 +1,181 @@
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from deadline_pacer import DeadlinePacer, MissedTickPolicy, StopToken  # type: ignore[import]  # noqa: E402
+
+INTERVAL = 0.01
+WAKE_NOISE = 0.0005
+
+
+class FakeClock:
+    def __init__(self, seed=0):
+        self.now = 1000.0
+        self.rng = random.Random(seed)
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, delay):
+        # Wake up slightly late, like a real loop under load
+        self.now += delay + self.rng.uniform(0, WAKE_NOISE)
+        await asyncio.sleep(0)
+
+    def work(self):
+        # Mostly short ticks, with occasional overruns of up to 3.5 intervals
+        if self.rng.random() < 0.02:
+            self.now += self.rng.uniform(1.2, 3.5) * INTERVAL
+        else:
+            self.now += self.rng.uniform(0.1, 0.6) * INTERVAL
+
+
+def _run(policy, ticks=10000, seed=0):
+    clock = FakeClock(seed)
+    pacer = DeadlinePacer(INTERVAL, policy=policy, clock=clock, sleep=clock.sleep)
+    start = clock.now
+    seen = []
+
+    def on_tick(ctx):
+        seen.append(ctx)
+        clock.work()
+
+    stats = asyncio.run(pacer.run(on_tick, max_ticks=ticks))
+    return start, seen, stats
+
+
+def test_skip_policy_keeps_drift_bounded_over_10k_ticks():
+    start, seen, stats = _run(MissedTickPolicy.SKIP)
+
+    assert stats.ticks == len(seen) == 10000
+    assert stats.overruns > 100
+    # Every tick serves a grid deadline and starts within the wake-up noise of it
+    for ctx in seen:
+        assert ctx.deadline == pytest.approx(start + ctx.index * INTERVAL, abs=1e-9)
+        assert 0 <= ctx.started - ctx.deadline <= WAKE_NOISE + 1e-9
+    assert stats.jitter_max <= WAKE_NOISE + 1e-9
+    # No tick is lost without being counted
+    assert seen[-1].index + 1 == stats.ticks + stats.missed_ticks
+    assert sum(ctx.missed for ctx in seen) == stats.missed_ticks
+
+
+def test_coalesce_policy_runs_one_catch_up_tick():
+    start, seen, stats = _run(MissedTickPolicy.COALESCE, seed=1)
+
+    assert stats.ticks == 10000
+    assert stats.coalesced_ticks == stats.missed_ticks == sum(ctx.missed for ctx in seen)
+    for prev, ctx in zip(seen, seen[1:]):
+        assert ctx.index == prev.index + 1 + ctx.missed
+        # A catch-up tick serves the latest passed deadline, so it is less than one interval late
+        assert ctx.started - ctx.deadline < INTERVAL
+    assert seen[-1].started - (start + seen[-1].index * INTERVAL) < INTERVAL
+
+
+def test_naive_sleep_loop_would_drift():
+    # Reference for the bound above: sleeping a fixed interval after each tick
+    clock = FakeClock()
+    start = clock.now
+
+    async def naive():
+        for _ in range(10000):
+            clock.work()
+            await clock.sleep(INTERVAL)
+
+    asyncio.run(naive())
+    assert clock.now - start > 10000 * INTERVAL * 1.3
+
+
+def test_errors_are_counted_and_can_stop_the_loop():
+    clock = FakeClock()
+
+    def flaky(ctx):
+        if ctx.index % 3 == 1:
+            raise RuntimeError("sensor dropout")
+
+    stats = asyncio.run(DeadlinePacer(INTERVAL, clock=clock, sleep=clock.sleep).run(flaky, max_ticks=9))
+    assert (stats.ticks, stats.errors) == (9, 3)
+
+    stats = asyncio.run(DeadlinePacer(INTERVAL, clock=clock, sleep=clock.sleep, stop_on_error=True).run(flaky))
+    assert (stats.ticks, stats.errors) == (2, 1)
+
+
+def test_stop_token_and_cancellation_with_real_clock():
+    async def scenario():
+        token = StopToken()
+        pacer = DeadlinePacer(30.0, stop_token=token)
+        ticks = []
+        task = asyncio.create_task(pacer.run(ticks.append))
+        await asyncio.sleep(0.05)
+        token.stop()
+        stats = await asyncio.wait_for(task, 1.0)
+        assert stats.ticks == len(ticks) == 1
+
+        cancelled = DeadlinePacer(30.0)
+        task = asyncio.create_task(cancelled.run(lambda ctx: None))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert cancelled.stats.ticks == 1
+
+    asyncio.run(scenario())
+
+
+def test_stop_token_serves_successive_loops_and_other_threads():
+    token = StopToken()
+    # A wait on one loop must not bind the token to it
+    assert asyncio.run(token.wait(0.01)) is False
+    assert asyncio.run(token.wait(0.01)) is False
+
+    pacer = DeadlinePacer(30.0, stop_token=token)
+    timer = threading.Timer(0.05, token.stop)
+    timer.start()
+    try:
+        stats = asyncio.run(asyncio.wait_for(pacer.run(lambda ctx: None), 2.0))
+    finally:
+        timer.cancel()
+    assert stats.ticks == 1
+    assert asyncio.run(token.wait(30.0)) is True
+
+
+def test_section3_biometrics_runner_shares_the_event_loop():
+    import life_algorithm_ultimate_section3 as section3  # type: ignore[import]
+
+    algorithm = section3.LIFEAlgorithm()
+    clock = FakeClock()
+    stats = asyncio.run(algorithm.run_biometrics(interval_s=INTERVAL, max_ticks=25, clock=clock, sleep=clock.sleep))
+    assert stats.ticks == 25 and stats.errors == 0
+    assert algorithm.biometrics_stats is stats
+
+    async def stop_soon():
+        task = asyncio.create_task(algorithm.run_biometrics(interval_s=30.0))
+        await asyncio.sleep(0.05)
+        algorithm.stop_biometrics()
+        return await asyncio.wait_for(task, 1.0)
+
+    assert asyncio.run(stop_soon()).ticks == 1
+
+
+def test_section3_biometrics_tick_does_not_block_the_loop():
+    import life_algorithm_ultimate_section3 as section3  # type: ignore[import]
+
+    algorithm = section3.LIFEAlgorithm()
+    algorithm.stream_eeg_to_azure = lambda eeg_data: time.sleep(0.3)  # blocking Event Hub send
+
+    async def run_with_heartbeat():
+        beats = 0
+        task = asyncio.create_task(algorithm.run_biometrics(interval_s=0.01, max_ticks=1))
+        while not task.done():
+            await asyncio.sleep(0.01)
+            beats += 1
+        return beats, await task
+
+    beats, stats = asyncio.run(run_with_heartbeat())
+    assert stats.ticks == 1 and stats.errors == 0
+    assert beats >= 10
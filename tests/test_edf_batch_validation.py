@@ -0,0 +1,180 @@
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'algorithms', 'python-core'))
+
+from edf_reader import EDFReader  # type: ignore[import]  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def validation_module(tmp_path_factory):
+    """Import lightweight_eeg_validation away from the repo root (it creates dirs on import)"""
+    pytest.importorskip("azure.identity")
+    workdir = tmp_path_factory.mktemp("validation_cwd")
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        import lightweight_eeg_validation  # type: ignore[import]
+    finally:
+        os.chdir(previous)
+    return lightweight_eeg_validation
+
+
+def _field(value, width):
+    return str(value).ljust(width)[:width].encode("ascii")
+
+
+def write_edf(path, signals, sampling_rate=250, record_seconds=1, labels=None,
+              physical=(-500.0, 500.0), annotations=False, declared_records=None):
+    """Write a minimal EDF (or EDF+C with an empty annotation channel)"""
+    signals = np.asarray(signals, dtype=float)
+    per_record = int(sampling_rate * record_seconds)
+    n_records = signals.shape[1] // per_record
+    labels = list(labels or [f"EEG{i}" for i in range(signals.shape[0])])
+    phys_min, phys_max = physical
+    dig_min, dig_max = -32768, 32767
+    digital = np.round(
+        (signals - phys_min) * (dig_max - dig_min) / (phys_max - phys_min) + dig_min
+    ).clip(dig_min, dig_max).astype("<i2")
+
+    headers = [(label, phys_min, phys_max, dig_min, dig_max, per_record) for label in labels]
+    if annotations:
+        headers.append(("EDF Annotations", -1, 1, dig_min, dig_max, 30))
+    ns = len(headers)
+
+    header = b"".join([
+        _field("0", 8), _field("X X X X", 80), _field("Startdate X X X X", 80),
+        _field("01.01.25", 8), _field("00.00.00", 8), _field(256 * (ns + 1), 8),
+        _field("EDF+C" if annotations else "", 44),
+        _field(n_records if declared_records is None else declared_records, 8),
+        _field(record_seconds, 8), _field(ns, 4),
+    ])
+    columns = [
+        [_field(h[0], 16) for h in headers], [_field("AgAgCl", 80) for _ in headers],
+        [_field("uV", 8) for _ in headers], [_field(h[1], 8) for h in headers],
+        [_field(h[2], 8) for h in headers], [_field(h[3], 8) for h in headers],
+        [_field(h[4], 8) for h in headers], [_field("HP:0.1Hz", 80) for _ in headers],
+        [_field(h[5], 8) for h in headers], [_field("", 32) for _ in headers],
+    ]
+    header += b"".join(b"".join(col) for col in columns)
+
+    with open(path, "wb") as f:
+        f.write(header)
+        for record in range(n_records):
+            block = digital[:, record * per_record:(record + 1) * per_record]
+            for row in block:
+                f.write(row.tobytes())
+            if annotations:
+                f.write(np.zeros(30, dtype="<i2").tobytes())
+    return path
+
+
+def test_reader_decodes_physical_units(tmp_path):
+    t = np.arange(1000) / 250.0
+    signals = np.vstack([100 * np.sin(2 * np.pi * 10 * t), 50 * np.cos(2 * np.pi * 3 * t)])
+    path = write_edf(tmp_path / "rec.edf", signals)
+
+    with EDFReader(path) as reader:
+        assert reader.channel_names == ["EEG0", "EEG1"]
+        assert reader.num_records == 4
+        assert reader.sampling_rate("EEG0") == 250.0
+        decoded = reader.read_channels()
+
+    resolution = 1000.0 / 65535
+    np.testing.assert_allclose(decoded["EEG0"], signals[0], atol=resolution)
+    np.testing.assert_allclose(decoded["EEG1"], signals[1], atol=resolution)
+
+
+def test_reader_handles_edf_plus_and_unknown_record_count(tmp_path):
+    signals = np.random.default_rng(0).uniform(-100, 100, size=(3, 500))
+    path = write_edf(tmp_path / "plus.edf", signals, annotations=True, declared_records=-1)
+
+    with EDFReader(path) as reader:
+        assert reader.is_edf_plus
+        assert reader.channel_names == ["EEG0", "EEG1", "EEG2"]
+        assert reader.num_records == 2
+        np.testing.assert_allclose(reader.read_channel(2), signals[2], atol=0.02)
+
+
+def test_batch_validation_runs_in_process_pool(validation_module, tmp_path, monkeypatch):
+    monkeypatch.setattr(validation_module, "TRACKING_DATA_DIR", str(tmp_path / "tracking"))
+    os.makedirs(tmp_path / "tracking")
+    dataset = tmp_path / "physionet"
+    (dataset / "S001").mkdir(parents=True)
+    rng = np.random.default_rng(1)
+    for i in range(5):
+        write_edf(dataset / "S001" / f"S001R{i:02d}.edf", rng.uniform(-50, 50, size=(4, 500)))
+
+    validator = validation_module.ValidatedLIFE()
+    results = asyncio.run(validator.batch_validate_physionet_data(
+        str(dataset), max_samples=4, max_workers=2, max_in_flight=2
+    ))
+
+    assert sorted(r.user_id for r in results) == [f"S001R{i:02d}" for i in range(4)]
+    assert all(r.validation_status in {"passed", "warning", "failed"} for r in results)
+    assert validator.get_validation_summary()["total_validations"] == 4
+    validator.close()
+
+
+def test_summary_includes_results_logged_while_another_process_held_the_log(
+        validation_module, tmp_path, monkeypatch):
+    monkeypatch.setattr(validation_module, "TRACKING_DATA_DIR", str(tmp_path / "tracking"))
+    os.makedirs(tmp_path / "tracking")
+    write_edf(tmp_path / "rec0.edf", np.zeros((2, 250)))
+    other_process = validation_module.ValidationLogWriter(str(tmp_path / "tracking" / "segments"))
+
+    validator = validation_module.ValidatedLIFE()
+    asyncio.run(validator.batch_validate_physionet_data(str(tmp_path), max_samples=1, max_workers=1))
+    assert validator.validation_log.log_dir.endswith(f"segments-{os.getpid()}")
+    assert validator.get_validation_summary()["total_validations"] == 1
+    validator.close()
+    other_process.close()
+
+    reader = validation_module.ValidatedLIFE()
+    assert reader.get_validation_summary()["total_validations"] == 1
+    reader._open_validation_log().close()
+    assert not (tmp_path / "tracking" / f"segments-{os.getpid()}").exists()
+    assert reader.get_validation_summary()["total_validations"] == 1
+
+
+def test_results_stream_as_they_finish(validation_module, tmp_path, monkeypatch):
+    monkeypatch.setattr(validation_module, "TRACKING_DATA_DIR", str(tmp_path))
+    for i in range(3):
+        write_edf(tmp_path / f"rec{i}.edf", np.zeros((2, 250)))
+
+    async def consume():
+        validator = validation_module.ValidatedLIFE()
+        seen = []
+        async for result in validator.iter_validate_physionet_data(str(tmp_path), max_workers=1):
+            seen.append(result.user_id)
+        return seen
+
+    assert sorted(asyncio.run(consume())) == ["rec0", "rec1", "rec2"]
+
+
+def test_metrics_come_from_decoded_samples(validation_module, tmp_path, monkeypatch):
+    monkeypatch.setattr(validation_module, "TRACKING_DATA_DIR", str(tmp_path))
+    t = np.arange(2500) / 250.0
+    write_edf(tmp_path / "alpha.edf", np.vstack([40 * np.sin(2 * np.pi * 10 * t)] * 3), annotations=True)
+    write_edf(tmp_path / "FLAT.EDF", np.zeros((2, 500)))
+
+    validator = validation_module.ValidatedLIFE()
+    results = asyncio.run(validator.batch_validate_physionet_data(str(tmp_path), max_workers=1))
+    by_user = {r.user_id: r for r in results}
+
+    # Each recording once, whatever the suffix case
+    assert sorted(by_user) == ["FLAT", "alpha"]
+    alpha = by_user["alpha"].metrics
+    assert alpha.alpha_power > 0.95
+    assert alpha.signal_quality > 0.95
+    assert by_user["FLAT"].metrics.signal_quality == 0.0
+    assert by_user["FLAT"].validation_status == "failed"
+    # Deterministic: the same file gives the same metrics
+    again = asyncio.run(validator.validate_eeg_stream({"edf_path": str(tmp_path / "alpha.edf")}, "alpha",
+                                                      log_result=False))
+    assert again.metrics.alpha_power == alpha.alpha_power
+    validator.close()
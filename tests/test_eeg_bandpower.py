@@ -0,0 +1,86 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from eeg_bandpower import (  # type: ignore[import]  # noqa: E402
+    EEG_BANDS,
+    bandpass,
+    band_powers,
+    eeg_band_powers,
+    fft_bandpass,
+    welch_psd,
+)
+
+FS = 128.0
+
+
+def _tones(freqs, samples=1024, amplitude=1.0):
+    t = np.arange(samples) / FS
+    return np.vstack([amplitude * np.sin(2 * np.pi * f * t) for f in freqs])
+
+
+def test_welch_matches_scipy():
+    signal = pytest.importorskip("scipy.signal")
+    X = np.random.default_rng(0).normal(size=(6, 1000))
+    for nperseg in (256, 255, 64):
+        freqs, psd = welch_psd(X, FS, nperseg)
+        ref_freqs, ref_psd = signal.welch(X, FS, nperseg=nperseg, axis=-1)
+        np.testing.assert_allclose(freqs, ref_freqs)
+        np.testing.assert_allclose(psd, ref_psd, atol=1e-14)
+
+
+@pytest.mark.parametrize("freq, band", [(6.0, "theta"), (10.0, "alpha"), (20.0, "beta")])
+def test_band_power_is_frequency_selective(freq, band):
+    powers = dict(zip(EEG_BANDS, eeg_band_powers(_tones([freq]), FS)[0]))
+    # A unit sine carries 0.5 units of power, all of it in its own band
+    assert powers[band] == pytest.approx(0.5, rel=0.02)
+    assert sum(powers.values()) == pytest.approx(powers[band], rel=0.01)
+
+
+def test_zero_phase_filters_remove_out_of_band_power():
+    X = _tones([10.0]) + _tones([0.1]) + _tones([55.0])
+    for filtered in (bandpass(X, FS), fft_bandpass(X, FS, 0.5, 45.0)):
+        freqs, psd = welch_psd(filtered, FS)
+        total = band_powers(freqs, psd, {"all": (0.0, 64.0)})[0, 0]
+        assert total == pytest.approx(0.5, rel=0.05)
+        # Zero phase: the filtered 10 Hz tone stays aligned with the original
+        middle = slice(256, 768)
+        assert np.corrcoef(filtered[0, middle], _tones([10.0])[0, middle])[0, 1] > 0.99
+
+
+def test_short_and_empty_signals():
+    assert eeg_band_powers(np.zeros((3, 1)), FS).shape == (3, 3)
+    assert np.all(eeg_band_powers(np.ones((2, 20)), FS) < 1e-12)
+
+
+def test_section8_batch_matches_scalar_path():
+    section8 = pytest.importorskip("life_algorithm_section8_integration")
+    algo = section8.LIFEAlgorithm()
+    algo.consent_manager.set_consent("eeg_processing", True)
+    rng = np.random.default_rng(1)
+    X = _tones([6.0, 10.0, 20.0, 10.0], samples=512) + 0.2 * rng.normal(size=(4, 512))
+    X[3] += _tones([20.0], samples=512)[0] * 2
+
+    batch = algo.preprocess_eeg_batch(X)
+
+    assert len(batch) == 4 and batch.alpha_power.shape == (4,)
+    singles = [algo.preprocess_eeg(row.tolist()) for row in X]
+    for one, single in zip(batch, singles):
+        assert isinstance(one, section8.EEGMetrics)
+        for name in ("alpha_power", "beta_power", "theta_power", "attention_index",
+                     "stress_level", "focus_level", "neuroplasticity_score"):
+            assert getattr(one, name) == pytest.approx(getattr(single, name), rel=1e-9, abs=1e-12)
+        assert one.stress_level == pytest.approx(min(1.0, one.beta_power / (one.alpha_power + 1e-9) / 10.0))
+    assert batch.theta_power.argmax() == 0 and batch.alpha_power[1] > batch.beta_power[1]
+    assert batch.stress_level[3] > batch.stress_level[1]
+    powers = dict(zip(EEG_BANDS, eeg_band_powers(X[1], algo.config.get("eeg_sampling_rate", 128.0))[0]))
+    assert (powers["alpha"], powers["beta"], powers["theta"]) == \
+        pytest.approx((batch[1].alpha_power, batch[1].beta_power, batch[1].theta_power))
+
+    algo.consent_manager.set_consent("eeg_processing", False)
+    with pytest.raises(PermissionError):
+        algo.preprocess_eeg_batch(X)
@@ -0,0 +1,93 @@
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'algorithms', 'python-core'))
+
+from experimentP2L_REPAIRED_CLEAN import (  # type: ignore[import]  # noqa: E402
+    EEG_BANDS,
+    EEGRingBuffer,
+    LIFEAlgorithm,
+    UserTraits,
+    benchmark_sessions_per_second,
+)
+
+FS = 256.0
+
+
+def _user():
+    return UserTraits(
+        user_id="test_user",
+        curiosity=0.5,
+        persistence=0.5,
+        openness=0.5,
+        processing_speed=0.5,
+        learning_efficiency=0.5,
+    )
+
+
+def _sinusoid(freq, channels=4, samples=256):
+    t = np.arange(samples) / FS
+    return np.tile(np.sin(2 * np.pi * freq * t), (channels, 1))
+
+
+@pytest.mark.parametrize(
+    "freq, band",
+    [(2.0, 'delta'), (6.0, 'theta'), (10.0, 'alpha'), (20.0, 'beta'), (60.0, 'gamma')],
+)
+def test_band_power_concentrates_in_known_band(freq, band):
+    algorithm = LIFEAlgorithm(_user(), sampling_rate=FS)
+    powers = algorithm._calculate_band_power(_sinusoid(freq))
+
+    assert set(powers) == set(EEG_BANDS)
+    assert max(powers, key=powers.get) == band
+    assert powers[band] > 0.9
+    assert sum(powers.values()) == pytest.approx(1.0)
+
+
+def test_band_power_splits_mixture_by_amplitude():
+    algorithm = LIFEAlgorithm(_user(), sampling_rate=FS)
+    mixture = _sinusoid(10.0) + 0.5 * _sinusoid(20.0)
+    powers = algorithm._calculate_band_power(mixture)
+
+    # Power scales with amplitude squared: alpha 1.0 vs beta 0.25
+    assert powers['alpha'] / powers['beta'] == pytest.approx(4.0, rel=0.05)
+
+
+def test_process_eeg_stream_uses_ring_buffer_window():
+    algorithm = LIFEAlgorithm(_user(), sampling_rate=FS, window_seconds=1.0, buffer_seconds=2.0)
+    metrics = asyncio.run(algorithm.process_eeg_stream(_sinusoid(10.0)))
+
+    assert metrics.alpha_power > 0.9
+    assert len(algorithm.eeg_buffer) == 256
+    assert len(algorithm.metrics_buffer) == 1
+
+
+def test_ring_buffer_wraps_and_returns_views():
+    buffer = EEGRingBuffer(channels=2, capacity=5)
+    stream = np.arange(24, dtype=float).reshape(2, 12)
+    for start in range(0, 12, 3):
+        buffer.append(stream[:, start:start + 3])
+
+    window = buffer.window(4)
+    np.testing.assert_array_equal(window, stream[:, -4:])
+    assert np.shares_memory(window, buffer._data)
+    assert len(buffer) == 5
+
+    buffer.append(np.arange(14, dtype=float).reshape(2, 7))
+    np.testing.assert_array_equal(buffer.window(), np.arange(14).reshape(2, 7)[:, -5:])
+
+
+def test_ring_buffer_rejects_wrong_channel_count():
+    buffer = EEGRingBuffer(channels=2, capacity=5)
+    with pytest.raises(ValueError):
+        buffer.append(np.zeros((3, 4)))
+
+
+def test_benchmark_reports_sessions_per_second():
+    result = asyncio.run(benchmark_sessions_per_second(num_sessions=3, samples_per_session=2))
+    assert result['sessions'] == 3
+    assert result['sessions_per_second'] > 0
@@ -0,0 +1,90 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from feature_ranking import (  # type: ignore[import]  # noqa: E402
+    rank_windows_by_variance,
+    top_k_indices,
+    top_magnitude_features,
+    window_variances,
+)
+
+
+def _legacy_window_ranking(raw_signal):
+    # Section 4 _classical_feature_optimization before vectorisation
+    signal_array = np.array(raw_signal)
+    window_size = min(50, len(signal_array) // 10)
+    if window_size < 2:
+        return list(range(len(signal_array)))
+    feature_importance = []
+    for i in range(0, len(signal_array) - window_size, window_size):
+        feature_importance.append((i, np.var(signal_array[i:i + window_size])))
+    feature_importance.sort(key=lambda x: x[1], reverse=True)
+    selected_count = max(1, len(feature_importance) // 2)
+    return [idx for idx, _ in feature_importance[:selected_count]]
+
+
+def _legacy_magnitude_selection(raw_signal):
+    # Section 8 _classical_feature_selection before vectorisation
+    magnitudes = [(i, abs(float(x))) for i, x in enumerate(raw_signal)]
+    magnitudes.sort(key=lambda x: -x[1])
+    n_features = min(16, max(1, len(raw_signal) // 4))
+    return sorted(idx for idx, _ in magnitudes[:n_features])
+
+
+def _signals(seed, rows, n, quantised=False):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(0, 1, (rows, n)) * rng.uniform(0.1, 3, (rows, 1))
+    # Rounding to a coarse grid produces many exact ties in |x|
+    return np.round(x * 2) / 2 if quantised else x
+
+
+@pytest.mark.parametrize("n", [20, 99, 256, 1000, 2503])
+def test_window_ranking_matches_legacy(n):
+    signals = _signals(n, 12, n)
+
+    batch = rank_windows_by_variance(signals)
+
+    for row, selected in zip(signals, batch.tolist()):
+        assert selected == _legacy_window_ranking(row.tolist())
+
+
+@pytest.mark.parametrize("quantised", [False, True])
+@pytest.mark.parametrize("n", [1, 3, 7, 40, 64, 500, 4096])
+def test_magnitude_selection_matches_legacy(n, quantised):
+    signals = _signals(n, 10, n, quantised)
+
+    batch = top_magnitude_features(signals)
+
+    for row, selected in zip(signals, batch.tolist()):
+        assert selected == _legacy_magnitude_selection(row.tolist())
+
+
+def test_top_k_breaks_ties_towards_lower_index():
+    scores = np.array([[1.0, 3.0, 3.0, 2.0, 3.0, 3.0], [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]])
+    np.testing.assert_array_equal(top_k_indices(scores, 3), [[1, 2, 4], [0, 1, 2]])
+    np.testing.assert_array_equal(top_k_indices(scores[0], 6), [[1, 2, 4, 5, 3, 0]])
+    assert top_k_indices(scores, 0).shape == (2, 0)
+
+
+def test_window_variances_and_section_methods():
+    x = _signals(0, 3, 310)
+    ref = [[np.var(row[i:i + 31]) for i in range(0, 310 - 31, 31)] for row in x]
+    np.testing.assert_allclose(window_variances(x, 31), ref, rtol=1e-12)
+
+    section8 = pytest.importorskip("life_algorithm_section8_integration")
+    algo = section8.LIFEAlgorithm()
+    assert algo._classical_feature_selection(x) == [_legacy_magnitude_selection(r) for r in x.tolist()]
+    assert algo._classical_feature_selection(x[0].tolist()) == _legacy_magnitude_selection(x[0].tolist())
+    assert algo._classical_feature_selection([]) == []
+
+    section4 = pytest.importorskip("life_algorithm_section4_integration")
+    algo4 = section4.LIFEAlgorithmSection4()
+    batch = algo4._classical_feature_optimization({"processed_data": x})
+    assert batch == [_legacy_window_ranking(r) for r in x.tolist()]
+    assert algo4._classical_feature_optimization({"processed_data": x[1].tolist()}) == batch[1]
+    assert algo4._classical_feature_optimization({"processed_data": list(range(12))}) == list(range(12))
@@ -0,0 +1,170 @@
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from iot_telemetry import (  # type: ignore[import]  # noqa: E402
+    F64,
+    F64_ARRAY,
+    JSON,
+    STR,
+    TIME,
+    StandInBroker,
+    TelemetryBatcher,
+    close_telemetry_clients,
+    decode_batch,
+    decode_schema,
+    encode_batch,
+    get_telemetry_client,
+    infer_schema,
+    release_telemetry_client,
+    schema_tag,
+    topic_matches,
+)
+
+CONNECTION = "HostName=life.azure-devices.net;DeviceId=headset-7;SharedAccessKey=abc="
+
+
+def _metrics(i):
+    return {
+        "timestamp": datetime(2025, 3, 1, 12, 0, i % 60, 1000 * i % 1_000_000),
+        "attention_index": 0.5 + i / 10_000,
+        "stress_level": i * 1e-3,
+        "sample": i,
+        "artifact": i % 7 == 0,
+    }
+
+
+def test_columnar_roundtrip_is_lossless():
+    samples = [_metrics(i) for i in range(300)]
+    samples[3]["note"] = "mail me at ada@example.com"
+    samples[5]["spectrum"] = [0.25, 1.5, -2.0]
+    samples[6]["context"] = {"domain": "healthcare", "ids": [1, 2]}
+    samples[7]["recorded_at"] = datetime(2025, 3, 1, 11, 59, tzinfo=timezone.utc)
+
+    payload = encode_batch(samples)
+    schema, rows, tag = decode_schema(payload)
+
+    assert decode_batch(payload) == samples
+    assert rows == 300 and tag == schema_tag(schema) == schema_tag(infer_schema(samples))
+    kinds = dict(schema)
+    assert kinds["timestamp"] == TIME and kinds["attention_index"] == F64
+    assert (kinds["note"], kinds["spectrum"], kinds["context"]) == (STR, F64_ARRAY, JSON)
+    # Far smaller than one JSON document per sample
+    assert len(payload) < 0.5 * sum(len(repr(s)) for s in samples)
+    with pytest.raises(ValueError):
+        decode_batch(payload[:-1])
+
+
+def test_redaction_touches_string_fields_only():
+    seen = []
+
+    def redact(text):
+        seen.append(text)
+        return text.replace("ada@example.com", "[REDACTED]")
+
+    samples = [{"stress": 0.4, "note": "ada@example.com", "context": {"who": "ada@example.com", "n": 3}},
+               {"stress": 0.5}]
+
+    decoded = decode_batch(encode_batch(samples, redact))
+
+    assert seen == ["ada@example.com", "ada@example.com"]
+    assert decoded[0] == {"stress": 0.4, "note": "[REDACTED]", "context": {"who": "[REDACTED]", "n": 3}}
+    assert decoded[1] == {"stress": 0.5}
+
+
+def test_batcher_reuses_one_connection_and_cuts_message_count():
+    broker = StandInBroker()
+    sender = TelemetryBatcher(broker.client_factory()(CONNECTION), max_batch=50, max_delay=None)
+    samples = [_metrics(i) for i in range(1000)]
+
+    for sample in samples:
+        assert sender.send(sample)
+    assert sender.flush(timeout=5)
+
+    messages = broker.received("devices/+/messages/events/#")
+    assert len(messages) == 20 and broker.connections == 1
+    assert broker.samples() == samples
+    assert messages[0].properties["rows"] == "50" and sender.stats.samples_per_message == 50
+    sender.close()
+    assert sender.client.shutdowns == 1
+    with pytest.raises(RuntimeError):
+        sender.send(samples[0])
+
+
+def test_batcher_sends_partial_batch_after_max_delay():
+    broker = StandInBroker()
+    sender = TelemetryBatcher(broker.client_factory()(CONNECTION), max_batch=100, max_delay=0.05)
+    for i in range(3):
+        sender.send(_metrics(i))
+
+    deadline = time.monotonic() + 2
+    while not broker.messages and time.monotonic() < deadline:
+        time.sleep(0.01)
+    sender.close()
+    assert len(broker.messages) == 1 and len(broker.samples()) == 3
+
+
+def test_flush_after_close_returns_and_exit_closes_bare_batchers():
+    broker = StandInBroker()
+    closed = TelemetryBatcher(broker.client_factory()(CONNECTION), max_delay=None)
+    closed.send(_metrics(0))
+    closed.close()
+    assert closed.flush() is True  # used to wait forever on the stopped sender thread
+
+    bare = TelemetryBatcher(broker.client_factory()("HostName=h;DeviceId=bare;SharedAccessKey=k="), max_delay=None)
+    bare.send(_metrics(1))
+    close_telemetry_clients()  # what atexit runs
+    assert bare.closed and bare.client.shutdowns == 1
+    assert broker.samples() == [_metrics(0), _metrics(1)]
+
+
+def test_topic_matching():
+    assert topic_matches("devices/+/messages/events/#", "devices/d1/messages/events/")
+    assert not topic_matches("devices/+/messages", "devices/d1/messages/events/")
+    assert topic_matches("#", "a/b")
+
+
+def test_sections_stream_through_shared_batched_client():
+    section10 = pytest.importorskip("life_algorithm_section10_integration")
+    section8 = pytest.importorskip("life_algorithm_section8_integration")
+    broker = StandInBroker()
+    config = {"iot_hub_connection_string": CONNECTION, "iot_client_factory": broker.client_factory(),
+              "iot_batch_size": 16, "iot_batch_delay_s": 60}
+    first, second = section10.LIFEAlgorithmSection10(config), section10.LIFEAlgorithmSection10(config)
+    try:
+        for i in range(40):
+            assert (first if i % 2 else second).stream_eeg_to_hub({"focus": i / 40, "contact": "ada@example.com"})
+        assert first.eeg_stream is second.eeg_stream is get_telemetry_client(CONNECTION)
+        first.flush_eeg_stream(timeout=5)
+    finally:
+        first.close_eeg_stream()
+    assert len(broker.messages) == 3 and broker.connections == 1
+    received = broker.samples()
+    assert [s["focus"] for s in received] == [i / 40 for i in range(40)]
+    assert {s["contact"] for s in received} == {"[REDACTED]"}
+    release_telemetry_client(CONNECTION)
+
+    algo = section8.LIFEAlgorithm({"iot_batch_size": 8})
+    algo.iot_client = broker.client_factory()(CONNECTION)
+    algo.consent_manager.set_consent("cloud_analytics", True)
+    calls = []
+    algo.gdpr_anonymizer.anonymize = lambda text: calls.append(text) or text
+    metrics = [
+        section8.EEGMetrics(timestamp=datetime(2025, 1, 1, 9, 0, i), alpha_power=0.4, beta_power=0.3,
+                            theta_power=0.2, attention_index=0.6, stress_level=i / 10, focus_level=0.5,
+                            neuroplasticity_score=0.5)
+        for i in range(8)
+    ]
+    for m in metrics:
+        algo.stream_to_azure_iot(m)
+    algo.close_iot_stream()
+
+    last = decode_batch(broker.messages[-1].payload)
+    assert len(broker.messages) == 4 and calls == []  # one message, no regex pass over numbers
+    assert [s["timestamp"] for s in last] == [m.timestamp for m in metrics]
+    assert [s["stress_level"] for s in last] == [m.stress_level for m in metrics]
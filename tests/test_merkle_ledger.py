@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import merkle_ledger  # type: ignore[import]  # noqa: E402
+from merkle_ledger import (  # type: ignore[import]  # noqa: E402
+    MerkleBatchMinter,
+    MerkleLedger,
+    benchmark_minting,
+    default_ledger_path,
+    inclusion_path,
+    leaf_hash,
+    merkle_levels,
+    verify,
+)
+
+
+def _rfc6962_root(leaves):
+    # Reference MTH: split at the largest power of two smaller than n
+    if len(leaves) == 1:
+        return leaves[0]
+    k = 1
+    while k * 2 < len(leaves):
+        k *= 2
+    return hashlib.sha256(b"\x01" + _rfc6962_root(leaves[:k]) + _rfc6962_root(leaves[k:])).digest()
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 8, 13, 64, 100])
+def test_every_proof_verifies_and_root_matches_reference(size):
+    records = [{"token_id": f"T{i}", "value": i} for i in range(size)]
+    levels = merkle_levels([leaf_hash(r) for r in records])
+    root = levels[-1][0]
+    assert root == _rfc6962_root([leaf_hash(r) for r in records])
+
+    for i, record in enumerate(records):
+        proof = {"index": i, "size": size, "path": [h.hex() for h in inclusion_path(levels, i)]}
+        assert verify(record, proof, root.hex())
+        assert not verify({**record, "value": -1}, proof, root.hex())
+        if size > 1:
+            assert not verify(record, {**proof, "index": (i + 1) % size}, root.hex())
+    assert not verify(records[0], {"index": size, "size": size, "path": []}, root.hex())
+    assert not verify(records[0], {"index": 0}, root.hex())
+
+
+def test_size_and_time_thresholds(tmp_path):
+    now = [0.0]
+    minter = MerkleBatchMinter(tmp_path / "ledger.jsonl", batch_size=3, max_delay=5.0, clock=lambda: now[0])
+
+    receipts = [minter.submit({"n": i}) for i in range(3)]
+    assert [r["status"] for r in receipts] == ["pending", "pending", "committed"]
+    assert minter.ledger.batch_count == 1
+
+    minter.submit({"n": 3})
+    now[0] = 4.9
+    assert minter.flush_if_due() is None
+    now[0] = 5.0
+    assert minter.submit({"n": 4})["status"] == "committed"
+    assert [b["size"] for b in minter.ledger.batches()] == [3, 2]
+
+
+def test_wall_clock_timer_flushes_idle_batch(tmp_path):
+    minter = MerkleBatchMinter(tmp_path / "ledger.jsonl", batch_size=100, max_delay=0.05)
+    minter.submit({"n": 1})
+    deadline = time.monotonic() + 5
+    while minter.ledger.batch_count == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert minter.ledger.batch_count == 1
+
+
+def test_ledger_survives_restart_and_torn_write(tmp_path):
+    path = tmp_path / "ledger.jsonl"
+    anchored = []
+    with MerkleBatchMinter(path, batch_size=4, max_delay=None, on_commit=anchored.append) as minter:
+        for i in range(10):
+            minter.submit({"token_id": f"LIFE-NFT-{i + 1:06d}", "score": i / 10})
+    assert [b["size"] for b in anchored] == [4, 4, 2]
+
+    with open(path, "ab") as f:
+        f.write(b'{"batch": 3, "root": "ab')  # crash mid-append
+
+    reopened = MerkleBatchMinter(path, batch_size=4, max_delay=None)
+    assert reopened.ledger.batch_count == 3
+    assert reopened.next_sequence == 11
+    last_line = path.read_bytes().splitlines()[-1]
+    assert reopened.ledger.head == hashlib.sha256(last_line).hexdigest()
+    reopened.submit({"token_id": "LIFE-NFT-000011"})
+    reopened.flush()
+
+    ledger = MerkleLedger(path)
+    assert ledger.verify_chain()
+    record, proof, root = ledger.lookup("LIFE-NFT-000007")
+    assert record == {"token_id": "LIFE-NFT-000007", "score": 0.6}
+    assert verify(record, proof, root)
+    assert ledger.lookup("missing") is None
+    assert path.read_bytes().endswith(b"\n")
+
+    lines = path.read_bytes().splitlines()
+    tampered = json.loads(lines[1])
+    tampered["records"][0]["record"]["score"] = 99
+    lines[1] = json.dumps(tampered).encode("utf-8")
+    path.write_bytes(b"\n".join(lines) + b"\n")
+    assert not MerkleLedger(path).verify_chain()
+
+
+def test_blockchain_reporter_batches_records(tmp_path):
+    from life_algorithm_section12_integration import BlockchainReporter  # type: ignore[import]
+
+    config = {"enabled": True, "ledger_path": tmp_path / "section12.jsonl", "batch_size": 2, "max_delay_s": None}
+    reporter = BlockchainReporter(config)
+    results = [asyncio.run(reporter.mint_learning_record({"domain": "education", "attention": 0.5}))
+               for _ in range(3)]
+    assert [r["token_id"] for r in results] == ["LIFE-NFT-000001", "LIFE-NFT-000002", "LIFE-NFT-000003"]
+    assert [r["batch_status"] for r in results] == ["pending", "committed", "pending"]
+    reporter.flush()
+
+    restarted = BlockchainReporter(config)
+    minted = asyncio.run(restarted.mint_learning_record({"domain": "education"}))
+    assert minted["token_id"] == "LIFE-NFT-000004"
+    assert verify(*reporter.proof_for("LIFE-NFT-000003"))
+    assert asyncio.run(BlockchainReporter().mint_learning_record({})) == {"status": "disabled"}
+
+
+def test_blockchain_reporter_keeps_only_recent_records_in_memory(tmp_path):
+    from life_algorithm_section12_integration import BlockchainReporter  # type: ignore[import]
+
+    config = {"enabled": True, "ledger_path": tmp_path / "section12.jsonl", "batch_size": 4,
+              "max_delay_s": None, "recent_records": 3}
+    reporter = BlockchainReporter(config)
+    for _ in range(10):
+        asyncio.run(reporter.mint_learning_record({"domain": "education"}))
+    reporter.flush()
+
+    assert [r["token_id"] for r in reporter.records] == [f"LIFE-NFT-{i:06d}" for i in (8, 9, 10)]
+    assert verify(*reporter.proof_for("LIFE-NFT-000001"))
+
+
+def test_default_ledger_path_follows_the_environment(tmp_path, monkeypatch):
+    monkeypatch.delenv(merkle_ledger.LEDGER_DIR_ENV, raising=False)
+    assert default_ledger_path("x.jsonl") == merkle_ledger.DEFAULT_LEDGER_DIR / "x.jsonl"
+    assert not merkle_ledger.DEFAULT_LEDGER_DIR.is_absolute()
+    monkeypatch.setenv(merkle_ledger.LEDGER_DIR_ENV, str(tmp_path))
+    assert default_ledger_path("x.jsonl") == tmp_path / "x.jsonl"
+
+
+def test_throughput_is_thousands_per_second(tmp_path):
+    report = benchmark_minting(tmp_path / "bench.jsonl", num_records=5000)
+    assert report["batches"] == 20
+    assert report["records_per_second"] > 2000
@@ -0,0 +1,159 @@
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import Executor, Future
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from model_registry import (  # type: ignore[import]  # noqa: E402
+    BackgroundTrainer,
+    ModelRef,
+    ModelStore,
+    ModelVersion,
+    OnlineLearner,
+)
+
+sklearn_linear = pytest.importorskip("sklearn.linear_model")
+
+
+def _data(seed=0, n=400):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 10))
+    y = (X[:, 0] > 0.5).astype(int) + (X[:, 0] > -0.5).astype(int)
+    return X, y
+
+
+def test_store_is_content_addressed_and_publishes_atomically(tmp_path):
+    store = ModelStore(tmp_path / "models")
+    assert store.versions() == [] and store.load_current() is None
+
+    first = store.save({"weights": [1, 2, 3]}, {"note": "a"})
+    again = store.save({"weights": [1, 2, 3]})
+    second = store.save({"weights": [4, 5, 6]})
+
+    assert first.version == again.version != second.version
+    assert sorted(store.versions()) == sorted({first.version, second.version})
+    assert store.load(first.version).model == {"weights": [1, 2, 3]}
+    assert store.metadata(first.version)["note"] == "a"
+    assert not [p for p in (tmp_path / "models").iterdir() if p.name.startswith(".")]
+
+    store.publish(second.version)
+    assert store.current_version() == second.version
+    assert store.load_current().model == {"weights": [4, 5, 6]}
+    with pytest.raises(KeyError):
+        store.publish("0" * 16)
+
+    assert store.prune(keep=0) == []
+    assert set(store.prune(keep=1)) <= {first.version}
+    assert second.version in store.versions()
+
+
+def test_ref_compare_and_swap():
+    old, new = ModelVersion("a", 1), ModelVersion("b", 2)
+    ref = ModelRef(old)
+    assert not ref.swap(new, expected=ModelVersion("a", 1))
+    assert ref.swap(new, expected=old) and ref.get() is new
+    assert ref.swap(old) and ref.swaps == 2
+
+
+class _ManualExecutor(Executor):
+    # Runs each submitted job only when the test says so, in any order
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self.jobs.append((future, fn, args, kwargs))
+        return future
+
+    def finish(self, index):
+        future, fn, args, kwargs = self.jobs[index]
+        future.set_result(fn(*args, **kwargs))
+
+
+def _constant_model(X, y, value):
+    return {"value": value}
+
+
+def test_trainer_never_installs_an_older_retrain_and_prunes(tmp_path):
+    store = ModelStore(tmp_path / "models")
+    ref = ModelRef()
+    executor = _ManualExecutor()
+    trainer = BackgroundTrainer(store, ref, executor=executor, keep_versions=2)
+
+    older = trainer.submit(_constant_model, None, None, value=1)
+    newer = trainer.submit(_constant_model, None, None, value=2)
+    executor.finish(1)
+    executor.finish(0)
+
+    assert ref.get().model == {"value": 2} and ref.swaps == 1
+    assert store.load_current().model == {"value": 2}
+    assert older.result() is newer.result() is ref.get()
+    assert (trainer.completed, trainer.superseded, trainer.pending) == (1, 1, 0)
+
+    for value in (3, 4, 5):
+        trainer.submit(_constant_model, None, None, value=value)
+        executor.finish(len(executor.jobs) - 1)
+    assert len(store.versions()) == 2
+    assert store.load_current().model == {"value": 5}
+
+
+def test_online_learner_is_copy_on_write():
+    X, y = _data()
+    learner = OnlineLearner(sklearn_linear.SGDClassifier(loss="log_loss", random_state=0), classes=[0, 1, 2])
+    learner.partial_fit(X[:200], y[:200])
+    live = learner.estimator
+    weights = live.coef_.copy()
+
+    learner.partial_fit(X[200:], y[200:])
+
+    np.testing.assert_array_equal(live.coef_, weights)  # readers holding the old model see no change
+    assert learner.estimator is not live
+    assert learner.updates == 2 and learner.samples_seen == 400
+    assert learner.snapshot().version == "online-2"
+
+
+def test_section4_predictions_keep_flowing_during_retrain(tmp_path):
+    section4 = pytest.importorskip("life_algorithm_section4_integration")
+    if not section4.ML_AVAILABLE:
+        pytest.skip("scikit-learn not available")
+    algo = section4.LIFEAlgorithmSection4(model_dir=str(tmp_path / "models"))
+    X, y = _data(1, 4000)
+    algo.update_stress_model(X[:500], y[:500])
+    assert algo.predict_stress(X[:5])["model_version"] is None
+
+    async def scenario():
+        retrain = asyncio.ensure_future(algo.retrain_stress_model(None, n_estimators=150))
+        served, versions, max_gap = 0, set(), 0.0
+        last = time.perf_counter()
+        while not retrain.done():
+            result = algo.predict_stress(X[served % 100:served % 100 + 4])
+            served += 1
+            versions.add(result["model_version"])
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            max_gap, last = max(max_gap, now - last), now
+        return await retrain, served, versions, max_gap
+
+    try:
+        uri, served, versions, max_gap = asyncio.run(scenario())
+    finally:
+        algo.shutdown_model_training()
+
+    installed = algo.stress_model.get()
+    assert uri == f"local://{installed.path}"
+    # Predictions used the old snapshot until the swap, then the new one, nothing else
+    assert None in versions and versions <= {None, installed.version}
+    assert served > 20 and max_gap < 0.5  # the loop never stalled on training
+    assert algo.model_store.current_version() == installed.version
+    assert algo.models["stress_classification"]["version"] == installed.version
+    result = algo.predict_stress(X[:8])
+    assert result["model_version"] == installed.version and result["online_updates"] == 1
+    assert len(result["predictions"]) == 8
+
+    # A fresh instance picks up the published version
+    assert section4.LIFEAlgorithmSection4(model_dir=str(tmp_path / "models")).stress_model.get().version == installed.version
@@ -0,0 +1,125 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from onnx_export import benchmark_backends  # type: ignore[import]  # noqa: E402
+
+
+def test_benchmark_backends_reports_percentiles():
+    report = benchmark_backends({"noop": lambda: None, "sum": lambda: sum(range(1000))}, repeats=50, warmup=2)
+    assert set(report) == {"noop", "sum"}
+    for stats in report.values():
+        assert 0 <= stats["p50_ms"] <= stats["p99_ms"] and stats["mean_ms"] >= 0
+    assert report["sum"]["p50_ms"] > report["noop"]["p50_ms"]
+
+
+def test_sklearn_stress_classifier_parity(tmp_path):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("skl2onnx")
+    from sklearn.ensemble import RandomForestClassifier
+
+    from onnx_export import ONNXPredictor, benchmark_export, export_sklearn_model  # type: ignore[import]
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 10)).astype(np.float32)
+    y = (X[:, 0] > 0.5).astype(int) + (X[:, 0] > -0.5).astype(int)
+    model = RandomForestClassifier(n_estimators=30, random_state=0).fit(X, y)
+
+    result = export_sklearn_model(model, tmp_path / "stress.onnx", sample_inputs=X[:100], quantize=True)
+    predictor = ONNXPredictor(result.path)
+
+    for batch in (1, 7, 256):  # dynamic batch axis
+        np.testing.assert_array_equal(predictor.predict(X[:batch]), model.predict(X[:batch]))
+        np.testing.assert_allclose(predictor.predict_proba(X[:batch]), model.predict_proba(X[:batch]), atol=1e-5)
+    assert result.max_abs_error < 1e-4 and os.path.exists(result.quantized_path)
+    report = benchmark_export(model, result, [X[:32]], repeats=20)
+    assert set(report) == {"sklearn", "onnx_fp32", "onnx_int8"}
+
+
+def test_torch_models_parity(tmp_path):
+    torch = pytest.importorskip("torch")
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("circuitbreaker")
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'algorithms', 'python-core'))
+    from advanced_life_quantum_integration import LIFETransformer, VRAdaptationModel  # type: ignore[import]
+
+    from onnx_export import ONNXPredictor, export_life_transformer, export_vr_adaptation_model  # type: ignore[import]
+
+    torch.manual_seed(0)
+    vr = VRAdaptationModel(input_dim=10)
+    result = export_vr_adaptation_model(vr, tmp_path / "vr.onnx", quantize=True)
+    features = np.random.default_rng(1).normal(size=(33, 10)).astype(np.float32)
+    with torch.no_grad():
+        expected = vr(torch.from_numpy(features)).numpy()
+    np.testing.assert_allclose(ONNXPredictor(result.path).run(features)[0], expected, atol=1e-5)
+    np.testing.assert_allclose(ONNXPredictor(result.quantized_path).run(features)[0], expected, atol=0.1)
+
+    transformer = LIFETransformer(input_dim=8, trait_dim=5, nhead=2, num_layers=2, ff_dim=32)
+    result = export_life_transformer(transformer, tmp_path / "transformer.onnx")
+    rng = np.random.default_rng(2)
+    experiences = rng.normal(size=(9, 3, 8)).astype(np.float32)  # other sequence and batch sizes
+    traits = rng.normal(size=(3, 5)).astype(np.float32)
+    with torch.no_grad():
+        expected = transformer(torch.from_numpy(experiences), torch.from_numpy(traits)).numpy()
+    np.testing.assert_allclose(ONNXPredictor(result.path).run(experiences, traits)[0], expected, atol=1e-4)
+
+
+def test_section_exports_degrade_without_toolchain(tmp_path):
+    section8 = pytest.importorskip("life_algorithm_section8_integration")
+    algo = section8.LIFEAlgorithm()
+    assert algo.export_model_to_onnx("missing_model", output_dir=str(tmp_path)) is None
+
+    from sklearn.linear_model import LogisticRegression
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(50, 4))
+    algo.models["complexity"] = LogisticRegression().fit(X, X[:, 0] > 0)
+    path = algo.export_model_to_onnx("complexity", output_dir=str(tmp_path))
+    try:
+        import onnxruntime  # noqa: F401
+        import skl2onnx  # noqa: F401
+    except ImportError:
+        assert path is None and not list(tmp_path.iterdir())
+    else:
+        assert path == str(tmp_path / "complexity.onnx") and algo.onnx_exports["complexity"].source == "sklearn"
+
+
+def test_torch_export_restores_training_mode(tmp_path):
+    torch = pytest.importorskip("torch")
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    from onnx_export import export_torch_model  # type: ignore[import]
+
+    model = torch.nn.Sequential(torch.nn.Linear(4, 8), torch.nn.Dropout(0.5), torch.nn.Linear(8, 2))
+    model.train()
+    export_torch_model(model, [np.zeros((3, 4))], tmp_path / "mlp.onnx", ["x"], ["y"],
+                       {"x": {0: "batch"}, "y": {0: "batch"}})
+    assert model.training and all(m.training for m in model.modules())
+
+
+def test_section3_motor_intent_export(tmp_path):
+    section3 = pytest.importorskip("life_algorithm_ultimate_section3")
+    from sklearn.ensemble import RandomForestClassifier
+
+    algo = section3.LIFEAlgorithm()
+    algo.models["motor_intent"] = RandomForestClassifier(n_estimators=10)
+    assert algo.export_motor_intent_model_to_onnx(str(tmp_path / "unfitted.onnx")) is None
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 5))  # C3/C4 mean and std plus lateralization
+    algo.models["motor_intent"] = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, X[:, 4] > 0)
+    result = algo.export_motor_intent_model_to_onnx(str(tmp_path / "motor_intent.onnx"))
+    try:
+        import onnxruntime  # noqa: F401
+        import skl2onnx  # noqa: F401
+    except ImportError:
+        assert result is None
+    else:
+        from onnx_export import ONNXPredictor  # type: ignore[import]
+        predicted = ONNXPredictor(result.path).predict(X.astype(np.float32))
+        np.testing.assert_array_equal(predicted, algo.models["motor_intent"].predict(X))
@@ -0,0 +1,111 @@
+import os
+import sys
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from life_algorithm_section8_integration import (  # type: ignore[import]  # noqa: E402
+    DOMAIN_OUTCOME_MULTIPLIERS,
+    LIFEAlgorithm,
+)
+from outcome_store import PARQUET_AVAILABLE, OutcomeStore  # type: ignore[import]  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tools'))
+
+from benchmark_outcome_tracking import benchmark_outcome_tracking  # type: ignore[import]  # noqa: E402
+
+FORMATS = ["npz"] + (["parquet"] if PARQUET_AVAILABLE else [])
+
+
+def _records(n, seed=0):
+    rng = np.random.default_rng(seed)
+    domains = list(DOMAIN_OUTCOME_MULTIPLIERS) + ["research"]  # no multiplier
+    records = []
+    for i in range(n):
+        domain = domains[i % len(domains)]
+        assessment = {
+            "skill_improvement": float(rng.random()),
+            "neural_adaptation": float(rng.random()),
+            "completion_time": float(60 * rng.random()),
+            "confidence_score": float(rng.random()),
+        }
+        if domain in DOMAIN_OUTCOME_MULTIPLIERS and i % 3:  # every third row reports no factor
+            assessment[DOMAIN_OUTCOME_MULTIPLIERS[domain][1]] = float(rng.random())
+        records.append({
+            "session_id": f"session_{i}",
+            "user_id": f"user_{i % 7}",
+            "domain": domain,
+            "timestamp": datetime(2025, 3, 1 + i % 3, 12),
+            "assessment_data": assessment,
+        })
+    return records
+
+
+def test_bulk_matches_scalar_tracking():
+    algo = LIFEAlgorithm()
+    records = _records(40)
+    batch = algo.track_learning_outcomes(records)
+    assert len(batch) == len(records)
+    for outcome, r in zip(batch, records):
+        expected = algo.track_learning_outcome(r["session_id"], r["user_id"], r["domain"], r["assessment_data"])
+        assert outcome == expected
+
+
+def test_anonymous_ids_are_memoized():
+    algo = LIFEAlgorithm()
+    batch = algo.track_learning_outcomes(_records(70))
+    info = algo.gdpr_anonymizer.anonymous_id_cache_info()
+    # One uuid5 per distinct user, whatever the number of rows
+    assert info.misses == 7
+    assert batch.user_id[0] == str(uuid.uuid5(uuid.NAMESPACE_OID, "user_0"))
+    algo.track_learning_outcomes(_records(70))
+    assert algo.gdpr_anonymizer.anonymous_id_cache_info().hits == info.hits + 7
+
+
+@pytest.mark.parametrize("file_format", FORMATS)
+def test_store_partitions_and_aggregates(tmp_path, file_format):
+    algo = LIFEAlgorithm({"outcome_store_dir": str(tmp_path)})
+    algo.outcome_store = OutcomeStore(tmp_path, file_format=file_format)
+    records = _records(50)
+    algo.track_learning_outcomes(records[:30])
+    algo.track_learning_outcomes(records[30:])
+    batch = LIFEAlgorithm().track_learning_outcomes(records)
+
+    assert (tmp_path / "domain=education" / "date=2025-03-02").is_dir()
+    assert len(algo.outcome_store.partitions()) == 5 * 3
+    assert [d for d, _, _ in algo.outcome_store.partitions(domain="finance", start="2025-03-02")] == ["finance"] * 2
+
+    summary = algo.learning_outcome_summary()
+    assert sorted(summary) == sorted(set(batch.domain))
+    for domain, stats in summary.items():
+        mask = batch.domain == domain
+        assert stats["count"] == mask.sum()
+        assert stats["unique_users"] == len(set(batch.user_id[mask]))
+        assert stats["mean_confidence_score"] == pytest.approx(batch.confidence_score[mask].mean())
+
+    day = algo.outcome_store.read(domain="healthcare", start="2025-03-03", end="2025-03-03")
+    assert set(day["date"]) == {np.datetime64("2025-03-03")}
+    assert sorted(day["session_id"]) == sorted(r["session_id"] for r in records
+                                               if r["domain"] == "healthcare" and r["timestamp"].day == 3)
+
+
+def test_domain_processors_apply_the_multiplier_table():
+    algo = LIFEAlgorithm()
+    base = {"skill_improvement": 0.5, "neural_adaptation": 0.5, "confidence_score": 0.5}
+    for domain, (target, factor_key) in DOMAIN_OUTCOME_MULTIPLIERS.items():
+        outcome = algo.track_learning_outcome("s", "u", domain, {**base, factor_key: 0.4})
+        processed = getattr(algo, f"_process_{domain}_outcome")(
+            algo.track_learning_outcome("s", "u", "research", base), {factor_key: 0.4})
+        assert getattr(outcome, target) == pytest.approx(0.2)
+        assert getattr(processed, target) == pytest.approx(0.2)
+
+
+def test_benchmark_reports_speedup(tmp_path):
+    result = benchmark_outcome_tracking(num_outcomes=5000, num_users=500, store_dir=tmp_path, scalar_sample=1000)
+    assert result["outcomes"] == 5000
+    assert OutcomeStore(tmp_path).count() == 5000
+    assert result["bulk_columns_s"] < result["scalar_s_extrapolated"]
@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tools'))
+
+import placeholder_audit  # type: ignore[import]  # noqa: E402
+import placeholder_cleanup  # type: ignore[import]  # noqa: E402
+import placeholder_scan  # type: ignore[import]  # noqa: E402
+from placeholder_scan import ScanCache, compile_tokens, scan_file, scan_paths  # type: ignore[import]  # noqa: E402
+
+TOKEN = "<<TODO-FILL>>"
+
+
+def test_compile_tokens_ignores_empty_tokens():
+    assert compile_tokens([""]) is None
+    pattern = compile_tokens(["TODO", "TODO-FILL", ""])
+    assert [m.group() for m in pattern.finditer(b"TODO-FILL TODO")] == [b"TODO-FILL", b"TODO"]
+
+
+def test_scan_file_counts_occurrences_and_hit_lines(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_bytes(f"a\r\n{TOKEN} b {TOKEN}\nc\n\nd {TOKEN}".encode("utf-8"))
+    empty = tmp_path / "empty.md"
+    empty.write_bytes(b"")
+
+    assert scan_file(str(path), compile_tokens([TOKEN])) == (3, [2, 5])
+    assert scan_file(str(empty), compile_tokens([TOKEN])) == (0, [])
+    assert scan_file(str(tmp_path / "missing.md"), compile_tokens([TOKEN])) == (0, [])
+
+
+def test_large_files_are_no_longer_skipped(tmp_path):
+    path = tmp_path / "big.txt"
+    with open(path, "wb") as f:
+        f.write(b"x" * 1023 + b"\n")
+        f.write((b"y" * 1023 + b"\n") * (6 * 1024))
+        f.write(TOKEN.encode("utf-8") + b"\n")
+
+    assert path.stat().st_size > 5 * 1024 * 1024
+    assert scan_file(str(path), compile_tokens([TOKEN])) == (1, [6 * 1024 + 2])
+
+
+def test_audit_contexts_cluster_adjacent_lines(tmp_path):
+    path = tmp_path / "notes.md"
+    lines = ["l1", f"l2 {TOKEN}", f"l3 {TOKEN}", "l4", "l5", f"l6 {TOKEN}", "l7"]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    count, contexts = placeholder_audit.scan_file_for_token(str(path), [TOKEN])
+
+    assert count == 3
+    assert contexts == [(2, f"l1\nl2 {TOKEN}\nl3 {TOKEN}"), (6, f"l5\nl6 {TOKEN}\nl7")]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_cache_skips_unchanged_files(tmp_path, monkeypatch, workers):
+    files = []
+    for i in range(4):
+        p = tmp_path / f"f{i}.txt"
+        p.write_text(TOKEN * i, encoding="utf-8")
+        files.append(str(p))
+    pattern = compile_tokens([TOKEN])
+    cache_path = str(tmp_path / "cache.json")
+
+    first = scan_paths(files, pattern, workers=workers, cache=ScanCache(cache_path, pattern))
+    assert [first[f][0] for f in files] == [0, 1, 2, 3]
+
+    scanned = []
+    real_scan = placeholder_scan.scan_file
+    monkeypatch.setattr(placeholder_scan, "scan_file", lambda path, pattern: scanned.append(path) or real_scan(path, pattern))
+    with open(files[2], "a", encoding="utf-8") as f:
+        f.write("\n" + TOKEN)
+
+    second = scan_paths(files, pattern, workers=1, cache=ScanCache(cache_path, pattern))
+    assert scanned == [files[2]]
+    assert [second[f][0] for f in files] == [0, 1, 3, 3]
+
+    other = compile_tokens(["OTHER"])
+    assert ScanCache(cache_path, other).entries == {}
+
+
+def test_changed_since_limits_to_git_changes(tmp_path):
+    def git(*args):
+        subprocess.run(["git", "-C", str(tmp_path), *args], check=True, capture_output=True)
+
+    git("init", "-q")
+    git("config", "user.email", "dev@example.com")
+    git("config", "user.name", "dev")
+    (tmp_path / "old.md").write_text("old\n", encoding="utf-8")
+    (tmp_path / "edited.md").write_text("v1\n", encoding="utf-8")
+    git("add", ".")
+    git("commit", "-q", "-m", "base")
+    (tmp_path / "edited.md").write_text("v2\n", encoding="utf-8")
+    (tmp_path / "new.md").write_text("new\n", encoding="utf-8")
+
+    changed = placeholder_scan.changed_since(str(tmp_path), "HEAD")
+
+    assert changed == {os.path.normpath(str(tmp_path / "edited.md")), os.path.normpath(str(tmp_path / "new.md"))}
+
+
+def test_cleanup_reads_only_files_with_hits(tmp_path, monkeypatch):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "a.md").write_text(f"keep {TOKEN} this\n", encoding="utf-8")
+    (tmp_path / "docs" / "b.md").write_text("clean\n", encoding="utf-8")
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "c.md").write_text(TOKEN, encoding="utf-8")
+
+    preview = placeholder_cleanup.walk_and_process(tmp_path, dry_run=True, target_file=None, token=TOKEN, workers=2)
+    assert sorted((os.path.basename(r["path"]), r["status"]) for r in preview) == [
+        ("a.md", "preview"), ("b.md", "no-op")
+    ]
+
+    placeholder_cleanup.walk_and_process(tmp_path, dry_run=False, target_file=None, token=TOKEN, workers=1,
+                                         cache_path=tmp_path / "logs" / "cache.json")
+    assert (tmp_path / "docs" / "a.md").read_text(encoding="utf-8") == "keep  this\n"
+    assert list((tmp_path / "quarantine").glob("a.md.*.bak"))
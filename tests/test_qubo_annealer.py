@@ -0,0 +1,166 @@
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import qubo_annealer  # type: ignore[import]  # noqa: E402
+from qubo_annealer import (  # type: ignore[import]  # noqa: E402
+    ParallelTempering,
+    Problem,
+    SimulatedAnnealing,
+    autocorrelation_redundancy,
+    correlation_redundancy,
+    feature_selection_problem,
+    select_features,
+    shortlist_candidates,
+    solve_exhaustive,
+)
+
+
+def _random_qubo(n, seed):
+    rng = np.random.default_rng(seed)
+    problem = Problem(num_variables=n)
+    for i in range(n):
+        problem.add_term(c=rng.normal(), indices=[i])
+        for j in range(i + 1, n):
+            problem.add_term(c=rng.normal(), indices=[i, j])
+    return problem
+
+
+def _redundant_features(n, seed, observations=60):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, observations))
+    X[1::2] += X[::2][: n // 2]  # every odd feature echoes its even neighbour
+    return rng.uniform(size=n), correlation_redundancy(X)
+
+
+def _greedy_energy(problem, k):
+    h, W, _ = problem.to_arrays()
+    x = np.zeros(h.size)
+    for _ in range(k):
+        gain = h + x @ W
+        gain[x > 0] = np.inf
+        x[np.argmin(gain)] = 1
+    return problem.evaluate(x)
+
+
+def test_problem_terms_and_energy():
+    problem = Problem()
+    problem.add_term(c=2.0, indices=[])
+    problem.add_term(c=-1.0, indices=[0])
+    problem.add_term(c=3.0, indices=[1, 1])  # x * x == x
+    problem.add_term(c=0.5, indices=[0, 2])
+    with pytest.raises(ValueError):
+        problem.add_term(c=1.0, indices=[0, 1, 2])
+
+    assert problem.num_variables == 3
+    assert problem.evaluate([1, 1, 1]) == pytest.approx(2.0 - 1.0 + 3.0 + 0.5)
+    rebuilt = Problem()
+    rebuilt.add_terms(problem.iter_terms())
+    batch = np.array([[0, 0, 0], [1, 0, 1], [0, 1, 1]])
+    np.testing.assert_allclose(rebuilt.evaluate(batch), problem.evaluate(batch))
+
+
+@pytest.mark.parametrize("solver_cls", [SimulatedAnnealing, ParallelTempering])
+def test_matches_exhaustive_on_random_qubos(solver_cls):
+    for seed in range(8):
+        problem = _random_qubo(12, seed)
+        result = solver_cls(sweeps=150, seed=seed).optimize(problem)
+        assert result.cost == pytest.approx(solve_exhaustive(problem).cost)
+        assert result.cost == pytest.approx(problem.evaluate(result.configuration))
+
+
+@pytest.mark.parametrize("solver_cls", [SimulatedAnnealing, ParallelTempering])
+def test_matches_exhaustive_on_feature_selection(solver_cls):
+    for seed in range(8):
+        relevance, redundancy = _redundant_features(16, seed)
+        problem = feature_selection_problem(relevance, redundancy, k=5)
+        exact = solve_exhaustive(problem)
+        result = solver_cls(seed=seed).optimize(problem)
+        assert sum(exact.configuration) == 5  # the penalty enforces the subset size
+        assert len(result.selected) == 5
+        assert result.cost == pytest.approx(exact.cost)
+
+
+@pytest.mark.parametrize("n", [100, 300, 1000])
+def test_large_selection_is_exact_size_and_beats_greedy(n):
+    k = n // 10
+    relevance, redundancy = _redundant_features(n, n)
+    problem = feature_selection_problem(relevance, redundancy, k=k)
+
+    selected = select_features(relevance, redundancy, k=k)
+
+    assert len(selected) == len(set(selected)) == k
+    assert list(selected) == sorted(selected, key=lambda i: -relevance[i])
+    x = np.zeros(n)
+    x[selected] = 1
+    top_k = np.zeros(n)
+    top_k[np.argsort(-relevance)[:k]] = 1
+    assert problem.evaluate(x) <= _greedy_energy(problem, k) + 1e-9
+    assert problem.evaluate(x) <= problem.evaluate(top_k) + 1e-9
+
+
+def test_swap_deltas_match_energy_differences():
+    problem = _random_qubo(12, seed=7)
+    h, W, offset = problem.to_arrays()
+    state = qubo_annealer._ChainState(h, W, offset, replicas=5, rng=np.random.default_rng(1), cardinality=4)
+    a = np.array([0, 1, 2, 3, 0])
+    b = np.array([0, 7, 3, 5, 2])
+
+    i, j, delta = state._pair_deltas(a, b)
+
+    for r in range(5):
+        swapped = state.X[r].copy()
+        swapped[i[r]], swapped[j[r]] = 0.0, 1.0
+        assert delta[r] == pytest.approx(problem.evaluate(swapped) - problem.evaluate(state.X[r]))
+
+
+def test_redundancy_matrices():
+    t = np.arange(256)
+    R = autocorrelation_redundancy(np.sin(t / 4.0), num_features=8)
+    assert R.shape == (8, 8)
+    np.testing.assert_allclose(np.diag(R), 1.0)
+    assert R[0, 1] > R[0, 6]  # neighbouring samples are the most alike
+
+    C = correlation_redundancy(np.vstack([t, 2 * t + 1, np.ones(256)]))
+    assert C[0, 1] == pytest.approx(1.0)
+    assert C[2].sum() == 0.0
+
+
+def test_shortlist_bounds_the_problem_for_long_signals():
+    rng = np.random.default_rng(4)
+    signal = np.sin(np.arange(8192) / 5.0) * rng.uniform(0.1, 1.0, 8192)
+    candidates = shortlist_candidates(signal, max_candidates=100)
+    assert len(candidates) == 100 and list(candidates) == sorted(candidates)
+    assert np.abs(signal[candidates]).min() >= np.sort(np.abs(signal))[-100]
+    np.testing.assert_array_equal(shortlist_candidates(signal[:50]), np.arange(50))
+
+    R = autocorrelation_redundancy(signal, indices=candidates)
+    np.testing.assert_allclose(R, autocorrelation_redundancy(signal)[np.ix_(candidates, candidates)])
+
+    section8 = pytest.importorskip("life_algorithm_section8_integration")
+    algo = section8.LIFEAlgorithm()
+    algo.consent_manager.set_consent("quantum_optimization", True)
+    selected = algo.optimize_eeg_features_quantum(list(signal))
+    assert len(selected) == 16 and set(selected) <= set(candidates.tolist())
+
+
+def test_section_selectors_use_local_qubo():
+    section8 = pytest.importorskip("life_algorithm_section8_integration")
+    algo = section8.LIFEAlgorithm()
+    algo.consent_manager.set_consent("quantum_optimization", True)
+    signal = list(np.sin(np.arange(64) / 3.0) * np.linspace(0.1, 1.0, 64))
+    selected = algo.optimize_eeg_features_quantum(signal)
+    assert len(selected) == 16 and selected == sorted(selected)
+
+    section12 = pytest.importorskip("life_algorithm_section12_integration")
+    selector = section12.QuantumFeatureSelector({"enabled": True, "max_features": 2})
+    # Feature 1 echoes feature 0 and feature 3 echoes feature 2; 0 and 2 are uncorrelated
+    for a, b in ((0.3, 0.3), (0.9, 0.3), (0.3, 0.5), (0.9, 0.5)):
+        result = asyncio.run(selector.select_features([a, 0.99 * a, b, 0.99 * b]))
+    assert result["status"] == "fallback"
+    assert result["selected_indices"] == [0, 2]  # not the two most relevant, 0 and 1
@@ -0,0 +1,64 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'algorithms', 'python-core'))
+
+from rolling_stats import rolling_mean_var, rolling_variance  # type: ignore[import]  # noqa: E402
+
+
+def _naive(x, before, after):
+    n = x.shape[-1]
+    windows = [x[..., max(0, i - before):i + after] for i in range(n)]
+    means = np.stack([np.mean(w, axis=-1) for w in windows], axis=-1)
+    variances = np.stack([np.var(w, axis=-1) for w in windows], axis=-1)
+    return means, variances
+
+
+def _adversarial_signals(n=3001, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    return {
+        "white_noise": rng.normal(0, 1, (3, n)),
+        "dc_offset": 1e6 + rng.normal(0, 1e-3, (2, n)),
+        "offset_drift": 1e6 + np.linspace(0, 1e3, n) + rng.normal(0, 1e-2, (2, n)),
+        "large_sine": 1e4 * np.sin(t / 300.0) + rng.normal(0, 1e-2, (1, n)),
+        "plateaus": np.repeat(rng.normal(0, 1e4, n // 100 + 1), 100)[:n] + rng.normal(0, 1e-3, (1, n)),
+    }
+
+
+@pytest.mark.parametrize("dtype, rtol", [(np.float64, 1e-10), (np.float32, 1e-4)])
+@pytest.mark.parametrize("name", list(_adversarial_signals()))
+def test_matches_naive_reference_on_adversarial_signals(name, dtype, rtol):
+    x = _adversarial_signals()[name]
+    ref_mean, ref_var = _naive(x, 10, 10)
+
+    mean, var = rolling_mean_var(x, 10, 10, dtype=dtype)
+
+    assert mean.dtype == var.dtype == np.dtype(dtype)
+    assert mean.shape == var.shape == x.shape
+    np.testing.assert_allclose(var, ref_var, rtol=rtol, atol=0)
+    # Means are bounded relative to the signal magnitude, not the local spread
+    np.testing.assert_allclose(mean, ref_mean, rtol=0, atol=rtol * np.abs(x).max())
+
+
+@pytest.mark.parametrize("before, after, n", [(0, 1, 50), (3, 7, 997), (50, 5, 400), (10, 10, 7)])
+def test_window_shapes_and_edges(before, after, n):
+    x = np.random.default_rng(before + after).normal(5, 2, (2, n))
+    ref_mean, ref_var = _naive(x, before, after)
+
+    mean, var = rolling_mean_var(x, before, after)
+
+    np.testing.assert_allclose(mean, ref_mean, rtol=1e-12)
+    np.testing.assert_allclose(var, ref_var, rtol=1e-10, atol=1e-12)
+
+
+def test_one_dimensional_and_constant_input():
+    flat = np.full(64, 123456.789)
+    assert rolling_variance(flat).shape == (64,)
+    np.testing.assert_allclose(rolling_variance(flat), 0.0, atol=1e-12)
+    assert rolling_variance(np.zeros(0)).shape == (0,)
+    with pytest.raises(ValueError):
+        rolling_mean_var(flat, before=2, after=0)
@@ -0,0 +1,111 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+import life_algorithm_ultimate_section3 as section3  # type: ignore[import]
+from life_algorithm_ultimate_section3 import (  # type: ignore[import]
+    NeuralPredictiveCodingModel,
+)
+
+
+def _random_inputs(batch, time, features, seed=0):
+    rng = np.random.default_rng(seed)
+    shape = (batch, time, features)
+    return rng.normal(size=shape), rng.normal(size=shape), rng.normal(0, 0.1, size=shape)
+
+
+@pytest.mark.parametrize("features", [4, 21, 40])
+def test_predict_batch_matches_single_sample_predict(features):
+    model = NeuralPredictiveCodingModel(input_dim=64)
+    x_t, x_prev, delta = _random_inputs(5, 1, features)
+
+    batched = model.predict_batch(x_t, x_prev, delta)
+
+    assert batched.shape == (5, 1, 64)
+    for idx in range(5):
+        single = model.predict(x_t[idx, 0], x_prev[idx, 0], delta[idx, 0])
+        np.testing.assert_allclose(batched[idx, 0], single, rtol=1e-5, atol=1e-5)
+
+
+def test_predict_step_matches_batched_sequence():
+    model = NeuralPredictiveCodingModel(input_dim=64)
+    x_t, x_prev, delta = _random_inputs(1, 6, 8, seed=1)
+
+    sequence = model.predict_batch(x_t, x_prev, delta)[0]
+    streamed = np.stack([
+        model.predict_step("session-a", x_t[0, t], x_prev[0, t], delta[0, t])
+        for t in range(6)
+    ])
+
+    np.testing.assert_allclose(streamed, sequence, rtol=1e-4, atol=1e-5)
+
+
+def test_predict_step_keeps_sessions_independent():
+    model = NeuralPredictiveCodingModel(input_dim=64)
+    x_t, x_prev, delta = _random_inputs(1, 3, 8, seed=2)
+
+    for t in range(3):
+        model.predict_step("busy", x_t[0, t], x_prev[0, t], delta[0, t])
+    fresh = model.predict_step("fresh", x_t[0, 0], x_prev[0, 0], delta[0, 0])
+    model.reset_session("busy")
+    restarted = model.predict_step("busy", x_t[0, 0], x_prev[0, 0], delta[0, 0])
+
+    np.testing.assert_allclose(fresh, restarted, rtol=1e-5, atol=1e-6)
+
+
+def test_predict_batch_rejects_unbatched_input():
+    model = NeuralPredictiveCodingModel(input_dim=64)
+    with pytest.raises(ValueError):
+        model.predict_batch(np.zeros(8), np.zeros(8), np.zeros(8))
+
+
+@pytest.mark.skipif(not section3.TENSORFLOW_AVAILABLE, reason="TensorFlow not installed")
+def test_tensorflow_step_carries_hidden_state():
+    model = NeuralPredictiveCodingModel(input_dim=16)
+    x_t, x_prev, delta = _random_inputs(1, 2, 4, seed=3)
+
+    first = model.predict_step("carry", x_t[0, 0], x_prev[0, 0], delta[0, 0])
+    second = model.predict_step("carry", x_t[0, 0], x_prev[0, 0], delta[0, 0])
+
+    assert not np.allclose(first, second)
+
+
+def test_session_states_are_bounded_and_expire():
+    now = [0.0]
+    cache = section3._SessionStateCache(max_sessions=3, idle_seconds=10.0, clock=lambda: now[0])
+    for i in range(4):
+        cache.put(f"s{i}", i)
+    assert "s0" not in cache and len(cache) == 3
+    cache.get("s1")  # a read does not refresh; only a new state does
+    cache.put("s1", 10)
+    now[0] = 5.0
+    cache.put("s3", 30)
+    now[0] = 12.0
+    assert cache.get("s2") is None and "s1" not in cache
+    assert cache.get("s3") == 30 and len(cache) == 1
+
+
+class _RecordingModel:
+    def __init__(self):
+        self.steps, self.resets = [], []
+
+    def predict_step(self, session_id, x_t, x_t_minus_1, delta_venturi):
+        self.steps.append(session_id)
+        return x_t
+
+    def reset_session(self, session_id):
+        self.resets.append(session_id)
+
+
+def test_stream_carries_state_only_for_identified_sessions():
+    algorithm = section3.LIFEAlgorithm()
+    algorithm.neural_predictive_model = _RecordingModel()
+    sample = {"alpha": 1.0, "beta": 0.5, "theta": 0.4, "delta": 0.3, "gamma": 0.2}
+
+    asyncio.run(algorithm.process_eeg_stream(sample))
+    asyncio.run(algorithm.process_eeg_stream({**sample, "session_id": "a"}))
+    asyncio.run(algorithm.process_eeg_stream({**sample, "session_id": "a", "session_end": True}))
+
+    assert algorithm.neural_predictive_model.steps == [None, "a", "a"]
+    assert algorithm.neural_predictive_model.resets == ["a"]
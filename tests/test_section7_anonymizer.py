@@ -0,0 +1,70 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+@pytest.fixture(scope="module")
+def section7(tmp_path_factory):
+    # The module creates logs/, tracking_data/ and models/ relative to the working directory
+    workdir = tmp_path_factory.mktemp("section7")
+    (workdir / "logs").mkdir()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        yield importlib.import_module("life_algorithm_section7_integration")
+    finally:
+        os.chdir(cwd)
+
+
+SAMPLES = [
+    "",
+    "no pii here",
+    "mail Jane.Doe+lab@Example.org now",
+    "call 555-123-4567 or 555-987-6543",
+    "555-123-4567@clinic.io is an address",
+    "a@b.co,c@d.com;555-000-1111",
+    "1555-123-45678 is not a phone",
+    "unicode café 555-222-3333 ✓",
+    "multi\nline x@y.io\n",
+]
+
+
+def test_anonymize_many_matches_legacy(section7):
+    anonymizer = section7.Anonymizer(chunk_size=4)
+    expected = [section7._legacy_anonymize_string(s) for s in SAMPLES]
+
+    assert anonymizer.anonymize_many(SAMPLES) == expected
+    assert anonymizer.anonymize_many(iter(SAMPLES)) == expected
+    assert [anonymizer.anonymize(s) for s in SAMPLES] == expected
+    assert anonymizer.anonymize_many([]) == []
+
+
+def test_inputs_containing_the_sentinel_fall_back(section7):
+    anonymizer = section7.Anonymizer()
+    texts = ["x@y.io\x1fz@w.io", "plain", "555-123-4567"]
+    assert anonymizer.anonymize_many(texts) == [section7._legacy_anonymize_string(t) for t in texts]
+
+
+def test_keyed_pseudonyms_are_stable_per_tenant(section7):
+    anonymizer = section7.Anonymizer(pseudonym_key="secret")
+    a, b, c = anonymizer.anonymize_many(
+        ["from Jane@Example.org", "cc jane@example.org", "other bob@example.org"], tenant_id="tenant-a")
+
+    token = a.split()[-1]
+    assert token.startswith("[EMAIL:") and "jane" not in token.lower()
+    assert b == f"cc {token}"
+    assert c.split()[-1] != token
+    assert anonymizer.anonymize("jane@example.org", "tenant-b") != token
+    assert section7.Anonymizer(pseudonym_key="secret").anonymize("jane@example.org", "tenant-a") == token
+    assert section7.Anonymizer(pseudonym_key="other").anonymize("jane@example.org", "tenant-a") != token
+    assert anonymizer.anonymize("jane@example.org") == "[EMAIL]"
+
+
+def test_benchmark_reports_speedup(section7):
+    report = section7.benchmark_anonymizer(num_strings=20000)
+    assert report["num_strings"] == 20000
+    assert report["batched_seconds"] > 0
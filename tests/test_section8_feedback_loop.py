@@ -0,0 +1,161 @@
+import asyncio
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from life_algorithm_section8_integration import EEGWindowBuffer, LIFEAlgorithm  # type: ignore[import]  # noqa: E402
+
+WINDOW = 100
+
+
+def _algorithm(**config):
+    algo = LIFEAlgorithm(config={"feedback_window_size": WINDOW, **config})
+    algo.consent_manager.set_consent("eeg_processing", True)
+    algo.consent_manager.set_consent("vr_adaptation", True)
+    return algo
+
+
+async def _produce(algo, session_id, windows, seed=0):
+    rng = random.Random(seed)
+    for i in range(windows):
+        # Each window arrives in two uneven chunks at irregular times
+        split = rng.randint(1, WINDOW - 1)
+        samples = [0.5 + 0.1 * np.sin(i + k) for k in range(WINDOW)]
+        await algo.ingest_eeg(session_id, samples[:split])
+        await asyncio.sleep(rng.uniform(0.0005, 0.002))
+        await algo.ingest_eeg(session_id, samples[split:])
+        await asyncio.sleep(rng.uniform(0.003, 0.012))
+
+
+async def _polling_loop(algo, session_id, poll_interval, stop):
+    # The previous design: wake on a fixed sleep and process whatever is buffered
+    buffer = algo.get_eeg_buffer(session_id)
+    latencies = []
+    while not stop.is_set():
+        await asyncio.sleep(poll_interval)
+        while buffer.available():
+            window, ready_at, _ = await buffer.next_window()
+            metrics = algo.preprocess_eeg(window.tolist())
+            algo.adjust_vr_environment(metrics)
+            latencies.append(time.perf_counter() - ready_at)
+    return latencies
+
+
+def test_event_driven_latency_beats_polling():
+    windows = 150
+
+    async def event_driven():
+        algo = _algorithm()
+        loop = asyncio.create_task(algo.real_time_feedback_loop("s1"))
+        await _produce(algo, "s1", windows)
+        await asyncio.sleep(0.01)
+        await algo.stop_feedback_loop("s1")
+        return await loop
+
+    async def polling():
+        algo = _algorithm()
+        stop = asyncio.Event()
+        loop = asyncio.create_task(_polling_loop(algo, "s1", 0.05, stop))
+        await _produce(algo, "s1", windows)
+        await asyncio.sleep(0.06)
+        stop.set()
+        return await loop
+
+    stats = asyncio.run(event_driven())
+    polled = np.array(asyncio.run(polling()))
+
+    assert stats.updates == windows and stats.dropped_windows == 0
+    event_p50, event_p99 = stats.percentile(50), stats.percentile(99)
+    poll_p50, poll_p99 = np.percentile(polled, 50), np.percentile(polled, 99)
+    latencies = (f"event p50={event_p50 * 1e3:.2f}ms p99={event_p99 * 1e3:.2f}ms; "
+                 f"polling p50={poll_p50 * 1e3:.2f}ms p99={poll_p99 * 1e3:.2f}ms")
+    assert len(polled) == windows
+    assert event_p50 < poll_p50 / 5, latencies
+    assert event_p99 < poll_p99, latencies
+
+
+def test_min_update_interval_rate_limits_and_keeps_freshest_window():
+    async def scenario():
+        algo = _algorithm(feedback_min_interval_s=0.05)
+        calls = []
+        real_adjust = algo.adjust_vr_environment
+        algo.adjust_vr_environment = lambda m, d="education", session_id=None: \
+            calls.append(time.perf_counter()) or real_adjust(m, d, session_id)
+        loop = asyncio.create_task(algo.real_time_feedback_loop("s2"))
+        await _produce(algo, "s2", 60, seed=3)
+        await asyncio.sleep(0.08)
+        await algo.stop_feedback_loop("s2")
+        return await loop, calls
+
+    stats, calls = asyncio.run(scenario())
+    gaps = np.diff(calls)
+    assert stats.updates == len(calls) < 60
+    assert gaps.min() >= 0.05 - 1e-3
+    assert stats.updates + stats.dropped_windows == 60
+
+
+def test_idle_loop_waits_without_spinning_and_stops_cleanly():
+    async def scenario():
+        algo = _algorithm()
+        loop = asyncio.create_task(algo.real_time_feedback_loop("idle"))
+        start = time.process_time()
+        await asyncio.sleep(0.2)
+        cpu = time.process_time() - start
+        await algo.stop_feedback_loop("idle")
+        return await asyncio.wait_for(loop, 1.0), cpu
+
+    stats, cpu = asyncio.run(scenario())
+    assert stats.updates == 0
+    assert cpu < 0.05
+
+
+def test_window_buffer_hop_and_latest():
+    async def scenario():
+        buffer = EEGWindowBuffer(window_size=4, hop=2)
+        await buffer.push(range(9))
+        assert buffer.available() == 3
+        first = await buffer.next_window()
+        latest = await buffer.next_window(latest=True)
+        return first, latest, buffer.available()
+
+    first, latest, remaining = asyncio.run(scenario())
+    np.testing.assert_array_equal(first[0], [0, 1, 2, 3])
+    np.testing.assert_array_equal(latest[0], [4, 5, 6, 7])
+    assert latest[2] == 1 and remaining == 0
+
+
+def test_window_buffer_drops_oldest_hops_beyond_max_samples():
+    async def scenario():
+        buffer = EEGWindowBuffer(window_size=4, hop=2, max_samples=8)
+        await buffer.push(range(13))
+        assert len(buffer._samples) <= 8 and buffer.available() == 2
+        return await buffer.next_window()
+
+    window, _, dropped = asyncio.run(scenario())
+    np.testing.assert_array_equal(window, [6, 7, 8, 9])
+    assert dropped == 3
+
+
+def test_loop_releases_buffer_and_stops_on_error_budget():
+    async def scenario():
+        algo = _algorithm(feedback_max_consecutive_errors=2)
+        limited = asyncio.create_task(algo.real_time_feedback_loop("done", max_updates=2))
+        await algo.ingest_eeg("done", [0.5] * (3 * WINDOW))
+        done = await asyncio.wait_for(limited, 1.0)
+
+        algo.preprocess_eeg = lambda samples: 1 / 0
+        failing = asyncio.create_task(algo.real_time_feedback_loop("broken"))
+        await algo.ingest_eeg("broken", [0.5] * (5 * WINDOW))
+        broken = await asyncio.wait_for(failing, 1.0)
+        return algo, done, broken
+
+    algo, done, broken = asyncio.run(scenario())
+    assert done.updates == 2
+    assert broken.errors == 3 and broken.updates == 0
+    assert algo.eeg_buffers == {}
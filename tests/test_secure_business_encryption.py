@@ -0,0 +1,156 @@
+import io
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import secure_business_data  # type: ignore[import]  # noqa: E402
+from secure_business_data import (  # type: ignore[import]  # noqa: E402
+    PassphraseKeyring,
+    decrypt_bytes,
+    decrypt_file,
+    encrypt_bytes,
+    encrypt_file,
+)
+
+CHUNK = 1024
+SEALED = CHUNK + 16
+HEADER = secure_business_data._SB2_HEADER.size
+
+
+@pytest.fixture(autouse=True)
+def _fast_kdf(tmp_path, monkeypatch):
+    monkeypatch.setattr(secure_business_data, "_PBKDF2_ITERATIONS", 1000)
+    monkeypatch.setattr(secure_business_data, "LOGS_DIR", tmp_path)
+
+
+def _encrypt(data, passphrase="pw", **kwargs):
+    keyring = PassphraseKeyring(passphrase)
+    out = io.BytesIO()
+    secure_business_data.encrypt_stream(io.BytesIO(data), out, keyring, chunk_size=CHUNK, **kwargs)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("size", [0, 1, CHUNK, 3 * CHUNK, 3 * CHUNK + 5])
+def test_sb2_roundtrip(size):
+    data = os.urandom(size)
+    blob = _encrypt(data)
+
+    assert blob.startswith(b"SB2")
+    assert len(blob) == HEADER + max(1, -(-size // CHUNK)) * 16 + size
+    assert decrypt_bytes(blob, "pw") == data
+
+
+def test_parallel_chunks_match_serial_decrypt():
+    data = os.urandom(20 * CHUNK + 7)
+    blob = _encrypt(data, max_workers=4)
+
+    out = io.BytesIO()
+    secure_business_data.decrypt_stream(io.BytesIO(blob), out, PassphraseKeyring("pw"), max_workers=3)
+    assert out.getvalue() == data
+    assert decrypt_bytes(blob, "pw") == data
+
+
+def test_wrong_passphrase_rejected():
+    with pytest.raises(ValueError, match="authentication"):
+        decrypt_bytes(_encrypt(b"secret"), "not-pw")
+
+
+def test_truncation_at_chunk_boundary_rejected():
+    blob = _encrypt(os.urandom(4 * CHUNK))
+
+    dropped_last = blob[:HEADER + 3 * SEALED]
+    with pytest.raises(ValueError, match="chunk 2"):
+        decrypt_bytes(dropped_last, "pw")
+    with pytest.raises(ValueError):
+        decrypt_bytes(blob[:-5], "pw")
+    with pytest.raises(ValueError):
+        decrypt_bytes(blob[:HEADER], "pw")
+
+
+def test_reordered_or_duplicated_chunks_rejected():
+    blob = _encrypt(os.urandom(3 * CHUNK + 10))
+    header, body = blob[:HEADER], blob[HEADER:]
+    chunks = [body[i:i + SEALED] for i in range(0, len(body), SEALED)]
+
+    swapped = header + chunks[1] + chunks[0] + b"".join(chunks[2:])
+    with pytest.raises(ValueError, match="chunk 0"):
+        decrypt_bytes(swapped, "pw")
+
+    appended = blob + chunks[0]
+    with pytest.raises(ValueError):
+        decrypt_bytes(appended, "pw")
+
+
+def test_header_is_authenticated():
+    blob = bytearray(_encrypt(os.urandom(2 * CHUNK)))
+    blob[HEADER - 1] ^= 0x01  # chunk size field
+    with pytest.raises(ValueError):
+        decrypt_bytes(bytes(blob), "pw")
+
+
+def test_oversized_chunk_size_rejected_before_reading_chunks():
+    keyring = PassphraseKeyring("pw")
+    header = secure_business_data._SB2_HEADER.pack(b"SB2", keyring.run_salt, os.urandom(16), 2 ** 32 - 1)
+
+    class _Body(io.BytesIO):
+        def read(self, size=-1):
+            assert size <= HEADER, "chunk read before the header was checked"
+            return super().read(size)
+
+    with pytest.raises(ValueError, match="exceeds"):
+        secure_business_data.decrypt_stream(_Body(header + b"\0" * 64), io.BytesIO(), keyring)
+    with pytest.raises(ValueError, match="chunk_size"):
+        secure_business_data.encrypt_stream(io.BytesIO(b"x"), io.BytesIO(), keyring,
+                                            chunk_size=secure_business_data.SB2_MAX_CHUNK_SIZE + 1)
+
+
+def test_keyring_stretches_passphrase_once_per_run(tmp_path, monkeypatch):
+    calls = []
+    real_pbkdf2 = secure_business_data._pbkdf2
+    monkeypatch.setattr(secure_business_data, "_pbkdf2", lambda p, s: calls.append(s) or real_pbkdf2(p, s))
+    keyring = PassphraseKeyring("pw")
+
+    sources = []
+    for i in range(5):
+        src = tmp_path / f"doc_{i}.md"
+        src.write_bytes(os.urandom(CHUNK * i + 3))
+        sources.append(src)
+        encrypt_file(src, "pw", keyring=keyring)
+
+    decrypt_keyring = PassphraseKeyring("pw")
+    for src in sources:
+        out = decrypt_file(src.with_suffix(".md.enc"), "pw", out_path=tmp_path / "plain" / src.name,
+                           keyring=decrypt_keyring)
+        assert out.read_bytes() == src.read_bytes()
+
+    assert len(calls) == 2
+    assert calls[0] == calls[1] == keyring.run_salt
+
+
+def test_failed_decrypt_leaves_no_output(tmp_path):
+    src = tmp_path / "doc.md"
+    src.write_bytes(os.urandom(3 * CHUNK))
+    enc = encrypt_file(src, "pw")
+    enc.write_bytes(enc.read_bytes()[:-SEALED])
+
+    with pytest.raises(ValueError):
+        decrypt_file(enc, "pw", out_path=tmp_path / "out.md")
+    assert not (tmp_path / "out.md").exists()
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_sb1_files_still_decrypt(tmp_path):
+    from cryptography.fernet import Fernet
+
+    salt = os.urandom(16)
+    token = Fernet(secure_business_data._derive_key("pw", salt)).encrypt(b"legacy report")
+    legacy = tmp_path / "report.md.enc"
+    legacy.write_bytes(b"SB1" + salt + token)
+
+    assert decrypt_file(legacy, "pw").read_bytes() == b"legacy report"
+    assert decrypt_bytes(encrypt_bytes(b"new report", "pw"), "pw") == b"new report"
@@ -0,0 +1,157 @@
+import io
+import os
+import random
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import secure_business_data  # type: ignore[import]  # noqa: E402
+from secure_business_data import BusinessSecurityUtility  # type: ignore[import]  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _isolated_logs(tmp_path, monkeypatch):
+    monkeypatch.setattr(secure_business_data, "LOGS_DIR", tmp_path)
+
+
+def _corpus(lines=2000, seed=3):
+    rng = random.Random(seed)
+    return "".join(rng.choice(secure_business_data._BENCH_SENTENCES) for _ in range(lines))
+
+
+def test_single_pass_matches_sequential_reference(tmp_path):
+    util = BusinessSecurityUtility(root=tmp_path)
+    text = _corpus() + "Price list: USD$5 and 2024 (not redacted) vs 2031.\n"
+
+    redacted, counts = util.redact_text_with_counts(text)
+    reference, reference_count = util.redact_text_sequential(text)
+
+    assert redacted == reference
+    assert sum(counts.values()) == reference_count
+    assert set(counts) == {"currency", "finance_term", "period", "phrase"}
+    assert util.redact_text(text) == (reference, reference_count)
+
+
+def test_guard_does_not_change_matches(tmp_path):
+    util = BusinessSecurityUtility(root=tmp_path)
+    unguarded = secure_business_data._combine_patterns(util.patterns, util.categories)
+    text = _corpus(500) + "ARR, Budget; FY2026 q4 2027 Sales   forecast £3 billion €7k\n"
+
+    assert util.combined_pattern.sub("#", text) == unguarded.sub("#", text)
+
+
+def test_default_guard_admits_every_default_match():
+    guard = re.compile(secure_business_data._DEFAULT_PATTERN_GUARD)
+    text = _corpus(500) + (
+        "$1 €2 £3 revenue Revenues PROFIT margin arr mrr forecast projection budget pricing price "
+        "Q1 2025 fy2026 2027 2031 business plan Financial  Plan\n"
+    )
+
+    for pat in secure_business_data._compile_default_patterns():
+        starts = [m.start() for m in pat.finditer(text)]
+        assert starts, pat.pattern
+        assert all(guard.match(text, start) for start in starts), pat.pattern
+
+
+def test_custom_patterns_are_not_guarded(tmp_path):
+    util = BusinessSecurityUtility(root=tmp_path, patterns=[re.compile(r"\bfoo\d"), re.compile(r"[#@]tag", re.I)])
+
+    assert not util.combined_pattern.pattern.startswith("(?=")
+    assert util.redact_text_with_counts("xfoo1 foo2 #Tag") == \
+        ("xfoo1 [REDACTED] [REDACTED]", {"pattern_0": 1, "pattern_1": 1})
+
+
+def test_phrase_containing_term_matches_sequential_output(tmp_path):
+    util = BusinessSecurityUtility(root=tmp_path)
+
+    redacted, counts = util.redact_text_with_counts("See the financial forecast and business plan.")
+
+    assert redacted == "See the financial [REDACTED] and [REDACTED]."
+    assert counts == {"finance_term": 1, "phrase": 1}
+    assert util.redact_text_sequential("See the financial forecast and business plan.") == (redacted, 2)
+
+
+def test_category_tokens_dispatch(tmp_path):
+    util = BusinessSecurityUtility(root=tmp_path, category_tokens={"currency": "[AMOUNT]"})
+
+    redacted, counts = util.redact_text_with_counts("Revenue was $5M.")
+
+    assert redacted == "[REDACTED] was [AMOUNT]."
+    assert counts == {"finance_term": 1, "currency": 1}
+
+
+def test_backreference_patterns_fall_back_to_sequential(tmp_path):
+    util = BusinessSecurityUtility(root=tmp_path, patterns=[re.compile(r"(\w)\1"), re.compile(r"zz")])
+
+    assert util.combined_pattern is None
+    assert util.redact_text_with_counts("aa b zz") == ("[REDACTED] b [REDACTED]", {"pattern_0": 2})
+
+
+@pytest.mark.parametrize("chunk_chars", [1, 7, 61, 4096])
+def test_stream_matches_whole_text_across_chunk_boundaries(tmp_path, chunk_chars):
+    util = BusinessSecurityUtility(root=tmp_path, chunk_chars=chunk_chars, overlap_chars=64)
+    text = _corpus(800)
+    expected, expected_counts = util.redact_text_with_counts(text)
+
+    out = []
+    counts = util.redact_stream(io.StringIO(text), out.append)
+
+    assert "".join(out) == expected
+    assert counts == expected_counts
+
+
+def _make_tree(root):
+    for i in range(12):
+        target = root / f"dept_{i % 3}" / f"note_{i}.md"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(_corpus(50, seed=i), encoding="utf-8")
+    (root / "dept_0" / "clean.txt").write_text("nothing sensitive here\n", encoding="utf-8")
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "skip.md").write_text("Revenue $5\n", encoding="utf-8")
+    (root / "code.py").write_text("price = 5\n", encoding="utf-8")
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_parallel_walk_matches_serial(tmp_path, use_processes):
+    source = tmp_path / "src"
+    _make_tree(source)
+    util = BusinessSecurityUtility(root=source)
+
+    serial = util.walk_and_process(out_dir=tmp_path / "serial", dry_run=False, max_workers=1)
+    pooled = util.walk_and_process(out_dir=tmp_path / "pooled", dry_run=False, max_workers=2,
+                                   use_processes=use_processes, max_in_flight=3)
+
+    assert [r.path for r in pooled] == [r.path for r in serial]
+    assert len(serial) == 12
+    assert not (tmp_path / "serial" / "node_modules").exists()
+    for res in serial:
+        rel = res.path.relative_to(source)
+        assert (tmp_path / "pooled" / rel).read_bytes() == (tmp_path / "serial" / rel).read_bytes()
+
+
+def test_streaming_file_path_matches_in_memory_path(tmp_path):
+    source = tmp_path / "src"
+    _make_tree(source)
+    in_memory = BusinessSecurityUtility(root=source)
+    streaming = BusinessSecurityUtility(root=source, stream_threshold=0, chunk_chars=97, overlap_chars=64)
+
+    expected = in_memory.walk_and_process(out_dir=tmp_path / "a", dry_run=False, max_workers=1)
+    streamed = streaming.walk_and_process(out_dir=tmp_path / "b", dry_run=False, max_workers=1)
+
+    assert [(r.path, r.redactions, r.categories) for r in streamed] == \
+        [(r.path, r.redactions, r.categories) for r in expected]
+    for res in expected:
+        rel = res.path.relative_to(source)
+        assert (tmp_path / "b" / rel).read_bytes() == (tmp_path / "a" / rel).read_bytes()
+    assert not list((tmp_path / "b").rglob("*.tmp"))
+
+
+def test_streaming_file_without_out_dir_raises(tmp_path):
+    (tmp_path / "big.md").write_text("Revenue $5\n", encoding="utf-8")
+    util = BusinessSecurityUtility(root=tmp_path, stream_threshold=0)
+
+    with pytest.raises(ValueError, match="out_dir is required"):
+        util.process_file(tmp_path / "big.md", dry_run=False)
@@ -0,0 +1,260 @@
+import asyncio
+import math
+import os
+import random
+import sys
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'algorithms', 'python-core'))
+
+from synapse_local import LocalSynapseAnalyticsEngine, recommended_mode  # type: ignore[import]  # noqa: E402
+
+T0 = 1_700_000_000.0
+
+
+def _rows(n=3000, users=25, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "userid": f"user_{rng.randrange(users)}",
+            "timestamp": T0 + rng.uniform(0, 7200),
+            "neuroplasticityindex": rng.uniform(0, 1),
+            "attention_index": rng.uniform(0, 1),
+            "learning_efficiency": rng.uniform(0, 1),
+        }
+        for _ in range(n)
+    ]
+
+
+def _engine(rows):
+    engine = LocalSynapseAnalyticsEngine(initialcapacity=16)
+    assert engine.append(rows) == len(rows)
+    return engine
+
+
+def _naive_life_scores(rows, since, until):
+    groups = defaultdict(list)
+    for row in rows:
+        if since <= row["timestamp"] < until:
+            groups[row["userid"]].append(row)
+    scores = {}
+    for user, items in groups.items():
+        values = [r["neuroplasticityindex"] for r in items]
+        times = [r["timestamp"] for r in items]
+        mean = sum(values) / len(values)
+        t_mean = sum(times) / len(times)
+        sxx = sum((t - t_mean) ** 2 for t in times)
+        sxy = sum((t - t_mean) * (v - mean) for t, v in zip(times, values))
+        scores[user] = {
+            "avgplasticity": mean,
+            "maxplasticity": max(values),
+            "minplasticity": min(values),
+            "plasticity_variance": (
+                math.sqrt(sum((v - mean) ** 2 for v in values) / (len(values) - 1))
+                if len(values) > 1 else float("nan")
+            ),
+            "avg_attention": sum(r["attention_index"] for r in items) / len(items),
+            "avg_learning_efficiency": sum(r["learning_efficiency"] for r in items) / len(items),
+            "measurement_count": len(items),
+            "p50plasticity": float(np.percentile(values, 50)),
+            "p95plasticity": float(np.percentile(values, 95)),
+            "plasticity_trend": sxy / sxx if sxx > 0 else 0.0,
+            "recommended_mode": recommended_mode(mean),
+        }
+    return scores
+
+
+def test_life_scores_match_naive_reference():
+    rows = _rows()
+    engine = _engine(rows)
+    since, until = T0 + 1800, T0 + 5400
+
+    table = engine.life_scores(since=since, until=until)
+    expected = _naive_life_scores(rows, since, until)
+
+    assert sorted(table["userid"]) == sorted(expected)
+    assert list(table["avgplasticity"]) == sorted(table["avgplasticity"], reverse=True)
+    for i, user in enumerate(table["userid"]):
+        for column, value in expected[user].items():
+            if isinstance(value, str) or column == "measurement_count":
+                assert table[column][i] == value
+            else:
+                assert table[column][i] == pytest.approx(value, rel=1e-9, abs=1e-9, nan_ok=True)
+
+
+def _naive_windows(rows, window, hop, origin):
+    sums, counts = defaultdict(float), defaultdict(int)
+    for row in rows:
+        offset = row["timestamp"] - origin
+        last = math.floor(offset / hop)
+        first = last - int(round(window / hop)) + 1
+        for k in range(first, last + 1):
+            key = (row["userid"], origin + k * hop)
+            sums[key] += row["neuroplasticityindex"]
+            counts[key] += 1
+    return {key: (counts[key], sums[key] / counts[key]) for key in counts}
+
+
+def _as_dict(table):
+    return {
+        (user, start): (count, mean)
+        for user, start, count, mean in zip(table["userid"], table["window_start"], table["count"], table["mean"])
+    }
+
+
+def test_tumbling_windows_match_naive_reference():
+    rows = _rows(seed=1)
+    engine = _engine(rows)
+
+    table = engine.tumbling_windows(300.0, origin=T0)
+    expected = _naive_windows(rows, 300.0, 300.0, T0)
+    actual = _as_dict(table)
+
+    assert actual.keys() == expected.keys()
+    for key, (count, mean) in expected.items():
+        assert actual[key][0] == count
+        assert actual[key][1] == pytest.approx(mean)
+    assert np.all(table["min"] <= table["mean"]) and np.all(table["mean"] <= table["max"])
+
+
+def test_hopping_windows_match_naive_reference():
+    rows = _rows(seed=2)
+    engine = _engine(rows)
+
+    actual = _as_dict(engine.hopping_windows(600.0, 120.0, origin=T0))
+    expected = _naive_windows(rows, 600.0, 120.0, T0)
+
+    assert actual.keys() == expected.keys()
+    for key, (count, mean) in expected.items():
+        assert actual[key][0] == count
+        assert actual[key][1] == pytest.approx(mean)
+
+
+def test_hopping_window_must_be_multiple_of_hop():
+    engine = _engine(_rows(n=10))
+    with pytest.raises(ValueError):
+        engine.hopping_windows(300.0, 70.0)
+
+
+def test_percentiles_survive_high_offset_values():
+    engine = LocalSynapseAnalyticsEngine()
+    values = 1e6 + np.random.default_rng(3).uniform(0, 1, 500)
+    engine.append_columns(["a"] * 250 + ["b"] * 250, np.arange(500.0), values)
+
+    table = engine.life_scores(percentiles=(10.0, 90.0))
+    by_user = {u: i for i, u in enumerate(table["userid"])}
+    for user, chunk in (("a", values[:250]), ("b", values[250:])):
+        i = by_user[user]
+        assert table["p10plasticity"][i] == pytest.approx(np.percentile(chunk, 10), abs=1e-6)
+        assert table["p90plasticity"][i] == pytest.approx(np.percentile(chunk, 90), abs=1e-6)
+
+
+def test_percentiles_are_exact_over_many_users_and_a_wide_range():
+    rng = np.random.default_rng(5)
+    users = [f"user_{u}" for u in rng.integers(0, 20_000, 50_000)]
+    values = rng.uniform(-1e9, 1e9, 50_000)
+    engine = LocalSynapseAnalyticsEngine()
+    engine.append_columns(users, np.arange(50_000.0), values)
+
+    table = engine.life_scores(percentiles=(50.0,))
+    groups = defaultdict(list)
+    for user, value in zip(users, values):
+        groups[user].append(value)
+    expected = np.array([np.percentile(groups[u], 50) for u in table["userid"]])
+    assert np.abs(table["p50plasticity"] - expected).max() < 1e-5  # a few ulps of 1e9
+
+
+@pytest.mark.filterwarnings("ignore:invalid value encountered:RuntimeWarning")
+def test_nan_value_stays_in_its_own_user():
+    engine = LocalSynapseAnalyticsEngine()
+    engine.append_columns(["a", "a", "a", "b", "b"], np.arange(5.0), np.array([0.1, np.nan, 0.3, 0.2, 0.4]))
+
+    table = engine.life_scores(percentiles=(0.0, 50.0, 100.0))
+    i, j = list(table["userid"]).index("a"), list(table["userid"]).index("b")
+    assert table["p0plasticity"][i] == 0.1 and table["p50plasticity"][i] == 0.3
+    assert np.isnan(table["p100plasticity"][i])
+    assert [table[f"p{q}plasticity"][j] for q in (0, 50, 100)] == pytest.approx([0.2, 0.3, 0.4])
+
+
+def test_architecture_analytics_uses_local_engine():
+    pytest.importorskip("azure.cosmos")
+    pytest.importorskip("azure.ai.ml")
+    from azure_architecture_optimized import OptimizedAzureArchitecture  # type: ignore[import]
+    from cosmos_local import InMemoryCosmosClient  # type: ignore[import]
+
+    architecture = OptimizedAzureArchitecture(cosmosclient=InMemoryCosmosClient(), mlclient=object())
+    rows = _rows(n=400, users=5, seed=4)
+    result = asyncio.run(architecture.realtimesynapseanalytics(rows, now=T0 + 7200))
+
+    expected = _naive_life_scores(rows, T0 + 3600, T0 + 7200)
+    assert result["rows_processed"] == sum(s["measurement_count"] for s in expected.values())
+    assert {r["userid"] for r in result["life_scores"]} == set(expected)
+    for row in result["life_scores"]:
+        assert row["avgplasticity"] == pytest.approx(expected[row["userid"]]["avgplasticity"])
+
+
+def test_append_skips_malformed_rows():
+    engine = LocalSynapseAnalyticsEngine()
+    rows = _rows(n=3, users=1)
+    rows[1]["timestamp"] = "not a timestamp"
+    rows.append({"userid": "x", "timestamp": None, "neuroplasticityindex": 0.5})
+    rows.append({"userid": "x", "timestamp": T0, "neuroplasticityindex": "n/a"})
+
+    assert engine.append(rows) == 2
+    assert len(engine) == 2
+
+
+def test_ingestion_survives_a_bad_analytics_row():
+    pytest.importorskip("azure.cosmos")
+    pytest.importorskip("azure.ai.ml")
+    from azure_architecture_optimized import OptimizedAzureArchitecture  # type: ignore[import]
+    from cosmos_local import InMemoryCosmosClient  # type: ignore[import]
+
+    architecture = OptimizedAzureArchitecture(cosmosclient=InMemoryCosmosClient(), mlclient=object())
+    rows = [dict(row, id=f"dp_{i}") for i, row in enumerate(_rows(n=20, users=2, seed=6))]
+    rows[3]["timestamp"] = "yesterday"
+
+    def broken_append(datapoints):
+        raise RuntimeError("mirror down")
+
+    results = asyncio.run(architecture.optimizeddataingestion(rows))
+    assert sum(len(batch) for batch in results) == 20
+    assert len(architecture.analyticsengine) == 19
+
+    architecture.analyticsengine.append = broken_append
+    results = asyncio.run(architecture.optimizeddataingestion(rows))
+    assert sum(len(batch) for batch in results) == 20
+
+
+def test_retention_compacts_instead_of_growing():
+    engine = LocalSynapseAnalyticsEngine(initialcapacity=1024, retention_seconds=600.0)
+    rng = np.random.default_rng(5)
+    for step in range(50):
+        t = T0 + step * 60.0 + np.arange(100) * 0.5
+        engine.append_columns([f"user_{step}_{i % 4}" for i in range(100)], t, rng.uniform(0, 1, 100))
+
+    # Only the last ~10 minutes (plus one buffer of slack) are kept
+    assert engine._capacity <= 4096
+    assert engine._timestamps[:len(engine)].min() >= T0 + 49 * 60.0 - 600.0 - 1024 * 0.5
+    assert len(engine.usernames) == len(set(engine.usernames)) < 50 * 4
+    table = engine.life_scores(since=T0 + 44 * 60.0)
+    assert int(table["measurement_count"].sum()) == 600
+    assert set(table["userid"]) == {f"user_{s}_{i}" for s in range(44, 50) for i in range(4)}
+
+
+def test_hopping_windows_over_a_wide_range_stay_sparse():
+    rows = _rows(n=400, seed=6)
+    # A few far-away rows make the dense users x span matrix enormous
+    rows += [dict(rows[i], timestamp=rows[i]["timestamp"] + 3.0e8 * (i + 1)) for i in range(3)]
+    engine = _engine(rows)
+
+    actual = _as_dict(engine.hopping_windows(600.0, 120.0, origin=T0))
+    expected = _naive_windows(rows, 600.0, 120.0, T0)
+
+    assert actual.keys() == expected.keys()
+    for key, (count, mean) in expected.items():
+        assert actual[key][0] == count
+        assert actual[key][1] == pytest.approx(mean)
@@ -0,0 +1,172 @@
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'algorithms', 'python-core'))
+
+import validation_log  # type: ignore[import]  # noqa: E402
+from validation_log import ValidationLogWriter  # type: ignore[import]  # noqa: E402
+
+
+def _record(i, status="passed"):
+    return {
+        "validation_id": f"val_{i}",
+        "user_id": f"user_{i % 3}",
+        "timestamp": "2025-01-01T00:00:00",
+        "metrics": {"attention_index": 0.5, "neuroplasticity_index": 0.25, "signal_quality": 0.9},
+        "quantum_score": 0.0,
+        "processing_time_ms": float(i),
+        "status": status,
+        "recommendations": ["rec"],
+    }
+
+
+def test_segments_rotate_and_preserve_order(tmp_path):
+    with ValidationLogWriter(str(tmp_path), max_segment_bytes=1024, fsync_every=10) as writer:
+        for i in range(40):
+            writer.append(_record(i))
+        records = list(writer.iter_records())
+
+    segments = sorted(p for p in os.listdir(tmp_path) if p.startswith("segment-"))
+    assert len(segments) > 1
+    assert all(os.path.getsize(tmp_path / name) <= 1024 for name in segments)
+    assert [r["validation_id"] for r in records] == [f"val_{i}" for i in range(40)]
+
+
+def test_summary_index_is_incremental_and_persistent(tmp_path):
+    with ValidationLogWriter(str(tmp_path), max_segment_bytes=2048) as writer:
+        for i in range(30):
+            writer.append(_record(i, status=("passed", "warning", "failed")[i % 3]))
+
+    reopened = ValidationLogWriter(str(tmp_path))
+    totals = reopened.summary()
+    assert totals["total_validations"] == 30
+    assert (totals["passed"], totals["warnings"], totals["failed"]) == (10, 10, 10)
+    assert totals["sum_processing_time_ms"] == pytest.approx(sum(range(30)))
+
+    # Summary must come from the index, not from re-reading records
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("summary rescanned records")
+
+    reopened._read_segment = _fail
+    assert reopened.summary()["total_validations"] == 30
+
+
+def test_recovers_unsynced_tail_and_drops_torn_line(tmp_path):
+    writer = ValidationLogWriter(str(tmp_path), fsync_every=1000, fsync_interval=3600)
+    writer.append(_record(0))
+    writer.sync()
+    writer.append(_record(1))
+    writer.append(_record(2))
+    writer._file.flush()
+    segment = writer._index["segments"][-1]["name"]
+    with open(tmp_path / segment, "ab") as f:
+        f.write(b'{"validation_id": "torn"')
+    writer._file.close()  # Simulated crash: index only knows about record 0
+    writer._release_lock()  # the OS drops a dead process's lock
+
+    recovered = ValidationLogWriter(str(tmp_path))
+    assert recovered.summary()["total_validations"] == 3
+    assert [r["validation_id"] for r in recovered.iter_records()] == ["val_0", "val_1", "val_2"]
+
+
+def test_migrate_folds_legacy_json_files(tmp_path):
+    legacy = tmp_path / "legacy"
+    legacy.mkdir()
+    for i in range(5):
+        (legacy / f"validation_val_{i}.json").write_text(json.dumps(_record(i)), encoding="utf-8")
+
+    assert validation_log.main(["migrate", "--source", str(legacy), "--remove"]) == 0
+
+    writer = ValidationLogWriter(str(legacy / "segments"))
+    assert writer.summary()["total_validations"] == 5
+    assert not list(legacy.glob("validation_*.json"))
+
+
+@pytest.mark.skipif(not validation_log.PARQUET_AVAILABLE, reason="pandas/pyarrow not installed")
+def test_parquet_compaction_keeps_records_and_summary(tmp_path):
+    with ValidationLogWriter(str(tmp_path), max_segment_bytes=1024) as writer:
+        for i in range(20):
+            writer.append(_record(i))
+    before = list(ValidationLogWriter(str(tmp_path)).iter_records())
+
+    writer = ValidationLogWriter(str(tmp_path))
+    assert writer.compact_to_parquet() > 0
+    assert not list(tmp_path.glob("segment-*.jsonl"))
+    assert list(writer.iter_records()) == before
+
+    writer.append(_record(20))
+    writer.close()
+    assert ValidationLogWriter(str(tmp_path)).summary()["total_validations"] == 21
+
+
+def test_migration_keeps_unreadable_files_and_is_idempotent(tmp_path):
+    legacy = tmp_path / "legacy"
+    legacy.mkdir()
+    for i in range(3):
+        (legacy / f"validation_val_{i}.json").write_text(json.dumps(_record(i)), encoding="utf-8")
+    (legacy / "validation_broken.json").write_text("{not json", encoding="utf-8")
+
+    with ValidationLogWriter(str(tmp_path / "segments")) as writer:
+        assert writer.migrate_json_logs(str(legacy)) == 3
+        # A second run finds every validation_id already stored
+        assert writer.migrate_json_logs(str(legacy), remove=True) == 0
+        assert writer.summary()["total_validations"] == 3
+
+    assert [p.name for p in legacy.glob("validation_*.json")] == ["validation_broken.json"]
+
+
+def test_second_writer_is_refused_until_the_first_closes(tmp_path):
+    first = ValidationLogWriter(str(tmp_path))
+    first.append(_record(0))
+    with pytest.raises(validation_log.ValidationLogLocked):
+        ValidationLogWriter(str(tmp_path))
+    first.close()
+
+    with ValidationLogWriter(str(tmp_path)) as second:
+        second.append(_record(1))
+    # Reusing the closed writer re-takes the lock and sees the other writer's record
+    first.append(_record(2))
+    first.close()
+    assert ValidationLogWriter(str(tmp_path)).summary()["total_validations"] == 3
+
+
+def test_idle_writer_syncs_after_the_interval(tmp_path):
+    with ValidationLogWriter(str(tmp_path), fsync_every=100, fsync_interval=0.05) as writer:
+        writer.append(_record(0))
+        assert validation_log.read_summary(str(tmp_path))["total_validations"] == 0
+        deadline = time.monotonic() + 5
+        while validation_log.read_summary(str(tmp_path))["total_validations"] == 0:
+            assert time.monotonic() < deadline, "pending record was never synced"
+            time.sleep(0.01)
+        with open(tmp_path / "segment-000000.jsonl", "rb") as f:
+            assert f.read().count(b"\n") == 1
+
+
+def test_sibling_logs_are_summarised_then_merged(tmp_path):
+    shared = str(tmp_path / "segments")
+    holder = ValidationLogWriter(shared)
+    holder.append(_record(0))
+    holder.sync()
+    with ValidationLogWriter(shared + "-4242") as sibling:
+        for i in range(1, 4):
+            sibling.append(_record(i, status="failed"))
+    busy = ValidationLogWriter(shared + "-4343")
+    busy.append(_record(9))
+    busy.sync()
+    os.makedirs(shared + "-backup")  # not a per-process sibling
+
+    summary = validation_log.read_summary(shared)
+    assert (summary["total_validations"], summary["failed"]) == (5, 3)
+    assert validation_log.read_summary(shared, include_siblings=False)["total_validations"] == 1
+
+    assert holder.merge_sibling_logs() == 3
+    assert holder.merge_sibling_logs() == 0
+    assert not os.path.exists(shared + "-4242") and os.path.exists(shared + "-4343")
+    assert [r["validation_id"] for r in holder.iter_records()] == ["val_0", "val_1", "val_2", "val_3"]
+    assert validation_log.read_summary(shared)["total_validations"] == 5
+    busy.close()
+    holder.close()
@@ -0,0 +1,182 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from vr_adaptation_bus import (  # type: ignore[import]  # noqa: E402
+    FRAME_HEADER,
+    KIND_ENVIRONMENT,
+    STATE_STRUCT,
+    StandInUnityListener,
+    VRAdaptationBus,
+    VRState,
+    decode_flags,
+    decode_frame,
+    encode_flags,
+    encode_frames,
+    slot_key,
+)
+
+USERS = 8
+PUBLISH_HZ = 1000  # per user, far above the frame rate
+
+
+class _ListTransport:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, payload):
+        self.sent.append(payload)
+
+
+def test_wire_format_roundtrip_and_chunking():
+    assert STATE_STRUCT.size == 40
+    state = VRState(slot_key("user-1"), 7, 123456789, 0.75, 0.25, -0.5,
+                    encode_flags(["relaxation_mode", "focus_prompts"]), KIND_ENVIRONMENT, 3)
+
+    frame, decoded = decode_frame(encode_frames(42, [state])[0])
+
+    assert frame == 42 and decoded == [state]
+    assert decode_flags(decoded[0].flags) == ["relaxation_mode", "focus_prompts"]
+    datagrams = encode_frames(1, [state] * 100, max_datagram=1400)
+    assert [len(decode_frame(d)[1]) for d in datagrams] == [34, 34, 32]
+    assert max(map(len, datagrams)) <= 1400 and len(datagrams[0]) == FRAME_HEADER.size + 34 * 40
+    with pytest.raises(ValueError):
+        decode_frame(datagrams[0][:-1])
+
+
+def test_latest_state_wins_per_slot():
+    transport = _ListTransport()
+    bus = VRAdaptationBus(transport, rate_hz=90, clock_ns=iter(range(100)).__next__)
+    for focus in (0.1, 0.2, 0.3):
+        bus.publish("user-a", focus=focus)
+    bus.publish("user-b", focus=0.9)
+
+    assert bus.flush() == 2 and bus.flush() == 0
+    _, states = decode_frame(transport.sent[0])
+    latest = {s.key: s for s in states}
+    a = latest[slot_key("user-a")]
+    assert a.focus == pytest.approx(0.3) and a.sequence == 3 and a.coalesced == 2
+    assert bus.stats.published == 4 and bus.stats.coalesced == 2 and bus.stats.frames == 1
+
+
+def test_slot_bookkeeping_is_bounded_and_sequences_keep_increasing():
+    bus = VRAdaptationBus(_ListTransport(), rate_hz=90, max_tracked_slots=8)
+    last = {}
+    for _ in range(3):
+        for i in range(100):
+            state = bus.publish(f"complexity:{i}")
+            assert state.sequence > last.get(i, 0)
+            last[i] = state.sequence
+            bus.flush()
+        assert len(bus._last_sent) == 8 and not bus._pending
+
+    # A slot still tracked continues from its own last sequence
+    assert bus.publish("complexity:99").sequence == last[99] + 1
+
+
+async def _produce(publish, seconds):
+    # Bursty producer: every millisecond, one state for each user
+    last = {}
+    loop = asyncio.get_running_loop()
+    end = loop.time() + seconds
+    tick = 0
+    while loop.time() < end:
+        for user in range(USERS):
+            last[user] = publish(f"user-{user}", tick)
+        tick += 1
+        await asyncio.sleep(1.0 / PUBLISH_HZ)
+    return last
+
+
+def test_udp_bus_bounds_staleness_against_fifo_delivery():
+    async def run_bus():
+        listener = await StandInUnityListener.start()
+        bus = await VRAdaptationBus.connect(*listener.address, rate_hz=90)
+        bus.start()
+        last = await _produce(lambda slot, t: bus.publish(slot, focus=t % 100 / 100.0), 0.5)
+        await bus.stop()
+        await asyncio.sleep(0.05)
+        listener.close()
+        return listener, bus, last
+
+    async def run_fifo():
+        # The old path: every event is queued and sent in order after a 10 ms call
+        listener = await StandInUnityListener.start()
+        bus = await VRAdaptationBus.connect(*listener.address)
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def sender():
+            while True:
+                state = await queue.get()
+                await asyncio.sleep(0.01)
+                bus.transport.send(encode_frames(0, [state])[0])
+
+        task = asyncio.ensure_future(sender())
+        await _produce(lambda slot, t: queue.put_nowait(
+            VRState(slot_key(slot), t + 1, bus.clock_ns(), focus=t % 100 / 100.0)), 0.5)
+        await asyncio.sleep(0.2)
+        task.cancel()
+        bus.transport.close()
+        listener.close()
+        return listener
+
+    listener, bus, last = asyncio.run(run_bus())
+    fifo = asyncio.run(run_fifo())
+
+    # Every user ends on its newest state, never steps back, and bursts were coalesced
+    assert listener.regressions == 0 and listener.malformed == 0
+    assert {k: s.sequence for k, s in listener.latest.items()} == {
+        slot_key(f"user-{u}"): state.sequence for u, state in last.items()
+    }
+    assert bus.stats.coalesced > bus.stats.states_sent
+    assert listener.states == bus.stats.states_sent
+
+    frame_ms = 1000 / 90
+    assert listener.staleness_ms(50) < 2 * frame_ms
+    assert listener.staleness_ms(99) < 5 * frame_ms
+    # In-order delivery falls further behind with every event; coalescing does not
+    assert fifo.staleness_ms(50) > 10 * listener.staleness_ms(99)
+
+
+def test_section_adjustments_publish_to_the_bus():
+    section10 = pytest.importorskip("life_algorithm_section10_integration")
+    section8 = pytest.importorskip("life_algorithm_section8_integration")
+    algo = section10.LIFEAlgorithmSection10()
+    algo.consent_manager.set_consent("vr_adaptation", True)
+    algo.vr_bus = VRAdaptationBus(_ListTransport())
+    metrics = section8.EEGMetrics(
+        timestamp=None, alpha_power=0.4, beta_power=0.3, theta_power=0.2, attention_index=0.6,
+        stress_level=0.8, focus_level=0.5, neuroplasticity_score=0.5,
+    )
+
+    algo.adjust_vr_environment(metrics, domain="healthcare")
+    algo.adjust_vr_environment(metrics, domain="healthcare", session_id="s1")
+    algo.adjust_vr_environment(metrics, domain="healthcare", session_id="s2")
+    algo.visualize_complexity_in_vr([0.2, 0.9])
+    algo.visualize_complexity_in_vr([0.7, 0.9])  # rescored: replaces the unsent states
+    algo.vr_bus.flush()
+
+    _, states = decode_frame(algo.vr_bus.transport.sent[0])
+    by_key = {s.key: s for s in states}
+    env = by_key[slot_key("environment:healthcare")]
+    assert env.kind == KIND_ENVIRONMENT and env.stress == pytest.approx(0.8)
+    assert set(decode_flags(env.flags)) == {"relaxation_mode", "clinical_scenario_adjustment", "trigger_relaxation"}
+    first = by_key[slot_key("complexity:1")]
+    assert first.value == pytest.approx(0.7) and decode_flags(first.flags) == ["stabilize"]
+    # Sessions in the same domain keep separate slots
+    assert {slot_key("environment:s1"), slot_key("environment:s2")} <= set(by_key)
+    assert len(states) == 5
+
+    section4 = pytest.importorskip("life_algorithm_section4_integration")
+    algo4 = section4.LIFEAlgorithmSection4()
+    algo4.consent_manager.consent_status["vr_adaptation"] = True
+    algo4.vr_bus = VRAdaptationBus(_ListTransport())
+    for level in (0.01, 0.02, 0.05):
+        assert asyncio.run(algo4.send_vr_adaptation({"processed_data": [level, -level], "user_id": "u1"}))
+    assert algo4.vr_bus.flush() == 1 and algo4.processing_stats["vr_adaptations_sent"] == 3
+    (state,) = decode_frame(algo4.vr_bus.transport.sent[0])[1]
+    assert state.sequence == 3 and state.stress == pytest.approx(0.5)
@@ -0,0 +1,131 @@
+"""
+Benchmark bulk learning-outcome tracking (Section 8) against the scalar path.
+
+Builds synthetic outcomes, times LIFEAlgorithm.track_learning_outcomes on
+column and row input, the OutcomeStore append and aggregate query, and the
+scalar track_learning_outcome on a sample extrapolated to the full count.
+
+    python tools/benchmark_outcome_tracking.py --outcomes 1000000 --store-dir /tmp/outcomes
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import life_algorithm_section8_integration as section8  # noqa: E402
+from life_algorithm_section8_integration import (  # noqa: E402
+    DOMAIN_OUTCOME_MULTIPLIERS,
+    OUTCOME_METRICS,
+    LIFEAlgorithm,
+)
+
+
+def benchmark_outcome_tracking(num_outcomes: int = 1_000_000, num_users: int = 50_000,
+                               store_dir: Optional[Union[str, Path]] = None, days: int = 7,
+                               scalar_sample: int = 20_000, seed: int = 0) -> Dict[str, float]:
+    """
+    Time bulk outcome tracking on ``num_outcomes`` synthetic outcomes
+
+    Measures track_learning_outcomes on column input (cold anonymous-ID LRU)
+    and on row records (warm LRU), appending the batch to the store and a
+    per-domain aggregate query when ``store_dir`` is given, and the scalar
+    track_learning_outcome on ``scalar_sample`` rows, extrapolated to
+    ``num_outcomes``.
+    """
+    rng = np.random.default_rng(seed)
+    domain_names = np.array(list(DOMAIN_OUTCOME_MULTIPLIERS))
+    factor_names = [key for _, key in DOMAIN_OUTCOME_MULTIPLIERS.values()]
+    domain_index = rng.integers(0, len(domain_names), num_outcomes)
+    factors = rng.random(num_outcomes)
+    columns: Dict[str, Any] = {
+        "session_id": np.char.add("session_", np.arange(num_outcomes).astype(str)),
+        "user_id": np.char.add("user_", rng.integers(0, num_users, num_outcomes).astype(str)),
+        "domain": domain_names[domain_index],
+        "timestamp": np.datetime64("2025-01-01T00:00:00", "us")
+        + rng.integers(0, days * 86_400_000_000, num_outcomes).astype("timedelta64[us]"),
+        "skill_improvement": rng.random(num_outcomes),
+        "neural_adaptation": rng.random(num_outcomes),
+        "completion_time": 60.0 * rng.random(num_outcomes),
+        "confidence_score": rng.random(num_outcomes),
+        **{key: factors for key in factor_names},
+    }
+    records = [
+        {
+            "session_id": str(columns["session_id"][i]),
+            "user_id": str(columns["user_id"][i]),
+            "domain": str(columns["domain"][i]),
+            "assessment_data": {
+                **{name: float(columns[name][i]) for name in OUTCOME_METRICS},
+                factor_names[domain_index[i]]: float(factors[i]),
+            },
+        }
+        for i in range(num_outcomes)
+    ]
+    algo = LIFEAlgorithm({"outcome_store_dir": str(store_dir)} if store_dir else {})
+    level = section8.logger.level
+    section8.logger.setLevel(logging.WARNING)
+    try:
+        began = time.perf_counter()
+        batch = algo.track_learning_outcomes(columns, persist=False)
+        columns_s = time.perf_counter() - began
+
+        append_s = 0.0
+        if algo.outcome_store is not None:
+            began = time.perf_counter()
+            algo.outcome_store.append(batch.columns())
+            append_s = time.perf_counter() - began
+
+        began = time.perf_counter()
+        algo.track_learning_outcomes(records, persist=False)
+        rows_s = time.perf_counter() - began
+
+        query_s = 0.0
+        if algo.outcome_store is not None:
+            began = time.perf_counter()
+            algo.learning_outcome_summary()
+            query_s = time.perf_counter() - began
+
+        sample = records[:scalar_sample]
+        scalar_algo = LIFEAlgorithm()
+        began = time.perf_counter()
+        for r in sample:
+            scalar_algo.track_learning_outcome(r["session_id"], r["user_id"], r["domain"], r["assessment_data"])
+        scalar_s = (time.perf_counter() - began) * num_outcomes / max(1, len(sample))
+    finally:
+        section8.logger.setLevel(level)
+    return {
+        "outcomes": float(num_outcomes),
+        "bulk_columns_s": columns_s,
+        "bulk_rows_s": rows_s,
+        "store_append_s": append_s,
+        "scalar_s_extrapolated": scalar_s,
+        "speedup_columns": scalar_s / columns_s if columns_s else 0.0,
+        "speedup_rows": scalar_s / rows_s if rows_s else 0.0,
+        "aggregate_query_s": query_s,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--outcomes", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--store-dir", default=None, help="also time the partitioned store under this directory")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--scalar-sample", type=int, default=20_000)
+    args = parser.parse_args(argv)
+    result = benchmark_outcome_tracking(args.outcomes, args.users, args.store_dir, args.days, args.scalar_sample)
+    for name, value in result.items():
+        print(f"{name:>24}: {value:.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,16 @@
+import argparse
 import os
 import sys
-from typing import List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from placeholder_scan import ScanCache, changed_since, compile_tokens, iter_files, read_lines, scan_paths
 
 # Windows-first path handling; no secrets used
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, os.pardir))
 LOGS_DIR = os.path.join(ROOT_DIR, "logs")
 REPORT_PATH = os.path.join(LOGS_DIR, "placeholder_audit.txt")
+CACHE_PATH = os.path.join(LOGS_DIR, "placeholder_audit_cache.json")
 
 TOKEN = ""
 
@@ -17,84 +21,94 @@ TEXT_EXTS = {
     ".toml", ".csv", ".tsv", ".html", ".css", ".js", ".ts"
 }
 
-# Skip very large files and known binary folders
+# Skip known binary folders (files of any size are memory-mapped, so no size cap)
 SKIP_DIRS = {
     ".git", "__pycache__", ".venv", "venv", "node_modules", ".azure", ".idea", ".vscode"
 }
 
-MAX_FILE_BYTES = 5 * 1024 * 1024  # 5 MB safety cap
-
 
 def is_text_like(path: str) -> bool:
     _, ext = os.path.splitext(path)
     return ext.lower() in TEXT_EXTS
 
 
-def scan_file_for_token(path: str) -> Tuple[int, List[Tuple[int, str]]]:
+def contexts_for_lines(path: str, hit_lines: List[int]) -> List[Tuple[int, str]]:
     """
-    Return (count, contexts) where contexts is a list of (line_number, context_str)
+    Return (line_number, context_str) per cluster of hit lines.
     context_str includes up to 1 line before and after.
     """
-    try:
-        size = os.path.getsize(path)
-        if size > MAX_FILE_BYTES:
-            return 0, []
-        with open(path, "r", encoding="utf-8", errors="replace") as f:
-            lines = f.readlines()
-    except Exception:
-        return 0, []
+    # Collapse contiguous or near-by matches to clusters and provide a compact context
+    shown: List[int] = []
+    last = -10
+    for ln in hit_lines:
+        if ln - last > 1:
+            shown.append(ln)
+        last = ln
 
-    matches: List[int] = []
-    for idx, line in enumerate(lines):
-        if TOKEN in line:
-            matches.append(idx)
+    text = read_lines(path, {n for ln in shown for n in (ln - 1, ln, ln + 1) if n >= 1})
+    return [
+        (ln, "".join(text.get(n, "") for n in (ln - 1, ln, ln + 1)).rstrip())
+        for ln in shown
+    ]
 
-    if not matches:
+
+def scan_file_for_token(path: str, tokens: Sequence[str] = (TOKEN,)) -> Tuple[int, List[Tuple[int, str]]]:
+    """
+    Return (count, contexts) where count is the number of lines containing a token
+    and contexts is a list of (line_number, context_str).
+    """
+    pattern = compile_tokens(tokens)
+    if pattern is None:
         return 0, []
+    _, hit_lines = scan_paths([path], pattern, workers=1)[path]
+    if not hit_lines:
+        return 0, []
+    return len(hit_lines), contexts_for_lines(path, hit_lines)
 
-    contexts: List[Tuple[int, str]] = []
 
-    # Collapse contiguous or near-by matches to clusters and provide a compact context
-    last_idx = -10
-    for idx in matches:
-        if idx - last_idx <= 1:
-            # Too close to previous, skip to avoid spamming
-            last_idx = idx
-            continue
-        start = max(0, idx - 1)
-        end = min(len(lines), idx + 2)
-        snippet = "".join(lines[start:end]).rstrip()
-        contexts.append((idx + 1, snippet))
-        last_idx = idx
-
-    return len(matches), contexts
-
-
-def main() -> int:
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Report placeholder tokens across the repository.")
+    parser.add_argument("--token", action="append", default=None,
+                        help="Token to search for (repeatable; default: module TOKEN)")
+    parser.add_argument("--since", default=None, help="Only scan files changed since this git revision")
+    parser.add_argument("--workers", type=int, default=None, help="Scanner processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the mtime cache")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
     os.makedirs(LOGS_DIR, exist_ok=True)
 
+    tokens = args.token or [TOKEN]
+    pattern = compile_tokens(tokens)
+    if pattern is None:
+        print("No placeholder token configured; pass --token.")
+        return 2
+
+    paths = list(iter_files(ROOT_DIR, lambda d: d in SKIP_DIRS, is_text_like))
+    if args.since:
+        changed = changed_since(ROOT_DIR, args.since)
+        paths = [p for p in paths if os.path.normpath(p) in changed]
+    cache = None if args.no_cache else ScanCache(CACHE_PATH, pattern)
+    scanned: Dict[str, Tuple[int, List[int]]] = scan_paths(paths, pattern, workers=args.workers, cache=cache)
+
     findings = []
     total_matches = 0
-
-    for root, dirs, files in os.walk(ROOT_DIR):
-        # prune dirs in-place
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        for name in files:
-            full = os.path.join(root, name)
-            if not is_text_like(full):
-                continue
-            c, ctx = scan_file_for_token(full)
-            if c:
-                rel = os.path.relpath(full, ROOT_DIR)
-                findings.append((rel, c, ctx))
-                total_matches += c
+    for full, (_, hit_lines) in scanned.items():
+        if hit_lines:
+            rel = os.path.relpath(full, ROOT_DIR)
+            findings.append((rel, len(hit_lines), contexts_for_lines(full, hit_lines)))
+            total_matches += len(hit_lines)
 
     findings.sort(key=lambda x: x[1], reverse=True)
 
     with open(REPORT_PATH, "w", encoding="utf-8") as rep:
         rep.write("Placeholder Audit Report\n")
-        rep.write("Token: %s\n" % TOKEN)
+        rep.write("Token: %s\n" % ", ".join(tokens))
         rep.write("Root: %s\n" % ROOT_DIR)
+        if args.since:
+            rep.write("Changed since: %s\n" % args.since)
         rep.write("Total files with matches: %d\n" % len(findings))
         rep.write("Total matches: %d\n" % total_matches)
         rep.write("\n=== Top offenders (by match count) ===\n\n")
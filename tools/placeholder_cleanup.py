@@ -5,6 +5,8 @@ import re
 from datetime import datetime
 from pathlib import Path
 
+from placeholder_scan import ScanCache, changed_since, compile_tokens, iter_files, scan_paths
+
 TOKEN = ""
 REPLACEMENTS = {
     # Common language tags broken by the token removal
@@ -25,13 +27,13 @@ def is_text_file(path: Path) -> bool:
     return path.suffix.lower() in TEXT_EXTS
 
 
-def clean_text(text: str) -> tuple[str, int]:
+def clean_text(text: str, token: str = TOKEN) -> tuple[str, int]:
     """Remove placeholder token and apply small quality fixes.
     Returns (cleaned_text, num_replacements).
     """
-    count = text.count(TOKEN)
+    count = text.count(token) if token else 0
     if count:
-        text = text.replace(TOKEN, "")
+        text = text.replace(token, "")
     # Small heuristics for common breakages after token removal
     for bad, good in REPLACEMENTS.items():
         if bad in text:
@@ -48,13 +50,21 @@ def backup_file(src: Path, quarantine_dir: Path) -> Path:
     return dst
 
 
-def process_file(path: Path, dry_run: bool, quarantine_dir: Path, logs_dir: Path) -> dict:
+def process_file(path: Path, dry_run: bool, quarantine_dir: Path, logs_dir: Path,
+                 token: str = TOKEN, matches: int | None = None) -> dict:
+    """Clean one file. ``matches`` is the scanner's hit count when already known;
+    files the scanner found clean are never read."""
+    if matches == 0:
+        return {"path": str(path), "status": "no-op", "matches": 0}
+    if dry_run and matches is not None:
+        return {"path": str(path), "status": "preview", "matches": matches}
+
     try:
         raw = path.read_text(encoding="utf-8", errors="replace")
     except Exception as e:
         return {"path": str(path), "status": "skip", "reason": f"read-error: {e}"}
 
-    cleaned, n = clean_text(raw)
+    cleaned, n = clean_text(raw, token)
     if n == 0:
         return {"path": str(path), "status": "no-op", "matches": 0}
 
@@ -70,7 +80,13 @@ def process_file(path: Path, dry_run: bool, quarantine_dir: Path, logs_dir: Path
         return {"path": str(path), "status": "error", "reason": str(e)}
 
 
-def walk_and_process(root: Path, dry_run: bool, target_file: str | None) -> list[dict]:
+def _skip_dir(name: str) -> bool:
+    return name in EXCLUDE_DIRS or name.startswith(".")
+
+
+def walk_and_process(root: Path, dry_run: bool, target_file: str | None, token: str = TOKEN,
+                     since: str | None = None, workers: int | None = None,
+                     cache_path: Path | None = None) -> list[dict]:
     results = []
     quarantine_dir = root / "quarantine"
     logs_dir = root / "logs"
@@ -82,21 +98,24 @@ def walk_and_process(root: Path, dry_run: bool, target_file: str | None) -> list
             return [{"path": str(path), "status": "skip", "reason": "not-found"}]
         if not is_text_file(path):
             return [{"path": str(path), "status": "skip", "reason": "non-text"}]
-        results.append(process_file(path, dry_run, quarantine_dir, logs_dir))
+        results.append(process_file(path, dry_run, quarantine_dir, logs_dir, token))
         return results
 
-    for dirpath, dirnames, filenames in os.walk(root):
-        # Prune excluded dirs
-        dirnames[:] = [d for d in dirnames if d not in EXCLUDE_DIRS and not d.startswith(".")]
-        for name in filenames:
-            p = Path(dirpath) / name
-            if not is_text_file(p):
-                continue
-            results.append(process_file(p, dry_run, quarantine_dir, logs_dir))
+    pattern = compile_tokens([token])
+    if pattern is None:
+        return results
+
+    paths = list(iter_files(str(root), _skip_dir, lambda p: is_text_file(Path(p))))
+    if since:
+        changed = changed_since(str(root), since)
+        paths = [p for p in paths if os.path.normpath(p) in changed]
+    cache = ScanCache(str(cache_path), pattern) if cache_path else None
+    for full, (count, _) in scan_paths(paths, pattern, workers=workers, cache=cache).items():
+        results.append(process_file(Path(full), dry_run, quarantine_dir, logs_dir, token, matches=count))
     return results
 
 
-def write_report(results: list[dict], logs_dir: Path, dry_run: bool) -> Path:
+def write_report(results: list[dict], logs_dir: Path, dry_run: bool, token: str = TOKEN) -> Path:
     updated = [r for r in results if r.get("status") in {"updated", "preview"}]
     total_matches = sum(r.get("matches", 0) for r in updated)
     mode = "DRY-RUN" if dry_run else "WRITE"
@@ -104,7 +123,7 @@ def write_report(results: list[dict], logs_dir: Path, dry_run: bool) -> Path:
 
     lines = [
         f"Placeholder cleanup report ({mode})",
-        f"Token: {TOKEN}",
+        f"Token: {token}",
         f"Files impacted: {len(updated)}",
         f"Total matches: {total_matches}",
         "",
@@ -123,13 +142,19 @@ def main():
     parser = argparse.ArgumentParser(description="Remove placeholder tokens from files and back up originals.")
     parser.add_argument("--path", dest="target_file", help="Specific file path relative to repo root", default=None)
     parser.add_argument("--write", action="store_true", help="Apply changes (default is dry-run)")
+    parser.add_argument("--token", default=TOKEN, help="Placeholder token to remove (default: module TOKEN)")
+    parser.add_argument("--since", default=None, help="Only consider files changed since this git revision")
+    parser.add_argument("--workers", type=int, default=None, help="Scanner processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the mtime cache")
     args = parser.parse_args()
 
     root = Path(__file__).resolve().parents[1]
-    results = walk_and_process(root, dry_run=not args.write, target_file=args.target_file)
-
     logs_dir = root / "logs"
-    report = write_report(results, logs_dir, dry_run=not args.write)
+    cache_path = None if args.no_cache else logs_dir / "placeholder_cleanup_cache.json"
+    results = walk_and_process(root, dry_run=not args.write, target_file=args.target_file, token=args.token,
+                               since=args.since, workers=args.workers, cache_path=cache_path)
+
+    report = write_report(results, logs_dir, dry_run=not args.write, token=args.token)
 
     impacted = [r for r in results if r.get("status") in {"updated", "preview"}]
     print(f"Cleanup complete. Mode: {'DRY-RUN' if not args.write else 'WRITE'} | Files impacted: {len(impacted)} | Report: {report}")
@@ -0,0 +1,174 @@
+"""
+Shared scanning core for placeholder_audit.py and placeholder_cleanup.py.
+
+Each file is memory-mapped and searched with one compiled multi-token byte
+regex; line numbers are only worked out for hits. Files are fanned out over a
+process pool, and an mtime/size cache plus an optional git revision filter let
+re-runs skip files that have not changed.
+"""
+
+import json
+import mmap
+import os
+import re
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# (occurrences, sorted 1-based line numbers containing at least one hit)
+ScanResult = Tuple[int, List[int]]
+
+NO_HITS: ScanResult = (0, [])
+
+
+def compile_tokens(tokens: Iterable[str]) -> Optional["re.Pattern[bytes]"]:
+    """One byte regex matching any token; longest first so overlapping tokens count once"""
+    encoded = sorted({t.encode("utf-8") for t in tokens if t}, key=len, reverse=True)
+    if not encoded:
+        return None
+    return re.compile(b"|".join(re.escape(t) for t in encoded))
+
+
+def scan_file(path: str, pattern: "re.Pattern[bytes]") -> ScanResult:
+    """Search a memory-mapped file; unreadable and empty files have no hits"""
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return NO_HITS
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                count = 0
+                lines: List[int] = []
+                line = 1
+                counted_to = 0
+                for m in pattern.finditer(mm):
+                    count += 1
+                    line += mm[counted_to:m.start()].count(b"\n")
+                    counted_to = m.start()
+                    if not lines or lines[-1] != line:
+                        lines.append(line)
+                return count, lines
+    except (OSError, ValueError):
+        return NO_HITS
+
+
+def read_lines(path: str, line_numbers: Iterable[int]) -> Dict[int, str]:
+    """Decode only the requested 1-based lines of a file (numbered by \\n like scan_file)"""
+    wanted = set(line_numbers)
+    found: Dict[int, str] = {}
+    if not wanted:
+        return found
+    last = max(wanted)
+    with open(path, "rb") as f:
+        for number, raw in enumerate(f, start=1):
+            if number in wanted:
+                found[number] = raw.decode("utf-8", errors="replace").replace("\r\n", "\n")
+            if number >= last:
+                break
+    return found
+
+
+def iter_files(root: str, skip_dir: Callable[[str], bool], include: Callable[[str], bool]) -> Iterator[str]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not skip_dir(d)]
+        for name in filenames:
+            full = os.path.join(dirpath, name)
+            if include(full):
+                yield full
+
+
+def changed_since(root: str, rev: str) -> Set[str]:
+    """Absolute paths changed since a git revision, plus untracked files"""
+    def git(*args: str) -> List[str]:
+        out = subprocess.run(["git", "-C", root, *args], check=True, capture_output=True, text=True).stdout
+        return [line for line in out.splitlines() if line]
+
+    top = git("rev-parse", "--show-toplevel")[0]
+    names = git("diff", "--name-only", rev, "--") + git("ls-files", "--others", "--exclude-standard")
+    return {os.path.normpath(os.path.join(top, name)) for name in names}
+
+
+class ScanCache:
+    """Per-file scan results keyed by mtime and size, invalidated when the tokens change"""
+
+    def __init__(self, path: Optional[str], pattern: "re.Pattern[bytes]"):
+        self.path = path
+        self.key = pattern.pattern.hex()
+        self.entries: Dict[str, list] = {}
+        self.dirty = False
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("key") == self.key:
+                    self.entries = data.get("files", {})
+            except (OSError, ValueError):
+                self.entries = {}
+
+    @staticmethod
+    def stamp(path: str) -> Optional[List[int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def get(self, path: str, stamp: Optional[List[int]]) -> Optional[ScanResult]:
+        entry = self.entries.get(path)
+        if entry is None or stamp is None or entry[0] != stamp:
+            return None
+        return entry[1], entry[2]
+
+    def put(self, path: str, stamp: Optional[List[int]], result: ScanResult) -> None:
+        # The stamp is taken before scanning, so a file edited mid-scan is rescanned next run
+        if stamp is not None:
+            self.entries[path] = [stamp, result[0], result[1]]
+            self.dirty = True
+
+    def save(self) -> None:
+        if not self.path or not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"key": self.key, "files": self.entries}, f)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def scan_paths(
+    paths: Iterable[str],
+    pattern: "re.Pattern[bytes]",
+    workers: Optional[int] = None,
+    cache: Optional[ScanCache] = None,
+) -> Dict[str, ScanResult]:
+    """Scan files in parallel, reusing cached results for unchanged files"""
+    order = list(paths)
+    results: Dict[str, ScanResult] = {}
+    stamps: Dict[str, Optional[List[int]]] = {}
+    todo: List[str] = []
+    for path in order:
+        if cache:
+            stamps[path] = cache.stamp(path)
+            cached = cache.get(path, stamps[path])
+            if cached is not None:
+                results[path] = cached
+                continue
+        todo.append(path)
+
+    workers = workers or os.cpu_count() or 1
+    scan = partial(scan_file, pattern=pattern)
+    if workers <= 1 or len(todo) < 2:
+        for path in todo:
+            results[path] = scan(path)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(todo) // (workers * 8))
+            for path, result in zip(todo, executor.map(scan, todo, chunksize=chunksize)):
+                results[path] = result
+
+    if cache:
+        for path in todo:
+            cache.put(path, stamps[path], results[path])
+        cache.save()
+    return {path: results[path] for path in order}
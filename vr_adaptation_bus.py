@@ -0,0 +1,358 @@
+"""
+L.I.F.E Algorithm - Coalescing VR Adaptation Bus
+
+Delivers VR adaptation states to Unity clients at the headset frame rate
+instead of once per EEG event. Producers publish into a per-slot mailbox
+(a slot is a user, an environment or a visualised item) where a newer state
+replaces the pending one, and a frame-paced flusher sends whatever is
+pending every 1/72 s or 1/90 s. A client therefore never has to work through
+stale intermediate states, and the age of what it receives is bounded by
+about one frame period regardless of the EEG event rate.
+
+Wire format (little-endian, one UDP datagram per frame, chunked to the MTU)
+    frame header  <HBBIH>           magic, version, reserved, frame number, state count
+    state         <BBHQIqfffHH>     kind, reserved, reserved, slot key, sequence,
+                                    created (ns), focus, stress, value, flags, coalesced
+
+Each state is 40 bytes. Slot keys are 64-bit BLAKE2b hashes of the slot name,
+so no user identifier ever goes on the wire. ``created`` is read from the
+bus clock (time.monotonic_ns), which same-host listeners share, so
+end-to-end staleness is receive time minus ``created``.
+
+Usage
+    bus = await VRAdaptationBus.connect("127.0.0.1", 7072, rate_hz=90)
+    bus.start()
+    bus.publish("user-1", focus=0.8, stress=0.2)
+    ...
+    await bus.stop()
+
+Copyright 2025 - Sergio Paya Benaully
+Azure Marketplace Offer ID: 9a600d96-fe1e-420b-902a-a0c42c561adb
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import struct
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from deadline_pacer import DeadlinePacer, MissedTickPolicy, PacerStats, StopToken
+
+logger = logging.getLogger(__name__)
+
+MAGIC = 0x4C56  # "LV"
+WIRE_VERSION = 1
+FRAME_HEADER = struct.Struct("<HBBIH")
+STATE_STRUCT = struct.Struct("<BBHQIqfffHH")
+MAX_DATAGRAM = 1400  # stay under a typical Ethernet MTU
+DEFAULT_PORT = 7072
+# Slots whose last sent sequence is remembered; older slots are forgotten
+MAX_TRACKED_SLOTS = 4096
+
+# State kinds
+KIND_ADAPTATION = 0  # per-user focus/stress adaptation (Section 4)
+KIND_ENVIRONMENT = 1  # environment adjustment (Section 8)
+KIND_COMPLEXITY = 2  # code-complexity visualisation item (Section 10)
+
+# Flag bits for environment changes
+ENVIRONMENT_FLAGS: Dict[str, int] = {
+    "increase_complexity": 1 << 0,
+    "relaxation_mode": 1 << 1,
+    "focus_prompts": 1 << 2,
+    "reduce_distractions": 1 << 3,
+    "clinical_scenario_adjustment": 1 << 4,
+    "market_simulation_adjustment": 1 << 5,
+    "learning_pace_adjustment": 1 << 6,
+    "trigger_relaxation": 1 << 7,
+    "stabilize": 1 << 8,
+}
+
+
+def slot_key(slot: str) -> int:
+    """Stable 64-bit key for a slot name"""
+    return int.from_bytes(hashlib.blake2b(slot.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def encode_flags(changes: Iterable[str]) -> int:
+    flags = 0
+    for change in changes:
+        flags |= ENVIRONMENT_FLAGS.get(change, 0)
+    return flags
+
+
+def decode_flags(flags: int) -> List[str]:
+    return [name for name, bit in ENVIRONMENT_FLAGS.items() if flags & bit]
+
+
+@dataclass(frozen=True)
+class VRState:
+    """One adaptation state as it travels on the wire"""
+
+    key: int
+    sequence: int
+    created_ns: int
+    focus: float = 0.0
+    stress: float = 0.0
+    value: float = 0.0
+    flags: int = 0
+    kind: int = KIND_ADAPTATION
+    coalesced: int = 0  # newer-state replacements absorbed before this was sent
+
+    def pack_into(self, buffer: bytearray, offset: int) -> None:
+        STATE_STRUCT.pack_into(
+            buffer, offset, self.kind, 0, 0, self.key, self.sequence & 0xFFFFFFFF, self.created_ns,
+            self.focus, self.stress, self.value, self.flags & 0xFFFF, min(self.coalesced, 0xFFFF),
+        )
+
+    @classmethod
+    def unpack_from(cls, buffer: bytes, offset: int = 0) -> "VRState":
+        kind, _, _, key, sequence, created, focus, stress, value, flags, coalesced = STATE_STRUCT.unpack_from(
+            buffer, offset
+        )
+        return cls(key, sequence, created, focus, stress, value, flags, kind, coalesced)
+
+
+def encode_frames(frame: int, states: List[VRState], max_datagram: int = MAX_DATAGRAM) -> List[bytes]:
+    """Pack states into as few datagrams as fit under ``max_datagram`` bytes"""
+    per_datagram = max(1, (max_datagram - FRAME_HEADER.size) // STATE_STRUCT.size)
+    datagrams = []
+    for start in range(0, len(states), per_datagram):
+        chunk = states[start:start + per_datagram]
+        buffer = bytearray(FRAME_HEADER.size + STATE_STRUCT.size * len(chunk))
+        FRAME_HEADER.pack_into(buffer, 0, MAGIC, WIRE_VERSION, 0, frame & 0xFFFFFFFF, len(chunk))
+        for i, state in enumerate(chunk):
+            state.pack_into(buffer, FRAME_HEADER.size + i * STATE_STRUCT.size)
+        datagrams.append(bytes(buffer))
+    return datagrams
+
+
+def decode_frame(datagram: bytes) -> Tuple[int, List[VRState]]:
+    """(frame number, states) from one datagram; raises ValueError if malformed"""
+    if len(datagram) < FRAME_HEADER.size:
+        raise ValueError("datagram shorter than the frame header")
+    magic, version, _, frame, count = FRAME_HEADER.unpack_from(datagram)
+    if magic != MAGIC or version != WIRE_VERSION:
+        raise ValueError("not a VR adaptation frame")
+    if len(datagram) != FRAME_HEADER.size + count * STATE_STRUCT.size:
+        raise ValueError("frame length does not match its state count")
+    return frame, [VRState.unpack_from(datagram, FRAME_HEADER.size + i * STATE_STRUCT.size) for i in range(count)]
+
+
+@dataclass
+class BusStats:
+    published: int = 0
+    coalesced: int = 0  # states replaced before they were sent
+    frames: int = 0  # flushes that sent at least one state
+    datagrams: int = 0
+    states_sent: int = 0
+    bytes_sent: int = 0
+    send_errors: int = 0
+
+
+class UDPTransport:
+    """Connected UDP socket on the running event loop; sends never block"""
+
+    def __init__(self, transport: asyncio.DatagramTransport) -> None:
+        self._transport = transport
+        self.errors = 0
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> "UDPTransport":
+        loop = asyncio.get_running_loop()
+        holder: List[UDPTransport] = []
+
+        class _Protocol(asyncio.DatagramProtocol):
+            def error_received(self, exc: Exception) -> None:  # e.g. ICMP port unreachable
+                if holder:
+                    holder[0].errors += 1
+
+        transport, _ = await loop.create_datagram_endpoint(_Protocol, remote_addr=(host, port))
+        holder.append(cls(transport))  # type: ignore[arg-type]
+        return holder[0]
+
+    def send(self, payload: bytes) -> None:
+        self._transport.sendto(payload)
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class VRAdaptationBus:
+    """
+    Latest-wins mailbox per slot, flushed on a fixed frame cadence
+
+    Args:
+        transport: Object with send(bytes) (and optionally close()), e.g. UDPTransport
+        rate_hz: Flush rate; 72 or 90 to match common headset refresh rates
+        clock_ns: Timestamp source for ``created`` (time.monotonic_ns)
+        max_datagram: Datagram size limit for frame chunking
+        max_tracked_slots: Slots whose last sent sequence is kept (least
+            recently sent are forgotten); a forgotten slot resumes above
+            every sequence forgotten so far, so per-slot sequences still
+            only increase
+    """
+
+    def __init__(self, transport, rate_hz: float = 90.0, clock_ns: Callable[[], int] = time.monotonic_ns,
+                 max_datagram: int = MAX_DATAGRAM, max_tracked_slots: int = MAX_TRACKED_SLOTS) -> None:
+        if not rate_hz > 0:
+            raise ValueError("rate_hz must be positive")
+        self.transport = transport
+        self.rate_hz = float(rate_hz)
+        self.clock_ns = clock_ns
+        self.max_datagram = max_datagram
+        self.stats = BusStats()
+        self.stop_token = StopToken()
+        self.max_tracked_slots = max(1, max_tracked_slots)
+        self._pending: Dict[int, VRState] = {}
+        self._last_sent: "OrderedDict[int, int]" = OrderedDict()
+        self._forgotten_sequence = 0
+        self._frame = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = DEFAULT_PORT, rate_hz: float = 90.0,
+                      **kwargs) -> "VRAdaptationBus":
+        return cls(await UDPTransport.connect(host, port), rate_hz=rate_hz, **kwargs)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def publish(self, slot: str, focus: float = 0.0, stress: float = 0.0, value: float = 0.0,
+                flags: int = 0, kind: int = KIND_ADAPTATION) -> VRState:
+        """Queue the newest state for ``slot``, replacing any unsent one; O(1), never blocks"""
+        key = slot_key(slot)
+        previous = self._pending.get(key)
+        coalesced = 0
+        if previous is not None:
+            sequence = previous.sequence + 1
+            coalesced = previous.coalesced + 1
+            self.stats.coalesced += 1
+        else:
+            sequence = self._last_sent.get(key, self._forgotten_sequence) + 1
+        state = VRState(key, sequence, self.clock_ns(), float(focus), float(stress), float(value),
+                        int(flags), int(kind), coalesced)
+        self._pending[key] = state
+        self.stats.published += 1
+        return state
+
+    def flush(self) -> int:
+        """Send everything pending as one frame; returns the number of states sent"""
+        if not self._pending:
+            return 0
+        states, self._pending = list(self._pending.values()), {}
+        self._frame += 1
+        for state in states:
+            self._last_sent[state.key] = state.sequence
+            self._last_sent.move_to_end(state.key)
+        while len(self._last_sent) > self.max_tracked_slots:
+            _, sequence = self._last_sent.popitem(last=False)
+            self._forgotten_sequence = max(self._forgotten_sequence, sequence)
+        for datagram in encode_frames(self._frame, states, self.max_datagram):
+            try:
+                self.transport.send(datagram)
+            except OSError as exc:
+                self.stats.send_errors += 1
+                logger.debug("VR frame send failed: %s", exc)
+                continue
+            self.stats.datagrams += 1
+            self.stats.bytes_sent += len(datagram)
+        self.stats.frames += 1
+        self.stats.states_sent += len(states)
+        return len(states)
+
+    async def run(self, max_frames: Optional[int] = None) -> PacerStats:
+        """Flush once per frame until stop() (missed frames are skipped, not replayed)"""
+        pacer = DeadlinePacer(1.0 / self.rate_hz, policy=MissedTickPolicy.SKIP, stop_token=self.stop_token)
+        return await pacer.run(lambda tick: self.flush(), max_ticks=max_frames)
+
+    def start(self) -> asyncio.Task:
+        if not self.running:
+            self.stop_token = StopToken()
+            self._task = asyncio.ensure_future(self.run())
+        return self._task  # type: ignore[return-value]
+
+    async def stop(self, close: bool = True) -> None:
+        """Stop the flusher, send what is still pending, and close the transport"""
+        self.stop_token.stop()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        self.flush()
+        if close and hasattr(self.transport, "close"):
+            self.transport.close()
+
+
+class StandInUnityListener(asyncio.DatagramProtocol):
+    """
+    Local stand-in for the Unity VR client (tests and demos)
+
+    Keeps the latest state per slot key, counts frames, and records the
+    staleness of every received state (receive time minus ``created``, same
+    clock as the bus). ``regressions`` counts states older than one already
+    applied for the same slot, which latest-wins delivery should never
+    produce.
+    """
+
+    def __init__(self, clock_ns: Callable[[], int] = time.monotonic_ns) -> None:
+        self.clock_ns = clock_ns
+        self.latest: Dict[int, VRState] = {}
+        self.staleness_ns: List[int] = []
+        self.frames = 0
+        self.states = 0
+        self.regressions = 0
+        self.malformed = 0
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.received = asyncio.Event()
+
+    @classmethod
+    async def start(cls, host: str = "127.0.0.1", port: int = 0, **kwargs) -> "StandInUnityListener":
+        loop = asyncio.get_running_loop()
+        _, protocol = await loop.create_datagram_endpoint(lambda: cls(**kwargs), local_addr=(host, port))
+        return protocol
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.transport.get_extra_info("sockname")[:2]  # type: ignore[union-attr]
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        now = self.clock_ns()
+        try:
+            _, states = decode_frame(data)
+        except ValueError:
+            self.malformed += 1
+            return
+        self.frames += 1
+        for state in states:
+            self.states += 1
+            self.staleness_ns.append(now - state.created_ns)
+            current = self.latest.get(state.key)
+            if current is not None and state.sequence <= current.sequence:
+                self.regressions += 1
+                continue
+            self.latest[state.key] = state
+        self.received.set()
+
+    def staleness_ms(self, percentile: float) -> float:
+        if not self.staleness_ns:
+            return 0.0
+        ordered = sorted(self.staleness_ns)
+        index = min(len(ordered) - 1, max(0, int(round(percentile / 100.0 * (len(ordered) - 1)))))
+        return ordered[index] / 1e6
+
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+